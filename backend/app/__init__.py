@@ -3,21 +3,84 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
 from .config import Config
+from .utils.startup import StartupTimer, STARTUP_TIMINGS
+from .utils.logging_setup import configure_logging
+from .utils.database import RoutingSession, configure_database, configure_sqlite
 import logging
-import sqlalchemy.exc
-import os
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+# Configure logging (handlers are installed by create_app and the Celery worker)
 logger = logging.getLogger(__name__)
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 
-def create_app():
+# Blueprints registered per process role; workers and CLI commands serve no routes
+ROLE_BLUEPRINTS = {
+    'api': ('patient', 'condition', 'auth', 'health', 'value_sets', 'observation', 'procedures', 'cohort', 'statistics'),
+    'worker': (),
+    'cli': (),
+}
+
+def create_app(role=None, config=None):
+    """Create the app for a process role: api, worker or cli (default: APP_ROLE), with optional config overrides"""
+    timer = StartupTimer()
     app = Flask(__name__)
     app.config.from_object(Config)
+    if config:
+        app.config.update(config)
+    role = role or app.config['APP_ROLE']
+    if role not in ROLE_BLUEPRINTS:
+        raise ValueError(f"Unknown app role '{role}', expected one of: {', '.join(ROLE_BLUEPRINTS)}")
+    app.config['APP_ROLE'] = role
+    configure_logging(app.config)
+    configure_database(app.config)
+    timer.mark('config')
+    
+    db.init_app(app)
+    migrate.init_app(app, db)
+    
+    # WAL, busy timeout and connection pragmas, and one writer per process, for SQLite databases
+    with app.app_context():
+        configure_sqlite(app.config, db.engines.values())
+    timer.mark('extensions')
+    
+    # Keep registry statistics in step with every ORM write
+    from app.services.statistics_service import register_statistics_listeners
+    register_statistics_listeners(db.session)
+    
+    # Drop cached value sets whenever they are re-seeded or edited
+    from app.services.value_set_service import register_value_set_listeners
+    register_value_set_listeners(db.session)
     
+    # Drop cached entity responses when their records are written (API requests, imports and sync tasks)
+    from app.services.response_cache_service import register_response_cache_listeners
+    register_response_cache_listeners(db.session)
+    
+    # Drop cached principals when a user's roles or active flag change
+    from app.services.auth_service import register_principal_listeners
+    register_principal_listeners(db.session)
+    timer.mark('listeners')
+    
+    register_blueprints(app, role)
+    timer.mark('blueprints')
+    
+    if role == 'api':
+        init_api_middleware(app)
+    
+    # Seed reference data only when its definitions changed (one fingerprint lookup)
+    if app.config['SEED_ON_STARTUP']:
+        from app.services.seed_service import seed_service
+        with app.app_context():
+            seed_service.ensure_seeded()
+    timer.mark('seed')
+    
+    # Kept for the startup benchmark (benchmarks/startup.py)
+    app.extensions[STARTUP_TIMINGS] = timer.as_dict()
+    logger.debug("Created %s app in %.3fs", role, timer.total)
+    return app
+
+def init_api_middleware(app):
+    """CORS, request timing and compression, for the API app and the documentation app built next to it"""
     # Enable CORS with specific settings
     CORS(app, resources={r"/*": {
         "origins": ["http://localhost:3000", "http://127.0.0.1:3000"],
@@ -26,291 +89,36 @@ def create_app():
         "supports_credentials": True
     }})
     
-    db.init_app(app)
-    migrate.init_app(app, db)
-    
-    # Register blueprints
-    from app.blueprints import patient_bp, condition_bp, auth_bp, health_bp, value_sets_bp, observation_bp, procedures_bp
-    
-    app.register_blueprint(patient_bp)
-    app.register_blueprint(condition_bp)
-    app.register_blueprint(auth_bp)
-    app.register_blueprint(health_bp)
-    app.register_blueprint(value_sets_bp)
-    app.register_blueprint(observation_bp)
-    app.register_blueprint(procedures_bp)
+    # Per-request Server-Timing instrumentation; installs nothing unless REQUEST_TIMING is set
+    from app.middleware.timing import init_request_timing
+    init_request_timing(app)
     
-    # Register API documentation blueprint
-    from app.api_docs import api_doc
-    app.register_blueprint(api_doc)
+    # Negotiated gzip/brotli for JSON and text responses above COMPRESSION_MIN_SIZE
+    from app.middleware.compression import init_compression
+    init_compression(app)
+
+def register_blueprints(app, role):
+    """Register the role's blueprints (or those listed in BLUEPRINTS) and, for the API, its documentation"""
+    from app.blueprints import load_blueprint
     
-    # Initialize value sets
-    with app.app_context():
-        init_value_sets()
-        init_admin_user()  # Create default admin user if it doesn't exist
+    names = [name.strip() for name in app.config['BLUEPRINTS'].split(',') if name.strip()] or ROLE_BLUEPRINTS[role]
+    for name in names:
+        app.register_blueprint(load_blueprint(name))
     
-    return app
-
-def init_value_sets():
-    """Initialize all value sets in the database"""
-    logger.info("Initializing value sets...")
+    if role != 'api':
+        return
     
-    # Check if database tables exist before initializing
-    if check_tables_exist():
-        # Initialize roles
-        init_roles()
-        
-        # Initialize other value sets
-        init_sync_statuses()
-        init_genders()
-        init_condition_statuses()
-        init_neurological_conditions()
-    else:
-        logger.info("Database tables don't exist yet. Skipping value set initialization.")
-
-def check_tables_exist():
-    """Check if required tables exist in the database"""
-    try:
-        inspector = sqlalchemy.inspect(db.engine)
-        
-        required_tables = ['role', 'gender', 'condition_status', 'neurological_condition', 'sync_status']
-        existing_tables = inspector.get_table_names()
-        
-        missing_tables = [table for table in required_tables if table not in existing_tables]
-        if missing_tables:
-            logger.info(f"Tables not yet created: {', '.join(missing_tables)}")
-            return False
-        
-        return True
-    except Exception as e:
-        logger.warning(f"Error checking if tables exist: {str(e)}")
-        return False
-
-def init_roles():
-    """Initialize roles from value sets"""
-    try:
-        from app.models import Role
-        from app.value_sets.roles import get_all_roles
-        
-        # Get roles from value sets
-        standard_roles = get_all_roles()
-        
-        # Create roles that don't exist
-        roles_created = 0
-        for role_data in standard_roles:
-            existing_role = Role.query.filter_by(name=role_data['name']).first()
-            if not existing_role:
-                logger.info(f"Creating role: {role_data['name']}")
-                new_role = Role(**role_data)
-                db.session.add(new_role)
-                roles_created += 1
-            else:
-                logger.debug(f"Role already exists: {role_data['name']}")
-        
-        if roles_created > 0:
-            db.session.commit()
-            logger.info(f"Created {roles_created} new roles")
-        else:
-            logger.info("All standard roles already exist in the database")
-            
-    except Exception as e:
-        logger.error(f"Error initializing roles: {str(e)}")
-        db.session.rollback()
-
-def init_genders():
-    """Initialize gender reference data in database"""
-    try:
-        from app.models import Gender
-        from app.value_sets.genders import get_all_genders
-        
-        # Create gender records that don't exist
-        genders = get_all_genders()
-        gender_count = 0
-        
-        for gender_data in genders:
-            existing = Gender.query.filter_by(code=gender_data['code']).first()
-            if not existing:
-                new_gender = Gender(
-                    code=gender_data['code'],
-                    display=gender_data['display'],
-                    description=gender_data['description']
-                )
-                db.session.add(new_gender)
-                gender_count += 1
-        
-        if gender_count > 0:
-            db.session.commit()
-            logger.info(f"Created {gender_count} new gender records")
-        else:
-            logger.info("All gender values already exist in the database")
-            
-    except Exception as e:
-        logger.error(f"Error initializing genders: {str(e)}")
-        db.session.rollback()
-
-def init_condition_statuses():
-    """Initialize condition status reference data in database"""
-    try:
-        from app.models import ConditionStatus
-        from app.value_sets.condition_statuses import get_all_condition_statuses
-        
-        # Create condition status records that don't exist
-        statuses = get_all_condition_statuses()
-        status_count = 0
-        
-        for status_data in statuses:
-            existing = ConditionStatus.query.filter_by(code=status_data['code']).first()
-            if not existing:
-                new_status = ConditionStatus(
-                    code=status_data['code'],
-                    display=status_data['display'],
-                    description=status_data['description']
-                )
-                db.session.add(new_status)
-                status_count += 1
-        
-        if status_count > 0:
-            db.session.commit()
-            logger.info(f"Created {status_count} new condition status records")
-        else:
-            logger.info("All condition status values already exist in the database")
-            
-    except Exception as e:
-        logger.error(f"Error initializing condition statuses: {str(e)}")
-        db.session.rollback()
-
-def init_neurological_conditions():
-    """Initialize neurological condition code reference data in database"""
-    try:
-        from app.models import NeurologicalCondition
-        from app.value_sets.neurological_conditions import get_all_neurological_conditions
-        
-        # Create neurological condition records that don't exist
-        conditions = get_all_neurological_conditions()
-        condition_count = 0
-        
-        for condition_data in conditions:
-            existing = NeurologicalCondition.query.filter_by(code=condition_data['code']).first()
-            if not existing:
-                new_condition = NeurologicalCondition(
-                    code=condition_data['code'],
-                    display=condition_data['display'],
-                    description=condition_data['description']
-                )
-                db.session.add(new_condition)
-                condition_count += 1
-        
-        if condition_count > 0:
-            db.session.commit()
-            logger.info(f"Created {condition_count} new neurological condition records")
-        else:
-            logger.info("All neurological condition values already exist in the database")
-            
-    except Exception as e:
-        logger.error(f"Error initializing neurological conditions: {str(e)}")
-        db.session.rollback()
-
-def init_sync_statuses():
-    """Initialize sync status reference data in database"""
-    try:
-        from app.models import SyncStatus
-        from app.value_sets.sync_statuses import get_all_sync_statuses
-        
-        # Create sync status records that don't exist
-        statuses = get_all_sync_statuses()
-        status_count = 0
-        
-        for status_data in statuses:
-            existing = SyncStatus.query.filter_by(code=status_data['code']).first()
-            if not existing:
-                new_status = SyncStatus(
-                    code=status_data['code'],
-                    display=status_data['display'],
-                    description=status_data['description']
-                )
-                db.session.add(new_status)
-                status_count += 1
-        
-        if status_count > 0:
-            db.session.commit()
-            logger.info(f"Created {status_count} new sync status records")
-        else:
-            logger.info("All sync status values already exist in the database")
-            
-    except Exception as e:
-        logger.error(f"Error initializing sync statuses: {str(e)}")
-        db.session.rollback()
-
-def init_admin_user():
-    """Create default demo users if they don't exist"""
-    try:
-        from app.models import User, Role
-        
-        # Create demo users with different roles
-        demo_users = [
-            {
-                'username': os.environ.get('DEFAULT_ADMIN_USERNAME', 'admin'),
-                'password': os.environ.get('DEFAULT_ADMIN_PASSWORD', 'password'),
-                'email': os.environ.get('DEFAULT_ADMIN_EMAIL', 'admin@example.com'),
-                'first_name': 'Default',
-                'last_name': 'Admin',
-                'role_name': 'admin'
-            },
-            {
-                'username': 'researcher',
-                'password': 'research',
-                'email': 'researcher@example.com',
-                'first_name': 'Demo',
-                'last_name': 'Researcher',
-                'role_name': 'researcher'
-            },
-            {
-                'username': 'clinician',
-                'password': 'clinic',
-                'email': 'clinician@example.com',
-                'first_name': 'Demo',
-                'last_name': 'Clinician', 
-                'role_name': 'clinician'
-            }
-        ]
-        
-        users_created = 0
-        
-        for user_data in demo_users:
-            # Check if user already exists
-            existing_user = User.query.filter_by(username=user_data['username']).first()
-            
-            if not existing_user:
-                # Get the role
-                role = Role.query.filter_by(name=user_data['role_name']).first()
-                
-                if not role:
-                    logger.warning(f"Role '{user_data['role_name']}' not found, can't create user '{user_data['username']}'")
-                    continue
-                    
-                # Create the user
-                new_user = User(
-                    username=user_data['username'],
-                    email=user_data['email'],
-                    first_name=user_data['first_name'],
-                    last_name=user_data['last_name'],
-                    is_active=True
-                )
-                new_user.set_password(user_data['password'])
-                new_user.roles.append(role)
-                
-                db.session.add(new_user)
-                users_created += 1
-                
-                logger.info(f"Created demo user: {user_data['username']} with role: {user_data['role_name']}")
-            else:
-                logger.info(f"User '{user_data['username']}' already exists")
-        
-        if users_created > 0:
-            db.session.commit()
-            logger.info(f"Created {users_created} demo users")
-            logger.info("IMPORTANT: These are demo users. Use secure passwords in production!")
-        
-    except Exception as e:
-        logger.error(f"Error creating demo users: {str(e)}")
-        db.session.rollback()
\ No newline at end of file
+    docs_mode = app.config['API_DOCS']
+    if docs_mode == 'lazy':
+        # Build flask-restx and the namespaces on the first /api/docs request
+        from app.api_docs.loader import LazyDocsMiddleware
+        app.wsgi_app = LazyDocsMiddleware(app)
+    elif docs_mode == 'eager':
+        from app.api_docs import api_doc
+        app.register_blueprint(api_doc)
+    elif docs_mode == 'static':
+        # Serve the file written by `flask export-openapi`
+        from app.api_docs.loader import static_docs_blueprint
+        app.register_blueprint(static_docs_blueprint(app.config['OPENAPI_SPEC_PATH']))
+    elif docs_mode != 'off':
+        logger.warning("Unknown API_DOCS mode '%s', API documentation disabled", docs_mode)
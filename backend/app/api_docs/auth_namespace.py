@@ -37,9 +37,23 @@ token_response_model = auth_ns.model('TokenResponse', {
     'access_token': fields.String(description="JWT access token"),
     'token_type': fields.String(description="Token type (bearer)"),
     'expires_in': fields.Integer(description="Token expiration time in seconds"),
+    'refresh_token': fields.String(description="Refresh token for /auth/refresh; rotated on every use"),
+    'refresh_expires_in': fields.Integer(description="Refresh token expiration time in seconds"),
     'user': fields.Nested(user_response_model, description="User information")
 })
 
+refresh_request_model = auth_ns.model('RefreshTokenRequest', {
+    'refresh_token': fields.String(required=True, description="Refresh token issued at login or by the last refresh")
+})
+
+refresh_response_model = auth_ns.model('RefreshTokenResponse', {
+    'access_token': fields.String(description="New JWT access token"),
+    'token_type': fields.String(description="Token type (bearer)"),
+    'expires_in': fields.Integer(description="Access token expiration time in seconds"),
+    'refresh_token': fields.String(description="Replacement refresh token; the one sent is revoked"),
+    'refresh_expires_in': fields.Integer(description="Refresh token expiration time in seconds")
+})
+
 error_model = auth_ns.model('ErrorResponse', {
     'error': fields.String(description="Error message")
 })
@@ -93,11 +107,44 @@ class Login(Resource):
             access_token=token_data["access_token"],
             token_type=token_data["token_type"],
             expires_in=token_data["expires_in"],
+            refresh_token=token_data["refresh_token"],
+            refresh_expires_in=token_data["refresh_expires_in"],
             user=UserResponse.model_validate(user)
         )
         
         return token_response.model_dump()
 
+@auth_ns.route('/refresh')
+class Refresh(Resource):
+    @auth_ns.doc('refresh_token', responses={
+        200: 'Tokens renewed',
+        400: 'Validation error',
+        401: 'Refresh token invalid, expired or revoked',
+        500: 'Server error'
+    })
+    @auth_ns.expect(refresh_request_model)
+    @auth_ns.marshal_with(refresh_response_model, code=200)
+    def post(self):
+        """Exchange a refresh token for a new access token and a rotated refresh token"""
+        result, status_code = auth_service.refresh_tokens(request.json.get('refresh_token', ''))
+        if status_code != 200:
+            auth_ns.abort(status_code, result["error"])
+        return result
+
+@auth_ns.route('/logout')
+class Logout(Resource):
+    @auth_ns.doc('logout_user', responses={
+        200: 'Refresh token family revoked',
+        400: 'Validation error',
+        401: 'Invalid refresh token',
+        500: 'Server error'
+    })
+    @auth_ns.expect(refresh_request_model)
+    def post(self):
+        """Revoke a refresh token and every token rotated from the same login"""
+        result, status_code = auth_service.revoke_refresh_token(request.json.get('refresh_token', ''))
+        return result, status_code
+
 @auth_ns.route('/me')
 class CurrentUser(Resource):
     @auth_ns.doc('get_current_user', responses={
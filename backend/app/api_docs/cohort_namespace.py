@@ -0,0 +1,66 @@
+from flask_restx import Namespace, Resource, fields
+from flask import request
+from app.services.cohort_service import cohort_service
+
+# Create a namespace for cohort query endpoints
+cohort_ns = Namespace('cohorts', description='Cohort queries across conditions, observations, procedures and demographics')
+
+# Define models for request and response documentation
+cohort_query_model = cohort_ns.model('CohortQuery', {
+    'criteria': fields.Raw(required=True, description=(
+        "Criteria tree. Inner nodes are {\"and\": [...]}, {\"or\": [...]} or {\"not\": {...}}; "
+        "leaves are condition (code, codes, status, onset_after, onset_before), "
+        "observation (code, min_value, max_value, since, until, within_days), "
+        "procedure (code, codes, since, until, within_days), age (min, max) and gender (codes)"
+    ), example={"and": [
+        {"condition": {"code": "G30.9", "status": "active"}},
+        {"age": {"min": 65}},
+        {"observation": {"code": "72172-0", "max_value": 25, "within_days": 365}}
+    ]}),
+    'limit': fields.Integer(required=False, default=100, description="Maximum number of patient IDs to return (1-1000)"),
+    'after_id': fields.Integer(required=False, description="Return patient IDs greater than this cursor"),
+})
+
+cohort_count_model = cohort_ns.model('CohortCount', {
+    'query_hash': fields.String(description="Hash of the normalized criteria tree"),
+    'count': fields.Integer(description="Number of matching patients"),
+    'cached': fields.Boolean(description="Whether the result was served from the cache"),
+})
+
+cohort_patients_model = cohort_ns.model('CohortPatients', {
+    'query_hash': fields.String(description="Hash of the normalized criteria tree"),
+    'patient_ids': fields.List(fields.Integer, description="Matching patient IDs in ascending order"),
+    'after_id': fields.Integer(description="Cursor this page starts after"),
+    'limit': fields.Integer(description="Page size"),
+    'next_after_id': fields.Integer(description="Cursor for the next page, null on the last page"),
+    'cached': fields.Boolean(description="Whether the result was served from the cache"),
+})
+
+# Define routes and their documentation
+@cohort_ns.route('/count')
+class CohortCount(Resource):
+    @cohort_ns.doc('count_cohort', responses={
+        200: 'Number of matching patients',
+        400: 'Invalid criteria',
+        403: 'Admin or researcher role required'
+    })
+    @cohort_ns.expect(cohort_query_model)
+    @cohort_ns.marshal_with(cohort_count_model)
+    def post(self):
+        """Count patients matching a criteria tree"""
+        result, status_code = cohort_service.count_patients(request.json)
+        return result, status_code
+
+@cohort_ns.route('/patients')
+class CohortPatients(Resource):
+    @cohort_ns.doc('find_cohort_patients', responses={
+        200: 'Page of matching patient IDs',
+        400: 'Invalid criteria',
+        403: 'Admin or researcher role required'
+    })
+    @cohort_ns.expect(cohort_query_model)
+    @cohort_ns.marshal_with(cohort_patients_model)
+    def post(self):
+        """Page through IDs of patients matching a criteria tree"""
+        result, status_code = cohort_service.find_patient_ids(request.json)
+        return result, status_code
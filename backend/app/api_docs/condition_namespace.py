@@ -8,9 +8,9 @@ condition_ns = Namespace('conditions', description='Condition operations')
 
 # Define models for request and response documentation
 condition_create_model = condition_ns.model('ConditionCreate', {
-    'condition_code': fields.String(required=True, description="Condition code"),
+    'condition_code': fields.String(required=True, description="Condition code from /value-sets/neurological-conditions"),
     'onset_date': fields.Date(required=True, description="Date of condition onset (YYYY-MM-DD)"),
-    'status': fields.String(required=True, description="Condition status (active, inactive, resolved, unknown)"),
+    'status': fields.String(required=True, description="Condition status from /value-sets/condition-statuses"),
     'patient_id': fields.Integer(required=True, description="ID of the patient with this condition"),
 })
 
@@ -41,6 +41,7 @@ class ConditionList(Resource):
 @condition_ns.param('id', 'The condition identifier')
 @condition_ns.response(404, 'Condition not found')
 class Condition(Resource):
+    @condition_ns.response(304, 'Not modified since the ETag sent in If-None-Match')
     @condition_ns.doc('get_condition')
     @condition_ns.marshal_with(condition_response_model)
     def get(self, id):
@@ -53,9 +54,43 @@ class Condition(Resource):
 @condition_ns.route('/patient/<int:patient_id>')
 @condition_ns.param('patient_id', 'The patient identifier')
 class PatientConditions(Resource):
+    @condition_ns.response(304, 'Not modified since the ETag sent in If-None-Match')
     @condition_ns.doc('get_patient_conditions')
     @condition_ns.marshal_list_with(condition_response_model)
     def get(self, patient_id):
         """Get all conditions for a specific patient"""
         conditions = condition_service.get_conditions_by_patient_id(patient_id)
-        return [c.model_dump() for c in conditions]
\ No newline at end of file
+        return [c.model_dump() for c in conditions]
+
+condition_bulk_error_model = condition_ns.model('ConditionBulkItemError', {
+    'field': fields.String(description="Field that failed validation"),
+    'message': fields.String(description="Error message"),
+    'type': fields.String(description="Error type"),
+})
+
+condition_bulk_item_model = condition_ns.model('ConditionBulkItemResult', {
+    'index': fields.Integer(description="Position of the item in the request"),
+    'status': fields.Integer(description="201 if created, 400 if rejected"),
+    'id': fields.Integer(description="ID of the created condition"),
+    'errors': fields.List(fields.Nested(condition_bulk_error_model), description="Validation errors for a rejected item"),
+})
+
+condition_bulk_result_model = condition_ns.model('ConditionBulkResult', {
+    'total': fields.Integer(description="Number of items submitted"),
+    'created': fields.Integer(description="Number of conditions created"),
+    'failed': fields.Integer(description="Number of items rejected"),
+    'results': fields.List(fields.Nested(condition_bulk_item_model), description="Per-item results in request order"),
+})
+
+@condition_ns.route('/bulk')
+@condition_ns.response(207, 'Some items were rejected')
+@condition_ns.response(400, 'No items were valid')
+@condition_ns.response(413, 'Too many items in one batch')
+class ConditionBulk(Resource):
+    @condition_ns.doc('create_conditions_bulk')
+    @condition_ns.expect([condition_create_model])
+    @condition_ns.marshal_with(condition_bulk_result_model, code=201)
+    def post(self):
+        """Create a batch of conditions with one insert and one batched sync"""
+        result, status_code = condition_service.create_conditions_bulk(request.json)
+        return result, status_code
@@ -0,0 +1,93 @@
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict
+
+from flask import Blueprint, Flask, jsonify, send_file
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# URL prefixes served by the documentation app (Swagger UI assets live under /swaggerui)
+DOCS_PREFIXES = ('/api/docs', '/swaggerui')
+
+
+def create_docs_app(app: Flask) -> Flask:
+    """
+    Build a Flask app serving only the flask-restx documentation, next to the API app
+
+    It takes the API app's config, database engines and session, and its
+    CORS, timing and compression middleware, so resources served under
+    /api/docs behave like the API itself.
+    """
+    from app import db, init_api_middleware
+    from app.api_docs.documentation import api_doc
+    from app.utils.database import share_database
+
+    docs_app = Flask('app')
+    docs_app.config.from_mapping(app.config)
+    share_database(db, app, docs_app)
+    docs_app.register_blueprint(api_doc)
+    init_api_middleware(docs_app)
+    return docs_app
+
+
+def build_openapi_spec(app: Flask) -> Dict[str, Any]:
+    """Generate the OpenAPI (Swagger 2.0) document without serving it"""
+    from app.api_docs.documentation import api
+
+    docs_app = create_docs_app(app)
+    with docs_app.test_request_context():
+        return api.__schema__
+
+
+def export_openapi_spec(app: Flask, path: str) -> str:
+    """Write the OpenAPI document to a file for API_DOCS=static"""
+    spec = build_openapi_spec(app)
+    with open(path, 'w', encoding='utf-8') as handle:
+        json.dump(spec, handle, indent=2, sort_keys=True)
+    return path
+
+
+class LazyDocsMiddleware:
+    """
+    WSGI middleware sending documentation requests to a docs app built on first use
+
+    Processes that never serve the docs never import flask-restx or build the
+    namespaces; other requests go straight to the wrapped application.
+    """
+
+    def __init__(self, app: Flask):
+        self.app = app
+        self.wsgi_app = app.wsgi_app
+        self._docs_app = None
+        self._lock = threading.Lock()
+
+    def docs_app(self) -> Flask:
+        if self._docs_app is None:
+            with self._lock:
+                if self._docs_app is None:
+                    logger.info("Building API documentation on first request")
+                    self._docs_app = create_docs_app(self.app)
+        return self._docs_app
+
+    def __call__(self, environ, start_response):
+        path = environ.get('PATH_INFO', '')
+        if any(path == prefix or path.startswith(prefix + '/') for prefix in DOCS_PREFIXES):
+            return self.docs_app()(environ, start_response)
+        return self.wsgi_app(environ, start_response)
+
+
+def static_docs_blueprint(spec_path: str) -> Blueprint:
+    """Blueprint serving a pre-generated OpenAPI file at /api/docs/swagger.json"""
+    static_docs = Blueprint('api_doc', __name__, url_prefix='/api/docs')
+
+    @static_docs.route('/swagger.json', methods=['GET'])
+    def get_openapi_spec():
+        """Serve the OpenAPI document written by `flask export-openapi`"""
+        if not os.path.exists(spec_path):
+            return jsonify({"error": "OpenAPI document not generated; run `flask export-openapi`"}), 404
+        return send_file(os.path.abspath(spec_path), mimetype='application/json', max_age=3600)
+
+    return static_docs
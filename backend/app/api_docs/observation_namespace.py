@@ -23,7 +23,10 @@ observation_response_model = observation_ns.model('ObservationResponse', {
     'observation_code': fields.String(description="Observation code"),
     'observation_name': fields.String(description="Observation name/type"),
     'value': fields.String(description="Observation value"),
+    'value_numeric': fields.Float(description="Parsed numeric value, null when the value is not numeric"),
+    'value_type': fields.String(description="Value type (quantity or string)"),
     'unit': fields.String(description="Unit of measurement"),
+    'unit_normalized': fields.String(description="Unit normalized to its UCUM code where known"),
     'reference_range': fields.String(description="Reference range for the observation"),
     'observation_date': fields.DateTime(description="Date and time of observation"),
     'status': fields.String(description="Observation status"),
@@ -51,6 +54,7 @@ class ObservationList(Resource):
 @observation_ns.param('id', 'The observation identifier')
 @observation_ns.response(404, 'Observation not found')
 class Observation(Resource):
+    @observation_ns.response(304, 'Not modified since the ETag sent in If-None-Match')
     @observation_ns.doc('get_observation')
     @observation_ns.marshal_with(observation_response_model)
     def get(self, id):
@@ -62,10 +66,67 @@ class Observation(Resource):
 
 @observation_ns.route('/patient/<int:patient_id>')
 @observation_ns.param('patient_id', 'The patient identifier')
+@observation_ns.param('code', 'Observation code to filter on (used with min_value/max_value)')
+@observation_ns.param('min_value', 'Inclusive lower bound on the numeric value')
+@observation_ns.param('max_value', 'Inclusive upper bound on the numeric value')
 class PatientObservations(Resource):
+    @observation_ns.response(304, 'Not modified since the ETag sent in If-None-Match')
     @observation_ns.doc('get_patient_observations')
     @observation_ns.marshal_list_with(observation_response_model)
     def get(self, patient_id):
         """Get all observations for a specific patient"""
         observations = observation_service.get_observations_by_patient_id(patient_id)
-        return [o.model_dump() for o in observations]
\ No newline at end of file
+        return [o.model_dump() for o in observations]
+
+observation_summary_model = observation_ns.model('ObservationSummary', {
+    'observation_code': fields.String(description="Observation code"),
+    'count': fields.Integer(description="Number of observations with a numeric value"),
+    'min': fields.Float(description="Minimum numeric value"),
+    'max': fields.Float(description="Maximum numeric value"),
+    'mean': fields.Float(description="Mean numeric value"),
+})
+
+@observation_ns.route('/summary')
+@observation_ns.param('code', 'The observation code to summarize')
+class ObservationSummary(Resource):
+    @observation_ns.doc('get_observation_summary')
+    @observation_ns.marshal_with(observation_summary_model)
+    def get(self):
+        """Get numeric aggregates for an observation code"""
+        code = request.args.get('code')
+        if not code:
+            observation_ns.abort(400, "code parameter is required")
+        return observation_service.summarize_observations_by_code(code)
+
+observation_bulk_error_model = observation_ns.model('ObservationBulkItemError', {
+    'field': fields.String(description="Field that failed validation"),
+    'message': fields.String(description="Error message"),
+    'type': fields.String(description="Error type"),
+})
+
+observation_bulk_item_model = observation_ns.model('ObservationBulkItemResult', {
+    'index': fields.Integer(description="Position of the item in the request"),
+    'status': fields.Integer(description="201 if created, 400 if rejected"),
+    'id': fields.Integer(description="ID of the created observation"),
+    'errors': fields.List(fields.Nested(observation_bulk_error_model), description="Validation errors for a rejected item"),
+})
+
+observation_bulk_result_model = observation_ns.model('ObservationBulkResult', {
+    'total': fields.Integer(description="Number of items submitted"),
+    'created': fields.Integer(description="Number of observations created"),
+    'failed': fields.Integer(description="Number of items rejected"),
+    'results': fields.List(fields.Nested(observation_bulk_item_model), description="Per-item results in request order"),
+})
+
+@observation_ns.route('/bulk')
+@observation_ns.response(207, 'Some items were rejected')
+@observation_ns.response(400, 'No items were valid')
+@observation_ns.response(413, 'Too many items in one batch')
+class ObservationBulk(Resource):
+    @observation_ns.doc('create_observations_bulk')
+    @observation_ns.expect([observation_create_model])
+    @observation_ns.marshal_with(observation_bulk_result_model, code=201)
+    def post(self):
+        """Create a batch of observations with one insert and one batched sync"""
+        result, status_code = observation_service.create_observations_bulk(request.json)
+        return result, status_code
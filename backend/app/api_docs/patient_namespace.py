@@ -26,6 +26,7 @@ patient_response_model = patient_ns.model('PatientResponse', {
 # Define routes and their documentation
 @patient_ns.route('/')
 class PatientList(Resource):
+    @patient_ns.response(304, 'Not modified since the ETag sent in If-None-Match')
     @patient_ns.doc('list_patients')
     @patient_ns.marshal_list_with(patient_response_model)
     def get(self):
@@ -45,6 +46,7 @@ class PatientList(Resource):
 @patient_ns.param('id', 'The patient identifier')
 @patient_ns.response(404, 'Patient not found')
 class Patient(Resource):
+    @patient_ns.response(304, 'Not modified since the ETag sent in If-None-Match')
     @patient_ns.doc('get_patient')
     @patient_ns.marshal_with(patient_response_model)
     def get(self, id):
@@ -45,6 +45,7 @@ class ProcedureList(Resource):
 @procedure_ns.param('id', 'The procedure identifier')
 @procedure_ns.response(404, 'Procedure not found')
 class Procedure(Resource):
+    @procedure_ns.response(304, 'Not modified since the ETag sent in If-None-Match')
     @procedure_ns.doc('get_procedure')
     @procedure_ns.marshal_with(procedure_response_model)
     def get(self, id):
@@ -58,6 +59,7 @@ class Procedure(Resource):
 @procedure_ns.param('patient_id', 'The patient identifier')
 @procedure_ns.response(404, 'No procedures found for this patient')
 class PatientProcedures(Resource):
+    @procedure_ns.response(304, 'Not modified since the ETag sent in If-None-Match')
     @procedure_ns.doc('get_patient_procedures')
     @procedure_ns.marshal_with(procedure_response_model, as_list=True)
     def get(self, patient_id):
@@ -65,4 +67,37 @@ class PatientProcedures(Resource):
         procedures = procedure_service.get_procedures_by_patient_id(patient_id)
         if not procedures:
             procedure_ns.abort(404, f"No procedures found for patient {patient_id}")
-        return [proc.model_dump() if hasattr(proc, 'model_dump') else proc for proc in procedures]
\ No newline at end of file
+        return [proc.model_dump() if hasattr(proc, 'model_dump') else proc for proc in procedures]
+
+procedure_bulk_error_model = procedure_ns.model('ProcedureBulkItemError', {
+    'field': fields.String(description="Field that failed validation"),
+    'message': fields.String(description="Error message"),
+    'type': fields.String(description="Error type"),
+})
+
+procedure_bulk_item_model = procedure_ns.model('ProcedureBulkItemResult', {
+    'index': fields.Integer(description="Position of the item in the request"),
+    'status': fields.Integer(description="201 if created, 400 if rejected"),
+    'id': fields.Integer(description="ID of the created procedure"),
+    'errors': fields.List(fields.Nested(procedure_bulk_error_model), description="Validation errors for a rejected item"),
+})
+
+procedure_bulk_result_model = procedure_ns.model('ProcedureBulkResult', {
+    'total': fields.Integer(description="Number of items submitted"),
+    'created': fields.Integer(description="Number of procedures created"),
+    'failed': fields.Integer(description="Number of items rejected"),
+    'results': fields.List(fields.Nested(procedure_bulk_item_model), description="Per-item results in request order"),
+})
+
+@procedure_ns.route('/bulk')
+@procedure_ns.response(207, 'Some items were rejected')
+@procedure_ns.response(400, 'No items were valid')
+@procedure_ns.response(413, 'Too many items in one batch')
+class ProcedureBulk(Resource):
+    @procedure_ns.doc('create_procedures_bulk')
+    @procedure_ns.expect([procedure_create_model])
+    @procedure_ns.marshal_with(procedure_bulk_result_model, code=201)
+    def post(self):
+        """Create a batch of procedures with one insert and one batched sync"""
+        result, status_code = procedure_service.create_procedures_bulk(request.json)
+        return result, status_code
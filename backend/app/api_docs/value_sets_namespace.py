@@ -16,6 +16,7 @@ value_set_item_model = value_sets_ns.model('ValueSetItem', {
 class GenderValueSet(Resource):
     @value_sets_ns.doc('get_genders', responses={
         200: 'List of gender values',
+        304: 'Not modified since the ETag sent in If-None-Match',
         500: 'Server error'
     })
     @value_sets_ns.marshal_list_with(value_set_item_model)
@@ -27,6 +28,7 @@ class GenderValueSet(Resource):
 class ConditionStatusValueSet(Resource):
     @value_sets_ns.doc('get_condition_statuses', responses={
         200: 'List of condition status values',
+        304: 'Not modified since the ETag sent in If-None-Match',
         500: 'Server error'
     })
     @value_sets_ns.marshal_list_with(value_set_item_model)
@@ -38,6 +40,7 @@ class ConditionStatusValueSet(Resource):
 class NeurologicalConditionValueSet(Resource):
     @value_sets_ns.doc('get_neurological_conditions', responses={
         200: 'List of neurological condition codes',
+        304: 'Not modified since the ETag sent in If-None-Match',
         500: 'Server error'
     })
     @value_sets_ns.marshal_list_with(value_set_item_model)
@@ -49,6 +52,7 @@ class NeurologicalConditionValueSet(Resource):
 class SyncStatusValueSet(Resource):
     @value_sets_ns.doc('get_sync_statuses', responses={
         200: 'List of sync status values',
+        304: 'Not modified since the ETag sent in If-None-Match',
         500: 'Server error'
     })
     @value_sets_ns.marshal_list_with(value_set_item_model)
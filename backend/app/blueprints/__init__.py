@@ -1,10 +1,31 @@
 # This file makes the blueprints directory a Python package
-from app.blueprints.patients import patient_bp
-from app.blueprints.conditions import condition_bp
-from app.blueprints.auth import auth_bp
-from app.blueprints.health import health_bp
-from app.blueprints.value_sets import value_sets_bp
-from app.blueprints.observations import observation_bp
-from app.blueprints.procedures import procedures_bp
-
-__all__ = ['patient_bp', 'condition_bp', 'auth_bp', 'health_bp', 'value_sets_bp', 'observation_bp', 'procedures_bp']
\ No newline at end of file
+import importlib
+
+# Blueprint name -> (module, attribute); a blueprint's routes are only imported when it is registered
+BLUEPRINTS = {
+    'patient': ('app.blueprints.patients', 'patient_bp'),
+    'condition': ('app.blueprints.conditions', 'condition_bp'),
+    'auth': ('app.blueprints.auth', 'auth_bp'),
+    'health': ('app.blueprints.health', 'health_bp'),
+    'value_sets': ('app.blueprints.value_sets', 'value_sets_bp'),
+    'observation': ('app.blueprints.observations', 'observation_bp'),
+    'procedures': ('app.blueprints.procedures', 'procedures_bp'),
+    'cohort': ('app.blueprints.cohorts', 'cohort_bp'),
+    'statistics': ('app.blueprints.statistics', 'statistics_bp'),
+    # Only registered with REQUEST_STATS (see app.middleware.timing)
+    'request_stats': ('app.blueprints.request_stats', 'request_stats_bp'),
+}
+
+def load_blueprint(name):
+    """Import and return a blueprint by name"""
+    module, attribute = BLUEPRINTS[name]
+    return getattr(importlib.import_module(module), attribute)
+
+def __getattr__(attribute):
+    """Keep `from app.blueprints import patient_bp` working without importing every blueprint"""
+    for name, (_, blueprint_attribute) in BLUEPRINTS.items():
+        if blueprint_attribute == attribute:
+            return load_blueprint(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {attribute!r}")
+
+__all__ = ['patient_bp', 'condition_bp', 'auth_bp', 'health_bp', 'value_sets_bp', 'observation_bp', 'procedures_bp', 'cohort_bp', 'statistics_bp']
@@ -3,7 +3,7 @@ from flask import Blueprint, request, jsonify, g
 from typing import Dict, Any
 
 from app.services.auth_service import auth_service
-from app.schemas import UserCreate, UserLogin, TokenResponse, UserResponse
+from app.schemas import UserCreate, UserLogin, TokenResponse, UserResponse, RefreshTokenRequest
 from pydantic import ValidationError
 from app.middleware.auth import jwt_required, has_role
 
@@ -21,23 +21,23 @@ def register():
         
         # Validate request data with Pydantic
         user_data = UserCreate(**data)
-        logger.debug(f"Registering user with username: {user_data.username}")
+        logger.debug("Registering user with username: %s", user_data.username)
         
         # Register user with auth service
         user, status_code = auth_service.register_user(user_data.model_dump())
         
         if status_code != 201:
-            logger.warning(f"User registration failed: {user}")
+            logger.warning("User registration failed: %s", user)
             return jsonify(user), status_code
         
-        logger.info(f"User registered successfully: {user.username} (ID: {user.id})")
+        logger.info("User registered successfully: %s (ID: %s)", user.username, user.id)
         # Return user data
         return jsonify(UserResponse.model_validate(user).model_dump()), 201
     except ValidationError as e:
-        logger.warning(f"Validation error during user registration: {e.errors()}")
+        logger.warning("Validation error during user registration: %s", e.errors())
         return jsonify({"error": e.errors()}), 400
     except Exception as e:
-        logger.error(f"Unexpected error during user registration: {str(e)}", exc_info=True)
+        logger.error("Unexpected error during user registration: %s", e, exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
 
 @auth_bp.route('/login', methods=['POST'])
@@ -49,17 +49,17 @@ def login():
         
         # Validate request data with Pydantic
         login_data = UserLogin(**data)
-        logger.debug(f"Attempting login for username: {login_data.username}")
+        logger.debug("Attempting login for username: %s", login_data.username)
         
         # Authenticate user
         user = auth_service.authenticate_user(login_data.username, login_data.password)
         
         if not user:
-            logger.warning(f"Failed login attempt for username: {login_data.username}")
+            logger.warning("Failed login attempt for username: %s", login_data.username)
             return jsonify({"error": "Invalid username or password"}), 401
         
         # Generate token
-        logger.debug(f"Generating token for user: {user.username}")
+        logger.debug("Generating token for user: %s", user.username)
         token_data = auth_service.generate_token(user)
         
         # Create response
@@ -67,16 +67,46 @@ def login():
             access_token=token_data["access_token"],
             token_type=token_data["token_type"],
             expires_in=token_data["expires_in"],
+            refresh_token=token_data["refresh_token"],
+            refresh_expires_in=token_data["refresh_expires_in"],
             user=UserResponse.model_validate(user)
         )
         
-        logger.info(f"User logged in successfully: {user.username} (ID: {user.id})")
+        logger.info("User logged in successfully: %s (ID: %s)", user.username, user.id)
         return jsonify(token_response.model_dump()), 200
     except ValidationError as e:
-        logger.warning(f"Validation error during login: {e.errors()}")
+        logger.warning("Validation error during login: %s", e.errors())
         return jsonify({"error": e.errors()}), 400
     except Exception as e:
-        logger.error(f"Unexpected error during login: {str(e)}", exc_info=True)
+        logger.error("Unexpected error during login: %s", e, exc_info=True)
+        return jsonify({"error": "Internal server error"}), 500
+
+@auth_bp.route('/refresh', methods=['POST'])
+def refresh():
+    """Exchange a refresh token for a new access token and a rotated refresh token"""
+    try:
+        refresh_data = RefreshTokenRequest(**(request.json or {}))
+        result, status_code = auth_service.refresh_tokens(refresh_data.refresh_token)
+        return jsonify(result), status_code
+    except ValidationError as e:
+        logger.warning("Validation error during token refresh: %s", e.errors())
+        return jsonify({"error": e.errors()}), 400
+    except Exception as e:
+        logger.error("Unexpected error during token refresh: %s", e, exc_info=True)
+        return jsonify({"error": "Internal server error"}), 500
+
+@auth_bp.route('/logout', methods=['POST'])
+def logout():
+    """Revoke a refresh token and every token rotated from the same login"""
+    try:
+        refresh_data = RefreshTokenRequest(**(request.json or {}))
+        result, status_code = auth_service.revoke_refresh_token(refresh_data.refresh_token)
+        return jsonify(result), status_code
+    except ValidationError as e:
+        logger.warning("Validation error during logout: %s", e.errors())
+        return jsonify({"error": e.errors()}), 400
+    except Exception as e:
+        logger.error("Unexpected error during logout: %s", e, exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
 
 @auth_bp.route('/me', methods=['GET'])
@@ -84,10 +114,13 @@ def login():
 def get_current_user():
     """Get details of the currently authenticated user"""
     try:
-        logger.debug(f"Retrieving current user info for: {g.current_user.username}")
-        return jsonify(UserResponse.model_validate(g.current_user).model_dump()), 200
+        logger.debug("Retrieving current user info for: %s", g.current_user.username)
+        user = auth_service.get_by_id(g.current_user.id)
+        if not user:
+            return jsonify({"error": "User not found"}), 404
+        return jsonify(UserResponse.model_validate(user).model_dump()), 200
     except Exception as e:
-        logger.error(f"Error retrieving user info: {str(e)}", exc_info=True)
+        logger.error("Error retrieving user info: %s", e, exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
 
 @auth_bp.route('/test', methods=['GET'])
@@ -95,13 +128,13 @@ def get_current_user():
 def test_auth():
     """Simple endpoint to test authentication without complex database operations"""
     try:
-        logger.debug(f"Authentication test for user: {g.current_user.username}")
+        logger.debug("Authentication test for user: %s", g.current_user.username)
         return jsonify({
             "message": "Authentication successful",
             "user_id": g.current_user.id,
             "username": g.current_user.username,
-            "roles": [role.name for role in g.current_user.roles]
+            "roles": list(g.current_user.roles)
         })
     except Exception as e:
-        logger.error(f"Error in auth test: {str(e)}", exc_info=True)
+        logger.error("Error in auth test: %s", e, exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
\ No newline at end of file
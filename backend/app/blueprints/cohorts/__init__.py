@@ -0,0 +1,2 @@
+# This file makes the cohorts directory a Python package
+from app.blueprints.cohorts.routes import cohort_bp
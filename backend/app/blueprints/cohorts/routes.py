@@ -0,0 +1,49 @@
+import logging
+from flask import Blueprint, request, jsonify, g
+
+from app.services.cohort_service import cohort_service
+from app.middleware.auth import jwt_required, has_any_role
+from app.utils import validation_error, server_error
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+cohort_bp = Blueprint('cohort', __name__, url_prefix='/cohorts')
+
+# Roles allowed to run population-level queries
+COHORT_ROLES = ['admin', 'researcher']
+
+def _cohort_response(result, status_code):
+    """Turn a cohort service result into an HTTP response"""
+    if status_code >= 400:
+        if 'error' in result and isinstance(result['error'], list):
+            return validation_error(result['error'])
+        logger.warning("Cohort query failed: %s", result)
+        return jsonify(result), status_code
+    return jsonify(result), status_code
+
+@cohort_bp.route('/count', methods=['POST'])
+@jwt_required
+@has_any_role(COHORT_ROLES)
+def count_cohort():
+    """Count patients matching a cohort criteria tree"""
+    try:
+        data = request.json or {}
+        logger.debug("Received cohort count request from user %s", g.current_user.username)
+        result, status_code = cohort_service.count_patients(data)
+        return _cohort_response(result, status_code)
+    except Exception as e:
+        return server_error("Error counting cohort", e)
+
+@cohort_bp.route('/patients', methods=['POST'])
+@jwt_required
+@has_any_role(COHORT_ROLES)
+def find_cohort_patients():
+    """Page through IDs of patients matching a cohort criteria tree"""
+    try:
+        data = request.json or {}
+        logger.debug("Received cohort patient request from user %s", g.current_user.username)
+        result, status_code = cohort_service.find_patient_ids(data)
+        return _cohort_response(result, status_code)
+    except Exception as e:
+        return server_error("Error retrieving cohort patients", e)
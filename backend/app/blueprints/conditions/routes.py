@@ -3,9 +3,11 @@ from flask import Blueprint, request, jsonify, g
 from typing import Dict, Any
 
 from app.services.condition_service import condition_service
-from app.schemas import ConditionCreate
+from app.schemas import ConditionCreate, ConditionResponse
 from pydantic import ValidationError
 from app.middleware.auth import jwt_required, has_role, has_any_role
+from app.utils import entity_etag, is_not_modified, not_modified, with_etag
+from app.utils.fast_json import json_response, requested_fields, fields_error
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -18,23 +20,45 @@ def create_condition():
     """Create a new condition"""
     try:
         data = request.json
-        logger.debug(f"Received request to create condition: {data}")
+        logger.debug("Received request to create condition: %s", data)
         
         # Add the current user as the creator
         if hasattr(g, 'current_user'):
             data['created_by_id'] = g.current_user.id
-            logger.debug(f"Creating condition with creator ID: {g.current_user.id}")
+            logger.debug("Creating condition with creator ID: %s", g.current_user.id)
         
         result, status_code = condition_service.create_condition(data)
         
         if status_code >= 400:
-            logger.warning(f"Failed to create condition: {result}")
+            logger.warning("Failed to create condition: %s", result)
             return jsonify(result), status_code
         
-        logger.info(f"Condition created successfully with ID: {result.id}")
+        logger.info("Condition created successfully with ID: %s", result.id)
         return jsonify(result.model_dump() if hasattr(result, 'model_dump') else result), status_code
     except Exception as e:
-        logger.error(f"Unexpected error creating condition: {str(e)}", exc_info=True)
+        logger.error("Unexpected error creating condition: %s", e, exc_info=True)
+        return jsonify({"error": "Internal server error"}), 500
+
+@condition_bp.route('/bulk', methods=['POST'])
+@jwt_required
+def create_conditions_bulk():
+    """Create a batch of conditions in one request"""
+    try:
+        data = request.json
+        # Accept a bare list or {"items": [...]}
+        items = data.get('items') if isinstance(data, dict) else data
+        created_by_id = g.current_user.id if hasattr(g, 'current_user') else None
+        logger.debug("Received request to bulk create %s conditions", len(items) if isinstance(items, list) else 0)
+        
+        result, status_code = condition_service.create_conditions_bulk(items, created_by_id)
+        
+        if status_code >= 400:
+            logger.warning("Failed to bulk create conditions: %s", result.get('error', 'all items invalid'))
+        else:
+            logger.info("Bulk created %s of %s conditions", result['created'], result['total'])
+        return jsonify(result), status_code
+    except Exception as e:
+        logger.error("Unexpected error bulk creating conditions: %s", e, exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
 
 @condition_bp.route('/<int:id>', methods=['GET'])
@@ -42,17 +66,28 @@ def create_condition():
 def get_condition(id):
     """Get a condition by ID"""
     try:
-        logger.debug(f"Received request to get condition with ID: {id}")
-        condition = condition_service.get_condition_by_id(id)
+        logger.debug("Received request to get condition with ID: %s", id)
+        version = condition_service.get_version(id)
+        
+        if version is None:
+            logger.info("Condition not found with ID: %s", id)
+            return jsonify({"error": "Condition not found"}), 404
+        
+        # The client's copy is current: answer from the version alone
+        etag = entity_etag('condition', id, version)
+        if is_not_modified(etag):
+            return not_modified(etag)
+        
+        condition = condition_service.get_condition_by_id(id, version)
         
         if not condition:
-            logger.info(f"Condition not found with ID: {id}")
+            logger.info("Condition not found with ID: %s", id)
             return jsonify({"error": "Condition not found"}), 404
         
-        logger.debug(f"Retrieved condition with ID: {id}")
-        return jsonify(condition.model_dump())
+        logger.debug("Retrieved condition with ID: %s", id)
+        return with_etag(jsonify(condition.model_dump()), etag)
     except Exception as e:
-        logger.error(f"Unexpected error retrieving condition {id}: {str(e)}", exc_info=True)
+        logger.error("Unexpected error retrieving condition %s: %s", id, e, exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
 
 @condition_bp.route('/patient/<int:patient_id>', methods=['GET'])
@@ -60,10 +95,20 @@ def get_condition(id):
 def get_patient_conditions(patient_id):
     """Get all conditions for a specific patient"""
     try:
-        logger.debug(f"Received request to get conditions for patient ID: {patient_id}")
-        conditions = condition_service.get_conditions_by_patient_id(patient_id)
-        logger.info(f"Retrieved {len(conditions)} conditions for patient ID: {patient_id}")
-        return jsonify([condition.model_dump() for condition in conditions])
+        logger.debug("Received request to get conditions for patient ID: %s", patient_id)
+        try:
+            fields = requested_fields(ConditionResponse)
+        except ValueError as e:
+            return fields_error(e)
+        
+        version = condition_service.get_collection_version(patient_id=patient_id)
+        etag = entity_etag('conditions', patient_id, *version, *(fields or ()))
+        if is_not_modified(etag):
+            return not_modified(etag)
+        
+        body = condition_service.get_conditions_json_by_patient_id(patient_id, version, fields)
+        logger.info("Retrieved conditions for patient ID: %s", patient_id)
+        return with_etag(json_response(body), etag)
     except Exception as e:
-        logger.error(f"Unexpected error retrieving conditions for patient {patient_id}: {str(e)}", exc_info=True)
+        logger.error("Unexpected error retrieving conditions for patient %s: %s", patient_id, e, exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
\ No newline at end of file
@@ -45,7 +45,7 @@ def celery_health():
                 "tasks": worker_stats.get("total", {})
             })
         
-        logger.info(f"Found {len(active_workers)} active Celery workers")
+        logger.info("Found %s active Celery workers", len(active_workers))
         
         # Get additional details about queued tasks
         active_tasks = celery_inspect.active()
@@ -69,7 +69,7 @@ def celery_health():
         }), 503  # Service Unavailable
         
     except Exception as e:
-        logger.error(f"Error checking Celery health: {str(e)}")
+        logger.error("Error checking Celery health: %s", e)
         return jsonify({
             "status": "error",
             "message": f"Error connecting to Celery workers: {str(e)}. FHIR synchronization may fail.",
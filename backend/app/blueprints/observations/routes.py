@@ -3,9 +3,11 @@ from flask import Blueprint, request, jsonify, g
 from typing import Dict, Any
 
 from app.services.observation_service import observation_service
-from app.schemas import ObservationCreate
+from app.schemas import ObservationCreate, ObservationResponse
 from pydantic import ValidationError
 from app.middleware.auth import jwt_required, has_role, has_any_role
+from app.utils import entity_etag, filter_tag, is_not_modified, not_modified, with_etag
+from app.utils.fast_json import json_response, requested_fields, fields_error
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -18,23 +20,45 @@ def create_observation():
     """Create a new observation"""
     try:
         data = request.json
-        logger.debug(f"Received request to create observation: {data}")
+        logger.debug("Received request to create observation: %s", data)
         
         # Add the current user as the creator
         if hasattr(g, 'current_user'):
             data['created_by_id'] = g.current_user.id
-            logger.debug(f"Creating observation with creator ID: {g.current_user.id}")
+            logger.debug("Creating observation with creator ID: %s", g.current_user.id)
         
         result, status_code = observation_service.create_observation(data)
         
         if status_code >= 400:
-            logger.warning(f"Failed to create observation: {result}")
+            logger.warning("Failed to create observation: %s", result)
             return jsonify(result), status_code
         
-        logger.info(f"Observation created successfully with ID: {result.id}")
+        logger.info("Observation created successfully with ID: %s", result.id)
         return jsonify(result.model_dump() if hasattr(result, 'model_dump') else result), status_code
     except Exception as e:
-        logger.error(f"Unexpected error creating observation: {str(e)}", exc_info=True)
+        logger.error("Unexpected error creating observation: %s", e, exc_info=True)
+        return jsonify({"error": "Internal server error"}), 500
+
+@observation_bp.route('/bulk', methods=['POST'])
+@jwt_required
+def create_observations_bulk():
+    """Create a batch of observations in one request"""
+    try:
+        data = request.json
+        # Accept a bare list or {"items": [...]}
+        items = data.get('items') if isinstance(data, dict) else data
+        created_by_id = g.current_user.id if hasattr(g, 'current_user') else None
+        logger.debug("Received request to bulk create %s observations", len(items) if isinstance(items, list) else 0)
+        
+        result, status_code = observation_service.create_observations_bulk(items, created_by_id)
+        
+        if status_code >= 400:
+            logger.warning("Failed to bulk create observations: %s", result.get('error', 'all items invalid'))
+        else:
+            logger.info("Bulk created %s of %s observations", result['created'], result['total'])
+        return jsonify(result), status_code
+    except Exception as e:
+        logger.error("Unexpected error bulk creating observations: %s", e, exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
 
 @observation_bp.route('/<int:id>', methods=['GET'])
@@ -42,17 +66,28 @@ def create_observation():
 def get_observation(id):
     """Get an observation by ID"""
     try:
-        logger.debug(f"Received request to get observation with ID: {id}")
-        observation = observation_service.get_observation_by_id(id)
+        logger.debug("Received request to get observation with ID: %s", id)
+        version = observation_service.get_version(id)
+        
+        if version is None:
+            logger.info("Observation not found with ID: %s", id)
+            return jsonify({"error": "Observation not found"}), 404
+        
+        # The client's copy is current: answer from the version alone
+        etag = entity_etag('observation', id, version)
+        if is_not_modified(etag):
+            return not_modified(etag)
+        
+        observation = observation_service.get_observation_by_id(id, version)
         
         if not observation:
-            logger.info(f"Observation not found with ID: {id}")
+            logger.info("Observation not found with ID: %s", id)
             return jsonify({"error": "Observation not found"}), 404
         
-        logger.debug(f"Retrieved observation with ID: {id}")
-        return jsonify(observation.model_dump())
+        logger.debug("Retrieved observation with ID: %s", id)
+        return with_etag(jsonify(observation.model_dump()), etag)
     except Exception as e:
-        logger.error(f"Unexpected error retrieving observation {id}: {str(e)}", exc_info=True)
+        logger.error("Unexpected error retrieving observation %s: %s", id, e, exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
 
 @observation_bp.route('/patient/<int:patient_id>', methods=['GET'])
@@ -60,10 +95,48 @@ def get_observation(id):
 def get_patient_observations(patient_id):
     """Get all observations for a specific patient"""
     try:
-        logger.debug(f"Received request to get observations for patient ID: {patient_id}")
-        observations = observation_service.get_observations_by_patient_id(patient_id)
-        logger.info(f"Retrieved {len(observations)} observations for patient ID: {patient_id}")
-        return jsonify([observation.model_dump() for observation in observations])
+        logger.debug("Received request to get observations for patient ID: %s", patient_id)
+        try:
+            fields = requested_fields(ObservationResponse)
+        except ValueError as e:
+            return fields_error(e)
+        
+        code = request.args.get('code')
+        min_value = request.args.get('min_value', type=float)
+        max_value = request.args.get('max_value', type=float)
+        value_range = bool(code and (min_value is not None or max_value is not None))
+        
+        version = observation_service.get_collection_version(patient_id=patient_id)
+        etag = entity_etag('observations', patient_id, *version, *(fields or ()),
+                           *((filter_tag(code, min_value, max_value),) if value_range else ()))
+        if is_not_modified(etag):
+            return not_modified(etag)
+        
+        if value_range:
+            # Numeric range filter served from the typed value column
+            body = observation_service.find_observations_json_by_value_range(
+                code, min_value, max_value, patient_id=patient_id, fields=fields)
+        else:
+            body = observation_service.get_observations_json_by_patient_id(patient_id, version, fields)
+        logger.info("Retrieved observations for patient ID: %s", patient_id)
+        return with_etag(json_response(body), etag)
+    except Exception as e:
+        logger.error("Unexpected error retrieving observations for patient %s: %s", patient_id, e, exc_info=True)
+        return jsonify({"error": "Internal server error"}), 500
+
+@observation_bp.route('/summary', methods=['GET'])
+@jwt_required
+def get_observation_summary():
+    """Get numeric aggregates (count, min, max, mean) for an observation code"""
+    try:
+        code = request.args.get('code')
+        if not code:
+            logger.warning("Observation summary missing code parameter")
+            return jsonify({"error": "code parameter is required"}), 400
+        
+        logger.debug("Received request to summarize observations with code: %s", code)
+        summary = observation_service.summarize_observations_by_code(code)
+        return jsonify(summary)
     except Exception as e:
-        logger.error(f"Unexpected error retrieving observations for patient {patient_id}: {str(e)}", exc_info=True)
+        logger.error("Unexpected error summarizing observations for code %s: %s", request.args.get('code'), e, exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
\ No newline at end of file
@@ -3,10 +3,12 @@ from flask import Blueprint, request, jsonify, g
 from typing import Dict, Any
 
 from app.services.patient_service import patient_service
-from app.schemas import PatientCreate
+from app.schemas import PatientCreate, PatientResponse
 from pydantic import ValidationError
 from app.middleware.auth import jwt_required, has_role, has_any_role
 from app.utils import validation_error, not_found_error, server_error
+from app.utils import entity_etag, is_not_modified, not_modified, with_etag
+from app.utils.fast_json import json_response, requested_fields, fields_error
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -19,22 +21,22 @@ def create_patient():
     """Create a new patient"""
     try:
         data = request.json
-        logger.debug(f"Received request to create patient: {data}")
+        logger.debug("Received request to create patient: %s", data)
         
         # Add the current user as the creator
         if hasattr(g, 'current_user'):
             data['created_by_id'] = g.current_user.id
-            logger.debug(f"Creating patient with creator ID: {g.current_user.id}")
+            logger.debug("Creating patient with creator ID: %s", g.current_user.id)
         
         result, status_code = patient_service.create_patient(data)
         
         if status_code >= 400:
             if 'error' in result and isinstance(result['error'], list):
                 return validation_error(result['error'])
-            logger.warning(f"Failed to create patient: {result}")
+            logger.warning("Failed to create patient: %s", result)
             return jsonify(result), status_code
         
-        logger.info(f"Patient created successfully with ID: {result.id}")
+        logger.info("Patient created successfully with ID: %s", result.id)
         return jsonify(result.model_dump() if hasattr(result, 'model_dump') else result), status_code
     except ValidationError as e:
         return validation_error(e.errors())
@@ -47,9 +49,18 @@ def get_patients():
     """Get all patients"""
     try:
         logger.debug("Received request to get all patients")
-        patients = patient_service.get_all_patients()
-        logger.info(f"Retrieved {len(patients)} patients")
-        return jsonify([patient.model_dump() for patient in patients])
+        try:
+            fields = requested_fields(PatientResponse)
+        except ValueError as e:
+            return fields_error(e)
+        
+        etag = entity_etag('patients', *patient_service.get_collection_version(), *(fields or ()))
+        if is_not_modified(etag):
+            return not_modified(etag)
+        
+        body = patient_service.get_all_patients_json(fields)
+        logger.info("Retrieved all patients")
+        return with_etag(json_response(body), etag)
     except Exception as e:
         return server_error("Error retrieving patients", e)
 
@@ -58,14 +69,24 @@ def get_patients():
 def get_patient(id):
     """Get a patient by ID"""
     try:
-        logger.debug(f"Received request to get patient with ID: {id}")
-        patient = patient_service.get_patient_by_id(id)
+        logger.debug("Received request to get patient with ID: %s", id)
+        version = patient_service.get_version(id)
+        
+        if version is None:
+            return not_found_error("Patient", id)
+        
+        # The client's copy is current: answer from the version alone
+        etag = entity_etag('patient', id, version)
+        if is_not_modified(etag):
+            return not_modified(etag)
+        
+        patient = patient_service.get_patient_by_id(id, version)
         
         if not patient:
             return not_found_error("Patient", id)
         
-        logger.debug(f"Retrieved patient with ID: {id}")
-        return jsonify(patient.model_dump())
+        logger.debug("Retrieved patient with ID: %s", id)
+        return with_etag(jsonify(patient.model_dump()), etag)
     except Exception as e:
         return server_error(f"Error retrieving patient with ID {id}", e)
 
@@ -75,7 +96,7 @@ def search_patients():
     """Search for patients by name"""
     try:
         name = request.args.get('name', '')
-        logger.debug(f"Received request to search for patients with name: {name}")
+        logger.debug("Received request to search for patients by name")
         
         if not name:
             logger.warning("Patient search missing name parameter")
@@ -85,8 +106,11 @@ def search_patients():
                 "type": "value_error.missing"
             }])
         
-        patients = patient_service.find_patients_by_name(name)
-        logger.info(f"Found {len(patients)} patients matching name: {name}")
-        return jsonify([patient.model_dump() for patient in patients])
+        try:
+            fields = requested_fields(PatientResponse)
+        except ValueError as e:
+            return fields_error(e)
+        
+        return json_response(patient_service.find_patients_json_by_name(name, fields))
     except Exception as e:
         return server_error("Error searching patients", e)
\ No newline at end of file
@@ -2,10 +2,12 @@ import logging
 from flask import Blueprint, request, jsonify, g
 from typing import Dict, Any
 
-from app.services.procedure_service import ProcedureService
-from app.schemas import ProcedureCreate
+from app.services.procedure_service import procedure_service
+from app.schemas import ProcedureCreate, ProcedureResponse
 from pydantic import ValidationError
 from app.middleware.auth import jwt_required, has_role, has_any_role
+from app.utils import entity_etag, is_not_modified, not_modified, with_etag
+from app.utils.fast_json import json_response, requested_fields, fields_error
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -18,23 +20,45 @@ def create_procedure():
     """Create a new procedure"""
     try:
         data = request.json
-        logger.debug(f"Received request to create procedure: {data}")
+        logger.debug("Received request to create procedure: %s", data)
         
         # Add the current user as the creator
         if hasattr(g, 'current_user'):
             data['created_by_id'] = g.current_user.id
-            logger.debug(f"Creating procedure with creator ID: {g.current_user.id}")
+            logger.debug("Creating procedure with creator ID: %s", g.current_user.id)
         
-        result, status_code = ProcedureService.create_procedure(data)
+        result, status_code = procedure_service.create_procedure(data)
         
         if status_code >= 400:
-            logger.warning(f"Failed to create procedure: {result}")
+            logger.warning("Failed to create procedure: %s", result)
             return jsonify(result), status_code
         
-        logger.info(f"Procedure created successfully with ID: {result.id}")
+        logger.info("Procedure created successfully with ID: %s", result.id)
         return jsonify(result.model_dump() if hasattr(result, 'model_dump') else result), status_code
     except Exception as e:
-        logger.error(f"Unexpected error creating procedure: {str(e)}", exc_info=True)
+        logger.error("Unexpected error creating procedure: %s", e, exc_info=True)
+        return jsonify({"error": "Internal server error"}), 500
+
+@procedures_bp.route('/bulk', methods=['POST'])
+@jwt_required
+def create_procedures_bulk():
+    """Create a batch of procedures in one request"""
+    try:
+        data = request.json
+        # Accept a bare list or {"items": [...]}
+        items = data.get('items') if isinstance(data, dict) else data
+        created_by_id = g.current_user.id if hasattr(g, 'current_user') else None
+        logger.debug("Received request to bulk create %s procedures", len(items) if isinstance(items, list) else 0)
+        
+        result, status_code = procedure_service.create_procedures_bulk(items, created_by_id)
+        
+        if status_code >= 400:
+            logger.warning("Failed to bulk create procedures: %s", result.get('error', 'all items invalid'))
+        else:
+            logger.info("Bulk created %s of %s procedures", result['created'], result['total'])
+        return jsonify(result), status_code
+    except Exception as e:
+        logger.error("Unexpected error bulk creating procedures: %s", e, exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
 
 @procedures_bp.route('/<int:id>', methods=['GET'])
@@ -42,17 +66,28 @@ def create_procedure():
 def get_procedure(id):
     """Get a procedure by ID"""
     try:
-        logger.debug(f"Received request to get procedure with ID: {id}")
-        procedure = ProcedureService.get_procedure_by_id(id)
+        logger.debug("Received request to get procedure with ID: %s", id)
+        version = procedure_service.get_version(id)
+        
+        if version is None:
+            logger.info("Procedure not found with ID: %s", id)
+            return jsonify({"error": "Procedure not found"}), 404
+        
+        # The client's copy is current: answer from the version alone
+        etag = entity_etag('procedure', id, version)
+        if is_not_modified(etag):
+            return not_modified(etag)
+        
+        procedure = procedure_service.get_procedure_by_id(id, version)
         
         if not procedure:
-            logger.info(f"Procedure not found with ID: {id}")
+            logger.info("Procedure not found with ID: %s", id)
             return jsonify({"error": "Procedure not found"}), 404
         
-        logger.debug(f"Retrieved procedure with ID: {id}")
-        return jsonify(procedure.model_dump())
+        logger.debug("Retrieved procedure with ID: %s", id)
+        return with_etag(jsonify(procedure.model_dump()), etag)
     except Exception as e:
-        logger.error(f"Unexpected error retrieving procedure {id}: {str(e)}", exc_info=True)
+        logger.error("Unexpected error retrieving procedure %s: %s", id, e, exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
 
 @procedures_bp.route('/patient/<int:patient_id>', methods=['GET'])
@@ -60,10 +95,20 @@ def get_procedure(id):
 def get_patient_procedures(patient_id):
     """Get all procedures for a specific patient"""
     try:
-        logger.debug(f"Received request to get procedures for patient ID: {patient_id}")
-        procedures = ProcedureService.get_procedures_by_patient_id(patient_id)
-        logger.info(f"Retrieved {len(procedures)} procedures for patient ID: {patient_id}")
-        return jsonify([procedure.model_dump() for procedure in procedures])
+        logger.debug("Received request to get procedures for patient ID: %s", patient_id)
+        try:
+            fields = requested_fields(ProcedureResponse)
+        except ValueError as e:
+            return fields_error(e)
+        
+        version = procedure_service.get_collection_version(patient_id=patient_id)
+        etag = entity_etag('procedures', patient_id, *version, *(fields or ()))
+        if is_not_modified(etag):
+            return not_modified(etag)
+        
+        body = procedure_service.get_procedures_json_by_patient_id(patient_id, version, fields)
+        logger.info("Retrieved procedures for patient ID: %s", patient_id)
+        return with_etag(json_response(body), etag)
     except Exception as e:
-        logger.error(f"Unexpected error retrieving procedures for patient {patient_id}: {str(e)}", exc_info=True)
+        logger.error("Unexpected error retrieving procedures for patient %s: %s", patient_id, e, exc_info=True)
         return jsonify({"error": "Internal server error"}), 500
\ No newline at end of file
@@ -0,0 +1,2 @@
+# This file makes the request_stats directory a Python package
+from app.blueprints.request_stats.routes import request_stats_bp
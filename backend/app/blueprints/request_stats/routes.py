@@ -0,0 +1,26 @@
+import logging
+from flask import Blueprint, jsonify
+
+from app.middleware.auth import jwt_required, has_role
+from app.middleware.timing import request_stats
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+request_stats_bp = Blueprint('request_stats', __name__, url_prefix='/request-stats')
+
+@request_stats_bp.route('/', methods=['GET'])
+@jwt_required
+@has_role('admin')
+def get_request_stats():
+    """Get per-endpoint request counts, wall time, SQL queries and phase times since startup or the last reset"""
+    return jsonify(request_stats.snapshot())
+
+@request_stats_bp.route('/', methods=['DELETE'])
+@jwt_required
+@has_role('admin')
+def reset_request_stats():
+    """Reset the aggregated request statistics"""
+    request_stats.reset()
+    logger.info("Request statistics reset")
+    return '', 204
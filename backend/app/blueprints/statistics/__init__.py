@@ -0,0 +1,2 @@
+# This file makes the statistics directory a Python package
+from app.blueprints.statistics.routes import statistics_bp
@@ -0,0 +1,69 @@
+import logging
+from flask import Blueprint, jsonify
+
+from app.services.statistics_service import statistics_service
+from app.middleware.auth import jwt_required, has_role
+from app.utils import server_error
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+statistics_bp = Blueprint('statistics', __name__, url_prefix='/statistics')
+
+@statistics_bp.route('/summary', methods=['GET'])
+@jwt_required
+def get_summary():
+    """Get registry-wide patient, condition and observation totals"""
+    try:
+        return jsonify(statistics_service.get_summary())
+    except Exception as e:
+        return server_error("Error retrieving statistics summary", e)
+
+@statistics_bp.route('/genders', methods=['GET'])
+@jwt_required
+def get_gender_distribution():
+    """Get patient counts per gender"""
+    try:
+        return jsonify(statistics_service.get_gender_distribution())
+    except Exception as e:
+        return server_error("Error retrieving gender distribution", e)
+
+@statistics_bp.route('/conditions', methods=['GET'])
+@jwt_required
+def get_condition_counts():
+    """Get condition counts per condition code"""
+    try:
+        return jsonify(statistics_service.get_condition_counts())
+    except Exception as e:
+        return server_error("Error retrieving condition statistics", e)
+
+@statistics_bp.route('/observations', methods=['GET'])
+@jwt_required
+def get_observation_code_counts():
+    """Get observation counts per observation code"""
+    try:
+        return jsonify(statistics_service.get_observation_code_counts())
+    except Exception as e:
+        return server_error("Error retrieving observation statistics", e)
+
+@statistics_bp.route('/observations/monthly', methods=['GET'])
+@jwt_required
+def get_observation_monthly_counts():
+    """Get observation counts per month"""
+    try:
+        return jsonify(statistics_service.get_observation_monthly_counts())
+    except Exception as e:
+        return server_error("Error retrieving monthly observation statistics", e)
+
+@statistics_bp.route('/rebuild', methods=['POST'])
+@jwt_required
+@has_role('admin')
+def rebuild_statistics():
+    """Queue a reconciliation of all statistics with the source tables"""
+    try:
+        from app.tasks import rebuild_registry_statistics
+        task = rebuild_registry_statistics.delay()
+        logger.info("Queued statistics rebuild task %s", task.id)
+        return jsonify({"message": "Statistics rebuild queued", "task_id": task.id}), 202
+    except Exception as e:
+        return server_error("Error queuing statistics rebuild", e)
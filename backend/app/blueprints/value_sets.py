@@ -1,46 +1,42 @@
-from flask import Blueprint, jsonify
-from app.models import Gender, ConditionStatus, NeurologicalCondition, SyncStatus
+from flask import Blueprint, current_app, jsonify, request
+from app.config import Config
+from app.services.value_set_service import value_set_service
 
 # Create a blueprint for value set endpoints
 value_sets_bp = Blueprint('value_sets', __name__, url_prefix='/value-sets')
 
+def value_set_response(name):
+    """Serve a cached value set with ETag/Cache-Control, answering If-None-Match with 304"""
+    value_set = value_set_service.get_value_set(name)
+    if value_set is None:
+        return jsonify({"error": "Value set not found"}), 404
+
+    # Unchanged for this client: skip building the body entirely
+    if request.if_none_match.contains_weak(value_set.etag):
+        response = current_app.response_class(status=304)
+    else:
+        response = current_app.response_class(value_set.body, mimetype=current_app.json.mimetype)
+    response.set_etag(value_set.etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = Config.VALUE_SET_MAX_AGE
+    return response
+
 @value_sets_bp.route('/genders', methods=['GET'])
 def get_genders():
     """Get all gender values"""
-    genders = Gender.query.filter_by(active=True).all()
-    return jsonify([{
-        'code': gender.code,
-        'display': gender.display,
-        'description': gender.description
-    } for gender in genders])
+    return value_set_response('genders')
 
 @value_sets_bp.route('/condition-statuses', methods=['GET'])
 def get_condition_statuses():
     """Get all condition status values"""
-    statuses = ConditionStatus.query.filter_by(active=True).all()
-    return jsonify([{
-        'code': status.code,
-        'display': status.display,
-        'description': status.description
-    } for status in statuses])
+    return value_set_response('condition-statuses')
 
 @value_sets_bp.route('/neurological-conditions', methods=['GET'])
 def get_neurological_conditions():
     """Get all neurological condition codes"""
-    conditions = NeurologicalCondition.query.filter_by(active=True).all()
-    return jsonify([{
-        'code': condition.code,
-        'display': condition.display,
-        'description': condition.description,
-        'system': condition.system
-    } for condition in conditions])
+    return value_set_response('neurological-conditions')
 
 @value_sets_bp.route('/sync-statuses', methods=['GET'])
 def get_sync_statuses():
     """Get all sync status values"""
-    statuses = SyncStatus.query.filter_by(active=True).all()
-    return jsonify([{
-        'code': status.code,
-        'display': status.display,
-        'description': status.description
-    } for status in statuses])
\ No newline at end of file
+    return value_set_response('sync-statuses')
@@ -1,11 +1,39 @@
 from celery import Celery
+from celery.signals import setup_logging
 from .config import Config
+from .utils.logging_setup import configure_logging
 
 celery = Celery(__name__, broker=Config.CELERY_BROKER_URL)
 celery.conf.update({
     'task_serializer': 'json',
     'result_serializer': 'json',
     'accept_content': ['json'],
+    'beat_schedule': {
+        # Periodic reconciliation of the incrementally maintained statistics
+        'rebuild-registry-statistics': {
+            'task': 'app.tasks.rebuild_registry_statistics',
+            'schedule': Config.STATISTICS_REBUILD_INTERVAL,
+        },
+        # Keep the refresh token revocation store small
+        'purge-expired-refresh-tokens': {
+            'task': 'app.tasks.purge_expired_refresh_tokens',
+            'schedule': Config.REFRESH_TOKEN_PURGE_INTERVAL,
+        },
+    },
 })
 
-celery.autodiscover_tasks(['app.tasks'])
\ No newline at end of file
+celery.autodiscover_tasks(['app.tasks'])
+
+def reset_broker_connections():
+    """
+    Forget broker connections inherited from the parent process, in a forked child
+
+    Celery does this itself only for multiprocessing forks; WSGI server workers
+    call it so each process opens its own broker connection to queue tasks.
+    """
+    celery._after_fork()
+
+@setup_logging.connect
+def configure_worker_logging(**kwargs):
+    """Use the app's queued, redacting log handler in the worker instead of Celery's"""
+    configure_logging(vars(Config))
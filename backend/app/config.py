@@ -8,6 +8,22 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL', 'sqlite:///app.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
+    # Database engine settings (pool settings are ignored for SQLite)
+    DATABASE_POOL_SIZE = int(os.environ.get('DATABASE_POOL_SIZE', 5))  # connections kept open per process
+    DATABASE_MAX_OVERFLOW = int(os.environ.get('DATABASE_MAX_OVERFLOW', 10))  # extra connections opened under load
+    DATABASE_POOL_TIMEOUT = int(os.environ.get('DATABASE_POOL_TIMEOUT', 30))  # seconds to wait for a free connection
+    DATABASE_POOL_RECYCLE = int(os.environ.get('DATABASE_POOL_RECYCLE', 1800))  # seconds; keep below server and proxy idle timeouts
+    DATABASE_POOL_PRE_PING = os.environ.get('DATABASE_POOL_PRE_PING', 'true').lower() == 'true'  # replace connections dropped by the server
+    DATABASE_STATEMENT_TIMEOUT = int(os.environ.get('DATABASE_STATEMENT_TIMEOUT', 0))  # milliseconds, 0 disables (PostgreSQL and MySQL)
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL', '')  # read replica for list and lookup reads; empty reads from the primary
+    
+    # SQLite settings (ignored for other databases)
+    SQLITE_CONCURRENT_MODE = os.environ.get('SQLITE_CONCURRENT_MODE', 'true').lower() == 'true'  # WAL, the pragmas below and one writer per process
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))  # milliseconds to wait for a lock before "database is locked"
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL')  # NORMAL is durable against crashes in WAL mode; FULL also against power loss
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 268435456))  # bytes of the file read through memory mapping, 0 disables
+    SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', -65536))  # page cache per connection: pages, or KiB when negative
+    
     # Secret key for JWT and session management
     SECRET_KEY = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
     
@@ -15,8 +31,70 @@ class Config:
     HAPI_FHIR_URL = os.environ.get('HAPI_FHIR_URL', 'http://localhost:8080/fhir')
     
     # JWT settings
-    JWT_EXPIRATION = int(os.environ.get('JWT_EXPIRATION', 86400))  # 24 hours
+    JWT_EXPIRATION = int(os.environ.get('JWT_EXPIRATION', 900))  # 15 minutes; renewed through /auth/refresh
+    REFRESH_TOKEN_EXPIRATION = int(os.environ.get('REFRESH_TOKEN_EXPIRATION', 2592000))  # 30 days
+    REFRESH_TOKEN_PURGE_INTERVAL = int(os.environ.get('REFRESH_TOKEN_PURGE_INTERVAL', 86400))  # 24 hours
+    PRINCIPAL_CACHE_TTL = int(os.environ.get('PRINCIPAL_CACHE_TTL', 10))  # seconds until role changes and deactivation apply
+    PRINCIPAL_CACHE_SIZE = int(os.environ.get('PRINCIPAL_CACHE_SIZE', 4096))
     
     # Celery settings
     CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', 'redis://localhost:6379/0')
     CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', 'redis://localhost:6379/0')
+    
+    # Logging settings
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_FORMAT = os.environ.get('LOG_FORMAT', '%(levelname)s:%(name)s:%(message)s')
+    LOG_QUEUE = os.environ.get('LOG_QUEUE', 'true').lower() == 'true'  # write records from a background thread
+    LOG_SAMPLING = os.environ.get('LOG_SAMPLING', '')  # logger=rate pairs for DEBUG records, e.g. app.middleware.auth=0.01
+    LOG_REDACT_FIELDS = os.environ.get('LOG_REDACT_FIELDS', '')  # comma-separated fields redacted in addition to the PHI defaults
+    
+    # Request instrumentation settings
+    REQUEST_TIMING = os.environ.get('REQUEST_TIMING', 'false').lower() == 'true'  # Server-Timing header with SQL, auth and serialization time
+    REQUEST_STATS = os.environ.get('REQUEST_STATS', 'false').lower() == 'true'  # per-endpoint aggregates at /request-stats (needs REQUEST_TIMING)
+    
+    # Response compression settings
+    COMPRESSION = os.environ.get('COMPRESSION', 'true').lower() == 'true'  # gzip (or brotli, if installed) when the client accepts it
+    COMPRESSION_MIN_SIZE = int(os.environ.get('COMPRESSION_MIN_SIZE', 1024))  # bytes; smaller bodies are sent uncompressed
+    COMPRESSION_LEVEL = int(os.environ.get('COMPRESSION_LEVEL', 6))  # gzip level, 1 (fastest) to 9
+    COMPRESSION_BROTLI_QUALITY = int(os.environ.get('COMPRESSION_BROTLI_QUALITY', 4))  # 0 (fastest) to 11
+    COMPRESSION_MIMETYPES = os.environ.get('COMPRESSION_MIMETYPES', 'application/json,text/html,text/plain,text/css,application/javascript')
+    
+    # Production server settings (gunicorn.conf.py)
+    WEB_BIND = os.environ.get('WEB_BIND', '0.0.0.0:5005')
+    WEB_WORKERS = int(os.environ.get('WEB_WORKERS', 0))  # processes; 0 starts one per CPU core
+    WEB_THREADS = int(os.environ.get('WEB_THREADS', 4))  # request threads per process
+    WEB_KEEPALIVE = int(os.environ.get('WEB_KEEPALIVE', 5))  # seconds an idle client connection is kept open
+    WEB_TIMEOUT = int(os.environ.get('WEB_TIMEOUT', 30))  # seconds before a stuck worker is restarted
+    WEB_MAX_REQUESTS = int(os.environ.get('WEB_MAX_REQUESTS', 0))  # restart a worker after this many requests, 0 never
+    
+    # Process role settings
+    APP_ROLE = os.environ.get('APP_ROLE', 'api')  # api, worker or cli
+    BLUEPRINTS = os.environ.get('BLUEPRINTS', '')  # comma-separated blueprint names overriding the role's set
+    API_DOCS = os.environ.get('API_DOCS', 'lazy')  # lazy, eager, static or off
+    OPENAPI_SPEC_PATH = os.environ.get('OPENAPI_SPEC_PATH', 'openapi.json')  # written by `flask export-openapi`
+    
+    # Reference data settings
+    SEED_ON_STARTUP = os.environ.get('SEED_ON_STARTUP', 'true').lower() == 'true'  # otherwise run `flask seed-reference-data`
+    
+    # Bulk create settings
+    BULK_MAX_ITEMS = int(os.environ.get('BULK_MAX_ITEMS', 500))
+    
+    # Bulk import settings
+    IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 2000))
+    
+    # Cohort query settings
+    COHORT_CACHE_TTL = int(os.environ.get('COHORT_CACHE_TTL', 300))  # 5 minutes
+    COHORT_CACHE_SIZE = int(os.environ.get('COHORT_CACHE_SIZE', 256))
+    
+    # Value set cache settings
+    VALUE_SET_CACHE_TTL = int(os.environ.get('VALUE_SET_CACHE_TTL', 300))  # reload interval for changes made by other processes
+    VALUE_SET_MAX_AGE = int(os.environ.get('VALUE_SET_MAX_AGE', 300))  # Cache-Control max-age sent to clients
+    
+    # Response cache settings
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')  # memory, redis or none
+    RESPONSE_CACHE_REDIS_URL = os.environ.get('RESPONSE_CACHE_REDIS_URL', 'redis://localhost:6379/1')
+    RESPONSE_CACHE_SIZE = int(os.environ.get('RESPONSE_CACHE_SIZE', 4096))
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 300))  # 5 minutes
+    
+    # Statistics settings
+    STATISTICS_REBUILD_INTERVAL = int(os.environ.get('STATISTICS_REBUILD_INTERVAL', 86400))  # 24 hours
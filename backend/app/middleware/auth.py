@@ -4,7 +4,8 @@ from typing import Callable, Optional, Dict, Any
 from flask import request, jsonify, g, current_app
 import jwt
 
-from app.models import User
+from app.services.auth_service import auth_service, ACCESS_TOKEN_TYPE
+from app.middleware.timing import phase_start, phase_end
 from app.utils import auth_error, permission_error
 
 # Configure logging
@@ -19,7 +20,7 @@ def get_token_from_header() -> Optional[str]:
     
     parts = auth_header.split()
     if parts[0].lower() != 'bearer':
-        logger.debug(f"Authorization header format is invalid: {auth_header[:15]}...")
+        logger.debug("Authorization header format is invalid: %s...", auth_header[:15])
         return None
     
     if len(parts) == 1:
@@ -36,6 +37,7 @@ def jwt_required(f: Callable) -> Callable:
     """Decorator to protect routes with JWT authentication"""
     @wraps(f)
     def decorated(*args, **kwargs):
+        auth_started = phase_start()
         token = get_token_from_header()
         
         if not token:
@@ -49,19 +51,30 @@ def jwt_required(f: Callable) -> Callable:
             
             # Decode and verify token
             payload = jwt.decode(token, secret_key, algorithms=['HS256'])
+            
+            # Refresh tokens are only accepted by /auth/refresh
+            if payload.get('type', ACCESS_TOKEN_TYPE) != ACCESS_TOKEN_TYPE:
+                logger.warning("Authentication failed: Refresh token used as access token")
+                return auth_error("Invalid token")
+            
             user_id = int(payload['sub'])  # Convert string ID back to integer
             
-            # Fetch user directly 
-            user = User.query.get(user_id)
+            # Resolve roles and account status from the short-lived principal cache
+            principal = auth_service.get_principal(user_id)
             
-            if not user:
-                logger.warning(f"Authentication failed: User with ID {user_id} not found")
+            if not principal:
+                logger.warning("Authentication failed: User with ID %s not found", user_id)
                 return auth_error("User not found")
+            
+            if not principal.is_active:
+                logger.warning("Authentication failed: User %s (ID: %s) is deactivated", principal.username, user_id)
+                return auth_error("User account is disabled")
                 
-            logger.debug(f"Authentication successful: User {user.username} (ID: {user_id})")
+            logger.debug("Authentication successful: User %s (ID: %s)", principal.username, user_id)
             
             # Set current user in Flask's g object for access in route handlers
-            g.current_user = user
+            g.current_user = principal
+            phase_end('auth', auth_started)
             
             return f(*args, **kwargs)
             
@@ -69,10 +82,10 @@ def jwt_required(f: Callable) -> Callable:
             logger.warning("Authentication failed: Token has expired")
             return auth_error("Token has expired")
         except jwt.InvalidTokenError as e:
-            logger.warning(f"Authentication failed: Invalid token - {str(e)}")
+            logger.warning("Authentication failed: Invalid token - %s", e)
             return auth_error("Invalid token")
         except Exception as e:
-            logger.error(f"Authentication error: {str(e)}", exc_info=True)
+            logger.error("Authentication error: %s", e, exc_info=True)
             return auth_error("Authentication error")
     
     return decorated
@@ -89,10 +102,10 @@ def has_role(required_role: str) -> Callable:
             
             # Check if user has the required role
             if not g.current_user.has_role(required_role):
-                logger.warning(f"Permission denied: User {g.current_user.username} lacks required role '{required_role}'")
+                logger.warning("Permission denied: User %s lacks required role '%s'", g.current_user.username, required_role)
                 return permission_error(f"Role '{required_role}' required")
             
-            logger.debug(f"Role check passed: User {g.current_user.username} has required role '{required_role}'")
+            logger.debug("Role check passed: User %s has required role '%s'", g.current_user.username, required_role)
             return f(*args, **kwargs)
         return decorated
     return decorator
@@ -108,13 +121,13 @@ def has_any_role(roles: list) -> Callable:
                 return auth_error("Authentication required")
             
             # Check if user has any of the required roles
-            user_roles = [role.name for role in g.current_user.roles]
+            user_roles = g.current_user.roles
             if not any(role in user_roles for role in roles):
-                logger.warning(f"Permission denied: User {g.current_user.username} lacks any required role from {roles}")
+                logger.warning("Permission denied: User %s lacks any required role from %s", g.current_user.username, roles)
                 return permission_error(f"One of these roles required: {', '.join(roles)}")
             
             matching_roles = [role for role in roles if role in user_roles]
-            logger.debug(f"Role check passed: User {g.current_user.username} has roles {matching_roles}")
+            logger.debug("Role check passed: User %s has roles %s", g.current_user.username, matching_roles)
             return f(*args, **kwargs)
         return decorated
     return decorator
\ No newline at end of file
@@ -0,0 +1,118 @@
+import logging
+import zlib
+from typing import Iterable, Iterator, Optional
+
+from flask import Flask, current_app, request
+
+from app.middleware.timing import phase_end, phase_start
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# wbits selecting the gzip container for zlib
+GZIP_WBITS = 31
+
+# app.extensions key holding the set of compressed mimetypes
+COMPRESSION_MIMETYPES = 'compression_mimetypes'
+
+try:
+    import brotli
+except ImportError:  # optional: gzip is always available
+    brotli = None
+
+
+def negotiate_encoding() -> Optional[str]:
+    """Best encoding the client accepts: br (when brotli is installed) over gzip, or None"""
+    offered = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(offered)
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    config = current_app.config
+    if encoding == 'br':
+        return brotli.compress(data, quality=config['COMPRESSION_BROTLI_QUALITY'])
+    compressor = zlib.compressobj(config['COMPRESSION_LEVEL'], zlib.DEFLATED, GZIP_WBITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def compress_stream(chunks: Iterable[bytes], encoding: str, level: int, quality: int) -> Iterator[bytes]:
+    """
+    Compress a streamed body chunk by chunk
+
+    Each chunk is flushed, so clients can decode rows as they arrive instead
+    of waiting for the compressor's window to fill.
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=quality)
+        for chunk in chunks:
+            data = compressor.process(chunk) + compressor.flush()
+            if data:
+                yield data
+        yield compressor.finish()
+        return
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def compressible(response) -> bool:
+    """Whether the response's type is worth compressing and it is not encoded or sent as a file"""
+    return (response.mimetype in current_app.extensions[COMPRESSION_MIMETYPES]
+            and 200 <= response.status_code < 300 and response.status_code != 204
+            and 'Content-Encoding' not in response.headers
+            and not response.direct_passthrough)
+
+
+def compress_response(response):
+    """
+    after_request hook compressing JSON and text responses the client accepts gzip or brotli for
+
+    Bodies under COMPRESSION_MIN_SIZE are sent as is: the framing costs more
+    than it saves. Streamed bodies are compressed as they are sent. ETags
+    become weak, since the compressed bytes differ from the identity body
+    while the representation is the same.
+    """
+    if not compressible(response):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding()
+    if encoding is None:
+        return response
+
+    config = current_app.config
+    if response.is_streamed:
+        response.response = compress_stream(response.iter_encoded(), encoding, config['COMPRESSION_LEVEL'],
+                                            config['COMPRESSION_BROTLI_QUALITY'])
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < config['COMPRESSION_MIN_SIZE']:
+            return response
+        started = phase_start()
+        response.set_data(compress(data, encoding))
+        phase_end('compress', started)
+
+    response.headers['Content-Encoding'] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
+
+
+def init_compression(app: Flask) -> None:
+    """
+    Compress responses when COMPRESSION is set
+
+    Call after init_request_timing: after_request hooks run in reverse order,
+    so compression then runs first and is included in the timed total.
+    """
+    if not app.config['COMPRESSION']:
+        return
+    app.extensions[COMPRESSION_MIMETYPES] = frozenset(
+        mimetype.strip() for mimetype in app.config['COMPRESSION_MIMETYPES'].split(',') if mimetype.strip())
+    app.after_request(compress_response)
+    logger.info("Response compression enabled (%s, min size %s bytes)",
+                'br, gzip' if brotli is not None else 'gzip', app.config['COMPRESSION_MIN_SIZE'])
@@ -0,0 +1,171 @@
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from flask import Flask, current_app, g, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# flask.g attribute holding the current request's timings
+TIMINGS = 'request_timings'
+
+# Set once an app enables REQUEST_TIMING; hooks are not installed otherwise
+_enabled = False
+
+
+class RequestTimings:
+    """Time spent by one request: wall time, SQL statements and named phases"""
+
+    __slots__ = ('started', 'query_count', 'query_time', 'phases')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.query_count = 0
+        self.query_time = 0.0
+        self.phases: Dict[str, float] = {}
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+
+    def server_timing(self, total: float) -> str:
+        """Server-Timing header value, durations in milliseconds"""
+        metrics = [f'db;desc="{self.query_count} queries";dur={self.query_time * 1000:.2f}']
+        metrics += [f'{phase};dur={seconds * 1000:.2f}' for phase, seconds in self.phases.items()]
+        metrics.append(f'total;dur={total * 1000:.2f}')
+        return ', '.join(metrics)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Timings of the current request, or None when instrumentation is off"""
+    if not _enabled or not has_request_context():
+        return None
+    return g.get(TIMINGS)
+
+
+def phase_start() -> Optional[float]:
+    """Start timing a phase of the current request (None when instrumentation is off)"""
+    return time.perf_counter() if current_timings() is not None else None
+
+
+def phase_end(phase: str, started: Optional[float]) -> None:
+    """Add the time since phase_start() to the named phase"""
+    if started is not None:
+        g.get(TIMINGS).add(phase, time.perf_counter() - started)
+
+
+class RequestStats:
+    """Thread-safe per-endpoint aggregate of request timings"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+
+    def record(self, endpoint: str, total: float, timings: RequestTimings) -> None:
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = {'count': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'queries': 0,
+                                                     'db_ms': 0.0, 'phases_ms': {}}
+            stats['count'] += 1
+            stats['total_ms'] += total * 1000
+            stats['max_ms'] = max(stats['max_ms'], total * 1000)
+            stats['queries'] += timings.query_count
+            stats['db_ms'] += timings.query_time * 1000
+            for phase, seconds in timings.phases.items():
+                stats['phases_ms'][phase] = stats['phases_ms'].get(phase, 0.0) + seconds * 1000
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Per-endpoint count, mean/max wall time, mean queries and mean time per phase"""
+        with self._lock:
+            result = {}
+            for endpoint, stats in sorted(self._endpoints.items()):
+                count = stats['count']
+                result[endpoint] = {
+                    'count': count,
+                    'mean_ms': round(stats['total_ms'] / count, 3),
+                    'max_ms': round(stats['max_ms'], 3),
+                    'mean_queries': round(stats['queries'] / count, 2),
+                    'mean_db_ms': round(stats['db_ms'] / count, 3),
+                    'mean_phases_ms': {phase: round(ms / count, 3) for phase, ms in stats['phases_ms'].items()},
+                }
+            return result
+
+    def reset(self) -> None:
+        with self._lock:
+            self._endpoints.clear()
+
+
+request_stats = RequestStats()
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider adding encoding time to the request's serialize phase"""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        started = phase_start()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            phase_end('serialize', started)
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    if current_timings() is not None:
+        conn.info.setdefault('query_started', []).append(time.perf_counter())
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    started = conn.info.get('query_started')
+    if started:
+        timings = current_timings()
+        elapsed = time.perf_counter() - started.pop()
+        if timings is not None:
+            timings.query_count += 1
+            timings.query_time += elapsed
+
+
+def start_request_timing() -> None:
+    setattr(g, TIMINGS, RequestTimings())
+
+
+def finish_request_timing(response):
+    timings = g.get(TIMINGS)
+    if timings is None:
+        return response
+    total = time.perf_counter() - timings.started
+    response.headers['Server-Timing'] = timings.server_timing(total)
+    if current_app.config['REQUEST_STATS']:
+        rule = request.url_rule.rule if request.url_rule else '<unmatched>'
+        request_stats.record(f"{request.method} {rule}", total, timings)
+    return response
+
+
+def init_request_timing(app: Flask) -> None:
+    """
+    Time requests when REQUEST_TIMING is set: wall time, SQL count and time, auth and serialization
+
+    Results are sent in a Server-Timing header and, with REQUEST_STATS, aggregated
+    per endpoint and served at /request-stats. Nothing is installed when off.
+    """
+    global _enabled
+    if not app.config['REQUEST_TIMING']:
+        return
+
+    _enabled = True
+    if not event.contains(Engine, 'before_cursor_execute', before_cursor_execute):
+        event.listen(Engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(Engine, 'after_cursor_execute', after_cursor_execute)
+
+    app.json = TimedJSONProvider(app)
+    app.before_request(start_request_timing)
+    app.after_request(finish_request_timing)
+
+    if app.config['REQUEST_STATS']:
+        from app.blueprints import load_blueprint
+        app.register_blueprint(load_blueprint('request_stats'))
+    logger.info("Request timing enabled (stats endpoint: %s)", app.config['REQUEST_STATS'])
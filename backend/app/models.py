@@ -1,4 +1,6 @@
 from . import db
+from sqlalchemy import event
+from sqlalchemy.orm import object_session
 from datetime import datetime
 import uuid
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -24,6 +26,9 @@ class SyncableMixin:
     sync_status = db.Column(db.String(SHORT_STRING_LENGTH), default=DEFAULT_SYNC_STATUS)
     synced_at = db.Column(db.DateTime)
     
+    # Incremented on every update (see bump_version); backs ETags for conditional GETs
+    version = db.Column(db.Integer, nullable=False, default=1, server_default='1')
+    
     def update_sync_status(self, status, fhir_id=None):
         """Update sync status of the model"""
         self.sync_status = status
@@ -33,6 +38,19 @@ class SyncableMixin:
             self.synced_at = datetime.utcnow()
         db.session.commit()
 
+@event.listens_for(SyncableMixin, 'before_update', propagate=True)
+def bump_version(mapper, connection, target):
+    """
+    Increment the version of a changed record in its UPDATE (SET version = version + 1)
+    
+    Not an optimistic lock: sync tasks hold a record across a FHIR request
+    while the API may update it, and both writes must succeed. The increment
+    is evaluated by the database, so concurrent updates each add one and the
+    ETag always changes.
+    """
+    if object_session(target).is_modified(target, include_collections=False):
+        target.version = type(target).version + 1
+
 # Base class for value set models
 class ValueSet(db.Model):
     """Base class for all value set models"""
@@ -150,6 +168,21 @@ class Role(db.Model):
     def __repr__(self):
         return f'<Role {self.name}>'
 
+class RefreshToken(db.Model):
+    """Issued refresh token; rotated on every use and revoked on logout or reuse"""
+    __tablename__ = 'refresh_token'
+    jti = db.Column(db.String(SHORT_STRING_LENGTH), primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    # Tokens rotated from the same login share a family, revoked together when a used token is replayed
+    family_id = db.Column(db.String(SHORT_STRING_LENGTH), nullable=False, index=True)
+    issued_at = db.Column(db.DateTime, default=datetime.utcnow)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+    revoked_at = db.Column(db.DateTime)
+    replaced_by = db.Column(db.String(SHORT_STRING_LENGTH))
+    
+    def __repr__(self):
+        return f'<RefreshToken {self.jti} for User {self.user_id}>'
+
 class Patient(db.Model, SyncableMixin):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(STANDARD_STRING_LENGTH), nullable=False)
@@ -162,6 +195,13 @@ class Patient(db.Model, SyncableMixin):
     # Add user relationship - who created/owns this patient
     created_by_id = db.Column(db.Integer, db.ForeignKey('user.id'))
     created_by = db.relationship('User', backref=db.backref('patients', lazy=True))
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_patient_birth_date', 'birth_date'),
+    )
 
 class Condition(db.Model, SyncableMixin):
     id = db.Column(db.Integer, primary_key=True)
@@ -173,6 +213,14 @@ class Condition(db.Model, SyncableMixin):
     # Add user relationship - who created/owns this condition
     created_by_id = db.Column(db.Integer, db.ForeignKey('user.id'))
     created_by = db.relationship('User', backref=db.backref('conditions', lazy=True))
+    
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    __table_args__ = (
+        db.Index('ix_condition_patient_code', 'patient_id', 'condition_code'),
+        db.Index('ix_condition_code_status', 'condition_code', 'status'),
+    )
 
 class Observation(db.Model, SyncableMixin):
     """Model for clinical observations"""
@@ -181,6 +229,11 @@ class Observation(db.Model, SyncableMixin):
     observation_name = db.Column(db.String(STANDARD_STRING_LENGTH), nullable=False)
     value = db.Column(db.String(STANDARD_STRING_LENGTH), nullable=False)
     unit = db.Column(db.String(SHORT_STRING_LENGTH))
+    
+    # Typed copies of value/unit, derived at write time for range filters and aggregates
+    value_numeric = db.Column(db.Float)
+    value_type = db.Column(db.String(SHORT_STRING_LENGTH))
+    unit_normalized = db.Column(db.String(SHORT_STRING_LENGTH))
     reference_range = db.Column(db.String(STANDARD_STRING_LENGTH))
     observation_date = db.Column(db.DateTime, default=datetime.utcnow)
     status = db.Column(db.String(SHORT_STRING_LENGTH), default="final")
@@ -194,6 +247,11 @@ class Observation(db.Model, SyncableMixin):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_observation_code_value_numeric', 'observation_code', 'value_numeric'),
+        db.Index('ix_observation_patient_code_date', 'patient_id', 'observation_code', 'observation_date'),
+    )
+    
     def __repr__(self):
         return f'<Observation {self.id}: {self.observation_name} for Patient {self.patient_id}>'
 
@@ -216,5 +274,57 @@ class Procedure(db.Model, SyncableMixin):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        db.Index('ix_procedure_patient_code', 'patient_id', 'procedure_code'),
+    )
+    
+    def __repr__(self):
+        return f'<Procedure {self.id}: {self.procedure_name} for Patient {self.patient_id}>'
+
+class RegistryStatistic(db.Model):
+    """Incrementally maintained counter backing the statistics endpoints"""
+    __tablename__ = 'registry_statistic'
+    metric = db.Column(db.String(SHORT_STRING_LENGTH), primary_key=True)
+    bucket = db.Column(db.String(STANDARD_STRING_LENGTH), primary_key=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<RegistryStatistic {self.metric}[{self.bucket}]={self.count}>'
+
+class ImportCheckpoint(db.Model):
+    """Progress of a streamed file import, committed with each batch so a failed run can resume"""
+    __tablename__ = 'import_checkpoint'
+    source = db.Column(db.String(STANDARD_STRING_LENGTH), primary_key=True)
+    entity = db.Column(db.String(SHORT_STRING_LENGTH), primary_key=True)
+    file_name = db.Column(db.String(255))
+    file_fingerprint = db.Column(db.String(64))
+    byte_offset = db.Column(db.BigInteger, nullable=False, default=0)
+    rows_read = db.Column(db.Integer, nullable=False, default=0)
+    rows_imported = db.Column(db.Integer, nullable=False, default=0)
+    rows_rejected = db.Column(db.Integer, nullable=False, default=0)
+    completed_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ImportCheckpoint {self.source}/{self.entity} @ {self.byte_offset}>'
+
+class ImportPatientKey(db.Model):
+    """Maps a source system's patient identifier to the registry patient it was imported as"""
+    __tablename__ = 'import_patient_key'
+    source = db.Column(db.String(STANDARD_STRING_LENGTH), primary_key=True)
+    patient_key = db.Column(db.String(STANDARD_STRING_LENGTH), primary_key=True)
+    patient_id = db.Column(db.Integer, db.ForeignKey('patient.id'), nullable=False)
+    
+    def __repr__(self):
+        return f'<ImportPatientKey {self.source}:{self.patient_key} -> {self.patient_id}>'
+
+class SeedFingerprint(db.Model):
+    """Fingerprint of the reference data definitions last seeded into this database"""
+    __tablename__ = 'seed_fingerprint'
+    name = db.Column(db.String(SHORT_STRING_LENGTH), primary_key=True)
+    fingerprint = db.Column(db.String(64), nullable=False)
+    seeded_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
     def __repr__(self):
-        return f'<Procedure {self.id}: {self.procedure_name} for Patient {self.patient_id}>'
\ No newline at end of file
+        return f'<SeedFingerprint {self.name}: {self.fingerprint[:12]}>'
@@ -1,7 +1,9 @@
 from abc import ABC, abstractmethod
-from typing import List, TypeVar, Generic, Type, Dict, Any, Optional
+from typing import List, TypeVar, Generic, Type, Dict, Any, Optional, Sequence, Tuple
+from sqlalchemy import func, insert, select
 from sqlalchemy.orm import Session
 from app import db
+from app.utils.database import replica_reads
 
 T = TypeVar('T')
 
@@ -45,9 +47,46 @@ class SQLAlchemyRepository(BaseRepository[T]):
         """Get a single record by ID"""
         return self.session.query(self.model_class).get(id)
     
+    @replica_reads
     def get_all(self) -> List[T]:
         """Get all records"""
-        return self.session.query(self.model_class).all()
+        return self.session.query(self.model_class).order_by(self.model_class.id).all()
+    
+    @replica_reads
+    def find_rows(self, columns: Sequence[str], **filters) -> List[Tuple]:
+        """
+        Only the named columns of the records matching equality filters, as tuples ordered by ID
+        
+        Nothing is hydrated into entities or added to the identity map, so
+        list responses built from rows skip the ORM's per-object work.
+        """
+        statement = select(*self.columns(columns)).filter_by(**filters).order_by(self.model_class.id)
+        return self.session.execute(statement).all()
+    
+    def columns(self, names: Sequence[str]) -> List[Any]:
+        """Mapped columns of this repository's model by attribute name"""
+        return [getattr(self.model_class, name) for name in names]
+    
+    @replica_reads
+    def get_version(self, id: int) -> Optional[int]:
+        """Get only the version of a record, None if it does not exist"""
+        statement = select(self.model_class.version).where(self.model_class.id == id)
+        return self.session.execute(statement).scalar_one_or_none()
+    
+    @replica_reads
+    def get_collection_version(self, **filters) -> Tuple[int, int, int]:
+        """
+        Fingerprint of the records matching equality filters: (count, max ID, sum of versions)
+        
+        Inserts and deletes change the count or max ID, updates raise the sum.
+        """
+        statement = select(
+            func.count(self.model_class.id),
+            func.max(self.model_class.id),
+            func.sum(self.model_class.version)
+        ).filter_by(**filters)
+        count, max_id, versions = self.session.execute(statement).one()
+        return count, max_id or 0, versions or 0
     
     def create(self, data: Dict[str, Any]) -> T:
         """Create a new record"""
@@ -56,6 +95,31 @@ class SQLAlchemyRepository(BaseRepository[T]):
         self.session.commit()
         return obj
     
+    def insert_returning_ids(self, rows: List[Dict[str, Any]], model_class: Optional[Type] = None) -> List[int]:
+        """Insert many records (default: this repository's model) without committing, returning IDs in input order"""
+        model_class = model_class or self.model_class
+        if not rows:
+            return []
+        if self.session.get_bind().dialect.name == 'sqlite':
+            # SQLite cannot order RETURNING rows by parameter, so sort_by_parameter_order would fall
+            # back to one INSERT per row; rowids of one multi-row INSERT ascend in input order
+            statement = insert(model_class).returning(model_class.id)
+            return sorted(row[0] for row in self.session.execute(statement, rows))
+        statement = insert(model_class).returning(model_class.id, sort_by_parameter_order=True)
+        return [row[0] for row in self.session.execute(statement, rows)]
+    
+    def bulk_create(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert many records with one multi-row INSERT in a single transaction, returning IDs in input order"""
+        if not rows:
+            return []
+        try:
+            ids = self.insert_returning_ids(rows)
+            self.session.commit()
+            return ids
+        except Exception:
+            self.session.rollback()
+            raise
+    
     def update(self, id: int, data: Dict[str, Any]) -> Optional[T]:
         """Update a record"""
         obj = self.get_by_id(id)
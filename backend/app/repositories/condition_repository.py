@@ -1,4 +1,5 @@
 from app.repositories.base_repository import SQLAlchemyRepository
+from app.utils.database import replica_reads
 from app.models import Condition
 from typing import List, Optional
 
@@ -8,10 +9,12 @@ class ConditionRepository(SQLAlchemyRepository[Condition]):
     def __init__(self):
         super().__init__(Condition)
     
+    @replica_reads
     def find_by_patient_id(self, patient_id: int) -> List[Condition]:
         """Find conditions for a specific patient"""
-        return self.session.query(Condition).filter(Condition.patient_id == patient_id).all()
+        return self.session.query(Condition).filter(Condition.patient_id == patient_id).order_by(Condition.id).all()
     
+    @replica_reads
     def find_by_code(self, code: str) -> List[Condition]:
         """Find conditions by code (exact match)"""
         return self.session.query(Condition).filter(Condition.condition_code == code).all()
@@ -0,0 +1,62 @@
+from app.repositories.base_repository import SQLAlchemyRepository
+from app.models import ImportCheckpoint, ImportPatientKey
+from typing import Any, Dict, List, Optional
+from sqlalchemy import insert, select
+
+class ImportRepository(SQLAlchemyRepository[ImportCheckpoint]):
+    """Repository for import checkpoints and imported patient keys"""
+
+    def __init__(self):
+        super().__init__(ImportCheckpoint)
+
+    def get_checkpoint(self, source: str, entity: str) -> Optional[ImportCheckpoint]:
+        """Get the checkpoint of a source/entity import, if one was started"""
+        return self.session.get(ImportCheckpoint, (source, entity))
+
+    def start_checkpoint(self, source: str, entity: str, file_name: str, file_fingerprint: str) -> ImportCheckpoint:
+        """Create or reset the checkpoint for a fresh import of a file"""
+        checkpoint = self.get_checkpoint(source, entity)
+        if checkpoint is None:
+            checkpoint = ImportCheckpoint(source=source, entity=entity)
+            self.session.add(checkpoint)
+        checkpoint.file_name = file_name
+        checkpoint.file_fingerprint = file_fingerprint
+        checkpoint.byte_offset = 0
+        checkpoint.rows_read = 0
+        checkpoint.rows_imported = 0
+        checkpoint.rows_rejected = 0
+        checkpoint.completed_at = None
+        self.session.commit()
+        return checkpoint
+
+    def load_patient_keys(self, source: str) -> Dict[str, int]:
+        """Load the source's patient key -> patient ID map"""
+        statement = select(ImportPatientKey.patient_key, ImportPatientKey.patient_id).where(
+            ImportPatientKey.source == source)
+        rows = self.session.execute(statement.execution_options(yield_per=10000))
+        return {patient_key: patient_id for patient_key, patient_id in rows}
+
+    def insert_batch(self, model_class, rows: List[Dict[str, Any]], return_ids: bool = False) -> List[int]:
+        """Insert a batch of rows without committing, optionally returning IDs in input order"""
+        if not rows:
+            return []
+        if return_ids:
+            return self.insert_returning_ids(rows, model_class)
+        self.session.execute(insert(model_class), rows)
+        return []
+
+    def add_patient_keys(self, source: str, keys: Dict[str, int]) -> None:
+        """Record imported patient keys without committing"""
+        if keys:
+            self.session.execute(insert(ImportPatientKey), [
+                {'source': source, 'patient_key': key, 'patient_id': patient_id}
+                for key, patient_id in keys.items()
+            ])
+
+    def commit(self) -> None:
+        """Commit the current batch together with its checkpoint"""
+        self.session.commit()
+
+    def rollback(self) -> None:
+        """Discard the current batch"""
+        self.session.rollback()
@@ -1,6 +1,8 @@
 from app.repositories.base_repository import SQLAlchemyRepository
+from app.utils.database import replica_reads
 from app.models import Observation
-from typing import List, Optional
+from typing import List, Optional, Dict, Any, Sequence, Tuple
+from sqlalchemy import func, select
 import logging
 
 # Configure logging
@@ -12,24 +14,76 @@ class ObservationRepository(SQLAlchemyRepository[Observation]):
     def __init__(self):
         super().__init__(Observation)
     
+    @replica_reads
     def find_by_patient_id(self, patient_id: int) -> List[Observation]:
         """Find observations for a specific patient"""
-        logger.debug(f"Finding observations for patient ID: {patient_id}")
-        return self.session.query(Observation).filter(Observation.patient_id == patient_id).all()
+        logger.debug("Finding observations for patient ID: %s", patient_id)
+        return self.session.query(Observation).filter(Observation.patient_id == patient_id).order_by(Observation.id).all()
     
+    @replica_reads
     def find_by_code(self, code: str) -> List[Observation]:
         """Find observations by code (exact match)"""
-        logger.debug(f"Finding observations with code: {code}")
+        logger.debug("Finding observations with code: %s", code)
         return self.session.query(Observation).filter(Observation.observation_code == code).all()
     
+    @replica_reads
+    def find_by_value_range(self, code: str, min_value: Optional[float] = None,
+                            max_value: Optional[float] = None, patient_id: Optional[int] = None) -> List[Observation]:
+        """Find numeric observations for a code within an inclusive value range"""
+        logger.debug("Finding observations with code %s in range [%s, %s]", code, min_value, max_value)
+        return self.session.query(Observation).filter(
+            *self._value_range_criteria(code, min_value, max_value, patient_id)
+        ).order_by(Observation.observation_date, Observation.id).all()
+    
+    @replica_reads
+    def find_rows_by_value_range(self, columns: Sequence[str], code: str, min_value: Optional[float] = None,
+                                 max_value: Optional[float] = None, patient_id: Optional[int] = None) -> List[Tuple]:
+        """Only the named columns of numeric observations for a code within an inclusive value range"""
+        logger.debug("Finding observation rows with code %s in range [%s, %s]", code, min_value, max_value)
+        statement = select(*self.columns(columns)).where(
+            *self._value_range_criteria(code, min_value, max_value, patient_id)
+        ).order_by(Observation.observation_date, Observation.id)
+        return self.session.execute(statement).all()
+    
+    @staticmethod
+    def _value_range_criteria(code: str, min_value: Optional[float], max_value: Optional[float],
+                              patient_id: Optional[int]) -> List[Any]:
+        """Filters shared by the entity and row range queries"""
+        criteria = [Observation.observation_code == code, Observation.value_numeric.isnot(None)]
+        if min_value is not None:
+            criteria.append(Observation.value_numeric >= min_value)
+        if max_value is not None:
+            criteria.append(Observation.value_numeric <= max_value)
+        if patient_id is not None:
+            criteria.append(Observation.patient_id == patient_id)
+        return criteria
+    
+    @replica_reads
+    def summarize_by_code(self, code: str) -> Dict[str, Any]:
+        """Aggregate numeric values for an observation code"""
+        logger.debug("Summarizing numeric observations with code: %s", code)
+        count, minimum, maximum, average = self.session.query(
+            func.count(Observation.value_numeric),
+            func.min(Observation.value_numeric),
+            func.max(Observation.value_numeric),
+            func.avg(Observation.value_numeric)
+        ).filter(Observation.observation_code == code).one()
+        return {
+            'observation_code': code,
+            'count': count,
+            'min': minimum,
+            'max': maximum,
+            'mean': float(average) if average is not None else None
+        }
+    
     def find_by_fhir_id(self, fhir_id: str) -> Optional[Observation]:
         """Find an observation by FHIR ID"""
-        logger.debug(f"Finding observation by FHIR ID: {fhir_id}")
+        logger.debug("Finding observation by FHIR ID: %s", fhir_id)
         return self.session.query(Observation).filter(Observation.fhir_id == fhir_id).first()
     
     def update_sync_status(self, id: int, status: str, fhir_id: Optional[str] = None) -> Optional[Observation]:
         """Update sync status for an observation"""
-        logger.debug(f"Updating sync status for observation ID {id} to {status}")
+        logger.debug("Updating sync status for observation ID %s to %s", id, status)
         observation = self.get_by_id(id)
         if observation:
             observation.update_sync_status(status, fhir_id)
@@ -1,6 +1,8 @@
 from app.repositories.base_repository import SQLAlchemyRepository
+from app.utils.database import replica_reads
 from app.models import Patient
-from typing import List, Optional
+from typing import Iterable, List, Optional, Sequence, Set, Tuple
+from sqlalchemy import func, select
 
 class PatientRepository(SQLAlchemyRepository[Patient]):
     """Repository for Patient model"""
@@ -8,14 +10,43 @@ class PatientRepository(SQLAlchemyRepository[Patient]):
     def __init__(self):
         super().__init__(Patient)
     
+    @replica_reads
     def find_by_name(self, name: str) -> List[Patient]:
         """Find patients by name (case-insensitive partial match)"""
-        return self.session.query(Patient).filter(Patient.name.ilike(f'%{name}%')).all()
+        return self.session.query(Patient).filter(Patient.name.ilike(f'%{name}%')).order_by(Patient.id).all()
+    
+    @replica_reads
+    def find_rows_by_name(self, name: str, columns: Sequence[str]) -> List[Tuple]:
+        """Only the named columns of patients matching a name (case-insensitive partial match), ordered by ID"""
+        statement = select(*self.columns(columns)).where(Patient.name.ilike(f'%{name}%')).order_by(Patient.id)
+        return self.session.execute(statement).all()
     
     def find_by_fhir_id(self, fhir_id: str) -> Optional[Patient]:
         """Find a patient by FHIR ID"""
         return self.session.query(Patient).filter(Patient.fhir_id == fhir_id).first()
     
+    def find_existing_ids(self, ids: Iterable[int]) -> Set[int]:
+        """Return the subset of the given patient IDs that exist"""
+        ids = set(ids)
+        if not ids:
+            return set()
+        return set(self.session.execute(select(Patient.id).where(Patient.id.in_(ids))).scalars())
+    
+    @replica_reads
+    def count_matching(self, criteria) -> int:
+        """Count patients matching a compiled SQL criteria expression"""
+        statement = select(func.count(Patient.id)).where(criteria)
+        return self.session.execute(statement).scalar_one()
+    
+    @replica_reads
+    def find_ids_matching(self, criteria, after_id: Optional[int] = None, limit: int = 100) -> List[int]:
+        """Page through IDs of patients matching a compiled SQL criteria expression"""
+        statement = select(Patient.id).where(criteria)
+        if after_id is not None:
+            statement = statement.where(Patient.id > after_id)
+        statement = statement.order_by(Patient.id).limit(limit)
+        return list(self.session.execute(statement).scalars())
+    
     def update_sync_status(self, id: int, status: str, fhir_id: Optional[str] = None) -> Optional[Patient]:
         """Update sync status for a patient"""
         patient = self.get_by_id(id)
@@ -1,4 +1,5 @@
 from app.repositories.base_repository import SQLAlchemyRepository
+from app.utils.database import replica_reads
 from app.models import Procedure
 from typing import List, Optional
 import logging
@@ -12,24 +13,26 @@ class ProcedureRepository(SQLAlchemyRepository[Procedure]):
     def __init__(self):
         super().__init__(Procedure)
     
+    @replica_reads
     def find_by_patient_id(self, patient_id: int) -> List[Procedure]:
         """Find procedures for a specific patient"""
-        logger.debug(f"Finding procedures for patient ID: {patient_id}")
-        return self.session.query(Procedure).filter(Procedure.patient_id == patient_id).all()
+        logger.debug("Finding procedures for patient ID: %s", patient_id)
+        return self.session.query(Procedure).filter(Procedure.patient_id == patient_id).order_by(Procedure.id).all()
     
+    @replica_reads
     def find_by_code(self, code: str) -> List[Procedure]:
         """Find procedures by code (exact match)"""
-        logger.debug(f"Finding procedures with code: {code}")
+        logger.debug("Finding procedures with code: %s", code)
         return self.session.query(Procedure).filter(Procedure.procedure_code == code).all()
     
     def find_by_fhir_id(self, fhir_id: str) -> Optional[Procedure]:
         """Find a procedure by FHIR ID"""
-        logger.debug(f"Finding procedure by FHIR ID: {fhir_id}")
+        logger.debug("Finding procedure by FHIR ID: %s", fhir_id)
         return self.session.query(Procedure).filter(Procedure.fhir_id == fhir_id).first()
     
     def update_sync_status(self, id: int, status: str, fhir_id: Optional[str] = None) -> Optional[Procedure]:
         """Update sync status for a procedure"""
-        logger.debug(f"Updating sync status for procedure ID {id} to {status}")
+        logger.debug("Updating sync status for procedure ID %s to %s", id, status)
         procedure = self.get_by_id(id)
         if procedure:
             procedure.update_sync_status(status, fhir_id)
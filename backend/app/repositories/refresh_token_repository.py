@@ -0,0 +1,57 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict
+from sqlalchemy import delete, update
+
+from app.models import RefreshToken
+from app.repositories.base_repository import SQLAlchemyRepository
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class RefreshTokenRepository(SQLAlchemyRepository[RefreshToken]):
+    """Repository for issued refresh tokens (the revocation store)"""
+    
+    def __init__(self):
+        super().__init__(RefreshToken)
+    
+    def rotate(self, jti: str, replacement: Dict[str, Any]) -> bool:
+        """
+        Revoke a token and store its replacement in one transaction
+        
+        The revocation only applies while the token is still live, so of two
+        concurrent refreshes with the same token exactly one succeeds.
+        """
+        now = datetime.utcnow()
+        try:
+            result = self.session.execute(
+                update(RefreshToken)
+                .where(RefreshToken.jti == jti, RefreshToken.revoked_at.is_(None))
+                .values(revoked_at=now, replaced_by=replacement['jti'])
+            )
+            if result.rowcount != 1:
+                self.session.rollback()
+                return False
+            self.session.add(RefreshToken(**replacement))
+            self.session.commit()
+            return True
+        except Exception:
+            self.session.rollback()
+            raise
+    
+    def revoke_family(self, family_id: str) -> int:
+        """Revoke every live token of a family, returning how many were revoked"""
+        result = self.session.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.revoked_at.is_(None))
+            .values(revoked_at=datetime.utcnow())
+        )
+        self.session.commit()
+        return result.rowcount
+    
+    def delete_expired(self, before: datetime) -> int:
+        """Delete tokens that expired before the given time, returning how many were deleted"""
+        result = self.session.execute(delete(RefreshToken).where(RefreshToken.expires_at < before))
+        self.session.commit()
+        logger.info("Deleted %s expired refresh tokens", result.rowcount)
+        return result.rowcount
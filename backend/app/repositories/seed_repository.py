@@ -0,0 +1,75 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from sqlalchemy import insert, select
+
+from app.models import SeedFingerprint, User, Role
+from app.repositories.base_repository import SQLAlchemyRepository
+from app.repositories.statistics_repository import UPSERT_INSERTS
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class SeedRepository(SQLAlchemyRepository[SeedFingerprint]):
+    """Repository for reference data seeding and its fingerprints"""
+    
+    def __init__(self):
+        super().__init__(SeedFingerprint)
+    
+    def get_fingerprint(self, name: str) -> Optional[str]:
+        """Get the stored fingerprint of a seed, None if it was never seeded"""
+        return self.session.execute(
+            select(SeedFingerprint.fingerprint).where(SeedFingerprint.name == name)
+        ).scalar_one_or_none()
+    
+    def set_fingerprint(self, name: str, fingerprint: str) -> None:
+        """Record a seed's fingerprint (committed with the seeded rows by commit())"""
+        self.session.merge(SeedFingerprint(name=name, fingerprint=fingerprint, seeded_at=datetime.utcnow()))
+    
+    def upsert(self, model_class, key: str, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert rows or update them by their unique key in a single statement
+        
+        Columns not in the rows (e.g. an entry's active flag) keep their values.
+        Dialects without ON CONFLICT support only get the missing rows inserted.
+        """
+        if not rows:
+            return 0
+        table = model_class.__table__
+        connection = self.session.connection()
+        dialect_insert = UPSERT_INSERTS.get(connection.dialect.name)
+        
+        if dialect_insert is not None:
+            statement = dialect_insert(table).values(rows)
+            statement = statement.on_conflict_do_update(
+                index_elements=[table.c[key]],
+                set_={column: statement.excluded[column] for column in rows[0] if column != key}
+            )
+            connection.execute(statement)
+            return len(rows)
+        
+        existing = set(connection.execute(select(table.c[key])).scalars())
+        missing = [row for row in rows if row[key] not in existing]
+        if missing:
+            connection.execute(insert(table), missing)
+        return len(missing)
+    
+    def find_existing_usernames(self, usernames: Iterable[str]) -> set:
+        """Usernames from the given ones that already exist"""
+        return set(self.session.execute(select(User.username).where(User.username.in_(list(usernames)))).scalars())
+    
+    def find_roles_by_name(self, names: Iterable[str]) -> Dict[str, Role]:
+        """Roles by name for the given names"""
+        return {role.name: role for role in self.session.query(Role).filter(Role.name.in_(list(names))).all()}
+    
+    def add(self, obj: Any) -> None:
+        """Add an object to the seeding transaction"""
+        self.session.add(obj)
+    
+    def commit(self) -> None:
+        """Commit the seeding transaction"""
+        self.session.commit()
+    
+    def rollback(self) -> None:
+        """Roll back the seeding transaction"""
+        self.session.rollback()
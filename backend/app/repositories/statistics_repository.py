@@ -0,0 +1,130 @@
+from app.repositories.base_repository import SQLAlchemyRepository
+from app.utils.database import replica_reads
+from app.models import RegistryStatistic
+from typing import Callable, Dict, List, Tuple
+from datetime import datetime
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+import logging
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# (metric, bucket) -> count delta or absolute count
+StatisticCounts = Dict[Tuple[str, str], int]
+
+# Dialects with INSERT ... ON CONFLICT DO UPDATE support
+UPSERT_INSERTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert,
+}
+
+# Dialects with shared and exclusive advisory locks, and the key of the one guarding the counters
+ADVISORY_LOCK_DIALECTS = ('postgresql',)
+STATISTICS_LOCK_KEY = 0x5354415453  # 'STATS'
+
+class StatisticsRepository(SQLAlchemyRepository[RegistryStatistic]):
+    """Repository for RegistryStatistic counters"""
+
+    def __init__(self):
+        super().__init__(RegistryStatistic)
+
+    @replica_reads
+    def find_by_metric(self, metric: str) -> List[RegistryStatistic]:
+        """Get all non-empty buckets of a metric, largest first"""
+        return self.session.query(RegistryStatistic).filter(
+            RegistryStatistic.metric == metric,
+            RegistryStatistic.count > 0
+        ).order_by(RegistryStatistic.count.desc(), RegistryStatistic.bucket).all()
+
+    @replica_reads
+    def get_count(self, metric: str, bucket: str) -> int:
+        """Get a single counter value, 0 if it has never been written"""
+        count = self.session.execute(
+            select(RegistryStatistic.count).where(
+                RegistryStatistic.metric == metric,
+                RegistryStatistic.bucket == bucket
+            )
+        ).scalar_one_or_none()
+        return count or 0
+
+    @staticmethod
+    def apply_deltas(connection, deltas: StatisticCounts) -> None:
+        """
+        Add deltas to counters on the given connection, creating missing rows
+
+        Counters are written in key order, so concurrent callers lock the
+        rows they share in the same order and cannot deadlock.
+        """
+        table = RegistryStatistic.__table__
+        now = datetime.utcnow()
+        dialect_insert = UPSERT_INSERTS.get(connection.dialect.name)
+
+        for (metric, bucket), delta in sorted(deltas.items()):
+            if not delta:
+                continue
+            if dialect_insert is not None:
+                statement = dialect_insert(table).values(metric=metric, bucket=bucket, count=delta, updated_at=now)
+                statement = statement.on_conflict_do_update(
+                    index_elements=[table.c.metric, table.c.bucket],
+                    set_={'count': table.c.count + statement.excluded.count, 'updated_at': now}
+                )
+                connection.execute(statement)
+            else:
+                result = connection.execute(
+                    update(table)
+                    .where(table.c.metric == metric, table.c.bucket == bucket)
+                    .values(count=table.c.count + delta, updated_at=now)
+                )
+                if result.rowcount == 0:
+                    connection.execute(insert(table).values(metric=metric, bucket=bucket, count=delta, updated_at=now))
+
+    @staticmethod
+    def has_advisory_locks(dialect) -> bool:
+        """Whether deltas can be applied after commit under a shared lock on this dialect"""
+        return dialect.name in ADVISORY_LOCK_DIALECTS
+
+    @staticmethod
+    def lock_shared(connection) -> None:
+        """Take the counters' lock in shared mode for the connection's lifetime, across its transactions"""
+        connection.execute(select(func.pg_advisory_lock_shared(STATISTICS_LOCK_KEY)))
+        connection.commit()
+
+    @staticmethod
+    def unlock_shared(connection) -> None:
+        """Release a shared lock taken by lock_shared"""
+        connection.execute(select(func.pg_advisory_unlock_shared(STATISTICS_LOCK_KEY)))
+        connection.commit()
+
+    @staticmethod
+    def lock_exclusive(session) -> None:
+        """Take the counters' lock exclusively until the session's transaction ends"""
+        session.execute(select(func.pg_advisory_xact_lock(STATISTICS_LOCK_KEY)))
+
+    def replace_all(self, compute: Callable[[], StatisticCounts]) -> StatisticCounts:
+        """
+        Recompute and replace every counter in one write transaction
+
+        No tracked write can commit between the count and the replacement:
+        on PostgreSQL the transaction takes the counters' lock exclusively,
+        which writers hold shared from their commit until their deltas are
+        applied; elsewhere the DELETE comes first, so the transaction holds
+        the database's write lock while it counts.
+        """
+        table = RegistryStatistic.__table__
+        try:
+            if self.has_advisory_locks(self.session.get_bind(mapper=RegistryStatistic).dialect):
+                self.lock_exclusive(self.session)
+            self.session.execute(delete(table))
+            counts = compute()
+            if counts:
+                now = datetime.utcnow()
+                self.session.execute(insert(table), [
+                    {'metric': metric, 'bucket': bucket, 'count': count, 'updated_at': now}
+                    for (metric, bucket), count in counts.items()
+                ])
+            self.session.commit()
+            return counts
+        except Exception:
+            self.session.rollback()
+            raise
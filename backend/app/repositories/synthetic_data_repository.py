@@ -0,0 +1,32 @@
+from app.repositories.base_repository import SQLAlchemyRepository
+from app.models import Patient
+from typing import Any, Dict, List
+from sqlalchemy import insert
+
+class SyntheticDataRepository(SQLAlchemyRepository[Patient]):
+    """Repository for bulk inserts of generated registry data"""
+
+    def __init__(self):
+        super().__init__(Patient)
+
+    def insert_patients(self, rows: List[Dict[str, Any]]) -> List[int]:
+        """Insert a batch of patients without committing, returning their IDs in input order"""
+        return self.insert_returning_ids(rows)
+
+    def insert_rows(self, model_class, rows: List[Dict[str, Any]]) -> None:
+        """
+        Insert a batch of rows of any model with one ORM bulk INSERT, without committing
+
+        ORM bulk inserts still run the session hooks that keep registry
+        statistics and cached responses in step with the new rows.
+        """
+        if rows:
+            self.session.execute(insert(model_class), rows)
+
+    def commit(self) -> None:
+        """Commit the current batch"""
+        self.session.commit()
+
+    def rollback(self) -> None:
+        """Discard the current batch"""
+        self.session.rollback()
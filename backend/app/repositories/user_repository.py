@@ -1,7 +1,8 @@
 import logging
 from app.repositories.base_repository import SQLAlchemyRepository
-from app.models import User, Role
-from typing import List, Optional
+from app.models import User, Role, user_roles
+from typing import List, Optional, Tuple
+from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
 from datetime import datetime
 
@@ -16,14 +17,28 @@ class UserRepository(SQLAlchemyRepository[User]):
     
     def find_by_username(self, username: str) -> Optional[User]:
         """Find a user by username"""
-        logger.debug(f"Finding user by username: {username}")
+        logger.debug("Finding user by username: %s", username)
         return self.session.query(User).filter(User.username == username).first()
     
     def find_by_email(self, email: str) -> Optional[User]:
         """Find a user by email"""
-        logger.debug(f"Finding user by email: {email}")
+        logger.debug("Finding user by email: %s", email)
         return self.session.query(User).filter(User.email == email).first()
     
+    def find_principal(self, user_id: int) -> Optional[Tuple[str, Tuple[str, ...], bool]]:
+        """Username, role names and active flag of a user in a single query, without loading the User"""
+        rows = self.session.execute(
+            select(User.username, Role.name, User.is_active)
+            .outerjoin(user_roles, user_roles.c.user_id == User.id)
+            .outerjoin(Role, Role.id == user_roles.c.role_id)
+            .where(User.id == user_id)
+        ).all()
+        if not rows:
+            return None
+        username, _, is_active = rows[0]
+        roles = tuple(sorted(role for _, role, _ in rows if role is not None))
+        return username, roles, is_active is not False
+    
     def create_with_roles(self, user_data: dict, role_names: List[str] = None) -> Optional[User]:
         """Create a new user with specified roles"""
         try:
@@ -32,37 +47,37 @@ class UserRepository(SQLAlchemyRepository[User]):
             
             # Add roles if provided
             if role_names:
-                logger.debug(f"Assigning roles to new user: {role_names}")
+                logger.debug("Assigning roles to new user: %s", role_names)
                 roles = self.session.query(Role).filter(Role.name.in_(role_names)).all()
                 found_role_names = [role.name for role in roles]
                 missing_roles = set(role_names) - set(found_role_names)
                 
                 if missing_roles:
-                    logger.warning(f"Some roles were not found: {missing_roles}")
+                    logger.warning("Some roles were not found: %s", missing_roles)
                 
                 user.roles = roles
             
             self.session.add(user)
             self.session.commit()
-            logger.info(f"Created new user: {user.username} (ID: {user.id}) with roles: {[r.name for r in user.roles]}")
+            logger.info("Created new user: %s (ID: %s) with roles: %s", user.username, user.id, [r.name for r in user.roles])
             return user
         except IntegrityError as e:
             self.session.rollback()
-            logger.warning(f"Failed to create user due to integrity error: {str(e)}")
+            logger.warning("Failed to create user due to integrity error: %s", e)
             return None
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Unexpected error creating user: {str(e)}", exc_info=True)
+            logger.error("Unexpected error creating user: %s", e, exc_info=True)
             raise
         
     def update_last_login(self, user_id: int) -> Optional[User]:
         """Update user's last login timestamp"""
-        logger.debug(f"Updating last login for user ID: {user_id}")
+        logger.debug("Updating last login for user ID: %s", user_id)
         user = self.get_by_id(user_id)
         if user:
             user.last_login = datetime.utcnow()
             self.session.commit()
-            logger.debug(f"Updated last login for user: {user.username}")
+            logger.debug("Updated last login for user: %s", user.username)
         else:
-            logger.warning(f"Failed to update last login - User ID not found: {user_id}")
+            logger.warning("Failed to update last login - User ID not found: %s", user_id)
         return user
\ No newline at end of file
@@ -0,0 +1,13 @@
+from app.repositories.base_repository import SQLAlchemyRepository
+from app.models import ValueSet
+from typing import List, Type
+
+class ValueSetRepository(SQLAlchemyRepository[ValueSet]):
+    """Repository for the reference value set tables"""
+    
+    def __init__(self):
+        super().__init__(ValueSet)
+    
+    def find_active(self, model_class: Type[ValueSet]) -> List[ValueSet]:
+        """Get the active entries of one value set table"""
+        return self.session.query(model_class).filter_by(active=True).all()
@@ -1,6 +1,12 @@
 from pydantic import BaseModel, Field, validator, EmailStr
 from datetime import date, datetime
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Dict
+
+def check_value_set_code(value_set: str, code: str, label: str) -> str:
+    """Validate a code against the cached value set index"""
+    # Imported here: the services package imports these schemas
+    from app.services.value_set_service import value_set_service
+    return value_set_service.validate_code(value_set, code, label)
 
 # Patient schemas
 class PatientBase(BaseModel):
@@ -11,10 +17,9 @@ class PatientBase(BaseModel):
     
     @validator('gender')
     def validate_gender(cls, v):
-        valid_genders = ['male', 'female', 'other', 'unknown', None]
-        if v not in valid_genders:
-            raise ValueError(f'Gender must be one of: {", ".join(str(g) for g in valid_genders if g)}')
-        return v
+        if v is None:
+            return v
+        return check_value_set_code('genders', v, 'Gender')
 
 class PatientCreate(PatientBase):
     """Schema for creating a new patient"""
@@ -38,12 +43,13 @@ class ConditionBase(BaseModel):
     status: str = Field(..., description="Condition status")
     patient_id: int = Field(..., description="ID of the patient with this condition")
     
+    @validator('condition_code')
+    def validate_condition_code(cls, v):
+        return check_value_set_code('neurological-conditions', v, 'Condition code')
+    
     @validator('status')
     def validate_status(cls, v):
-        valid_statuses = ['active', 'inactive', 'resolved', 'unknown']
-        if v not in valid_statuses:
-            raise ValueError(f'Status must be one of: {", ".join(valid_statuses)}')
-        return v
+        return check_value_set_code('condition-statuses', v, 'Status')
 
 class ConditionCreate(ConditionBase):
     """Schema for creating a new condition"""
@@ -127,8 +133,14 @@ class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
     expires_in: int
+    refresh_token: Optional[str] = None
+    refresh_expires_in: Optional[int] = None
     user: UserResponse
 
+class RefreshTokenRequest(BaseModel):
+    """Schema for refresh and logout requests"""
+    refresh_token: str = Field(..., min_length=1, description="Refresh token issued at login or by the last refresh")
+
 # Observation schemas
 class ObservationBase(BaseModel):
     """Base schema for observation data"""
@@ -155,6 +167,9 @@ class ObservationCreate(ObservationBase):
 class ObservationResponse(ObservationBase):
     """Schema for observation response"""
     id: int
+    value_numeric: Optional[float] = None
+    value_type: Optional[str] = None
+    unit_normalized: Optional[str] = None
     sync_status: str
     fhir_id: Optional[str] = None
     synced_at: Optional[datetime] = None
@@ -196,4 +211,60 @@ class ProcedureResponse(ProcedureBase):
     updated_at: Optional[datetime] = None
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Cohort query schemas
+class ConditionCriterion(BaseModel):
+    """Patients with at least one matching condition"""
+    code: Optional[str] = Field(None, description="Condition code (ICD-10)")
+    codes: Optional[List[str]] = Field(None, description="Any of these condition codes")
+    status: Optional[str] = Field(None, description="Condition status")
+    onset_after: Optional[date] = Field(None, description="Earliest onset date (inclusive)")
+    onset_before: Optional[date] = Field(None, description="Latest onset date (inclusive)")
+    
+    class Config:
+        extra = 'forbid'
+
+class ObservationCriterion(BaseModel):
+    """Patients with at least one matching observation"""
+    code: str = Field(..., min_length=1, description="Observation code")
+    min_value: Optional[float] = Field(None, description="Inclusive lower bound on the numeric value")
+    max_value: Optional[float] = Field(None, description="Inclusive upper bound on the numeric value")
+    since: Optional[datetime] = Field(None, description="Earliest observation date (inclusive)")
+    until: Optional[datetime] = Field(None, description="Latest observation date (inclusive)")
+    within_days: Optional[int] = Field(None, ge=1, description="Only observations from the last N days")
+    
+    class Config:
+        extra = 'forbid'
+
+class ProcedureCriterion(BaseModel):
+    """Patients with at least one matching procedure"""
+    code: Optional[str] = Field(None, description="Procedure code")
+    codes: Optional[List[str]] = Field(None, description="Any of these procedure codes")
+    since: Optional[datetime] = Field(None, description="Earliest performed date (inclusive)")
+    until: Optional[datetime] = Field(None, description="Latest performed date (inclusive)")
+    within_days: Optional[int] = Field(None, ge=1, description="Only procedures from the last N days")
+    
+    class Config:
+        extra = 'forbid'
+
+class AgeCriterion(BaseModel):
+    """Patients whose current age in whole years is within the bounds"""
+    min: Optional[int] = Field(None, ge=0, description="Minimum age (inclusive)")
+    max: Optional[int] = Field(None, ge=0, description="Maximum age (inclusive)")
+    
+    class Config:
+        extra = 'forbid'
+
+class GenderCriterion(BaseModel):
+    """Patients with any of the given genders"""
+    codes: List[str] = Field(..., min_length=1, description="Gender codes")
+    
+    class Config:
+        extra = 'forbid'
+
+class CohortQuery(BaseModel):
+    """Schema for a cohort query request"""
+    criteria: Dict[str, Any] = Field(..., description="Criteria tree of and/or/not nodes over criterion leaves")
+    limit: int = Field(100, ge=1, le=1000, description="Maximum number of patient IDs to return")
+    after_id: Optional[int] = Field(None, description="Return patient IDs greater than this cursor")
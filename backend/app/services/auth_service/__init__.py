@@ -1,24 +1,77 @@
 import logging
-from typing import Dict, Optional, Tuple, Any, Union
+import uuid
+from typing import Dict, NamedTuple, Optional, Tuple, Any, Union
 from datetime import datetime, timedelta
 import jwt
 from flask import current_app
+from sqlalchemy import event, inspect
 
+from app import db
+from app.config import Config
 from app.models import User
 from app.services.base_service import BaseService
 from app.repositories.user_repository import UserRepository
 from app.repositories.role_repository import RoleRepository
+from app.repositories.refresh_token_repository import RefreshTokenRepository
+from app.utils.cache import TTLCache, MISSING
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Value of the "type" claim; tokens without one predate refresh tokens and are access tokens
+ACCESS_TOKEN_TYPE = 'access'
+REFRESH_TOKEN_TYPE = 'refresh'
+
+# User attributes a Principal is built from
+PRINCIPAL_ATTRIBUTES = ('username', 'roles', 'is_active')
+
+# Session.info key collecting the IDs of users whose principal the current transaction changed
+STALE_PRINCIPALS = 'stale_principal_ids'
+
+class Principal(NamedTuple):
+    """The authenticated caller as seen by route handlers, resolved without loading the User"""
+    id: int
+    username: str
+    roles: Tuple[str, ...]
+    is_active: bool
+    
+    def has_role(self, role_name: str) -> bool:
+        """Check if the caller has a specific role"""
+        return role_name in self.roles
+
 class AuthService(BaseService[User, UserRepository]):
     """Service for authentication-related operations"""
     
-    def __init__(self, user_repository: Optional[UserRepository] = None, role_repository: Optional[RoleRepository] = None):
-        """Initialize with repositories using dependency injection"""
+    def __init__(self, user_repository: Optional[UserRepository] = None, role_repository: Optional[RoleRepository] = None,
+                 principal_cache: Optional[TTLCache] = None,
+                 refresh_token_repository: Optional[RefreshTokenRepository] = None):
+        """Initialize with repositories and principal cache using dependency injection"""
         super().__init__(user_repository or UserRepository())
         self.role_repository = role_repository or RoleRepository()
+        self.refresh_token_repository = refresh_token_repository or RefreshTokenRepository()
+        if principal_cache is None:
+            principal_cache = TTLCache(maxsize=Config.PRINCIPAL_CACHE_SIZE, ttl=Config.PRINCIPAL_CACHE_TTL)
+        self.principal_cache = principal_cache
+    
+    def get_principal(self, user_id: int) -> Optional[Principal]:
+        """
+        Resolve a token's user to its current roles and active flag
+        
+        Results (including unknown users) are cached for PRINCIPAL_CACHE_TTL
+        seconds. Commits in this process that change a user's roles or active
+        flag drop the entry at once (see register_principal_listeners); other
+        processes see the change within that window.
+        """
+        principal = self.principal_cache.get(user_id)
+        if principal is MISSING:
+            row = self.repository.find_principal(user_id)
+            principal = Principal(user_id, *row) if row else None
+            self.principal_cache.set(user_id, principal)
+        return principal
+    
+    def invalidate_principal(self, user_id: int) -> None:
+        """Drop a cached principal so this process sees role or status changes immediately"""
+        self.principal_cache.delete(user_id)
     
     @BaseService.handle_service_exceptions
     def register_user(self, user_data: Dict[str, Any]) -> Tuple[Union[Dict[str, Any], User], int]:
@@ -27,7 +80,7 @@ class AuthService(BaseService[User, UserRepository]):
         role_names = user_data.pop('roles', ['user'])  # Default to 'user' role
         
         # Log the roles being assigned
-        logger.info(f"Registering user with roles: {role_names}")
+        logger.info("Registering user with roles: %s", role_names)
         
         # Set password hash
         password = user_data.pop('password')
@@ -47,90 +100,216 @@ class AuthService(BaseService[User, UserRepository]):
         created_user = self.repository.create_with_roles(user_dict, role_names)
         
         if not created_user:
-            logger.warning(f"Failed to create user. Username or email already exists: {user.username}, {user.email}")
+            logger.warning("Failed to create user. Username or email already exists: %s", user.username)
             return {"error": "Username or email already exists"}, 400
         
         # Check if roles were properly assigned
         assigned_roles = [role.name for role in created_user.roles]
-        logger.info(f"User created with roles: {assigned_roles}")
+        logger.info("User created with roles: %s", assigned_roles)
         
         # If no roles were assigned, try to add them manually
         if not assigned_roles and role_names:
-            logger.warning(f"No roles were assigned automatically. Trying manual assignment...")
+            logger.warning("No roles were assigned automatically. Trying manual assignment...")
             for role_name in role_names:
                 role = self.role_repository.find_by_name(role_name)
                 if role:
                     created_user.roles.append(role)
             
             self.repository.session.commit()
-            logger.info(f"After manual assignment, user has roles: {[r.name for r in created_user.roles]}")
+            logger.info("After manual assignment, user has roles: %s", [r.name for r in created_user.roles])
             
         return created_user, 201
     
     def authenticate_user(self, username: str, password: str) -> Optional[User]:
         """Authenticate a user by username/email and password"""
-        logger.debug(f"Attempting to authenticate user: {username}")
+        logger.debug("Attempting to authenticate user: %s", username)
         
         # Try to find by username
         user = self.repository.find_by_username(username)
         
         # If not found, try by email
         if not user:
-            logger.debug(f"User not found by username, trying email")
+            logger.debug("User not found by username, trying email")
             user = self.repository.find_by_email(username)
             
         # Check password if user exists
         if user and user.check_password(password):
-            logger.info(f"User authenticated successfully: {username} (ID: {user.id})")
+            logger.info("User authenticated successfully: %s (ID: %s)", username, user.id)
             # Update last login
             self.repository.update_last_login(user.id)
             return user
         
         if user:
-            logger.warning(f"Failed authentication attempt for user: {username} - Invalid password")
+            logger.warning("Failed authentication attempt for user: %s - Invalid password", username)
         else:
-            logger.warning(f"Failed authentication attempt - User not found: {username}")
+            logger.warning("Failed authentication attempt - User not found: %s", username)
             
         return None
     
     @BaseService.handle_service_exceptions
-    def generate_token(self, user: User, expires_in: int = 86400) -> Dict[str, Any]:
-        """Generate JWT token for authenticated user"""
-        # Get config secret key
-        from app.config import Config
-        secret_key = Config.SECRET_KEY
+    def generate_token(self, user: User, expires_in: Optional[int] = None) -> Dict[str, Any]:
+        """Generate a short-lived access token and a refresh token for an authenticated user"""
+        expires_in = expires_in or Config.JWT_EXPIRATION
         
         # Log token generation info with limited sensitive data
-        logger.info(f"Generating token for user: {user.username} (ID: {user.id})")
+        logger.info("Generating tokens for user: %s (ID: %s)", user.username, user.id)
         
-        # Generate token
-        now = datetime.utcnow()
-        payload = {
-            'sub': str(user.id),  # Convert ID to string to avoid JWT validation issues
-            'iat': now,
-            'exp': now + timedelta(seconds=expires_in),
-            'username': user.username,
-            'roles': [role.name for role in user.roles]
-        }
-        
-        token = jwt.encode(
-            payload,
-            secret_key,
-            algorithm='HS256'
-        )
+        access_token = self._encode_access_token(user.id, user.username, [role.name for role in user.roles], expires_in)
         
-        # If token is returned as bytes, convert to string
-        if isinstance(token, bytes):
-            token = token.decode('utf-8')
+        # Each login starts a new refresh token family
+        refresh_token, record = self._new_refresh_token(user.id, uuid.uuid4().hex)
+        self.refresh_token_repository.create(record)
             
-        logger.info(f"Token generated successfully for user: {user.username}")
+        logger.info("Tokens generated successfully for user: %s", user.username)
             
         return {
-            "access_token": token,
+            "access_token": access_token,
             "token_type": "bearer",
             "expires_in": expires_in,
+            "refresh_token": refresh_token,
+            "refresh_expires_in": Config.REFRESH_TOKEN_EXPIRATION,
             "user": user
         }
+    
+    def refresh_tokens(self, refresh_token: str) -> Tuple[Dict[str, Any], int]:
+        """
+        Exchange a refresh token for a new access token and a rotated refresh token
+        
+        Costs a signature check and one indexed update instead of a password hash.
+        Presenting a token that was already rotated revokes its whole family.
+        """
+        payload = self._decode_refresh_token(refresh_token)
+        if payload is None:
+            return {"error": "Invalid refresh token"}, 401
+        
+        user_id, jti, family_id = int(payload['sub']), payload['jti'], payload['fam']
+        stored = self.refresh_token_repository.get_by_id(jti)
+        if stored is None:
+            logger.warning("Refresh failed: unknown refresh token for user ID %s", user_id)
+            return {"error": "Invalid refresh token"}, 401
+        if stored.revoked_at is not None:
+            logger.warning("Refresh token reuse detected for user ID %s, revoking token family", user_id)
+            self.refresh_token_repository.revoke_family(family_id)
+            return {"error": "Refresh token has been revoked"}, 401
+        
+        principal = self.get_principal(user_id)
+        if not principal or not principal.is_active:
+            logger.warning("Refresh failed: user ID %s is missing or deactivated", user_id)
+            self.refresh_token_repository.revoke_family(family_id)
+            return {"error": "User account is disabled"}, 401
+        
+        new_refresh_token, record = self._new_refresh_token(user_id, family_id)
+        if not self.refresh_token_repository.rotate(jti, record):
+            # Another request rotated this token first
+            logger.warning("Concurrent refresh token reuse for user ID %s, revoking token family", user_id)
+            self.refresh_token_repository.revoke_family(family_id)
+            return {"error": "Refresh token has been revoked"}, 401
+        
+        logger.debug("Rotated refresh token for user: %s", principal.username)
+        return {
+            "access_token": self._encode_access_token(user_id, principal.username, principal.roles, Config.JWT_EXPIRATION),
+            "token_type": "bearer",
+            "expires_in": Config.JWT_EXPIRATION,
+            "refresh_token": new_refresh_token,
+            "refresh_expires_in": Config.REFRESH_TOKEN_EXPIRATION
+        }, 200
+    
+    def revoke_refresh_token(self, refresh_token: str) -> Tuple[Dict[str, Any], int]:
+        """Log out by revoking the refresh token's family; issued access tokens run out within JWT_EXPIRATION"""
+        # Expired tokens can still be used to log out
+        payload = self._decode_refresh_token(refresh_token, verify_exp=False)
+        if payload is None:
+            return {"error": "Invalid refresh token"}, 401
+        
+        revoked = self.refresh_token_repository.revoke_family(payload['fam'])
+        logger.info("Revoked %s refresh tokens for user ID %s", revoked, payload['sub'])
+        return {"message": "Logged out successfully"}, 200
+    
+    def purge_expired_refresh_tokens(self) -> int:
+        """Remove expired tokens from the revocation store"""
+        return self.refresh_token_repository.delete_expired(datetime.utcnow())
+    
+    def _encode_access_token(self, user_id: int, username: str, roles, expires_in: int) -> str:
+        """Encode an access token for the authenticated caller"""
+        now = datetime.utcnow()
+        return self._encode({
+            'sub': str(user_id),  # Convert ID to string to avoid JWT validation issues
+            'iat': now,
+            'exp': now + timedelta(seconds=expires_in),
+            'username': username,
+            'roles': list(roles),
+            'type': ACCESS_TOKEN_TYPE
+        })
+    
+    def _new_refresh_token(self, user_id: int, family_id: str) -> Tuple[str, Dict[str, Any]]:
+        """Encode a refresh token and build the revocation store record tracking it"""
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=Config.REFRESH_TOKEN_EXPIRATION)
+        jti = uuid.uuid4().hex
+        token = self._encode({
+            'sub': str(user_id),
+            'iat': now,
+            'exp': expires_at,
+            'jti': jti,
+            'fam': family_id,
+            'type': REFRESH_TOKEN_TYPE
+        })
+        return token, {'jti': jti, 'user_id': user_id, 'family_id': family_id, 'issued_at': now, 'expires_at': expires_at}
+    
+    @staticmethod
+    def _decode_refresh_token(token: str, verify_exp: bool = True) -> Optional[Dict[str, Any]]:
+        """Verify a refresh token's signature and type, returning its claims or None"""
+        try:
+            payload = jwt.decode(token, Config.SECRET_KEY, algorithms=['HS256'], options={'verify_exp': verify_exp})
+        except jwt.InvalidTokenError as e:
+            logger.warning("Invalid refresh token: %s", e)
+            return None
+        if payload.get('type') != REFRESH_TOKEN_TYPE or not payload.get('jti') or not payload.get('fam'):
+            logger.warning("Invalid refresh token: not a refresh token")
+            return None
+        return payload
+    
+    @staticmethod
+    def _encode(payload: Dict[str, Any]) -> str:
+        """Sign a token payload"""
+        token = jwt.encode(payload, Config.SECRET_KEY, algorithm='HS256')
+        
+        # If token is returned as bytes, convert to string
+        if isinstance(token, bytes):
+            token = token.decode('utf-8')
+        return token
+
+def mark_principal_changes(session, flush_context) -> None:
+    """Session hook recording users created, deleted or whose username, roles or active flag changed in a flush"""
+    user_ids = set()
+    for user in list(session.new) + list(session.deleted):
+        if isinstance(user, User) and user.id is not None:
+            user_ids.add(user.id)
+    for user in session.dirty:
+        if isinstance(user, User):
+            attrs = inspect(user).attrs
+            if any(getattr(attrs, name).history.has_changes() for name in PRINCIPAL_ATTRIBUTES):
+                user_ids.add(user.id)
+    if user_ids:
+        session.info.setdefault(STALE_PRINCIPALS, set()).update(user_ids)
+
+def invalidate_principals_after_commit(session) -> None:
+    """Session hook dropping the cached principals of the users the committed transaction changed"""
+    for user_id in session.info.pop(STALE_PRINCIPALS, ()):
+        auth_service.invalidate_principal(user_id)
+
+def discard_principal_changes(session) -> None:
+    """Session hook forgetting principal changes that were rolled back"""
+    session.info.pop(STALE_PRINCIPALS, None)
+
+def register_principal_listeners(session=None) -> None:
+    """Drop cached principals whenever the given (default: app) session commits changes to users"""
+    session = session or db.session
+    for name, listener in (('after_flush', mark_principal_changes),
+                           ('after_commit', invalidate_principals_after_commit),
+                           ('after_rollback', discard_principal_changes)):
+        if not event.contains(session, name, listener):
+            event.listen(session, name, listener)
 
 # Create instance for easier imports with default repositories
 auth_service = AuthService()
\ No newline at end of file
@@ -2,9 +2,14 @@
 from app import db
 from datetime import datetime
 import logging
-from typing import Dict, Tuple, Any, Optional, List, TypeVar, Type, Generic, Callable
+from typing import Dict, Tuple, Any, Optional, List, TypeVar, Type, Generic, Callable, Hashable
 from functools import wraps
+from pydantic import BaseModel, ValidationError
+from app.config import Config
 from app.repositories.base_repository import BaseRepository
+from app.repositories.patient_repository import PatientRepository
+from app.utils.error_handlers import format_validation_errors
+from app.utils.response_cache import ResponseCache, response_cache as default_response_cache
 
 # Define a generic type for our models
 T = TypeVar('T')
@@ -16,9 +21,10 @@ logger = logging.getLogger(__name__)
 class BaseService(Generic[T, R]):
     """Base service class with common CRUD operations, error handling, and dependency injection"""
     
-    def __init__(self, repository: R):
-        """Initialize with repository dependency injection"""
+    def __init__(self, repository: R, response_cache: Optional[ResponseCache] = None):
+        """Initialize with repository and response cache dependency injection"""
         self.repository = repository
+        self.response_cache = response_cache or default_response_cache
     
     @staticmethod
     def handle_service_exceptions(func: Callable) -> Callable:
@@ -29,22 +35,22 @@ class BaseService(Generic[T, R]):
                 return func(*args, **kwargs)
             except KeyError as e:
                 error_msg = f"Missing required field: {str(e)}"
-                logger.warning(f"Validation error: {error_msg}")
+                logger.warning("Validation error: %s", error_msg)
                 return {"error": error_msg}, 400
             except ValueError as e:
                 error_msg = f"Invalid data format: {str(e)}"
-                logger.warning(f"Validation error: {error_msg}")
+                logger.warning("Validation error: %s", error_msg)
                 return {"error": error_msg}, 400
             except Exception as e:
                 error_msg = f"Server error: {str(e)}"
-                logger.error(f"Unexpected error in service operation: {error_msg}", exc_info=True)
+                logger.error("Unexpected error in service operation: %s", error_msg, exc_info=True)
                 db.session.rollback()
                 return {"error": error_msg}, 500
         return wrapper
     
     def get_by_id(self, id: int) -> Optional[T]:
         """Get a single record by ID"""
-        logger.debug(f"Fetching record with ID: {id}")
+        logger.debug("Fetching record with ID: %s", id)
         return self.repository.get_by_id(id)
     
     def get_all(self) -> List[T]:
@@ -52,20 +58,87 @@ class BaseService(Generic[T, R]):
         logger.debug("Fetching all records")
         return self.repository.get_all()
     
+    def get_version(self, id: int) -> Optional[int]:
+        """Get the version of a record without loading it"""
+        return self.repository.get_version(id)
+    
+    def get_collection_version(self, **filters) -> Tuple[int, int, int]:
+        """Get a cheap fingerprint of the records matching equality filters"""
+        return self.repository.get_collection_version(**filters)
+    
+    def read_through(self, key: str, version: Hashable, loader: Callable[[], Any], value_type: Any = Any) -> Any:
+        """Serve key from the response cache if it was built from this version, otherwise load and store it"""
+        return self.response_cache.get_or_load(key, version, loader, value_type)
+    
     def create(self, data: Dict[str, Any]) -> Tuple[T, int]:
         """Create a new record"""
-        logger.info(f"Creating new record with data: {data}")
+        logger.debug("Creating new record with data: %s", data)
         try:
             record = self.repository.create(data)
             return record, 201
         except Exception as e:
-            logger.error(f"Error creating record: {str(e)}", exc_info=True)
+            logger.error("Error creating record: %s", e, exc_info=True)
             db.session.rollback()
             raise
     
+    def bulk_create(self, items: Any, create_schema: Type[BaseModel], created_by_id: Optional[int] = None,
+                    prepare: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None) -> Tuple[Dict[str, Any], int]:
+        """
+        Validate a batch of items in one pass and insert the valid ones together
+        
+        Every item gets a result entry in input order: its new ID, or the
+        validation errors that kept it out. Returns 201 when all items were
+        created, 207 for a partial batch and 400 when nothing was created.
+        """
+        if not isinstance(items, list) or not items:
+            return {"error": "Request body must be a non-empty list of items"}, 400
+        if len(items) > Config.BULK_MAX_ITEMS:
+            return {"error": f"Batch of {len(items)} items exceeds the limit of {Config.BULK_MAX_ITEMS}"}, 413
+        
+        results: List[Dict[str, Any]] = [None] * len(items)
+        rows: List[Tuple[int, Dict[str, Any]]] = []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results[index] = {"index": index, "status": 400, "errors": [
+                    {"field": "", "message": "Item must be an object", "type": "dict_type"}]}
+                continue
+            try:
+                row = create_schema(**item).model_dump()
+            except ValidationError as e:
+                results[index] = {"index": index, "status": 400, "errors": format_validation_errors(e.errors())}
+                continue
+            if prepare:
+                row = prepare(row)
+            row['created_by_id'] = created_by_id
+            rows.append((index, row))
+        
+        # One query resolves every referenced patient for the whole batch
+        if rows and 'patient_id' in rows[0][1]:
+            existing = PatientRepository().find_existing_ids(row['patient_id'] for _, row in rows)
+            for index, row in rows:
+                if row['patient_id'] not in existing:
+                    results[index] = {"index": index, "status": 400, "errors": [
+                        {"field": "patient_id", "message": f"Patient {row['patient_id']} not found", "type": "not_found"}]}
+            rows = [(index, row) for index, row in rows if row['patient_id'] in existing]
+        
+        ids = self.repository.bulk_create([row for _, row in rows])
+        for (index, _), record_id in zip(rows, ids):
+            results[index] = {"index": index, "status": 201, "id": record_id}
+        
+        created = len(ids)
+        failed = len(items) - created
+        logger.info("Bulk created %s of %s records (%s failed validation)", created, len(items), failed)
+        status_code = 201 if not failed else (400 if not created else 207)
+        return {"total": len(items), "created": created, "failed": failed, "results": results}, status_code
+    
+    @staticmethod
+    def created_ids(result: Dict[str, Any]) -> List[int]:
+        """IDs of the records created by a bulk_create call"""
+        return [item["id"] for item in result.get("results", []) if item.get("status") == 201]
+    
     def update(self, id: int, data: Dict[str, Any]) -> Tuple[Optional[T], int]:
         """Update a record"""
-        logger.info(f"Updating record {id} with data: {data}")
+        logger.debug("Updating record %s with data: %s", id, data)
         record = self.repository.update(id, data)
         if record:
             return record, 200
@@ -73,7 +146,7 @@ class BaseService(Generic[T, R]):
     
     def delete(self, id: int) -> Tuple[Dict[str, Any], int]:
         """Delete a record"""
-        logger.info(f"Deleting record with ID: {id}")
+        logger.info("Deleting record with ID: %s", id)
         success = self.repository.delete(id)
         if success:
             return {"message": "Record deleted successfully"}, 200
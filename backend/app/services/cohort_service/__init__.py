@@ -0,0 +1,5 @@
+# This file makes the cohort_service directory a Python package
+from app.services.cohort_service.service import (
+    CohortService,
+    cohort_service  # Add the service instance itself
+)
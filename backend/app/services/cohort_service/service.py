@@ -0,0 +1,259 @@
+import hashlib
+import json
+import logging
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional, Tuple, Any
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import and_, or_, not_, exists
+
+from app.config import Config
+from app.models import Patient, Condition, Observation, Procedure
+from app.schemas import (
+    CohortQuery, ConditionCriterion, ObservationCriterion, ProcedureCriterion,
+    AgeCriterion, GenderCriterion
+)
+from app.services.base_service import BaseService
+from app.repositories.patient_repository import PatientRepository
+from app.utils.cache import TTLCache, MISSING
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Leaf criterion types and the schema that validates each of them
+CRITERION_SCHEMAS = {
+    'condition': ConditionCriterion,
+    'observation': ObservationCriterion,
+    'procedure': ProcedureCriterion,
+    'age': AgeCriterion,
+    'gender': GenderCriterion,
+}
+BOOLEAN_OPERATORS = ('and', 'or', 'not')
+
+# Guards against pathological criteria trees
+MAX_CRITERIA_DEPTH = 10
+MAX_CRITERIA_NODES = 100
+
+
+def years_before(day: date, years: int) -> date:
+    """Return the same calendar day a number of years earlier (Feb 29 -> Feb 28)"""
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+class CohortService(BaseService[Patient, PatientRepository]):
+    """Service that compiles cohort criteria trees into a single SQL statement"""
+
+    def __init__(self, repository: Optional[PatientRepository] = None, cache: Optional[TTLCache] = None):
+        """Initialize with repository and result cache using dependency injection"""
+        super().__init__(repository or PatientRepository())
+        self.cache = cache or TTLCache(maxsize=Config.COHORT_CACHE_SIZE, ttl=Config.COHORT_CACHE_TTL)
+
+    def normalize_criteria(self, node: Any, depth: int = 0, counter: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Validate a criteria tree and return its canonical form
+
+        Leaves are validated with their pydantic schema and dumped without
+        defaults; children of and/or nodes are sorted so that equivalent
+        queries share the same hash.
+        """
+        counter = counter if counter is not None else [0]
+        counter[0] += 1
+        if depth > MAX_CRITERIA_DEPTH:
+            raise ValueError(f"criteria tree is nested deeper than {MAX_CRITERIA_DEPTH} levels")
+        if counter[0] > MAX_CRITERIA_NODES:
+            raise ValueError(f"criteria tree has more than {MAX_CRITERIA_NODES} nodes")
+        if not isinstance(node, dict) or len(node) != 1:
+            raise ValueError("each criteria node must be an object with exactly one key")
+
+        key, value = next(iter(node.items()))
+
+        if key in ('and', 'or'):
+            if not isinstance(value, list) or not value:
+                raise ValueError(f"'{key}' must be a non-empty list of criteria")
+            children = [self.normalize_criteria(child, depth + 1, counter) for child in value]
+            children.sort(key=lambda child: json.dumps(child, sort_keys=True))
+            return {key: children}
+
+        if key == 'not':
+            return {'not': self.normalize_criteria(value, depth + 1, counter)}
+
+        if key not in CRITERION_SCHEMAS:
+            allowed = ', '.join(list(BOOLEAN_OPERATORS) + list(CRITERION_SCHEMAS))
+            raise ValueError(f"unknown criterion '{key}', expected one of: {allowed}")
+
+        # Shorthands: {"gender": "female"} and {"gender": ["female", "other"]}
+        if key == 'gender' and isinstance(value, (str, list)):
+            value = {'codes': [value] if isinstance(value, str) else value}
+        if not isinstance(value, dict):
+            raise ValueError(f"'{key}' criterion must be an object")
+
+        criterion = CRITERION_SCHEMAS[key](**value)
+        self._check_criterion(key, criterion)
+        canonical = criterion.model_dump(mode='json', exclude_none=True)
+        if 'codes' in canonical:
+            canonical['codes'] = sorted(set(canonical['codes']))
+        return {key: canonical}
+
+    @staticmethod
+    def _check_criterion(key: str, criterion: BaseModel) -> None:
+        """Cross-field checks that the schemas cannot express on their own"""
+        if key == 'procedure' and not (criterion.code or criterion.codes):
+            raise ValueError("'procedure' criterion requires 'code' or 'codes'")
+        if key == 'observation' and criterion.min_value is not None and criterion.max_value is not None \
+                and criterion.min_value > criterion.max_value:
+            raise ValueError("'observation' min_value must not exceed max_value")
+        if key == 'age':
+            if criterion.min is None and criterion.max is None:
+                raise ValueError("'age' criterion requires 'min' or 'max'")
+            if criterion.min is not None and criterion.max is not None and criterion.min > criterion.max:
+                raise ValueError("'age' min must not exceed max")
+
+    @staticmethod
+    def query_hash(normalized: Dict[str, Any]) -> str:
+        """Stable hash of a normalized criteria tree"""
+        canonical = json.dumps(normalized, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def compile_criteria(self, node: Dict[str, Any], today: Optional[date] = None):
+        """Compile a normalized criteria tree into a SQL boolean expression over Patient"""
+        today = today or date.today()
+        key, value = next(iter(node.items()))
+
+        if key == 'and':
+            return and_(*[self.compile_criteria(child, today) for child in value])
+        if key == 'or':
+            return or_(*[self.compile_criteria(child, today) for child in value])
+        if key == 'not':
+            return not_(self.compile_criteria(value, today))
+        if key == 'condition':
+            return self._condition_exists(value)
+        if key == 'observation':
+            return self._observation_exists(value, today)
+        if key == 'procedure':
+            return self._procedure_exists(value, today)
+        if key == 'age':
+            return self._age_filter(value, today)
+        if key == 'gender':
+            # gender is nullable: without the IS NOT NULL, NOT (gender IN (...)) would drop patients with none
+            return and_(Patient.gender.isnot(None), Patient.gender.in_(value['codes']))
+        raise ValueError(f"unknown criterion '{key}'")
+
+    @staticmethod
+    def _codes(value: Dict[str, Any]) -> List[str]:
+        codes = list(value.get('codes', []))
+        if value.get('code'):
+            codes.append(value['code'])
+        return codes
+
+    def _condition_exists(self, value: Dict[str, Any]):
+        clauses = [Condition.patient_id == Patient.id]
+        codes = self._codes(value)
+        if codes:
+            clauses.append(Condition.condition_code.in_(codes))
+        if 'status' in value:
+            clauses.append(Condition.status == value['status'])
+        if 'onset_after' in value:
+            clauses.append(Condition.onset_date >= date.fromisoformat(value['onset_after']))
+        if 'onset_before' in value:
+            clauses.append(Condition.onset_date <= date.fromisoformat(value['onset_before']))
+        return exists().where(*clauses)
+
+    def _observation_exists(self, value: Dict[str, Any], today: date):
+        clauses = [
+            Observation.patient_id == Patient.id,
+            Observation.observation_code == value['code'],
+        ]
+        if 'min_value' in value:
+            clauses.append(Observation.value_numeric >= value['min_value'])
+        if 'max_value' in value:
+            clauses.append(Observation.value_numeric <= value['max_value'])
+        clauses.extend(self._date_window(Observation.observation_date, value, today))
+        return exists().where(*clauses)
+
+    def _procedure_exists(self, value: Dict[str, Any], today: date):
+        clauses = [
+            Procedure.patient_id == Patient.id,
+            Procedure.procedure_code.in_(self._codes(value)),
+        ]
+        clauses.extend(self._date_window(Procedure.performed_date, value, today))
+        return exists().where(*clauses)
+
+    @staticmethod
+    def _date_window(column, value: Dict[str, Any], today: date) -> List[Any]:
+        clauses = []
+        if 'since' in value:
+            clauses.append(column >= datetime.fromisoformat(value['since']))
+        if 'until' in value:
+            clauses.append(column <= datetime.fromisoformat(value['until']))
+        if 'within_days' in value:
+            start = datetime.combine(today - timedelta(days=value['within_days']), datetime.min.time())
+            clauses.append(column >= start)
+        return clauses
+
+    @staticmethod
+    def _age_filter(value: Dict[str, Any], today: date):
+        # Compare birth_date against cutoff dates so the birth_date index can be used
+        clauses = []
+        if 'min' in value:
+            clauses.append(Patient.birth_date <= years_before(today, value['min']))
+        if 'max' in value:
+            clauses.append(Patient.birth_date > years_before(today, value['max'] + 1))
+        return and_(*clauses)
+
+    def _prepare(self, data: Dict[str, Any]) -> Tuple[CohortQuery, Dict[str, Any], str]:
+        query = CohortQuery.model_validate(data)
+        normalized = self.normalize_criteria(query.criteria)
+        return query, normalized, self.query_hash(normalized)
+
+    @BaseService.handle_service_exceptions
+    def count_patients(self, data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """Count patients matching a cohort query"""
+        try:
+            _, normalized, query_hash = self._prepare(data)
+        except ValidationError as e:
+            logger.warning("Validation error in cohort query: %s", e.errors())
+            return {"error": e.errors()}, 400
+
+        cache_key = ('count', query_hash)
+        count = self.cache.get(cache_key)
+        cached = count is not MISSING
+        if not cached:
+            logger.debug("Counting cohort %s", query_hash[:12])
+            count = self.repository.count_matching(self.compile_criteria(normalized))
+            self.cache.set(cache_key, count)
+
+        logger.info("Cohort %s has %s patients (cached: %s)", query_hash[:12], count, cached)
+        return {"query_hash": query_hash, "count": count, "cached": cached}, 200
+
+    @BaseService.handle_service_exceptions
+    def find_patient_ids(self, data: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+        """Page through IDs of patients matching a cohort query"""
+        try:
+            query, normalized, query_hash = self._prepare(data)
+        except ValidationError as e:
+            logger.warning("Validation error in cohort query: %s", e.errors())
+            return {"error": e.errors()}, 400
+
+        cache_key = ('ids', query_hash, query.after_id, query.limit)
+        patient_ids = self.cache.get(cache_key)
+        cached = patient_ids is not MISSING
+        if not cached:
+            logger.debug("Fetching cohort %s page after ID %s", query_hash[:12], query.after_id)
+            patient_ids = self.repository.find_ids_matching(
+                self.compile_criteria(normalized), after_id=query.after_id, limit=query.limit)
+            self.cache.set(cache_key, patient_ids)
+
+        next_after_id = patient_ids[-1] if len(patient_ids) == query.limit else None
+        return {
+            "query_hash": query_hash,
+            "patient_ids": patient_ids,
+            "after_id": query.after_id,
+            "limit": query.limit,
+            "next_after_id": next_after_id,
+            "cached": cached
+        }, 200
+
+# Create an instance of the service for easier imports with default repository
+cohort_service = CohortService()
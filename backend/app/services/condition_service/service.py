@@ -1,13 +1,15 @@
 import logging
-from typing import Dict, List, Optional, Tuple, Any, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Any, Union
 from pydantic import ValidationError
 
 from app import db
 from app.models import Condition
 from app.schemas import ConditionCreate, ConditionResponse
 from app.services.base_service import BaseService
+from app.utils.fast_json import RowSerializer
+from app.utils.response_cache import ResponseCache, entity_key, collection_key, json_key
 from app.repositories.condition_repository import ConditionRepository
-from app.services.sync_service import trigger_condition_sync
+from app.services.sync_service import trigger_condition_sync, trigger_batch_sync
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -15,16 +17,19 @@ logger = logging.getLogger(__name__)
 class ConditionService(BaseService[Condition, ConditionRepository]):
     """Service for condition-related operations"""
     
-    def __init__(self, repository: Optional[ConditionRepository] = None):
-        """Initialize with repository using dependency injection"""
-        super().__init__(repository or ConditionRepository())
+    # Encodes list responses straight from projected rows
+    row_serializer = RowSerializer(ConditionResponse)
+    
+    def __init__(self, repository: Optional[ConditionRepository] = None, response_cache: Optional[ResponseCache] = None):
+        """Initialize with repository and response cache using dependency injection"""
+        super().__init__(repository or ConditionRepository(), response_cache)
     
     @BaseService.handle_service_exceptions
     def create_condition(self, data: Dict[str, Any]) -> Tuple[Union[Dict[str, Any], ConditionResponse], int]:
         """Create a new condition and trigger sync"""
         try:
             # Log the incoming request
-            logger.info(f"Creating new condition with data: {data}")
+            logger.debug("Creating new condition with data: %s", data)
             
             # Validate incoming data with Pydantic
             condition_data = ConditionCreate(**{k: v for k, v in data.items() 
@@ -41,31 +46,82 @@ class ConditionService(BaseService[Condition, ConditionRepository]):
             condition = self.repository.create(condition_dict)
             
             # Trigger sync
-            logger.info(f"Triggering sync for new condition ID: {condition.id}")
+            logger.info("Triggering sync for new condition ID: %s", condition.id)
             trigger_condition_sync(condition.id)
             
             # Return response using Pydantic model
             return ConditionResponse.model_validate(condition), 201
             
         except ValidationError as e:
-            logger.warning(f"Validation error when creating condition: {e.errors()}")
+            logger.warning("Validation error when creating condition: %s", e.errors())
             return {"error": e.errors()}, 400
     
-    def get_condition_by_id(self, condition_id: int) -> Optional[ConditionResponse]:
-        """Get a single condition by ID"""
-        logger.debug(f"Fetching condition with ID: {condition_id}")
+    @BaseService.handle_service_exceptions
+    def create_conditions_bulk(self, items: Any, created_by_id: Optional[int] = None) -> Tuple[Dict[str, Any], int]:
+        """Create a batch of conditions and trigger one batched sync"""
+        logger.info("Bulk creating %s conditions", len(items) if isinstance(items, list) else 0)
+        result, status_code = self.bulk_create(items, ConditionCreate, created_by_id)
+        
+        if status_code < 400:
+            trigger_batch_sync('condition', self.created_ids(result))
+        return result, status_code
+    
+    def get_condition_by_id(self, condition_id: int, version: Optional[int] = None) -> Optional[ConditionResponse]:
+        """Get a single condition by ID through the response cache; pass version if already looked up"""
+        logger.debug("Fetching condition with ID: %s", condition_id)
+        if version is None:
+            version = self.get_version(condition_id)
+        if version is None:
+            logger.info("Condition with ID %s not found", condition_id)
+            return None
+        return self.read_through(entity_key('condition', condition_id), version,
+                                 lambda: self._load_condition(condition_id), ConditionResponse)
+    
+    def _load_condition(self, condition_id: int) -> Optional[ConditionResponse]:
+        """Build the response for a condition from the database"""
         condition = self.repository.get_by_id(condition_id)
         if not condition:
-            logger.info(f"Condition with ID {condition_id} not found")
+            logger.info("Condition with ID %s not found", condition_id)
             return None
         return ConditionResponse.model_validate(condition)
     
-    def get_conditions_by_patient_id(self, patient_id: int) -> List[ConditionResponse]:
-        """Get all conditions for a specific patient"""
-        logger.debug(f"Fetching conditions for patient ID: {patient_id}")
+    def get_conditions_by_patient_id(self, patient_id: int,
+                                     version: Optional[Tuple[int, int, int]] = None) -> List[ConditionResponse]:
+        """Get all conditions for a specific patient through the response cache; pass version if already looked up"""
+        logger.debug("Fetching conditions for patient ID: %s", patient_id)
+        if version is None:
+            version = self.get_collection_version(patient_id=patient_id)
+        return self.read_through(collection_key('condition', patient_id), version,
+                                 lambda: self._load_patient_conditions(patient_id), List[ConditionResponse])
+    
+    def _load_patient_conditions(self, patient_id: int) -> List[ConditionResponse]:
+        """Build the responses for a patient's conditions from the database"""
         conditions = self.repository.find_by_patient_id(patient_id)
-        logger.info(f"Found {len(conditions)} conditions for patient ID: {patient_id}")
+        logger.info("Found %s conditions for patient ID: %s", len(conditions), patient_id)
         return [ConditionResponse.model_validate(condition) for condition in conditions]
+    
+    def get_conditions_json_by_patient_id(self, patient_id: int, version: Optional[Tuple[int, int, int]] = None,
+                                          fields: Optional[Sequence[str]] = None) -> str:
+        """
+        Get the encoded JSON list of a patient's conditions; pass version if already looked up
+        
+        Full lists go through the response cache. A sparse fieldset selects
+        and encodes only those columns and is not cached.
+        """
+        logger.debug("Fetching conditions JSON for patient ID: %s", patient_id)
+        if fields:
+            return self._dump_patient_conditions(patient_id, fields)
+        if version is None:
+            version = self.get_collection_version(patient_id=patient_id)
+        return self.read_through(json_key(collection_key('condition', patient_id)), version,
+                                 lambda: self._dump_patient_conditions(patient_id), str)
+    
+    def _dump_patient_conditions(self, patient_id: int, fields: Optional[Sequence[str]] = None) -> str:
+        """Encode a patient's conditions (only the given fields, if any) from projected rows"""
+        serializer = self.row_serializer.project(fields)
+        rows = self.repository.find_rows(serializer.fields, patient_id=patient_id)
+        logger.info("Found %s conditions for patient ID: %s", len(rows), patient_id)
+        return serializer.dumps(rows)
 
 # Create an instance of the service for easier imports with default repository
 condition_service = ConditionService()
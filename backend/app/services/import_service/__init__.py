@@ -0,0 +1,7 @@
+# This file makes the import_service directory a Python package
+from app.services.import_service.service import (
+    ImportService,
+    IMPORT_ENTITIES,
+    IMPORT_FORMATS,
+    import_service  # Add the service instance itself
+)
@@ -0,0 +1,256 @@
+import csv
+import hashlib
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from pydantic import ValidationError
+
+from app.config import Config
+from app.models import Patient, Condition, Observation, Procedure, ImportCheckpoint
+from app.schemas import PatientCreate, ConditionCreate, ObservationCreate, ProcedureCreate
+from app.services.base_service import BaseService
+from app.repositories.import_repository import ImportRepository
+from app.utils.error_handlers import format_validation_errors
+from app.utils.observation_values import parse_observation_value
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Importable entities and the model/schema each row is validated against
+IMPORT_ENTITIES = {
+    'patients': (Patient, PatientCreate),
+    'conditions': (Condition, ConditionCreate),
+    'observations': (Observation, ObservationCreate),
+    'procedures': (Procedure, ProcedureCreate),
+}
+IMPORT_FORMATS = ('csv', 'ndjson')
+FORMAT_EXTENSIONS = {'.csv': 'csv', '.ndjson': 'ndjson', '.jsonl': 'ndjson'}
+
+# Column holding the sending site's patient identifier in every file
+PATIENT_KEY_FIELD = 'patient_key'
+
+# Bytes hashed to recognise the same file when resuming
+FINGERPRINT_BYTES = 1024 * 1024
+
+
+def detect_format(path: str, file_format: Optional[str] = None) -> str:
+    """Resolve the file format from an explicit value or the file extension"""
+    if file_format:
+        if file_format not in IMPORT_FORMATS:
+            raise ValueError(f"unknown format '{file_format}', expected one of: {', '.join(IMPORT_FORMATS)}")
+        return file_format
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMAT_EXTENSIONS:
+        raise ValueError(f"cannot infer format from '{extension}', pass csv or ndjson explicitly")
+    return FORMAT_EXTENSIONS[extension]
+
+
+def file_fingerprint(path: str) -> str:
+    """Cheap identity of a file: its size plus a hash of its first megabyte"""
+    digest = hashlib.sha256(str(os.path.getsize(path)).encode('ascii'))
+    with open(path, 'rb') as handle:
+        digest.update(handle.read(FINGERPRINT_BYTES))
+    return digest.hexdigest()
+
+
+def iter_records(path: str, file_format: str, start_offset: int = 0) -> Iterator[Tuple[Any, Optional[str], int]]:
+    """
+    Stream (record, parse error, end offset) tuples from a byte offset
+
+    The file is read line by line in binary mode so the offset after every
+    record is exact and an interrupted import can seek straight back to it.
+    """
+    with open(path, 'rb') as handle:
+        if file_format == 'csv':
+            fieldnames = next(csv.reader([handle.readline().decode('utf-8-sig')]), [])
+            position = [max(start_offset, handle.tell())]
+            handle.seek(position[0])
+
+            def lines():
+                for raw in handle:
+                    position[0] += len(raw)
+                    yield raw.decode('utf-8')
+
+            # csv.reader pulls lines lazily, so position is exact after each row
+            for values in csv.reader(lines()):
+                if not values:
+                    continue
+                if len(values) != len(fieldnames):
+                    yield None, f"expected {len(fieldnames)} columns, found {len(values)}", position[0]
+                    continue
+                yield {name: value if value != '' else None for name, value in zip(fieldnames, values)}, None, position[0]
+        else:
+            handle.seek(start_offset)
+            offset = start_offset
+            for raw in handle:
+                offset += len(raw)
+                line = raw.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield None, f"invalid JSON: {str(e)}", offset
+                    continue
+                if not isinstance(record, dict):
+                    yield None, "each line must be a JSON object", offset
+                    continue
+                yield record, None, offset
+
+
+class ImportService(BaseService[ImportCheckpoint, ImportRepository]):
+    """Service for resumable, streamed bulk imports of registry data"""
+
+    def __init__(self, repository: Optional[ImportRepository] = None):
+        """Initialize with repository using dependency injection"""
+        super().__init__(repository or ImportRepository())
+
+    def import_file(self, entity: str, path: str, source: str, file_format: Optional[str] = None,
+                    batch_size: Optional[int] = None, restart: bool = False, rejects_path: Optional[str] = None,
+                    progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Import a CSV or NDJSON file of one entity type
+
+        Rows are validated with the create schemas and written in batches; each
+        batch commits together with the checkpoint, so re-running the same
+        command after a failure continues after the last committed batch.
+        Patients are referenced through the source's `patient_key` column.
+        """
+        if entity not in IMPORT_ENTITIES:
+            raise ValueError(f"unknown entity '{entity}', expected one of: {', '.join(IMPORT_ENTITIES)}")
+        file_format = detect_format(path, file_format)
+        batch_size = batch_size or Config.IMPORT_BATCH_SIZE
+        fingerprint = file_fingerprint(path)
+
+        checkpoint = self.repository.get_checkpoint(source, entity)
+        if checkpoint is not None and not restart:
+            if checkpoint.file_fingerprint != fingerprint:
+                raise ValueError(f"the {entity} import for '{source}' was started from a different file; "
+                                 f"use restart to import this file from the beginning")
+            if checkpoint.completed_at:
+                logger.info("%s import for '%s' already completed", entity, source)
+                return self._summary(checkpoint, 0, 0.0, resumed=False)
+        else:
+            checkpoint = self.repository.start_checkpoint(source, entity, os.path.basename(path), fingerprint)
+
+        resumed = checkpoint.byte_offset > 0
+        if resumed:
+            logger.info("Resuming %s import for '%s' at row %s", entity, source, checkpoint.rows_read + 1)
+
+        patient_keys = self.repository.load_patient_keys(source)
+        started = time.monotonic()
+        rows_this_run = 0
+        batch: List[Tuple[Any, Optional[str]]] = []
+        end_offset = checkpoint.byte_offset
+
+        rejects = open(rejects_path, 'a', encoding='utf-8') if rejects_path else None
+        try:
+            for record, error, end_offset in iter_records(path, file_format, checkpoint.byte_offset):
+                batch.append((record, error))
+                if len(batch) >= batch_size:
+                    rows_this_run += self._import_batch(entity, source, batch, end_offset, checkpoint, patient_keys, rejects)
+                    batch = []
+                    if progress:
+                        progress(self._summary(checkpoint, rows_this_run, time.monotonic() - started, resumed))
+            if batch:
+                rows_this_run += self._import_batch(entity, source, batch, end_offset, checkpoint, patient_keys, rejects)
+
+            checkpoint.completed_at = datetime.utcnow()
+            self.repository.commit()
+        finally:
+            if rejects:
+                rejects.close()
+
+        summary = self._summary(checkpoint, rows_this_run, time.monotonic() - started, resumed)
+        logger.info("Imported %s %s for '%s' (%s rejected, %s rows/s)", checkpoint.rows_imported, entity, source,
+                    checkpoint.rows_rejected, summary['rows_per_second'])
+        return summary
+
+    def _import_batch(self, entity: str, source: str, batch: List[Tuple[Any, Optional[str]]], end_offset: int,
+                      checkpoint: ImportCheckpoint, patient_keys: Dict[str, int], rejects) -> int:
+        """Validate and insert one batch, committing it together with the checkpoint"""
+        model_class, schema = IMPORT_ENTITIES[entity]
+        first_row = checkpoint.rows_read + 1
+        rows: List[Dict[str, Any]] = []
+        new_keys: Dict[str, None] = {}  # ordered like rows, O(1) duplicate checks
+        rejected: List[Dict[str, Any]] = []
+
+        for row_number, (record, error) in enumerate(batch, start=first_row):
+            if error:
+                rejected.append({'row': row_number, 'errors': [{'field': '', 'message': error, 'type': 'parse_error'}]})
+                continue
+            row, errors = self._validate(entity, schema, dict(record), patient_keys, new_keys)
+            if errors:
+                rejected.append({'row': row_number, 'errors': errors, 'record': record})
+            else:
+                rows.append(row)
+
+        try:
+            ids = self.repository.insert_batch(model_class, rows, return_ids=entity == 'patients')
+            if entity == 'patients':
+                self.repository.add_patient_keys(source, dict(zip(new_keys, ids)))
+            checkpoint.byte_offset = end_offset
+            checkpoint.rows_read += len(batch)
+            checkpoint.rows_imported += len(rows)
+            checkpoint.rows_rejected += len(rejected)
+            self.repository.commit()
+        except Exception:
+            logger.error("Failed to import %s rows %s-%s", entity, first_row, first_row + len(batch) - 1, exc_info=True)
+            self.repository.rollback()
+            raise
+
+        if entity == 'patients':
+            patient_keys.update(zip(new_keys, ids))
+        if rejects:
+            for rejection in rejected:
+                rejects.write(json.dumps(rejection, default=str) + '\n')
+        return len(batch)
+
+    @staticmethod
+    def _validate(entity: str, schema, record: Dict[str, Any], patient_keys: Dict[str, int],
+                  new_keys: Dict[str, None]) -> Tuple[Optional[Dict[str, Any]], Optional[List[Dict[str, Any]]]]:
+        """Validate one record, resolving its patient key; returns (row, None) or (None, errors)"""
+        key = record.pop(PATIENT_KEY_FIELD, None)
+        key = str(key) if key is not None else None
+        if not key:
+            return None, [{'field': PATIENT_KEY_FIELD, 'message': 'Field required', 'type': 'missing'}]
+
+        if entity == 'patients':
+            if key in patient_keys or key in new_keys:
+                return None, [{'field': PATIENT_KEY_FIELD, 'message': f"Duplicate patient key {key}", 'type': 'duplicate'}]
+        else:
+            if key not in patient_keys:
+                return None, [{'field': PATIENT_KEY_FIELD, 'message': f"Unknown patient key {key}", 'type': 'not_found'}]
+            record['patient_id'] = patient_keys[key]
+
+        try:
+            row = schema(**record).model_dump()
+        except ValidationError as e:
+            return None, format_validation_errors(e.errors())
+
+        if entity == 'patients':
+            new_keys[key] = None
+        if entity == 'observations':
+            row.update(parse_observation_value(row['value'], row.get('unit')))
+        return row, None
+
+    @staticmethod
+    def _summary(checkpoint: ImportCheckpoint, rows_this_run: int, elapsed: float, resumed: bool) -> Dict[str, Any]:
+        return {
+            'source': checkpoint.source,
+            'entity': checkpoint.entity,
+            'file': checkpoint.file_name,
+            'rows_read': checkpoint.rows_read,
+            'rows_imported': checkpoint.rows_imported,
+            'rows_rejected': checkpoint.rows_rejected,
+            'completed': checkpoint.completed_at is not None,
+            'resumed': resumed,
+            'elapsed_seconds': round(elapsed, 2),
+            'rows_per_second': round(rows_this_run / elapsed) if elapsed > 0 else 0,
+        }
+
+# Create an instance of the service for easier imports with default repository
+import_service = ImportService()
@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, List, Optional, Tuple, Any, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Any, Union
 from pydantic import ValidationError
 
 from app import db
@@ -7,6 +7,10 @@ from app.models import Observation
 from app.schemas import ObservationCreate, ObservationResponse
 from app.repositories.observation_repository import ObservationRepository
 from app.services.base_service import BaseService
+from app.utils.fast_json import RowSerializer
+from app.utils.response_cache import ResponseCache, entity_key, collection_key, json_key
+from app.services.sync_service import trigger_batch_sync
+from app.utils.observation_values import parse_observation_value
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -14,16 +18,19 @@ logger = logging.getLogger(__name__)
 class ObservationService(BaseService[Observation, ObservationRepository]):
     """Service for observation-related operations"""
     
-    def __init__(self, repository: Optional[ObservationRepository] = None):
-        """Initialize with repository using dependency injection"""
-        super().__init__(repository or ObservationRepository())
+    # Encodes list responses straight from projected rows
+    row_serializer = RowSerializer(ObservationResponse)
+    
+    def __init__(self, repository: Optional[ObservationRepository] = None, response_cache: Optional[ResponseCache] = None):
+        """Initialize with repository and response cache using dependency injection"""
+        super().__init__(repository or ObservationRepository(), response_cache)
     
     @BaseService.handle_service_exceptions
     def create_observation(self, data: Dict[str, Any]) -> Tuple[Union[Dict[str, Any], ObservationResponse], int]:
         """Create a new observation and trigger sync"""
         try:
             # Log the incoming request
-            logger.info(f"Creating new observation with data: {data}")
+            logger.debug("Creating new observation with data: %s", data)
             
             # Using ** unpacking for more direct validation instead of filtering
             observation_data = ObservationCreate(**data)
@@ -31,40 +38,124 @@ class ObservationService(BaseService[Observation, ObservationRepository]):
             # Convert validated data to dict for repository
             observation_dict = observation_data.model_dump()
             
+            # Store the typed value and normalized unit next to the original text
+            observation_dict = self._with_typed_value(observation_dict)
+            
             # Add creator if present in original data
             if 'created_by_id' in data:
                 observation_dict['created_by_id'] = data['created_by_id']
-                logger.debug(f"Setting creator ID to {data['created_by_id']}")
+                logger.debug("Setting creator ID to %s", data['created_by_id'])
             
             # Use repository to create observation
             observation = self.repository.create(observation_dict)
             
             # Note: Sync functionality would be implemented here
             # For now, just log that we would sync in the future
-            logger.info(f"Would trigger sync for new observation ID: {observation.id} in a real implementation")
+            logger.info("Would trigger sync for new observation ID: %s in a real implementation", observation.id)
             
             # Return response using Pydantic model
             return ObservationResponse.model_validate(observation), 201
             
         except ValidationError as e:
-            logger.warning(f"Validation error when creating observation: {e.errors()}")
+            logger.warning("Validation error when creating observation: %s", e.errors())
             return {"error": e.errors()}, 400
     
-    def get_observation_by_id(self, observation_id: int) -> Optional[ObservationResponse]:
-        """Get a single observation by ID"""
-        logger.debug(f"Fetching observation with ID: {observation_id}")
+    @BaseService.handle_service_exceptions
+    def create_observations_bulk(self, items: Any, created_by_id: Optional[int] = None) -> Tuple[Dict[str, Any], int]:
+        """Create a batch of observations and trigger one batched sync"""
+        logger.info("Bulk creating %s observations", len(items) if isinstance(items, list) else 0)
+        result, status_code = self.bulk_create(items, ObservationCreate, created_by_id, prepare=self._with_typed_value)
+        
+        if status_code < 400:
+            trigger_batch_sync('observation', self.created_ids(result))
+        return result, status_code
+    
+    @staticmethod
+    def _with_typed_value(observation_dict: Dict[str, Any]) -> Dict[str, Any]:
+        observation_dict.update(parse_observation_value(observation_dict['value'], observation_dict.get('unit')))
+        return observation_dict
+    
+    def get_observation_by_id(self, observation_id: int, version: Optional[int] = None) -> Optional[ObservationResponse]:
+        """Get a single observation by ID through the response cache; pass version if already looked up"""
+        logger.debug("Fetching observation with ID: %s", observation_id)
+        if version is None:
+            version = self.get_version(observation_id)
+        if version is None:
+            logger.info("Observation with ID %s not found", observation_id)
+            return None
+        return self.read_through(entity_key('observation', observation_id), version,
+                                 lambda: self._load_observation(observation_id), ObservationResponse)
+    
+    def _load_observation(self, observation_id: int) -> Optional[ObservationResponse]:
+        """Build the response for an observation from the database"""
         observation = self.repository.get_by_id(observation_id)
         if not observation:
-            logger.info(f"Observation with ID {observation_id} not found")
+            logger.info("Observation with ID %s not found", observation_id)
             return None
         return ObservationResponse.model_validate(observation)
     
-    def get_observations_by_patient_id(self, patient_id: int) -> List[ObservationResponse]:
-        """Get all observations for a specific patient"""
-        logger.debug(f"Fetching observations for patient ID: {patient_id}")
+    def get_observations_by_patient_id(self, patient_id: int,
+                                       version: Optional[Tuple[int, int, int]] = None) -> List[ObservationResponse]:
+        """Get all observations for a specific patient through the response cache; pass version if already looked up"""
+        logger.debug("Fetching observations for patient ID: %s", patient_id)
+        if version is None:
+            version = self.get_collection_version(patient_id=patient_id)
+        return self.read_through(collection_key('observation', patient_id), version,
+                                 lambda: self._load_patient_observations(patient_id), List[ObservationResponse])
+    
+    def _load_patient_observations(self, patient_id: int) -> List[ObservationResponse]:
+        """Build the responses for a patient's observations from the database"""
         observations = self.repository.find_by_patient_id(patient_id)
-        logger.info(f"Found {len(observations)} observations for patient ID: {patient_id}")
+        logger.info("Found %s observations for patient ID: %s", len(observations), patient_id)
         return [ObservationResponse.model_validate(observation) for observation in observations]
+    
+    def get_observations_json_by_patient_id(self, patient_id: int, version: Optional[Tuple[int, int, int]] = None,
+                                            fields: Optional[Sequence[str]] = None) -> str:
+        """
+        Get the encoded JSON list of a patient's observations; pass version if already looked up
+        
+        Full lists go through the response cache. A sparse fieldset selects
+        and encodes only those columns and is not cached.
+        """
+        logger.debug("Fetching observations JSON for patient ID: %s", patient_id)
+        if fields:
+            return self._dump_patient_observations(patient_id, fields)
+        if version is None:
+            version = self.get_collection_version(patient_id=patient_id)
+        return self.read_through(json_key(collection_key('observation', patient_id)), version,
+                                 lambda: self._dump_patient_observations(patient_id), str)
+    
+    def _dump_patient_observations(self, patient_id: int, fields: Optional[Sequence[str]] = None) -> str:
+        """Encode a patient's observations (only the given fields, if any) from projected rows"""
+        serializer = self.row_serializer.project(fields)
+        rows = self.repository.find_rows(serializer.fields, patient_id=patient_id)
+        logger.info("Found %s observations for patient ID: %s", len(rows), patient_id)
+        return serializer.dumps(rows)
+
+    def find_observations_by_value_range(self, code: str, min_value: Optional[float] = None,
+                                         max_value: Optional[float] = None,
+                                         patient_id: Optional[int] = None) -> List[ObservationResponse]:
+        """Find numeric observations for a code within a value range"""
+        logger.debug("Fetching observations with code %s in range [%s, %s]", code, min_value, max_value)
+        observations = self.repository.find_by_value_range(code, min_value, max_value, patient_id)
+        logger.info("Found %s observations with code %s in range", len(observations), code)
+        return [ObservationResponse.model_validate(observation) for observation in observations]
+    
+    def find_observations_json_by_value_range(self, code: str, min_value: Optional[float] = None,
+                                              max_value: Optional[float] = None,
+                                              patient_id: Optional[int] = None,
+                                              fields: Optional[Sequence[str]] = None) -> str:
+        """Encode the numeric observations for a code within a value range (only the given fields, if any)"""
+        logger.debug("Fetching observation rows with code %s in range [%s, %s]", code, min_value, max_value)
+        serializer = self.row_serializer.project(fields)
+        rows = self.repository.find_rows_by_value_range(serializer.fields, code, min_value, max_value, patient_id)
+        logger.info("Found %s observations with code %s in range", len(rows), code)
+        return serializer.dumps(rows)
+    
+    def summarize_observations_by_code(self, code: str) -> Dict[str, Any]:
+        """Get count/min/max/mean of numeric values for an observation code"""
+        logger.debug("Summarizing observations with code: %s", code)
+        return self.repository.summarize_by_code(code)
 
 # Create an instance of the service for easier imports with default repository
 observation_service = ObservationService()
@@ -1,11 +1,13 @@
 import logging
-from typing import Dict, List, Optional, Tuple, Any, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Any, Union
 from pydantic import ValidationError
 
 from app import db
 from app.models import Patient
 from app.schemas import PatientCreate, PatientResponse
 from app.services.base_service import BaseService
+from app.utils.fast_json import RowSerializer
+from app.utils.response_cache import ResponseCache, entity_key
 from app.repositories.patient_repository import PatientRepository
 from app.services.sync_service import trigger_patient_sync
 
@@ -15,16 +17,19 @@ logger = logging.getLogger(__name__)
 class PatientService(BaseService[Patient, PatientRepository]):
     """Service for patient-related operations"""
     
-    def __init__(self, repository: Optional[PatientRepository] = None):
-        """Initialize with repository using dependency injection"""
-        super().__init__(repository or PatientRepository())
+    # Encodes list responses straight from projected rows
+    row_serializer = RowSerializer(PatientResponse)
+    
+    def __init__(self, repository: Optional[PatientRepository] = None, response_cache: Optional[ResponseCache] = None):
+        """Initialize with repository and response cache using dependency injection"""
+        super().__init__(repository or PatientRepository(), response_cache)
     
     @BaseService.handle_service_exceptions
     def create_patient(self, data: Dict[str, Any]) -> Tuple[Union[Dict[str, Any], PatientResponse], int]:
         """Create a new patient and trigger sync"""
         try:
             # Log the incoming request
-            logger.info(f"Creating new patient with data: {data}")
+            logger.debug("Creating new patient with data: %s", data)
             
             # Validate incoming data with Pydantic
             patient_data = PatientCreate(**{k: v for k, v in data.items() if k in ['name', 'birth_date', 'gender']})
@@ -40,14 +45,14 @@ class PatientService(BaseService[Patient, PatientRepository]):
             patient = self.repository.create(patient_dict)
             
             # Trigger sync
-            logger.info(f"Triggering sync for new patient ID: {patient.id}")
+            logger.info("Triggering sync for new patient ID: %s", patient.id)
             trigger_patient_sync(patient.id)
             
             # Return response using Pydantic model
             return PatientResponse.model_validate(patient), 201
             
         except ValidationError as e:
-            logger.warning(f"Validation error when creating patient: {e.errors()}")
+            logger.warning("Validation error when creating patient: %s", e.errors())
             return {"error": e.errors()}, 400
     
     def get_all_patients(self) -> List[PatientResponse]:
@@ -56,21 +61,45 @@ class PatientService(BaseService[Patient, PatientRepository]):
         patients = self.repository.get_all()
         return [PatientResponse.model_validate(patient) for patient in patients]
     
-    def get_patient_by_id(self, patient_id: int) -> Optional[PatientResponse]:
-        """Get a single patient by ID"""
-        logger.debug(f"Fetching patient with ID: {patient_id}")
+    def get_all_patients_json(self, fields: Optional[Sequence[str]] = None) -> str:
+        """Encode every patient (only the given fields, if any) as the JSON list response from projected rows"""
+        logger.debug("Fetching all patient rows")
+        serializer = self.row_serializer.project(fields)
+        return serializer.dumps(self.repository.find_rows(serializer.fields))
+    
+    def get_patient_by_id(self, patient_id: int, version: Optional[int] = None) -> Optional[PatientResponse]:
+        """Get a single patient by ID through the response cache; pass version if already looked up"""
+        logger.debug("Fetching patient with ID: %s", patient_id)
+        if version is None:
+            version = self.get_version(patient_id)
+        if version is None:
+            logger.info("Patient with ID %s not found", patient_id)
+            return None
+        return self.read_through(entity_key('patient', patient_id), version,
+                                 lambda: self._load_patient(patient_id), PatientResponse)
+    
+    def _load_patient(self, patient_id: int) -> Optional[PatientResponse]:
+        """Build the response for a patient from the database"""
         patient = self.repository.get_by_id(patient_id)
         if not patient:
-            logger.info(f"Patient with ID {patient_id} not found")
+            logger.info("Patient with ID %s not found", patient_id)
             return None
         return PatientResponse.model_validate(patient)
     
     def find_patients_by_name(self, name: str) -> List[PatientResponse]:
         """Find patients by name"""
-        logger.debug(f"Searching for patients with name containing: {name}")
+        logger.debug("Searching for patients by name")
         patients = self.repository.find_by_name(name)
-        logger.info(f"Found {len(patients)} patients matching name query: {name}")
+        logger.info("Found %s patients matching name query", len(patients))
         return [PatientResponse.model_validate(patient) for patient in patients]
+    
+    def find_patients_json_by_name(self, name: str, fields: Optional[Sequence[str]] = None) -> str:
+        """Encode the patients matching a name (only the given fields, if any) from projected rows"""
+        logger.debug("Searching for patient rows by name")
+        serializer = self.row_serializer.project(fields)
+        rows = self.repository.find_rows_by_name(name, serializer.fields)
+        logger.info("Found %s patients matching name query", len(rows))
+        return serializer.dumps(rows)
 
 # Create an instance of the service for easier imports with default repository
 patient_service = PatientService()
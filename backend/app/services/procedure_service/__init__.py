@@ -1,3 +1,3 @@
-from .service import ProcedureService
+from .service import ProcedureService, procedure_service
 
-__all__ = ['ProcedureService']
\ No newline at end of file
+__all__ = ['ProcedureService', 'procedure_service']
\ No newline at end of file
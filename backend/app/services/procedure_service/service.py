@@ -1,5 +1,5 @@
 import logging
-from typing import Dict, List, Optional, Tuple, Any, Union
+from typing import Dict, List, Optional, Sequence, Tuple, Any, Union
 from pydantic import ValidationError
 
 from app import db
@@ -7,6 +7,9 @@ from app.models import Procedure
 from app.schemas import ProcedureCreate, ProcedureResponse
 from app.repositories.procedure_repository import ProcedureRepository
 from app.services.base_service import BaseService
+from app.utils.fast_json import RowSerializer
+from app.utils.response_cache import ResponseCache, entity_key, collection_key, json_key
+from app.services.sync_service import trigger_batch_sync
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -14,16 +17,19 @@ logger = logging.getLogger(__name__)
 class ProcedureService(BaseService[Procedure, ProcedureRepository]):
     """Service for procedure-related operations"""
     
-    def __init__(self, repository: Optional[ProcedureRepository] = None):
-        """Initialize with repository using dependency injection"""
-        super().__init__(repository or ProcedureRepository())
+    # Encodes list responses straight from projected rows
+    row_serializer = RowSerializer(ProcedureResponse)
+    
+    def __init__(self, repository: Optional[ProcedureRepository] = None, response_cache: Optional[ResponseCache] = None):
+        """Initialize with repository and response cache using dependency injection"""
+        super().__init__(repository or ProcedureRepository(), response_cache)
     
     @BaseService.handle_service_exceptions
     def create_procedure(self, data: Dict[str, Any]) -> Tuple[Union[Dict[str, Any], ProcedureResponse], int]:
         """Create a new procedure and trigger sync"""
         try:
             # Log the incoming request
-            logger.info(f"Creating new procedure with data: {data}")
+            logger.debug("Creating new procedure with data: %s", data)
             
             # Using ** unpacking for more direct validation
             procedure_data = ProcedureCreate(**data)
@@ -34,37 +40,88 @@ class ProcedureService(BaseService[Procedure, ProcedureRepository]):
             # Add creator if present in original data
             if 'created_by_id' in data:
                 procedure_dict['created_by_id'] = data['created_by_id']
-                logger.debug(f"Setting creator ID to {data['created_by_id']}")
+                logger.debug("Setting creator ID to %s", data['created_by_id'])
             
             # Use repository to create procedure
             procedure = self.repository.create(procedure_dict)
             
             # Note: Sync functionality would be implemented here
             # For now, just log that we would sync in the future
-            logger.info(f"Would trigger sync for new procedure ID: {procedure.id} in a real implementation")
+            logger.info("Would trigger sync for new procedure ID: %s in a real implementation", procedure.id)
             
             # Return response using Pydantic model
             return ProcedureResponse.model_validate(procedure), 201
             
         except ValidationError as e:
-            logger.warning(f"Validation error when creating procedure: {e.errors()}")
+            logger.warning("Validation error when creating procedure: %s", e.errors())
             return {"error": e.errors()}, 400
     
-    def get_procedure_by_id(self, procedure_id: int) -> Optional[ProcedureResponse]:
-        """Get a single procedure by ID"""
-        logger.debug(f"Fetching procedure with ID: {procedure_id}")
+    @BaseService.handle_service_exceptions
+    def create_procedures_bulk(self, items: Any, created_by_id: Optional[int] = None) -> Tuple[Dict[str, Any], int]:
+        """Create a batch of procedures and trigger one batched sync"""
+        logger.info("Bulk creating %s procedures", len(items) if isinstance(items, list) else 0)
+        result, status_code = self.bulk_create(items, ProcedureCreate, created_by_id)
+        
+        if status_code < 400:
+            trigger_batch_sync('procedure', self.created_ids(result))
+        return result, status_code
+    
+    def get_procedure_by_id(self, procedure_id: int, version: Optional[int] = None) -> Optional[ProcedureResponse]:
+        """Get a single procedure by ID through the response cache; pass version if already looked up"""
+        logger.debug("Fetching procedure with ID: %s", procedure_id)
+        if version is None:
+            version = self.get_version(procedure_id)
+        if version is None:
+            logger.info("Procedure with ID %s not found", procedure_id)
+            return None
+        return self.read_through(entity_key('procedure', procedure_id), version,
+                                 lambda: self._load_procedure(procedure_id), ProcedureResponse)
+    
+    def _load_procedure(self, procedure_id: int) -> Optional[ProcedureResponse]:
+        """Build the response for a procedure from the database"""
         procedure = self.repository.get_by_id(procedure_id)
         if not procedure:
-            logger.info(f"Procedure with ID {procedure_id} not found")
+            logger.info("Procedure with ID %s not found", procedure_id)
             return None
         return ProcedureResponse.model_validate(procedure)
     
-    def get_procedures_by_patient_id(self, patient_id: int) -> List[ProcedureResponse]:
-        """Get all procedures for a specific patient"""
-        logger.debug(f"Fetching procedures for patient ID: {patient_id}")
+    def get_procedures_by_patient_id(self, patient_id: int,
+                                     version: Optional[Tuple[int, int, int]] = None) -> List[ProcedureResponse]:
+        """Get all procedures for a specific patient through the response cache; pass version if already looked up"""
+        logger.debug("Fetching procedures for patient ID: %s", patient_id)
+        if version is None:
+            version = self.get_collection_version(patient_id=patient_id)
+        return self.read_through(collection_key('procedure', patient_id), version,
+                                 lambda: self._load_patient_procedures(patient_id), List[ProcedureResponse])
+    
+    def _load_patient_procedures(self, patient_id: int) -> List[ProcedureResponse]:
+        """Build the responses for a patient's procedures from the database"""
         procedures = self.repository.find_by_patient_id(patient_id)
-        logger.info(f"Found {len(procedures)} procedures for patient ID: {patient_id}")
+        logger.info("Found %s procedures for patient ID: %s", len(procedures), patient_id)
         return [ProcedureResponse.model_validate(procedure) for procedure in procedures]
+    
+    def get_procedures_json_by_patient_id(self, patient_id: int, version: Optional[Tuple[int, int, int]] = None,
+                                          fields: Optional[Sequence[str]] = None) -> str:
+        """
+        Get the encoded JSON list of a patient's procedures; pass version if already looked up
+        
+        Full lists go through the response cache. A sparse fieldset selects
+        and encodes only those columns and is not cached.
+        """
+        logger.debug("Fetching procedures JSON for patient ID: %s", patient_id)
+        if fields:
+            return self._dump_patient_procedures(patient_id, fields)
+        if version is None:
+            version = self.get_collection_version(patient_id=patient_id)
+        return self.read_through(json_key(collection_key('procedure', patient_id)), version,
+                                 lambda: self._dump_patient_procedures(patient_id), str)
+    
+    def _dump_patient_procedures(self, patient_id: int, fields: Optional[Sequence[str]] = None) -> str:
+        """Encode a patient's procedures (only the given fields, if any) from projected rows"""
+        serializer = self.row_serializer.project(fields)
+        rows = self.repository.find_rows(serializer.fields, patient_id=patient_id)
+        logger.info("Found %s procedures for patient ID: %s", len(rows), patient_id)
+        return serializer.dumps(rows)
 
 # Create an instance of the service for easier imports with default repository
 procedure_service = ProcedureService()
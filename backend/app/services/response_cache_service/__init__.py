@@ -0,0 +1,6 @@
+# This file makes the response_cache_service directory a Python package
+from app.services.response_cache_service.service import (
+    CACHED_ENTITIES,
+    cache_keys_for,
+    register_response_cache_listeners
+)
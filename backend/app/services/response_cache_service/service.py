@@ -0,0 +1,94 @@
+import logging
+from typing import Set
+from sqlalchemy import event, inspect
+
+from app import db
+from app.models import Patient, Condition, Observation, Procedure
+from app.utils.response_cache import response_cache, entity_key, collection_key, json_key
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Models whose service responses are cached -> entity name used in cache keys
+CACHED_ENTITIES = {
+    Patient: 'patient',
+    Condition: 'condition',
+    Observation: 'observation',
+    Procedure: 'procedure',
+}
+
+# Session.info key collecting the cache keys written by the current transaction
+STALE_CACHE_KEYS = 'stale_response_cache_keys'
+
+
+def collection_keys(entity: str, patient_id: int) -> Set[str]:
+    """Cache keys of a patient's list of one entity: the responses and their encoded JSON body"""
+    key = collection_key(entity, patient_id)
+    return {key, json_key(key)}
+
+
+def cache_keys_for(obj) -> Set[str]:
+    """Cache keys affected by writing an object: its own entry and its patient's list (old and new patient)"""
+    entity = CACHED_ENTITIES[type(obj)]
+    keys = {entity_key(entity, obj.id)} if obj.id is not None else set()
+    if entity != 'patient':
+        history = inspect(obj).attrs.patient_id.history
+        for patient_id in list(history.deleted) + [obj.patient_id]:
+            if patient_id is not None:
+                keys |= collection_keys(entity, patient_id)
+    return keys
+
+
+def mark_cached_entity_changes(session, flush_context) -> None:
+    """Session hook recording the cache keys of every cached entity written in a flush"""
+    keys = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if type(obj) in CACHED_ENTITIES:
+            keys |= cache_keys_for(obj)
+    if keys:
+        session.info.setdefault(STALE_CACHE_KEYS, set()).update(keys)
+
+
+def mark_cached_bulk_inserts(orm_execute_state) -> None:
+    """
+    Session hook for ORM bulk inserts (session.execute(insert(Model), rows))
+
+    These bypass the unit of work, so the patients' list keys are taken from
+    the parameter rows; the new records themselves have no entries yet.
+    """
+    if not orm_execute_state.is_insert or orm_execute_state.bind_mapper is None:
+        return
+    entity = CACHED_ENTITIES.get(orm_execute_state.bind_mapper.class_)
+    rows = orm_execute_state.parameters
+    if entity is None or entity == 'patient' or not rows:
+        return
+    if isinstance(rows, dict):
+        rows = [rows]
+    keys = set()
+    for patient_id in {row.get('patient_id') for row in rows} - {None}:
+        keys |= collection_keys(entity, patient_id)
+    if keys:
+        orm_execute_state.session.info.setdefault(STALE_CACHE_KEYS, set()).update(keys)
+
+
+def invalidate_response_cache_after_commit(session) -> None:
+    """Session hook deleting the cache entries of everything the committed transaction wrote"""
+    keys = session.info.pop(STALE_CACHE_KEYS, None)
+    if keys:
+        response_cache.invalidate(keys)
+
+
+def discard_response_cache_changes(session) -> None:
+    """Session hook forgetting cache keys of writes that were rolled back"""
+    session.info.pop(STALE_CACHE_KEYS, None)
+
+
+def register_response_cache_listeners(session=None) -> None:
+    """Invalidate cached responses whenever the given (default: app) session commits writes to cached entities"""
+    session = session or db.session
+    for name, listener in (('after_flush', mark_cached_entity_changes),
+                           ('do_orm_execute', mark_cached_bulk_inserts),
+                           ('after_commit', invalidate_response_cache_after_commit),
+                           ('after_rollback', discard_response_cache_changes)):
+        if not event.contains(session, name, listener):
+            event.listen(session, name, listener)
@@ -0,0 +1,6 @@
+# This file makes the seed_service directory a Python package
+from app.services.seed_service.service import (
+    SeedService,
+    reference_data_fingerprint,
+    seed_service  # Add the service instance itself
+)
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import db
+from app.models import SeedFingerprint, User, Role, Gender, ConditionStatus, NeurologicalCondition, SyncStatus
+from app.services.base_service import BaseService
+from app.repositories.seed_repository import SeedRepository
+from app.value_sets.roles import get_all_roles
+from app.value_sets.genders import get_all_genders
+from app.value_sets.condition_statuses import get_all_condition_statuses
+from app.value_sets.neurological_conditions import get_all_neurological_conditions
+from app.value_sets.sync_statuses import get_all_sync_statuses
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Reference tables seeded from app/value_sets: (model, unique key, definitions); roles first for the demo users
+REFERENCE_DATA = [
+    (Role, 'name', get_all_roles),
+    (SyncStatus, 'code', get_all_sync_statuses),
+    (Gender, 'code', get_all_genders),
+    (ConditionStatus, 'code', get_all_condition_statuses),
+    (NeurologicalCondition, 'code', get_all_neurological_conditions),
+]
+
+# Name of the fingerprint row covering everything seeded here
+SEED_NAME = 'reference_data'
+
+
+def get_demo_users() -> List[Dict[str, Any]]:
+    """Demo users created on first seed (the admin's credentials can be set through the environment)"""
+    return [
+        {
+            'username': os.environ.get('DEFAULT_ADMIN_USERNAME', 'admin'),
+            'password': os.environ.get('DEFAULT_ADMIN_PASSWORD', 'password'),
+            'email': os.environ.get('DEFAULT_ADMIN_EMAIL', 'admin@example.com'),
+            'first_name': 'Default',
+            'last_name': 'Admin',
+            'role_name': 'admin'
+        },
+        {
+            'username': 'researcher',
+            'password': 'research',
+            'email': 'researcher@example.com',
+            'first_name': 'Demo',
+            'last_name': 'Researcher',
+            'role_name': 'researcher'
+        },
+        {
+            'username': 'clinician',
+            'password': 'clinic',
+            'email': 'clinician@example.com',
+            'first_name': 'Demo',
+            'last_name': 'Clinician',
+            'role_name': 'clinician'
+        }
+    ]
+
+
+def reference_data_fingerprint() -> str:
+    """SHA-256 over every seed definition (demo user passwords excluded)"""
+    definitions = {model.__tablename__: loader() for model, _, loader in REFERENCE_DATA}
+    definitions['demo_users'] = [{key: value for key, value in user.items() if key != 'password'}
+                                 for user in get_demo_users()]
+    return hashlib.sha256(json.dumps(definitions, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class SeedService(BaseService[SeedFingerprint, SeedRepository]):
+    """Seeds reference data and demo users once per change of their definitions"""
+    
+    def __init__(self, repository: Optional[SeedRepository] = None):
+        """Initialize with repository using dependency injection"""
+        super().__init__(repository or SeedRepository())
+        # Databases (by URL) this process has already found up to date
+        self._verified = set()
+    
+    def is_current(self, fingerprint: Optional[str] = None) -> bool:
+        """Whether the database was seeded from the current definitions"""
+        return self.repository.get_fingerprint(SEED_NAME) == (fingerprint or reference_data_fingerprint())
+    
+    def seed(self, force: bool = False) -> Dict[str, Any]:
+        """Bulk upsert reference data and create missing demo users, then store the fingerprint"""
+        fingerprint = reference_data_fingerprint()
+        if not force and self.is_current(fingerprint):
+            logger.info("Reference data is up to date")
+            return {'seeded': False, 'fingerprint': fingerprint}
+        
+        try:
+            tables = {}
+            for model_class, key, loader in REFERENCE_DATA:
+                tables[model_class.__tablename__] = self.repository.upsert(model_class, key, loader())
+            users_created = self._create_demo_users()
+            self.repository.set_fingerprint(SEED_NAME, fingerprint)
+            self.repository.commit()
+        except Exception:
+            self.repository.rollback()
+            raise
+        
+        # Upserts bypass the session hooks that normally drop the value set cache
+        from app.services.value_set_service import value_set_service
+        value_set_service.invalidate()
+        
+        logger.info("Seeded reference data %s: %s, %s demo users created", fingerprint[:12], tables, users_created)
+        if users_created:
+            logger.info("IMPORTANT: These are demo users. Use secure passwords in production!")
+        return {'seeded': True, 'fingerprint': fingerprint, 'tables': tables, 'demo_users_created': users_created}
+    
+    def ensure_seeded(self) -> None:
+        """
+        Startup check: one fingerprint lookup, and a seed only when the definitions changed
+        
+        Repeated app creation in the same process (e.g. per Celery task) skips
+        even the lookup. Databases without the tables yet are left alone.
+        """
+        database = str(db.engine.url)
+        if database in self._verified:
+            return
+        try:
+            if not self.is_current():
+                logger.info("Reference data definitions changed or never seeded, seeding...")
+                self.seed(force=True)
+        except SQLAlchemyError as e:
+            self.repository.rollback()
+            logger.info("Reference data tables not available yet, skipping seeding: %s", str(e).splitlines()[0])
+            return
+        self._verified.add(database)
+    
+    def _create_demo_users(self) -> int:
+        """Add the demo users that do not exist yet to the seeding transaction"""
+        demo_users = get_demo_users()
+        existing = self.repository.find_existing_usernames(user['username'] for user in demo_users)
+        missing = [user for user in demo_users if user['username'] not in existing]
+        if not missing:
+            return 0
+        
+        roles = self.repository.find_roles_by_name(user['role_name'] for user in missing)
+        created = 0
+        for user_data in missing:
+            role = roles.get(user_data['role_name'])
+            if not role:
+                logger.warning("Role '%s' not found, can't create user '%s'", user_data['role_name'], user_data['username'])
+                continue
+            user = User(
+                username=user_data['username'],
+                email=user_data['email'],
+                first_name=user_data['first_name'],
+                last_name=user_data['last_name'],
+                is_active=True
+            )
+            user.set_password(user_data['password'])
+            user.roles.append(role)
+            self.repository.add(user)
+            created += 1
+            logger.info("Created demo user: %s with role: %s", user_data['username'], user_data['role_name'])
+        return created
+
+# Create an instance of the service for easier imports with default repository
+seed_service = SeedService()
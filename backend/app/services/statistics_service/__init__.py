@@ -0,0 +1,7 @@
+# This file makes the statistics_service directory a Python package
+from app.services.statistics_service.service import (
+    StatisticsService,
+    register_statistics_listeners,
+    statistic_deltas,
+    statistics_service  # Add the service instance itself
+)
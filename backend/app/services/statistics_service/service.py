@@ -0,0 +1,350 @@
+import logging
+from collections import Counter
+from typing import Dict, List, Optional, Tuple, Any, Iterable
+from sqlalchemy import event, func, inspect, select
+
+from app import db
+from app.models import Patient, Condition, Observation, RegistryStatistic
+from app.services.base_service import BaseService
+from app.repositories.statistics_repository import StatisticsRepository, StatisticCounts
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Metric names stored in RegistryStatistic.metric
+METRIC_PATIENTS_TOTAL = 'patients.total'
+METRIC_PATIENTS_BY_GENDER = 'patients.gender'
+METRIC_CONDITIONS_TOTAL = 'conditions.total'
+METRIC_CONDITIONS_BY_CODE = 'conditions.code'
+METRIC_OBSERVATIONS_TOTAL = 'observations.total'
+METRIC_OBSERVATIONS_BY_CODE = 'observations.code'
+METRIC_OBSERVATIONS_BY_MONTH = 'observations.month'
+
+TOTAL_BUCKET = 'all'
+UNSPECIFIED_BUCKET = 'unspecified'
+
+# Session.info keys: counter deltas per (sub)transaction, and the connection holding the counters' shared lock
+PENDING_STATISTIC_DELTAS = 'pending_statistic_deltas'
+STATISTICS_LOCK_CONNECTION = 'statistics_lock_connection'
+
+
+def month_bucket(value) -> str:
+    """Bucket a date/datetime into YYYY-MM"""
+    return value.strftime('%Y-%m') if value else UNSPECIFIED_BUCKET
+
+
+def patient_buckets(values: Dict[str, Any]) -> List[Tuple[str, str]]:
+    return [
+        (METRIC_PATIENTS_TOTAL, TOTAL_BUCKET),
+        (METRIC_PATIENTS_BY_GENDER, values.get('gender') or UNSPECIFIED_BUCKET),
+    ]
+
+
+def condition_buckets(values: Dict[str, Any]) -> List[Tuple[str, str]]:
+    return [
+        (METRIC_CONDITIONS_TOTAL, TOTAL_BUCKET),
+        (METRIC_CONDITIONS_BY_CODE, values.get('condition_code') or UNSPECIFIED_BUCKET),
+    ]
+
+
+def observation_buckets(values: Dict[str, Any]) -> List[Tuple[str, str]]:
+    return [
+        (METRIC_OBSERVATIONS_TOTAL, TOTAL_BUCKET),
+        (METRIC_OBSERVATIONS_BY_CODE, values.get('observation_code') or UNSPECIFIED_BUCKET),
+        (METRIC_OBSERVATIONS_BY_MONTH, month_bucket(values.get('observation_date'))),
+    ]
+
+
+# Model -> (attributes that determine its buckets, bucket function)
+TRACKED_MODELS = {
+    Patient: (('gender',), patient_buckets),
+    Condition: (('condition_code',), condition_buckets),
+    Observation: (('observation_code', 'observation_date'), observation_buckets),
+}
+
+
+def statistic_deltas(model, rows: Iterable[Dict[str, Any]], sign: int = 1) -> StatisticCounts:
+    """Counter deltas for rows of a tracked model written outside the ORM unit of work"""
+    _, buckets = TRACKED_MODELS[model]
+    deltas = Counter()
+    for row in rows:
+        for key in buckets(row):
+            deltas[key] += sign
+    return deltas
+
+
+def collect_flush_deltas(session) -> StatisticCounts:
+    """Counter deltas for the tracked objects inserted, deleted or re-bucketed in a flush"""
+    deltas = Counter()
+
+    for obj in session.new:
+        tracked = TRACKED_MODELS.get(type(obj))
+        if tracked:
+            attributes, buckets = tracked
+            for key in buckets({name: getattr(obj, name) for name in attributes}):
+                deltas[key] += 1
+
+    for obj in session.deleted:
+        tracked = TRACKED_MODELS.get(type(obj))
+        if tracked:
+            attributes, buckets = tracked
+            state = inspect(obj)
+            old_values = {}
+            for name in attributes:
+                history = state.attrs[name].history
+                old_values[name] = history.deleted[0] if history.deleted else getattr(obj, name)
+            for key in buckets(old_values):
+                deltas[key] -= 1
+
+    for obj in session.dirty:
+        tracked = TRACKED_MODELS.get(type(obj))
+        if not tracked:
+            continue
+        attributes, buckets = tracked
+        state = inspect(obj)
+        histories = {name: state.attrs[name].history for name in attributes}
+        if not any(history.deleted for history in histories.values()):
+            continue
+        old_values, new_values = {}, {}
+        for name, history in histories.items():
+            current = getattr(obj, name)
+            old_values[name] = history.deleted[0] if history.deleted else current
+            new_values[name] = current
+        for key in buckets(old_values):
+            deltas[key] -= 1
+        for key in buckets(new_values):
+            deltas[key] += 1
+
+    return deltas
+
+
+def record_pending_deltas(session, deltas: StatisticCounts) -> None:
+    """Add deltas to those of the session's innermost transaction, applied once the whole transaction commits"""
+    if deltas:
+        transaction = session.get_nested_transaction() or session.get_transaction()
+        pending = session.info.setdefault(PENDING_STATISTIC_DELTAS, {})
+        pending.setdefault(transaction, Counter()).update(deltas)
+
+
+def pop_pending_deltas(session) -> StatisticCounts:
+    """Deltas of every savepoint and transaction of the session that has not been rolled back"""
+    deltas = Counter()
+    for transaction_deltas in session.info.pop(PENDING_STATISTIC_DELTAS, {}).values():
+        deltas.update(transaction_deltas)
+    return deltas
+
+
+def record_statistics_after_flush(session, flush_context) -> None:
+    """Session hook recording the counter deltas of a flush"""
+    record_pending_deltas(session, collect_flush_deltas(session))
+
+
+def record_statistics_on_bulk_insert(orm_execute_state):
+    """
+    Session hook for ORM bulk inserts (session.execute(insert(Model), rows))
+
+    These bypass the unit of work and therefore after_flush, so the deltas are
+    computed from the parameter rows and recorded once the statement has run.
+    """
+    if not orm_execute_state.is_insert or orm_execute_state.bind_mapper is None:
+        return None
+    model = orm_execute_state.bind_mapper.class_
+    rows = orm_execute_state.parameters
+    if model not in TRACKED_MODELS or not rows:
+        return None
+    if isinstance(rows, dict):
+        rows = [rows]
+
+    result = orm_execute_state.invoke_statement()
+    record_pending_deltas(orm_execute_state.session, statistic_deltas(model, rows))
+    return result
+
+
+def prepare_statistics_before_commit(session) -> None:
+    """
+    Session hook readying the transaction's deltas as it commits
+
+    On PostgreSQL the counters' lock is taken in shared mode on a connection
+    of its own, before the data commits, and held until the deltas are
+    applied after the commit. A rebuild takes it exclusively, so it never
+    counts rows whose deltas are still to come. Without advisory locks
+    (SQLite, which allows one writer at a time anyway) the deltas are
+    applied here, inside the writer's transaction.
+    """
+    if session.in_nested_transaction():
+        return  # releasing a savepoint; its deltas wait for the outermost commit
+    session.flush()
+    if not session.info.get(PENDING_STATISTIC_DELTAS):
+        return
+    engine = session.get_bind(mapper=inspect(RegistryStatistic))
+    if not StatisticsRepository.has_advisory_locks(engine.dialect):
+        StatisticsRepository.apply_deltas(session.connection(), pop_pending_deltas(session))
+        return
+    connection = engine.connect()
+    try:
+        StatisticsRepository.lock_shared(connection)
+    except Exception:
+        connection.close()
+        raise
+    session.info[STATISTICS_LOCK_CONNECTION] = connection
+
+
+def release_statistics_lock(session) -> None:
+    """Release the counters' shared lock and return its connection to the pool"""
+    connection = session.info.pop(STATISTICS_LOCK_CONNECTION, None)
+    if connection is None:
+        return
+    try:
+        StatisticsRepository.unlock_shared(connection)
+    except Exception:
+        # Closing the database session releases the lock; don't pool a connection that may still hold it
+        logger.exception("Failed to release the registry statistics lock")
+        connection.invalidate()
+    finally:
+        connection.close()
+
+
+def apply_statistics_after_commit(session) -> None:
+    """
+    Session hook applying the committed transaction's deltas in a short transaction of their own
+
+    Upserting the counters inside the writer's transaction would hold their
+    row locks until it commits, serializing every registry write on the few
+    total rows. Applied here, the locks last one small statement per counter,
+    at the cost of counters briefly trailing the data, or drifting if this
+    transaction fails; the scheduled rebuild_registry_statistics job
+    reconciles them.
+    """
+    connection = session.info.get(STATISTICS_LOCK_CONNECTION)
+    if connection is None or session.in_nested_transaction():
+        return
+    deltas = pop_pending_deltas(session)
+    try:
+        StatisticsRepository.apply_deltas(connection, deltas)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        logger.exception("Failed to apply %s registry statistic deltas; the next rebuild will correct them",
+                         len(deltas))
+    finally:
+        release_statistics_lock(session)
+
+
+def discard_rolled_back_statistics(session, previous_transaction) -> None:
+    """Session hook forgetting the deltas of a rolled back transaction or savepoint, and of savepoints inside it"""
+    pending = session.info.get(PENDING_STATISTIC_DELTAS)
+    if not pending:
+        return
+    for transaction in list(pending):
+        ancestor = transaction
+        while ancestor is not None and ancestor is not previous_transaction:
+            ancestor = ancestor.parent
+        if ancestor is not None:
+            del pending[transaction]
+
+
+def end_statistics_transaction(session, transaction) -> None:
+    """Session hook releasing the shared lock of an outermost transaction whose commit failed"""
+    if transaction.parent is None:
+        release_statistics_lock(session)
+        session.info.pop(PENDING_STATISTIC_DELTAS, None)
+
+
+def register_statistics_listeners(session=None) -> None:
+    """Keep statistics up to date with every committed flush and bulk insert of the given (default: app) session"""
+    session = session or db.session
+    for name, listener in (('after_flush', record_statistics_after_flush),
+                           ('do_orm_execute', record_statistics_on_bulk_insert),
+                           ('before_commit', prepare_statistics_before_commit),
+                           ('after_commit', apply_statistics_after_commit),
+                           ('after_soft_rollback', discard_rolled_back_statistics),
+                           ('after_transaction_end', end_statistics_transaction)):
+        if not event.contains(session, name, listener):
+            event.listen(session, name, listener)
+
+
+class StatisticsService(BaseService[RegistryStatistic, StatisticsRepository]):
+    """Service for reading and reconciling registry statistics"""
+
+    def __init__(self, repository: Optional[StatisticsRepository] = None):
+        """Initialize with repository using dependency injection"""
+        super().__init__(repository or StatisticsRepository())
+
+    def _distribution(self, metric: str, key_name: str) -> List[Dict[str, Any]]:
+        return [
+            {key_name: statistic.bucket, 'count': statistic.count}
+            for statistic in self.repository.find_by_metric(metric)
+        ]
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Get registry-wide totals"""
+        logger.debug("Fetching registry statistics summary")
+        return {
+            'patients': self.repository.get_count(METRIC_PATIENTS_TOTAL, TOTAL_BUCKET),
+            'conditions': self.repository.get_count(METRIC_CONDITIONS_TOTAL, TOTAL_BUCKET),
+            'observations': self.repository.get_count(METRIC_OBSERVATIONS_TOTAL, TOTAL_BUCKET),
+        }
+
+    def get_gender_distribution(self) -> List[Dict[str, Any]]:
+        """Get patient counts per gender"""
+        logger.debug("Fetching gender distribution")
+        return self._distribution(METRIC_PATIENTS_BY_GENDER, 'gender')
+
+    def get_condition_counts(self) -> List[Dict[str, Any]]:
+        """Get condition counts per condition code"""
+        logger.debug("Fetching condition counts per code")
+        return self._distribution(METRIC_CONDITIONS_BY_CODE, 'code')
+
+    def get_observation_code_counts(self) -> List[Dict[str, Any]]:
+        """Get observation counts per observation code"""
+        logger.debug("Fetching observation counts per code")
+        return self._distribution(METRIC_OBSERVATIONS_BY_CODE, 'code')
+
+    def get_observation_monthly_counts(self) -> List[Dict[str, Any]]:
+        """Get observation counts per month, oldest first"""
+        logger.debug("Fetching observation counts per month")
+        return sorted(self._distribution(METRIC_OBSERVATIONS_BY_MONTH, 'month'), key=lambda row: row['month'])
+
+    def compute_counts(self) -> StatisticCounts:
+        """Recompute every counter from the source tables"""
+        session = self.repository.session
+        counts = Counter()
+
+        counts[(METRIC_PATIENTS_TOTAL, TOTAL_BUCKET)] = session.execute(
+            select(func.count(Patient.id))).scalar_one()
+        counts[(METRIC_CONDITIONS_TOTAL, TOTAL_BUCKET)] = session.execute(
+            select(func.count(Condition.id))).scalar_one()
+        counts[(METRIC_OBSERVATIONS_TOTAL, TOTAL_BUCKET)] = session.execute(
+            select(func.count(Observation.id))).scalar_one()
+        for gender, count in session.execute(select(Patient.gender, func.count()).group_by(Patient.gender)):
+            counts[(METRIC_PATIENTS_BY_GENDER, gender or UNSPECIFIED_BUCKET)] += count
+        for code, count in session.execute(
+                select(Condition.condition_code, func.count()).group_by(Condition.condition_code)):
+            counts[(METRIC_CONDITIONS_BY_CODE, code or UNSPECIFIED_BUCKET)] += count
+        for code, count in session.execute(
+                select(Observation.observation_code, func.count()).group_by(Observation.observation_code)):
+            counts[(METRIC_OBSERVATIONS_BY_CODE, code or UNSPECIFIED_BUCKET)] += count
+
+        dialect = session.get_bind().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            month = (func.strftime('%Y-%m', Observation.observation_date) if dialect == 'sqlite'
+                     else func.to_char(Observation.observation_date, 'YYYY-MM'))
+            for bucket, count in session.execute(select(month, func.count()).group_by(month)):
+                counts[(METRIC_OBSERVATIONS_BY_MONTH, bucket or UNSPECIFIED_BUCKET)] += count
+        else:
+            dates = session.execute(select(Observation.observation_date).execution_options(yield_per=10000))
+            for (observation_date,) in dates:
+                counts[(METRIC_OBSERVATIONS_BY_MONTH, month_bucket(observation_date))] += 1
+
+        # Totals of zero still get a row so reads never have to special-case them
+        return {key: count for key, count in counts.items() if count or key[1] == TOTAL_BUCKET}
+
+    def rebuild_statistics(self) -> Dict[str, Any]:
+        """Reconcile all counters with the source tables"""
+        logger.info("Rebuilding registry statistics")
+        counts = self.repository.replace_all(self.compute_counts)
+        logger.info("Rebuilt %s registry statistic counters", len(counts))
+        return {'counters': len(counts), 'summary': self.get_summary()}
+
+# Create an instance of the service for easier imports with default repository
+statistics_service = StatisticsService()
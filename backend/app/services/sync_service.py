@@ -14,11 +14,11 @@ def trigger_patient_sync(patient_id: int) -> None:
     """
     from app.tasks import sync_patient_to_fhir
     try:
-        logger.info(f"Triggering sync for patient ID: {patient_id}")
+        logger.info("Triggering sync for patient ID: %s", patient_id)
         task = sync_patient_to_fhir.delay(patient_id)
-        logger.debug(f"Sync task created for patient ID: {patient_id}, task ID: {task.id}")
+        logger.debug("Sync task created for patient ID: %s, task ID: %s", patient_id, task.id)
     except Exception as e:
-        logger.error(f"Failed to trigger sync for patient ID: {patient_id} - {str(e)}", exc_info=True)
+        logger.error("Failed to trigger sync for patient ID: %s - %s", patient_id, e, exc_info=True)
 
 def trigger_condition_sync(condition_id: int) -> None:
     """
@@ -30,11 +30,11 @@ def trigger_condition_sync(condition_id: int) -> None:
     """
     from app.tasks import sync_condition_to_fhir
     try:
-        logger.info(f"Triggering sync for condition ID: {condition_id}")
+        logger.info("Triggering sync for condition ID: %s", condition_id)
         task = sync_condition_to_fhir.delay(condition_id)
-        logger.debug(f"Sync task created for condition ID: {condition_id}, task ID: {task.id}")
+        logger.debug("Sync task created for condition ID: %s, task ID: %s", condition_id, task.id)
     except Exception as e:
-        logger.error(f"Failed to trigger sync for condition ID: {condition_id} - {str(e)}", exc_info=True)
+        logger.error("Failed to trigger sync for condition ID: %s - %s", condition_id, e, exc_info=True)
 
 def trigger_observation_sync(observation_id: int) -> None:
     """
@@ -46,11 +46,11 @@ def trigger_observation_sync(observation_id: int) -> None:
     """
     from app.tasks import sync_observation_to_fhir
     try:
-        logger.info(f"Triggering sync for observation ID: {observation_id}")
+        logger.info("Triggering sync for observation ID: %s", observation_id)
         task = sync_observation_to_fhir.delay(observation_id)
-        logger.debug(f"Sync task created for observation ID: {observation_id}, task ID: {task.id}")
+        logger.debug("Sync task created for observation ID: %s, task ID: %s", observation_id, task.id)
     except Exception as e:
-        logger.error(f"Failed to trigger sync for observation ID: {observation_id} - {str(e)}", exc_info=True)
+        logger.error("Failed to trigger sync for observation ID: %s - %s", observation_id, e, exc_info=True)
 
 def trigger_procedure_sync(procedure_id: int) -> None:
     """
@@ -62,11 +62,11 @@ def trigger_procedure_sync(procedure_id: int) -> None:
     """
     from app.tasks import sync_procedure_to_fhir
     try:
-        logger.info(f"Triggering sync for procedure ID: {procedure_id}")
+        logger.info("Triggering sync for procedure ID: %s", procedure_id)
         task = sync_procedure_to_fhir.delay(procedure_id)
-        logger.debug(f"Sync task created for procedure ID: {procedure_id}, task ID: {task.id}")
+        logger.debug("Sync task created for procedure ID: %s, task ID: %s", procedure_id, task.id)
     except Exception as e:
-        logger.error(f"Failed to trigger sync for procedure ID: {procedure_id} - {str(e)}", exc_info=True)
+        logger.error("Failed to trigger sync for procedure ID: %s - %s", procedure_id, e, exc_info=True)
 
 def check_sync_status(entity_type: str, entity_id: int) -> Optional[Dict[str, Any]]:
     """
@@ -80,7 +80,7 @@ def check_sync_status(entity_type: str, entity_id: int) -> Optional[Dict[str, An
         Dictionary with sync status details or None if entity not found
     """
     try:
-        logger.debug(f"Checking sync status for {entity_type} ID: {entity_id}")
+        logger.debug("Checking sync status for %s ID: %s", entity_type, entity_id)
         
         if entity_type == 'patient':
             from app.repositories.patient_repository import PatientRepository
@@ -95,12 +95,12 @@ def check_sync_status(entity_type: str, entity_id: int) -> Optional[Dict[str, An
             from app.repositories.procedure_repository import ProcedureRepository
             repository = ProcedureRepository()
         else:
-            logger.warning(f"Invalid entity type: {entity_type}")
+            logger.warning("Invalid entity type: %s", entity_type)
             return None
         
         entity = repository.get_by_id(entity_id)
         if not entity:
-            logger.warning(f"{entity_type.capitalize()} with ID {entity_id} not found")
+            logger.warning("%s with ID %s not found", entity_type.capitalize(), entity_id)
             return None
         
         sync_status = {
@@ -111,9 +111,9 @@ def check_sync_status(entity_type: str, entity_id: int) -> Optional[Dict[str, An
             'fhir_id': entity.fhir_id
         }
         
-        logger.debug(f"Sync status for {entity_type} ID {entity_id}: {sync_status}")
+        logger.debug("Sync status for %s ID %s: %s", entity_type, entity_id, sync_status)
         return sync_status
         
     except Exception as e:
-        logger.error(f"Error checking sync status for {entity_type} ID {entity_id}: {str(e)}", exc_info=True)
+        logger.error("Error checking sync status for %s ID %s: %s", entity_type, entity_id, e, exc_info=True)
         return None
\ No newline at end of file
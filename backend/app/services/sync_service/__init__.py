@@ -1,4 +1,4 @@
 # This file makes the sync_service directory a Python package
-from app.services.sync_service.service import trigger_patient_sync, trigger_condition_sync
+from app.services.sync_service.service import trigger_patient_sync, trigger_condition_sync, trigger_batch_sync
 
-__all__ = ['trigger_patient_sync', 'trigger_condition_sync']
\ No newline at end of file
+__all__ = ['trigger_patient_sync', 'trigger_condition_sync', 'trigger_batch_sync']
\ No newline at end of file
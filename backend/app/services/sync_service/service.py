@@ -18,6 +18,29 @@ class SyncService:
             sync_condition_to_fhir.delay(entity_id)
         else:
             raise ValueError(f"Unknown entity type: {entity_type}")
+    
+    @staticmethod
+    def trigger_batch_sync(entity_type, entity_ids):
+        """
+        Trigger a single Celery task that syncs a batch of entities
+        
+        Args:
+            entity_type: String representing entity type (e.g., 'condition', 'observation')
+            entity_ids: IDs of the entities to sync
+        """
+        if not entity_ids:
+            return
+        if entity_type == 'condition':
+            from app.tasks import sync_conditions_to_fhir
+            sync_conditions_to_fhir.delay(list(entity_ids))
+        elif entity_type == 'observation':
+            from app.tasks import sync_observations_to_fhir
+            sync_observations_to_fhir.delay(list(entity_ids))
+        elif entity_type == 'procedure':
+            from app.tasks import sync_procedures_to_fhir
+            sync_procedures_to_fhir.delay(list(entity_ids))
+        else:
+            raise ValueError(f"Unknown entity type for batch sync: {entity_type}")
 
 
 def trigger_patient_sync(patient_id):
@@ -31,4 +54,11 @@ def trigger_condition_sync(condition_id):
     """
     Trigger a Celery task to sync a condition to FHIR
     """
-    SyncService.trigger_sync('condition', condition_id)
\ No newline at end of file
+    SyncService.trigger_sync('condition', condition_id)
+
+
+def trigger_batch_sync(entity_type, entity_ids):
+    """
+    Trigger one Celery task to sync a batch of entities to FHIR
+    """
+    SyncService.trigger_batch_sync(entity_type, entity_ids)
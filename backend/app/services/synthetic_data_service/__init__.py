@@ -0,0 +1,7 @@
+# This file makes the synthetic_data_service directory a Python package
+from app.services.synthetic_data_service.service import (
+    SyntheticDataService,
+    RegistryGenerator,
+    DEFAULT_AS_OF,
+    synthetic_data_service  # Add the service instance itself
+)
@@ -0,0 +1,338 @@
+import itertools
+import logging
+import random
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.models import Patient, Condition, Observation, Procedure
+from app.services.base_service import BaseService
+from app.repositories.synthetic_data_repository import SyntheticDataRepository
+from app.utils.observation_values import VALUE_TYPE_QUANTITY, normalize_unit
+from app.value_sets.neurological_conditions import get_all_neurological_conditions
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Patients generated and committed per transaction
+DEFAULT_BATCH_SIZE = 1000
+
+# Date generated histories run up to; fixed so a seed always produces the same registry
+DEFAULT_AS_OF = date(2025, 1, 1)
+
+FIRST_NAMES = [
+    'Ada', 'Aisha', 'Alejandro', 'Amara', 'Anders', 'Ana', 'Ben', 'Carla', 'Chen', 'Chloe', 'Daniel', 'Dev',
+    'Elena', 'Emeka', 'Eva', 'Farid', 'Fatima', 'George', 'Grace', 'Hana', 'Hiro', 'Ines', 'Ivan', 'James',
+    'Jonas', 'Kemi', 'Kofi', 'Laila', 'Liam', 'Lucia', 'Luis', 'Maria', 'Mateo', 'Mei', 'Nadia', 'Noah',
+    'Olga', 'Omar', 'Priya', 'Rafael', 'Rosa', 'Samuel', 'Sara', 'Sofia', 'Tariq', 'Thomas', 'Yuki', 'Zara',
+]
+LAST_NAMES = [
+    'Abbott', 'Adeyemi', 'Barros', 'Bauer', 'Chen', 'Costa', 'Diallo', 'Dubois', 'Evans', 'Fischer', 'Garcia',
+    'Gupta', 'Haddad', 'Hansen', 'Ito', 'Ivanova', 'Jensen', 'Johnson', 'Kim', 'Kowalski', 'Larsen', 'Lopez',
+    'Martin', 'Mensah', 'Morales', 'Nakamura', 'Nguyen', 'Novak', 'Okafor', 'Olsen', 'Patel', 'Petrov',
+    'Quinn', 'Rossi', 'Schmidt', 'Silva', 'Singh', 'Smith', 'Sato', 'Tanaka', 'Torres', 'Walker', 'Wang',
+    'Weber', 'Williams', 'Yilmaz', 'Young', 'Zhang',
+]
+
+# Condition code -> (relative prevalence in the registry, mean onset age, onset age SD, share of female patients)
+CONDITION_PROFILES = {
+    'G43.909': (22, 30, 10, 0.75),  # Migraine
+    'G40.909': (12, 28, 18, 0.48),  # Epilepsy
+    'G47.00': (12, 50, 15, 0.58),  # Insomnia
+    'G31.84': (13, 70, 8, 0.52),  # Mild cognitive impairment
+    'G30.9': (11, 75, 7, 0.64),  # Alzheimer's disease
+    'I63.9': (10, 70, 11, 0.48),  # Cerebral infarction
+    'G20': (9, 65, 9, 0.40),  # Parkinson's disease
+    'G35': (6, 32, 9, 0.74),  # Multiple sclerosis
+    'F03.90': (4, 80, 6, 0.62),  # Unspecified dementia
+    'G31.9': (1, 65, 12, 0.50),  # Degenerative disease of nervous system
+}
+# Profile of codes added to NEUROLOGICAL_CONDITIONS without one above
+DEFAULT_CONDITION_PROFILE = (3, 55, 15, 0.50)
+
+# Condition code -> current status (condition status value set codes) -> weight
+CONDITION_STATUSES = {
+    'G43.909': {'active': 6, 'remission': 3, 'resolved': 1},
+    'G40.909': {'active': 6, 'remission': 4},
+    'G47.00': {'active': 5, 'remission': 3, 'resolved': 2},
+    'G35': {'active': 4, 'relapse': 3, 'remission': 3},
+    'I63.9': {'resolved': 5, 'active': 4, 'recurrence': 1},
+}
+DEFAULT_CONDITION_STATUSES = {'active': 1}
+
+# Number of conditions beyond the one a patient was enrolled with -> weight
+COMORBIDITY_COUNTS = {0: 60, 1: 30, 2: 10}
+
+# Condition code -> (typical MoCA score at enrollment, points lost per year); followed with MoCA at every visit
+COGNITIVE_PROFILES = {
+    'G31.84': (23.0, 1.0),
+    'G30.9': (18.0, 2.5),
+    'F03.90': (15.0, 2.5),
+    'G20': (25.0, 0.6),
+    'I63.9': (24.0, 0.4),
+    'G31.9': (22.0, 1.5),
+}
+# Patients without a cognitive condition are screened at enrollment only
+NORMAL_COGNITION = (27.5, 0.0)
+
+# Observations: (LOINC code, name, unit)
+MOCA = ('72172-0', 'MoCA total score', '{score}')
+SYSTOLIC_BP = ('8480-6', 'Systolic blood pressure', 'mm[Hg]')
+DIASTOLIC_BP = ('8462-4', 'Diastolic blood pressure', 'mm[Hg]')
+HEART_RATE = ('8867-4', 'Heart rate', '/min')
+BODY_WEIGHT = ('29463-7', 'Body weight', 'kg')
+
+# Procedures: (CPT code, name, body site)
+MRI_BRAIN = ('70553', 'MRI brain without and with contrast', 'Brain')
+CT_HEAD = ('70450', 'CT head without contrast', 'Head')
+EEG = ('95816', 'EEG, awake and drowsy', 'Head')
+LUMBAR_PUNCTURE = ('62270', 'Lumbar puncture, diagnostic', 'Lumbar spine')
+NEUROPSYCH_EVALUATION = ('96132', 'Neuropsychological evaluation', None)
+DAT_SCAN = ('78607', 'Brain SPECT (DaTscan)', 'Brain')
+POLYSOMNOGRAPHY = ('95810', 'Polysomnography', None)
+
+# Condition code -> diagnostic work-up around onset: (procedure, probability)
+WORKUP_PROCEDURES = {
+    'G43.909': ((MRI_BRAIN, 0.3),),
+    'G40.909': ((EEG, 0.95), (MRI_BRAIN, 0.8)),
+    'G47.00': ((POLYSOMNOGRAPHY, 0.4),),
+    'G31.84': ((NEUROPSYCH_EVALUATION, 0.8), (MRI_BRAIN, 0.6)),
+    'G30.9': ((MRI_BRAIN, 0.85), (NEUROPSYCH_EVALUATION, 0.7), (LUMBAR_PUNCTURE, 0.25)),
+    'I63.9': ((CT_HEAD, 0.95), (MRI_BRAIN, 0.7)),
+    'G20': ((DAT_SCAN, 0.3), (MRI_BRAIN, 0.5)),
+    'G35': ((MRI_BRAIN, 1.0), (LUMBAR_PUNCTURE, 0.6)),
+    'F03.90': ((CT_HEAD, 0.6), (NEUROPSYCH_EVALUATION, 0.5)),
+    'G31.9': ((MRI_BRAIN, 0.7),),
+}
+
+# Condition code -> (procedure, share of follow-up visits it is repeated at)
+MONITORING_PROCEDURES = {
+    'G35': (MRI_BRAIN, 0.5),
+    'G40.909': (EEG, 0.15),
+}
+
+# Days between visits, chance of being lost to follow-up after each visit, and visits per patient at most
+VISIT_INTERVAL_DAYS = (120, 365)
+DROPOUT_RATE = 0.1
+MAX_VISITS = 12
+
+# Years between the enrolling diagnosis and the as-of date at most
+MAX_YEARS_ENROLLED = 12
+
+DAYS_PER_YEAR = 365.25
+
+# Record type -> model, in insert order after the patients
+RECORD_MODELS = {
+    'conditions': Condition,
+    'observations': Observation,
+    'procedures': Procedure,
+}
+
+
+def weighted(weights: Dict[Any, float]) -> Tuple[List[Any], List[float]]:
+    """Population and cumulative weights for random.choices"""
+    return list(weights), list(itertools.accumulate(weights.values()))
+
+
+class RegistryGenerator:
+    """
+    Deterministic stream of synthetic patient histories
+
+    Patients are enrolled with one condition from NEUROLOGICAL_CONDITIONS, drawn
+    by registry prevalence, with age and sex following that condition's onset
+    profile, plus age-plausible comorbidities. Each is followed up in visits
+    recording vitals and, for cognitive conditions, a declining MoCA score,
+    with work-up procedures around every diagnosis.
+    """
+
+    def __init__(self, seed: int, as_of: date = DEFAULT_AS_OF):
+        self.rng = random.Random(seed)
+        self.as_of = as_of
+        codes = [condition['code'] for condition in get_all_neurological_conditions()]
+        self.profiles = {code: CONDITION_PROFILES.get(code, DEFAULT_CONDITION_PROFILE) for code in codes}
+        self.conditions = weighted({code: profile[0] for code, profile in self.profiles.items()})
+        self.statuses = {code: weighted(CONDITION_STATUSES.get(code, DEFAULT_CONDITION_STATUSES)) for code in codes}
+        self.comorbidities = weighted(COMORBIDITY_COUNTS)
+        self.units = {spec: normalize_unit(spec[2]) for spec in (MOCA, SYSTOLIC_BP, DIASTOLIC_BP, HEART_RATE, BODY_WEIGHT)}
+
+    def _choice(self, population: Tuple[List[Any], List[float]]) -> Any:
+        return self.rng.choices(population[0], cum_weights=population[1])[0]
+
+    def _observation(self, spec: Tuple[str, str, str], value: float, text: str, when: datetime) -> Dict[str, Any]:
+        return {
+            'observation_code': spec[0],
+            'observation_name': spec[1],
+            'value': text,
+            'unit': spec[2],
+            'value_numeric': value,
+            'value_type': VALUE_TYPE_QUANTITY,
+            'unit_normalized': self.units[spec],
+            'observation_date': when,
+            'status': 'final',
+        }
+
+    @staticmethod
+    def _procedure(spec: Tuple[str, str, Optional[str]], when: datetime) -> Dict[str, Any]:
+        return {
+            'procedure_code': spec[0],
+            'procedure_name': spec[1],
+            'body_site': spec[2],
+            'performed_date': when,
+            'status': 'completed',
+        }
+
+    def _at_clinic_hours(self, day: date) -> datetime:
+        return datetime(day.year, day.month, day.day, self.rng.randint(8, 16), self.rng.choice((0, 15, 30, 45)))
+
+    def patient(self) -> Dict[str, Any]:
+        """One patient row plus its 'conditions', 'observations' and 'procedures' rows (without patient IDs)"""
+        rng = self.rng
+        as_of = self.as_of
+
+        enrolling_code = self._choice(self.conditions)
+        _, onset_mean, onset_sd, female_share = self.profiles[enrolling_code]
+        onset_age = min(max(rng.gauss(onset_mean, onset_sd), 18.0), 95.0)
+        age = min(onset_age + rng.uniform(0, MAX_YEARS_ENROLLED), 100.0)
+        birth_date = as_of - timedelta(days=int(age * DAYS_PER_YEAR))
+
+        draw = rng.random()
+        if draw < 0.99:
+            gender = 'female' if draw < 0.99 * female_share else 'male'
+        else:
+            gender = rng.choice(('other', 'unknown'))
+        female = gender == 'female'
+
+        # Condition code -> onset date; comorbidities must have started by the as-of date
+        onsets = {enrolling_code: birth_date + timedelta(days=int(onset_age * DAYS_PER_YEAR))}
+        for _ in range(self._choice(self.comorbidities)):
+            code = self._choice(self.conditions)
+            _, mean, sd, _ = self.profiles[code]
+            comorbid_onset_age = max(rng.gauss(mean, sd), 18.0)
+            if code not in onsets and comorbid_onset_age < age:
+                onsets[code] = birth_date + timedelta(days=int(comorbid_onset_age * DAYS_PER_YEAR))
+
+        conditions = [{'condition_code': code, 'onset_date': onset, 'status': self._choice(self.statuses[code])}
+                      for code, onset in onsets.items()]
+
+        procedures = []
+        for code, onset in onsets.items():
+            performed = set()
+            for spec, probability in WORKUP_PROCEDURES.get(code, ()):
+                if spec[0] not in performed and rng.random() < probability:
+                    performed.add(spec[0])
+                    day = min(onset + timedelta(days=rng.randint(0, 60)), as_of)
+                    procedures.append(self._procedure(spec, self._at_clinic_hours(day)))
+
+        # Follow-up visits from enrollment until dropout, the visit cap or the as-of date
+        enrolled = min(onsets[enrolling_code] + timedelta(days=rng.randint(0, 90)), as_of)
+        visits = []
+        visit = enrolled
+        while visit <= as_of and len(visits) < MAX_VISITS:
+            visits.append(visit)
+            if rng.random() < DROPOUT_RATE:
+                break
+            visit += timedelta(days=rng.randint(*VISIT_INTERVAL_DAYS))
+
+        cognitive = [COGNITIVE_PROFILES[code] for code in onsets if code in COGNITIVE_PROFILES]
+        moca_baseline, moca_decline = ((min(profile[0] for profile in cognitive), max(profile[1] for profile in cognitive))
+                                       if cognitive else NORMAL_COGNITION)
+        moca_baseline = rng.gauss(moca_baseline, 2.0)
+        systolic = min(max(rng.gauss(110 + 0.3 * age, 12), 90.0), 180.0)
+        diastolic = min(max(rng.gauss(76, 8), 55.0), 105.0)
+        heart_rate = min(max(rng.gauss(72, 9), 48.0), 110.0)
+        weight = min(max(rng.gauss(70 if female else 84, 13), 40.0), 180.0)
+        monitoring = [MONITORING_PROCEDURES[code] for code in onsets if code in MONITORING_PROCEDURES]
+
+        observations = []
+        for number, visit in enumerate(visits):
+            when = self._at_clinic_hours(visit)
+            years = (visit - enrolled).days / DAYS_PER_YEAR
+            if cognitive or number == 0:
+                score = min(max(round(moca_baseline - moca_decline * years + rng.gauss(0, 1.2)), 0), 30)
+                observations.append(self._observation(MOCA, float(score), str(score), when))
+            for spec, mean, sd in ((SYSTOLIC_BP, systolic, 8), (DIASTOLIC_BP, diastolic, 6), (HEART_RATE, heart_rate, 6)):
+                value = round(rng.gauss(mean, sd))
+                observations.append(self._observation(spec, float(value), str(value), when))
+            value = round(weight + rng.gauss(0, 1.5), 1)
+            observations.append(self._observation(BODY_WEIGHT, value, f"{value:.1f}", when))
+            if number:
+                for spec, share in monitoring:
+                    if rng.random() < share:
+                        procedures.append(self._procedure(spec, when))
+
+        return {
+            'patient': {'name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", 'birth_date': birth_date,
+                        'gender': gender},
+            'conditions': conditions,
+            'observations': observations,
+            'procedures': procedures,
+        }
+
+
+class SyntheticDataService(BaseService[Patient, SyntheticDataRepository]):
+    """Service for filling the registry with synthetic patients at scale"""
+
+    def __init__(self, repository: Optional[SyntheticDataRepository] = None):
+        """Initialize with repository using dependency injection"""
+        super().__init__(repository or SyntheticDataRepository())
+
+    def generate(self, patients: int, seed: int = 0, batch_size: Optional[int] = None, as_of: date = DEFAULT_AS_OF,
+                 progress: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Insert synthetic patients with their conditions, observations and procedures
+
+        The same seed and as-of date always produce the same records (IDs
+        aside), whatever the batch size. Each batch is generated in memory and
+        written with one bulk INSERT per table in a single transaction.
+        """
+        if patients < 1:
+            raise ValueError("number of patients must be at least 1")
+        batch_size = batch_size or DEFAULT_BATCH_SIZE
+        if batch_size < 1:
+            raise ValueError("batch size must be at least 1")
+
+        generator = RegistryGenerator(seed, as_of)
+        counts = dict.fromkeys(['patients', *RECORD_MODELS], 0)
+        started = time.monotonic()
+        for offset in range(0, patients, batch_size):
+            histories = [generator.patient() for _ in range(min(batch_size, patients - offset))]
+            self._insert_batch(histories, counts)
+            if progress:
+                progress(self._summary(counts, time.monotonic() - started))
+
+        summary = self._summary(counts, time.monotonic() - started)
+        logger.info("Generated %s synthetic patients with seed %s (%s rows, %s rows/s)", counts['patients'], seed,
+                    summary['rows'], summary['rows_per_second'])
+        return summary
+
+    def _insert_batch(self, histories: List[Dict[str, Any]], counts: Dict[str, int]) -> None:
+        """Insert one batch of patient histories, committing them together"""
+        try:
+            patient_ids = self.repository.insert_patients([history['patient'] for history in histories])
+            inserted = {}
+            for record_type, model_class in RECORD_MODELS.items():
+                rows = []
+                for history, patient_id in zip(histories, patient_ids):
+                    for row in history[record_type]:
+                        row['patient_id'] = patient_id
+                        rows.append(row)
+                self.repository.insert_rows(model_class, rows)
+                inserted[record_type] = len(rows)
+            self.repository.commit()
+        except Exception:
+            logger.error("Failed to insert a batch of %s synthetic patients", len(histories), exc_info=True)
+            self.repository.rollback()
+            raise
+
+        counts['patients'] += len(patient_ids)
+        for record_type, count in inserted.items():
+            counts[record_type] += count
+
+    @staticmethod
+    def _summary(counts: Dict[str, int], elapsed: float) -> Dict[str, Any]:
+        rows = sum(counts.values())
+        return dict(counts, rows=rows, elapsed_seconds=round(elapsed, 2),
+                    rows_per_second=round(rows / elapsed) if elapsed > 0 else 0)
+
+# Create an instance of the service for easier imports with default repository
+synthetic_data_service = SyntheticDataService()
@@ -0,0 +1,7 @@
+# This file makes the value_set_service directory a Python package
+from app.services.value_set_service.service import (
+    ValueSetService,
+    VALUE_SETS,
+    register_value_set_listeners,
+    value_set_service  # Add the service instance itself
+)
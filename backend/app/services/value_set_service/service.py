@@ -0,0 +1,165 @@
+import hashlib
+import logging
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional
+from flask import current_app, has_app_context
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+
+from app import db
+from app.config import Config
+from app.models import ValueSet, Gender, ConditionStatus, NeurologicalCondition, SyncStatus
+from app.services.base_service import BaseService
+from app.repositories.value_set_repository import ValueSetRepository
+from app.utils.cache import TTLCache, MISSING
+from app.value_sets.genders import get_all_genders
+from app.value_sets.condition_statuses import get_all_condition_statuses
+from app.value_sets.neurological_conditions import get_all_neurological_conditions
+from app.value_sets.sync_statuses import get_all_sync_statuses
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# Value set name (as used in /value-sets/<name>) -> (model, fields served)
+VALUE_SETS = {
+    'genders': (Gender, ('code', 'display', 'description')),
+    'condition-statuses': (ConditionStatus, ('code', 'display', 'description')),
+    'neurological-conditions': (NeurologicalCondition, ('code', 'display', 'description', 'system')),
+    'sync-statuses': (SyncStatus, ('code', 'display', 'description')),
+}
+
+# Seed definitions, used for validation when the tables cannot be read
+SEED_VALUE_SETS = {
+    'genders': get_all_genders,
+    'condition-statuses': get_all_condition_statuses,
+    'neurological-conditions': get_all_neurological_conditions,
+    'sync-statuses': get_all_sync_statuses,
+}
+
+# Longer value sets are referenced by endpoint instead of listed in error messages
+MAX_CODES_IN_MESSAGE = 20
+
+SNAPSHOT_KEY = 'value_sets'
+
+# Session.info flag set when a flush touched value set rows
+VALUE_SETS_CHANGED = 'value_sets_changed'
+
+
+class CachedValueSet(NamedTuple):
+    """A value set as served: items, pre-serialized JSON body, its ETag and a code index"""
+    items: List[Dict[str, Any]]
+    body: bytes
+    etag: str
+    codes: FrozenSet[str]
+
+
+class ValueSetService(BaseService[ValueSet, ValueSetRepository]):
+    """Serves value sets from a process-local snapshot, reloaded on change or after a TTL"""
+
+    def __init__(self, repository: Optional[ValueSetRepository] = None, cache: Optional[TTLCache] = None):
+        """Initialize with repository and snapshot cache using dependency injection"""
+        super().__init__(repository or ValueSetRepository())
+        self.cache = cache or TTLCache(maxsize=1, ttl=Config.VALUE_SET_CACHE_TTL)
+
+    def _load(self) -> Dict[str, CachedValueSet]:
+        """Load every value set once and pre-serialize each response body"""
+        snapshot = {}
+        for name, (model_class, fields) in VALUE_SETS.items():
+            items = [{field: getattr(entry, field) for field in fields}
+                     for entry in self.repository.find_active(model_class)]
+            body = current_app.json.response(items).get_data()
+            codes = frozenset(item['code'] for item in items)
+            snapshot[name] = CachedValueSet(items, body, hashlib.sha256(body).hexdigest()[:32], codes)
+        logger.info("Loaded %s value sets into the cache", len(snapshot))
+        return snapshot
+
+    def get_snapshot(self) -> Dict[str, CachedValueSet]:
+        """Get all cached value sets, loading them on first use or after expiry"""
+        snapshot = self.cache.get(SNAPSHOT_KEY)
+        if snapshot is MISSING:
+            snapshot = self._load()
+            self.cache.set(SNAPSHOT_KEY, snapshot)
+        return snapshot
+
+    def get_value_set(self, name: str) -> Optional[CachedValueSet]:
+        """Get one value set by name"""
+        return self.get_snapshot().get(name)
+
+    def get_version(self) -> str:
+        """Content hash over all value sets"""
+        etags = ''.join(value_set.etag for _, value_set in sorted(self.get_snapshot().items()))
+        return hashlib.sha256(etags.encode('ascii')).hexdigest()[:32]
+
+    def get_codes(self, name: str) -> List[str]:
+        """Codes of a value set in display order"""
+        value_set = self._value_set_for_validation(name)
+        if value_set is None:
+            return [entry['code'] for entry in SEED_VALUE_SETS[name]()]
+        return [item['code'] for item in value_set.items]
+
+    def is_valid_code(self, name: str, code: str) -> bool:
+        """O(1) membership check against the cached code index"""
+        value_set = self._value_set_for_validation(name)
+        if value_set is None:
+            return any(entry['code'] == code for entry in SEED_VALUE_SETS[name]())
+        return code in value_set.codes
+
+    def validate_code(self, name: str, code: str, label: str) -> str:
+        """Return the code if it belongs to the value set, otherwise raise ValueError"""
+        if self.is_valid_code(name, code):
+            return code
+        codes = self.get_codes(name)
+        if len(codes) > MAX_CODES_IN_MESSAGE:
+            raise ValueError(f'{label} must be a code from /value-sets/{name}')
+        raise ValueError(f'{label} must be one of: {", ".join(codes)}')
+
+    def _value_set_for_validation(self, name: str) -> Optional[CachedValueSet]:
+        """
+        Cached value set to validate against, or None to fall back to the seeds
+
+        Schemas are also used outside an app context and before the value set
+        tables exist or are seeded; the seed definitions cover those cases.
+        """
+        if not has_app_context():
+            return None
+        try:
+            value_set = self.get_value_set(name)
+        except SQLAlchemyError as e:
+            logger.warning("Value set tables unavailable, validating %s against seed data: %s", name, e)
+            db.session.rollback()
+            return None
+        return value_set if value_set and value_set.codes else None
+
+    def invalidate(self) -> None:
+        """Drop the snapshot so the next read reloads it"""
+        logger.info("Invalidating value set cache")
+        self.cache.clear()
+
+
+def mark_value_set_changes(session, flush_context) -> None:
+    """Session hook noting that a flush wrote value set rows"""
+    if any(isinstance(obj, ValueSet) for obj in list(session.new) + list(session.dirty) + list(session.deleted)):
+        session.info[VALUE_SETS_CHANGED] = True
+
+
+def invalidate_value_sets_after_commit(session) -> None:
+    """Session hook dropping the cache once value set changes (e.g. a re-seed) are committed"""
+    if session.info.pop(VALUE_SETS_CHANGED, False):
+        value_set_service.invalidate()
+
+
+def discard_value_set_changes(session) -> None:
+    """Session hook forgetting value set changes that were rolled back"""
+    session.info.pop(VALUE_SETS_CHANGED, None)
+
+
+def register_value_set_listeners(session=None) -> None:
+    """Invalidate the value set cache whenever the given (default: app) session commits value set changes"""
+    session = session or db.session
+    for name, listener in (('after_flush', mark_value_set_changes),
+                           ('after_commit', invalidate_value_sets_after_commit),
+                           ('after_rollback', discard_value_set_changes)):
+        if not event.contains(session, name, listener):
+            event.listen(session, name, listener)
+
+# Create an instance of the service for easier imports with default repository
+value_set_service = ValueSetService()
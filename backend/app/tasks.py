@@ -5,11 +5,136 @@ from .config import Config
 from datetime import datetime
 import requests
 
+# FHIR transaction bundles are posted in chunks of this many entries
+FHIR_BUNDLE_CHUNK_SIZE = 100
+
 # Instead of creating the app immediately, we'll create it only when running a task
-# This breaks the circular import cycle
+# This breaks the circular import cycle; the worker app is built once per process
+# and registers no blueprints since tasks only need its app context
+_flask_app = None
+
 def get_flask_app():
-    from . import create_app
-    return create_app()
+    global _flask_app
+    if _flask_app is None:
+        from . import create_app
+        _flask_app = create_app(role='worker')
+    return _flask_app
+
+def condition_resource(condition, patient):
+    """Build the FHIR Condition resource for a condition"""
+    return {
+        "resourceType": "Condition",
+        "subject": {"reference": f"Patient/{patient.fhir_id}"},
+        "code": {"text": condition.condition_code},
+        "clinicalStatus": {"text": condition.status},
+        "onsetDateTime": condition.onset_date.strftime('%Y-%m-%d')
+    }
+
+def observation_resource(observation, patient):
+    """Build the FHIR Observation resource for an observation"""
+    resource = {
+        "resourceType": "Observation",
+        "status": observation.status,
+        "code": {
+            "coding": [
+                {
+                    "system": "http://loinc.org",
+                    "code": observation.observation_code,
+                    "display": observation.observation_name
+                }
+            ],
+            "text": observation.observation_name
+        },
+        "subject": {"reference": f"Patient/{patient.fhir_id}"},
+        "effectiveDateTime": observation.observation_date.strftime('%Y-%m-%dT%H:%M:%S%z')
+    }
+    if observation.value_numeric is not None:
+        resource["valueQuantity"] = {
+            "value": observation.value_numeric,
+            "unit": observation.unit,
+            "system": "http://unitsofmeasure.org",
+            "code": observation.unit_normalized or observation.unit
+        }
+    else:
+        resource["valueString"] = observation.value
+    return resource
+
+def procedure_resource(procedure, patient):
+    """Build the FHIR Procedure resource for a procedure"""
+    resource = {
+        "resourceType": "Procedure",
+        "status": procedure.status,
+        "code": {
+            "coding": [
+                {
+                    "system": "http://snomed.info/sct",
+                    "code": procedure.procedure_code,
+                    "display": procedure.procedure_name
+                }
+            ],
+            "text": procedure.procedure_name
+        },
+        "subject": {"reference": f"Patient/{patient.fhir_id}"},
+        "performedDateTime": procedure.performed_date.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        "bodySite": [
+            {
+                "text": procedure.body_site
+            }
+        ] if procedure.body_site else None,
+        "note": [
+            {
+                "text": procedure.notes
+            }
+        ] if procedure.notes else None
+    }
+    return resource
+
+def sync_records_as_bundle(resource_type, records, build_resource):
+    """
+    POST records to FHIR in transaction bundles and record each sync status
+
+    The transaction response lists one entry per request entry in the same
+    order, so results are matched back to records by position.
+    """
+    patient_ids = {record.patient_id for record in records}
+    patients = {patient.id: patient for patient in Patient.query.filter(Patient.id.in_(patient_ids))}
+    records = [record for record in records if record.patient_id in patients]
+
+    for start in range(0, len(records), FHIR_BUNDLE_CHUNK_SIZE):
+        chunk = records[start:start + FHIR_BUNDLE_CHUNK_SIZE]
+        bundle = {
+            "resourceType": "Bundle",
+            "type": "transaction",
+            "entry": [
+                {
+                    "resource": build_resource(record, patients[record.patient_id]),
+                    "request": {"method": "POST", "url": resource_type}
+                }
+                for record in chunk
+            ]
+        }
+        try:
+            r = requests.post(Config.HAPI_FHIR_URL, json=bundle)
+            if r.status_code in (200, 201):
+                entries = r.json().get("entry", [])
+                for record, entry in zip(chunk, entries):
+                    response = entry.get("response", {})
+                    status = response.get("status", "")
+                    if status.startswith(("200", "201")):
+                        # Location looks like "Observation/123/_history/1"
+                        location = response.get("location", "").split("/")
+                        record.fhir_id = location[1] if len(location) > 1 else None
+                        record.sync_status = "success"
+                        record.synced_at = datetime.utcnow()
+                    else:
+                        record.sync_status = f"failed ({status})"
+            else:
+                for record in chunk:
+                    record.sync_status = f"failed ({r.status_code})"
+        except Exception as e:
+            for record in chunk:
+                record.sync_status = f"error: {str(e)}"
+        db.session.commit()
 
 @celery.task
 def sync_patient_to_fhir(patient_id):
@@ -52,13 +177,7 @@ def sync_condition_to_fhir(condition_id):
         if not patient:
             return
             
-        fhir_resource = {
-            "resourceType": "Condition",
-            "subject": {"reference": f"Patient/{patient.fhir_id}"},
-            "code": {"text": condition.condition_code},
-            "clinicalStatus": {"text": condition.status},
-            "onsetDateTime": condition.onset_date.strftime('%Y-%m-%d')
-        }
+        fhir_resource = condition_resource(condition, patient)
         try:
             r = requests.post(f"{Config.HAPI_FHIR_URL}/Condition", json=fhir_resource)
             if r.status_code in (200, 201):
@@ -85,28 +204,7 @@ def sync_observation_to_fhir(observation_id):
         if not patient:
             return
             
-        fhir_resource = {
-            "resourceType": "Observation",
-            "status": observation.status,
-            "code": {
-                "coding": [
-                    {
-                        "system": "http://loinc.org",
-                        "code": observation.observation_code,
-                        "display": observation.observation_name
-                    }
-                ],
-                "text": observation.observation_name
-            },
-            "subject": {"reference": f"Patient/{patient.fhir_id}"},
-            "effectiveDateTime": observation.observation_date.strftime('%Y-%m-%dT%H:%M:%S%z'),
-            "valueQuantity": {
-                "value": float(observation.value) if observation.value.replace('.', '', 1).isdigit() else None,
-                "unit": observation.unit,
-                "system": "http://unitsofmeasure.org",
-                "code": observation.unit
-            }
-        }
+        fhir_resource = observation_resource(observation, patient)
         try:
             r = requests.post(f"{Config.HAPI_FHIR_URL}/Observation", json=fhir_resource)
             if r.status_code in (200, 201):
@@ -133,32 +231,7 @@ def sync_procedure_to_fhir(procedure_id):
         if not patient:
             return
             
-        fhir_resource = {
-            "resourceType": "Procedure",
-            "status": procedure.status,
-            "code": {
-                "coding": [
-                    {
-                        "system": "http://snomed.info/sct",
-                        "code": procedure.procedure_code,
-                        "display": procedure.procedure_name
-                    }
-                ],
-                "text": procedure.procedure_name
-            },
-            "subject": {"reference": f"Patient/{patient.fhir_id}"},
-            "performedDateTime": procedure.performed_date.strftime('%Y-%m-%dT%H:%M:%S%z'),
-            "bodySite": [
-                {
-                    "text": procedure.body_site
-                }
-            ] if procedure.body_site else None,
-            "note": [
-                {
-                    "text": procedure.notes
-                }
-            ] if procedure.notes else None
-        }
+        fhir_resource = procedure_resource(procedure, patient)
         try:
             r = requests.post(f"{Config.HAPI_FHIR_URL}/Procedure", json=fhir_resource)
             if r.status_code in (200, 201):
@@ -169,4 +242,49 @@ def sync_procedure_to_fhir(procedure_id):
                 procedure.sync_status = f"failed ({r.status_code})"
         except Exception as e:
             procedure.sync_status = f"error: {str(e)}"
-        db.session.commit()
\ No newline at end of file
+        db.session.commit()
+
+@celery.task
+def sync_conditions_to_fhir(condition_ids):
+    """Sync a batch of conditions in FHIR transaction bundles"""
+    flask_app = get_flask_app()
+    
+    with flask_app.app_context():
+        conditions = Condition.query.filter(Condition.id.in_(condition_ids)).all()
+        sync_records_as_bundle("Condition", conditions, condition_resource)
+
+@celery.task
+def sync_observations_to_fhir(observation_ids):
+    """Sync a batch of observations in FHIR transaction bundles"""
+    flask_app = get_flask_app()
+    
+    with flask_app.app_context():
+        observations = Observation.query.filter(Observation.id.in_(observation_ids)).all()
+        sync_records_as_bundle("Observation", observations, observation_resource)
+
+@celery.task
+def sync_procedures_to_fhir(procedure_ids):
+    """Sync a batch of procedures in FHIR transaction bundles"""
+    flask_app = get_flask_app()
+    
+    with flask_app.app_context():
+        procedures = Procedure.query.filter(Procedure.id.in_(procedure_ids)).all()
+        sync_records_as_bundle("Procedure", procedures, procedure_resource)
+
+@celery.task
+def rebuild_registry_statistics():
+    """Reconcile the incrementally maintained statistics with the source tables"""
+    flask_app = get_flask_app()
+    
+    with flask_app.app_context():
+        from .services.statistics_service import statistics_service
+        return statistics_service.rebuild_statistics()
+
+@celery.task
+def purge_expired_refresh_tokens():
+    """Remove expired refresh tokens from the revocation store"""
+    flask_app = get_flask_app()
+    
+    with flask_app.app_context():
+        from .services.auth_service import auth_service
+        return auth_service.purge_expired_refresh_tokens()
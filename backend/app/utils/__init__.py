@@ -6,4 +6,11 @@ from app.utils.error_handlers import (
     permission_error,
     server_error,
     ErrorCode
+)
+from app.utils.http_cache import (
+    entity_etag,
+    filter_tag,
+    is_not_modified,
+    not_modified,
+    with_etag
 )
\ No newline at end of file
@@ -0,0 +1,217 @@
+import logging
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Iterable, List, MutableMapping, NamedTuple
+from weakref import WeakKeyDictionary
+
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import URL, Engine, make_url
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+# SQLALCHEMY_BINDS key of the read replica engine
+REPLICA_BIND = 'replica'
+
+# Session.info keys: depth of replica_reads calls in progress, and whether the session has written
+REPLICA_READS = 'replica_reads'
+SESSION_WROTE = 'session_wrote'
+
+# Session.info key of the SQLite writer lock the session holds until its transaction ends
+WRITE_LOCK = 'write_lock'
+
+SQLITE_SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+
+class WriteLock(NamedTuple):
+    lock: threading.RLock
+    timeout: float  # seconds
+
+
+# Writer lock of each SQLite engine in concurrent mode, per process
+_write_locks: 'WeakKeyDictionary[Engine, WriteLock]' = WeakKeyDictionary()
+
+
+def engine_options(config: MutableMapping[str, Any]) -> Dict[str, Any]:
+    """
+    SQLALCHEMY_ENGINE_OPTIONS built from the DATABASE_* settings
+
+    Pool settings only apply to server databases; SQLite connections are
+    local files, so its engine keeps the defaults.
+    """
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    if url.get_backend_name() == 'sqlite':
+        return {}
+
+    options: Dict[str, Any] = {
+        'pool_size': config['DATABASE_POOL_SIZE'],
+        'max_overflow': config['DATABASE_MAX_OVERFLOW'],
+        'pool_timeout': config['DATABASE_POOL_TIMEOUT'],
+        'pool_recycle': config['DATABASE_POOL_RECYCLE'],
+        'pool_pre_ping': config['DATABASE_POOL_PRE_PING'],
+    }
+    timeout = config['DATABASE_STATEMENT_TIMEOUT']
+    if timeout:
+        if url.get_backend_name() == 'postgresql':
+            options['connect_args'] = {'options': f"-c statement_timeout={timeout}"}
+        elif url.get_backend_name() == 'mysql':
+            options['connect_args'] = {'init_command': f"SET SESSION max_execution_time={timeout}"}
+        else:
+            logger.warning("DATABASE_STATEMENT_TIMEOUT is not supported for %s and is ignored", url.get_backend_name())
+    return options
+
+
+def configure_database(config: MutableMapping[str, Any]) -> None:
+    """Fill in engine options and the replica bind from the DATABASE_* settings, keeping explicit overrides"""
+    config.setdefault('SQLALCHEMY_ENGINE_OPTIONS', engine_options(config))
+    if config['DATABASE_REPLICA_URL']:
+        binds = dict(config.get('SQLALCHEMY_BINDS') or {})
+        binds.setdefault(REPLICA_BIND, config['DATABASE_REPLICA_URL'])
+        config['SQLALCHEMY_BINDS'] = binds
+
+
+def sqlite_pragmas(config: MutableMapping[str, Any], url: URL) -> List[str]:
+    """PRAGMA statements run on each new connection to a SQLite database in concurrent mode"""
+    synchronous = config['SQLITE_SYNCHRONOUS'].upper()
+    if synchronous not in SQLITE_SYNCHRONOUS_MODES:
+        raise ValueError(f"Unknown SQLITE_SYNCHRONOUS '{config['SQLITE_SYNCHRONOUS']}', "
+                         f"expected one of: {', '.join(SQLITE_SYNCHRONOUS_MODES)}")
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(config['SQLITE_BUSY_TIMEOUT'])}",
+        f"PRAGMA synchronous = {synchronous}",
+        f"PRAGMA mmap_size = {int(config['SQLITE_MMAP_SIZE'])}",
+        f"PRAGMA cache_size = {int(config['SQLITE_CACHE_SIZE'])}",
+    ]
+    # In-memory databases cannot use a write-ahead log
+    if url.database not in (None, '', ':memory:'):
+        pragmas.insert(0, "PRAGMA journal_mode = WAL")
+    return pragmas
+
+
+def configure_sqlite(config: MutableMapping[str, Any], engines: Iterable[Engine]) -> None:
+    """
+    Put the SQLite engines in concurrent mode, when SQLITE_CONCURRENT_MODE is set
+
+    Connections use WAL journaling, so reads run alongside a write and never
+    block it, and wait SQLITE_BUSY_TIMEOUT for locks instead of failing.
+    Write transactions begin IMMEDIATE: a deferred one that has to upgrade
+    after another writer committed fails at once, whatever the timeout.
+    Writes in this process are serialized by a writer lock (see
+    RoutingSession), so sessions queue for it in order rather than retrying
+    against SQLite's lock; other processes are covered by the busy timeout.
+    """
+    if not config['SQLITE_CONCURRENT_MODE']:
+        return
+    for engine in engines:
+        if engine.dialect.name != 'sqlite':
+            continue
+        pragmas = sqlite_pragmas(config, engine.url)
+        
+        def set_pragmas(dbapi_connection, connection_record, pragmas=pragmas):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+            # The driver opens a transaction just before the first INSERT, UPDATE or DELETE; make it
+            # take the write lock there, so it waits for other writers rather than failing on upgrade
+            dbapi_connection.isolation_level = 'IMMEDIATE'
+        
+        event.listen(engine, 'connect', set_pragmas)
+        _write_locks[engine] = WriteLock(threading.RLock(), config['SQLITE_BUSY_TIMEOUT'] / 1000)
+        logger.debug("SQLite concurrent mode enabled for %s", engine.url.database or ':memory:')
+
+
+def acquire_write_lock(session: Session, engine: Engine) -> None:
+    """Take the engine's writer lock for the session's transaction, if it has one and the session does not hold it"""
+    write_lock = _write_locks.get(engine)
+    if write_lock is None or WRITE_LOCK in session.info:
+        return
+    if write_lock.lock.acquire(timeout=write_lock.timeout):
+        session.info[WRITE_LOCK] = write_lock.lock
+    else:
+        logger.warning("Waited %.1fs for the SQLite writer lock; writing without it", write_lock.timeout)
+
+
+def release_write_lock(session: Session, transaction) -> None:
+    """after_transaction_end listener releasing the writer lock when the session's outermost transaction ends"""
+    if transaction.parent is None:
+        lock = session.info.pop(WRITE_LOCK, None)
+        if lock is not None:
+            lock.release()
+
+
+class RoutingSession(Session):
+    """
+    Session sending reads made through replica_reads to the replica bind
+
+    Once the session writes (a flush or an INSERT/UPDATE/DELETE statement),
+    its later reads stay on the primary until it is closed, so a request
+    always reads its own writes. Without a replica bind it behaves exactly
+    like the default session.
+
+    On SQLite in concurrent mode the first write also takes the engine's
+    writer lock, held until the transaction commits or rolls back.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            if self._flushing or (clause is not None and clause.is_dml):
+                self.info[SESSION_WROTE] = True
+                engine = super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+                acquire_write_lock(self, engine)
+                return engine
+            elif self.info.get(REPLICA_READS) and not self.info.get(SESSION_WROTE):
+                replica = self._db.engines.get(REPLICA_BIND)
+                if replica is not None:
+                    return replica
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def close(self) -> None:
+        self.info.pop(SESSION_WROTE, None)
+        super().close()
+
+
+event.listen(RoutingSession, 'after_transaction_end', release_write_lock)
+
+
+def replica_reads(method: Callable) -> Callable:
+    """Decorator routing a repository read to the replica, if configured and the session has not written"""
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        info = self.session.info
+        info[REPLICA_READS] = info.get(REPLICA_READS, 0) + 1
+        try:
+            return method(self, *args, **kwargs)
+        finally:
+            info[REPLICA_READS] -= 1
+    return wrapper
+
+
+def share_database(db, app, other_app) -> None:
+    """
+    Give other_app the engines and session of app, which db was initialized with
+
+    db.init_app(other_app) would build a second set of engines, without the
+    SQLite pragmas and writer lock configure_sqlite installed or a shared
+    pool. Flask-SQLAlchemy keys engines by app and has no public way to
+    share them, hence the private mapping.
+    """
+    other_app.extensions['sqlalchemy'] = db
+    other_app.teardown_appcontext(db._teardown_session)
+    db._app_engines[other_app] = db._app_engines[app]
+
+
+def dispose_engines_after_fork(db) -> None:
+    """
+    Drop pooled connections inherited from the parent process, in a forked child
+
+    close=False leaves the parent's sockets alone; the child opens its own
+    connections on first use (primary and replica engines alike). SQLite
+    writer locks are replaced, in case the parent forked while one was held.
+    """
+    for engine in db.engines.values():
+        engine.dispose(close=False)
+        write_lock = _write_locks.get(engine)
+        if write_lock is not None:
+            _write_locks[engine] = write_lock._replace(lock=threading.RLock())
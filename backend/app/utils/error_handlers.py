@@ -56,7 +56,7 @@ def create_error_response(
     if details:
         error_response["error"]["details"] = details
         
-    logger.debug(f"Creating error response: {code} - {message} (Status: {status_code})")
+    logger.debug("Creating error response: %s - %s (Status: %s)", code, message, status_code)
     return jsonify(error_response), status_code
 
 def validation_error(errors: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], int]:
@@ -70,7 +70,7 @@ def validation_error(errors: List[Dict[str, Any]]) -> Tuple[Dict[str, Any], int]
         Standardized validation error response
     """
     formatted_errors = format_validation_errors(errors)
-    logger.warning(f"Validation error: {formatted_errors}")
+    logger.warning("Validation error: %s", formatted_errors)
     return create_error_response(
         message="Validation error - check 'details' for more information",
         code=ErrorCode.VALIDATION_ERROR,
@@ -93,7 +93,7 @@ def not_found_error(resource_type: str, resource_id: Any = None) -> Tuple[Dict[s
     if resource_id is not None:
         message = f"{resource_type} with ID {resource_id} not found"
         
-    logger.info(f"Resource not found: {message}")
+    logger.info("Resource not found: %s", message)
     return create_error_response(
         message=message,
         code=ErrorCode.RESOURCE_NOT_FOUND,
@@ -110,7 +110,7 @@ def auth_error(message: str = "Authentication required") -> Tuple[Dict[str, Any]
     Returns:
         Standardized authentication error response
     """
-    logger.warning(f"Authentication error: {message}")
+    logger.warning("Authentication error: %s", message)
     return create_error_response(
         message=message,
         code=ErrorCode.AUTHENTICATION_ERROR,
@@ -127,7 +127,7 @@ def permission_error(message: str = "Insufficient permissions") -> Tuple[Dict[st
     Returns:
         Standardized authorization error response
     """
-    logger.warning(f"Permission error: {message}")
+    logger.warning("Permission error: %s", message)
     return create_error_response(
         message=message,
         code=ErrorCode.AUTHORIZATION_ERROR,
@@ -146,9 +146,9 @@ def server_error(message: str = "Internal server error", exc: Exception = None)
         Standardized server error response
     """
     if exc:
-        logger.error(f"Server error: {message} - {str(exc)}", exc_info=True)
+        logger.error("Server error: %s - %s", message, exc, exc_info=True)
     else:
-        logger.error(f"Server error: {message}")
+        logger.error("Server error: %s", message)
         
     return create_error_response(
         message=message,
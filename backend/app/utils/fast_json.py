@@ -0,0 +1,120 @@
+import json
+from datetime import date, datetime, timezone
+from functools import lru_cache
+from typing import Any, Iterable, List, Optional, Sequence, Tuple, Type, get_args
+
+from flask import current_app, request
+from pydantic import BaseModel
+
+from app.middleware.timing import phase_end, phase_start
+from app.utils.error_handlers import validation_error
+
+WEEKDAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+MONTHS = ('Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+
+@lru_cache(maxsize=65536)
+def http_day(value: date) -> str:
+    """Date part of an RFC 2822 date, e.g. Wed, 01 Jan 1950; lists repeat days, so they are cached"""
+    return f"{WEEKDAYS[value.weekday()]}, {value.day:02d} {MONTHS[value.month - 1]} {value.year:04d}"
+
+
+def http_date(value: date) -> str:
+    """
+    RFC 2822 date as Flask's JSON provider writes dates and datetimes
+
+    Same output as werkzeug.http.http_date (naive datetimes are UTC, plain
+    dates are midnight UTC) without building aware datetimes per value.
+    """
+    if isinstance(value, datetime):
+        if value.tzinfo is not None and value.utcoffset():
+            value = value.astimezone(timezone.utc)
+        # isoformat is the cheapest way to the zero-padded time of day
+        return f"{http_day(value.date())}{value.isoformat(' ', 'seconds')[10:19]} GMT"
+    return f"{http_day(value)} 00:00:00 GMT"
+
+
+def is_date_field(annotation: Any) -> bool:
+    """Whether a schema field holds a date or datetime (optional or not)"""
+    if isinstance(annotation, type):
+        return issubclass(annotation, date)
+    return any(is_date_field(argument) for argument in get_args(annotation))
+
+
+class RowSerializer:
+    """
+    Encodes column-projected rows as the JSON array a response schema gives through jsonify
+
+    Rows are tuples of the schema's fields in `fields` order, as selected by
+    the repositories' find_rows methods. They skip ORM hydration, pydantic
+    validation and model_dump: only date and datetime values are converted
+    before the standard library's C encoder writes the array. Keys, key order,
+    separators and escaping follow the app's JSON provider, so the body is
+    byte-for-byte what `jsonify([schema.model_validate(obj).model_dump() ...])`
+    returns.
+    """
+
+    def __init__(self, schema: Type[BaseModel], fields: Optional[Sequence[str]] = None):
+        self.schema = schema
+        self.fields = tuple(fields or schema.model_fields)
+        self.date_indexes = tuple(index for index, name in enumerate(self.fields)
+                                  if is_date_field(schema.model_fields[name].annotation))
+
+    def project(self, fields: Optional[Sequence[str]]) -> 'RowSerializer':
+        """Serializer for a subset of the schema's fields; this one when fields is empty"""
+        if not fields or tuple(fields) == self.fields:
+            return self
+        return RowSerializer(self.schema, fields)
+
+    def to_dicts(self, rows: Iterable[Sequence[Any]]) -> List[dict]:
+        """Rows as JSON-ready dictionaries, dates already formatted"""
+        fields = self.fields
+        date_indexes = self.date_indexes
+        if not date_indexes:
+            return [dict(zip(fields, row)) for row in rows]
+        items = []
+        for row in rows:
+            values = list(row)
+            for index in date_indexes:
+                if values[index] is not None:
+                    values[index] = http_date(values[index])
+            items.append(dict(zip(fields, values)))
+        return items
+
+    def dumps(self, rows: Iterable[Sequence[Any]]) -> str:
+        """JSON array of the rows, without the trailing newline jsonify adds"""
+        started = phase_start()
+        try:
+            provider = current_app.json
+            indent = 2 if (provider.compact is None and current_app.debug) or provider.compact is False else None
+            encoder = json.JSONEncoder(ensure_ascii=provider.ensure_ascii, sort_keys=provider.sort_keys, indent=indent,
+                                       separators=None if indent else (',', ':'), default=provider.default)
+            return encoder.encode(self.to_dicts(rows))
+        finally:
+            phase_end('serialize', started)
+
+
+def json_response(body: str, status: int = 200):
+    """Response for a body encoded by RowSerializer, as jsonify would send it"""
+    return current_app.response_class(f"{body}\n", status=status, mimetype=current_app.json.mimetype)
+
+
+def requested_fields(schema: Type[BaseModel]) -> Optional[Tuple[str, ...]]:
+    """
+    Fields named by the request's sparse fieldset, e.g. ?fields=id,procedure_code,performed_date
+
+    None when the parameter is absent or empty (every field). Raises
+    ValueError for names that are not fields of the response schema.
+    """
+    names = [name.strip() for name in request.args.get('fields', '').split(',') if name.strip()]
+    if not names:
+        return None
+    unknown = [name for name in names if name not in schema.model_fields]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}; available: {', '.join(schema.model_fields)}")
+    return tuple(dict.fromkeys(names))
+
+
+def fields_error(error: ValueError):
+    """Validation error response for an invalid fields parameter"""
+    return validation_error([{"loc": ["query", "fields"], "msg": str(error), "type": "value_error"}])
@@ -0,0 +1,40 @@
+import hashlib
+
+from flask import current_app, request
+
+def entity_etag(*parts) -> str:
+    """Build an ETag value from an entity name and its version fingerprint"""
+    return '-'.join(str(part) for part in parts)
+
+def filter_tag(*filters) -> str:
+    """
+    Short digest of a list's query filters, as an ETag part
+
+    Differently filtered lists of one collection share its version, so their
+    ETags must differ by the filters; raw values could contain quotes or '-'.
+    """
+    return hashlib.sha1(repr(filters).encode()).hexdigest()[:12]
+
+def is_not_modified(etag: str) -> bool:
+    """
+    Whether the client's If-None-Match already names this ETag
+
+    Weak comparison (RFC 7232): compressed responses carry the ETag as weak.
+    """
+    return request.if_none_match.contains_weak(etag)
+
+def not_modified(etag: str):
+    """Empty 304 response for a client whose cached copy is current"""
+    return with_etag(current_app.response_class(status=304), etag)
+
+def with_etag(response, etag: str):
+    """
+    Attach an ETag to a response
+
+    Registry data is patient-specific, so clients may keep a private copy but
+    must revalidate it on every use.
+    """
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
@@ -0,0 +1,256 @@
+import atexit
+import itertools
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import sys
+import threading
+from datetime import date
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+# Fields whose values never reach the logs (patient PHI, user identity and credentials)
+REDACTED_FIELDS = frozenset({
+    'name', 'first_name', 'last_name', 'birth_date', 'birthdate', 'gender', 'address', 'phone', 'email',
+    'mrn', 'ssn', 'identifier', 'source_identifier', 'password', 'password_hash', 'token', 'access_token',
+    'refresh_token',
+})
+
+# Redacted fields whose numbers are sensitive too (identifiers and credentials); other numbers are counts
+NUMERIC_FIELDS = frozenset({
+    'mrn', 'ssn', 'phone', 'identifier', 'source_identifier', 'password', 'password_hash', 'token', 'access_token',
+    'refresh_token',
+})
+
+REDACTED = '[REDACTED]'
+
+# Unquoted number, and empty or boolean value, in message text
+NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+NO_VALUE = re.compile(r"None|null|True|true|False|false")
+
+# printf-style conversion specifier in a log message: %s, %(name)r, %-10.2f, %*d, %%
+SPECIFIER = re.compile(r"%(?:\((?P<key>[^)]*)\))?[#0\- +]*(?P<width>\*|\d+)?(?:\.(?P<precision>\*|\d+))?[hlL]?"
+                       r"(?P<type>[diouxXeEfFgGcrsa%])")
+
+
+def can_carry_phi(field: str, value: Any) -> bool:
+    """Whether a value of a redacted field can hold PHI: text and dates can, counts, flags and None cannot"""
+    if value is None or isinstance(value, bool):
+        return False
+    return isinstance(value, (str, bytes, date)) or (field in NUMERIC_FIELDS and isinstance(value, (int, float)))
+
+
+def redact(value: Any, fields: frozenset = REDACTED_FIELDS, field: Optional[str] = None) -> Any:
+    """
+    Copy of a log argument with the values of redacted fields replaced
+
+    `field` is the redacted field the value sits under, however deeply. Only
+    values that can carry PHI are replaced, so counts keyed by a field name
+    (`{'gender': 2}`) are kept.
+    """
+    if isinstance(value, Mapping):
+        return {key: redact(item, fields, field or (str(key).lower() if str(key).lower() in fields else None))
+                for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(redact(item, fields, field) for item in value)
+    if hasattr(value, 'model_dump'):
+        return redact(value.model_dump(), fields, field)
+    if field is not None and can_carry_phi(field, value):
+        return REDACTED
+    return value
+
+
+class RedactionFilter(logging.Filter):
+    """
+    Redacts PHI fields in log arguments and in `key: value` pairs of messages
+
+    Arguments are redacted before the message is formatted, so dictionaries and
+    schemas can be logged lazily (`logger.debug("data: %s", data)`), and so is
+    an argument formatted right after a field name
+    (`logger.debug("Finding user by email: %s", email)`). Conversion
+    specifiers are kept, so the message still formats with its arguments.
+    Only values that can carry PHI are replaced: a number under a field name
+    is a count (`{'gender': 2}`), except for identifiers and credentials.
+    """
+
+    def __init__(self, fields: Iterable[str] = REDACTED_FIELDS):
+        super().__init__()
+        self.fields = frozenset(field.lower() for field in fields)
+        names = '|'.join(sorted(map(re.escape, self.fields), key=len, reverse=True))
+        # 'name': 'Jane Doe', "email": "x@y.z", birth_date=1950-01-01
+        self.pattern = re.compile(rf"""(['"]?\b(?P<field>{names})\b['"]?\s*[:=]\s*)('[^']*'|"[^"]*"|[^,}})\s]+)""",
+                                  re.IGNORECASE)
+        # Text ending in a field name, just before the specifier of its value: "email: ", "name='"
+        self.key_before = re.compile(rf"""\b(?P<field>{names})\b['"]?\s*[:=]\s*['"]?$""", re.IGNORECASE)
+
+    @staticmethod
+    def _redact_pair(match: 're.Match[str]') -> str:
+        """Replace the value of a `key: value` pair in message text, unless it is a count, a flag or empty"""
+        field, value = match.group('field').lower(), match.group(3)
+        if NO_VALUE.fullmatch(value) or (field not in NUMERIC_FIELDS and NUMBER.fullmatch(value)):
+            return match.group()
+        return match.group(1) + REDACTED
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.args:
+            if isinstance(record.args, Mapping):
+                record.args = redact(record.args, self.fields)
+            else:
+                record.args = tuple(redact(arg, self.fields) for arg in record.args)
+        if isinstance(record.msg, str) and ('=' in record.msg or ':' in record.msg):
+            if record.args:
+                record.msg, record.args = self._redact_format(record.msg, record.args)
+            else:
+                record.msg = self.pattern.sub(self._redact_pair, record.msg)
+        return True
+
+    def _redact_format(self, msg: str, args: Any):
+        """
+        Redact the literal text of a format string and the arguments formatted after a redacted field name
+
+        Only the text between conversion specifiers is rewritten, so the
+        message keeps one specifier per argument. Arguments are redacted as
+        values of the field, so a count after a field name is kept, and a
+        replaced argument's specifier becomes `s`, since `[REDACTED]` is not
+        a number.
+        """
+        named = isinstance(args, Mapping)
+        values = dict(args) if named else list(args)
+        parts, position, index = [], 0, 0
+        for match in SPECIFIER.finditer(msg):
+            literal = msg[position:match.start()]
+            key = self.key_before.search(literal)
+            # The field name before the specifier is kept as is; its value is the argument
+            head, tail = (literal[:key.start()], literal[key.start():]) if key else (literal, '')
+            parts.append(self.pattern.sub(self._redact_pair, head) + tail)
+            position = match.end()
+            specifier = match.group()
+            if match.group('type') != '%':
+                if not named:
+                    # `*` width and precision take their own arguments first
+                    index += (match.group('width') == '*') + (match.group('precision') == '*')
+                argument = match.group('key') if named else index
+                if key and (argument in values if named else argument < len(values)):
+                    values[argument] = redact(values[argument], self.fields, key.group('field').lower())
+                    if values[argument] is REDACTED:
+                        specifier = specifier[:-1] + 's'
+                if not named:
+                    index += 1
+            parts.append(specifier)
+        parts.append(self.pattern.sub(self._redact_pair, msg[position:]))
+        return ''.join(parts), (values if named else tuple(values))
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps one in every N records at or below a level for configured loggers (and their children)"""
+
+    def __init__(self, rates: Mapping[str, float], level: int = logging.DEBUG):
+        super().__init__()
+        self.level = level
+        self.every = {name: max(1, round(1 / rate)) for name, rate in rates.items() if rate > 0}
+        self.dropped = {name for name, rate in rates.items() if rate <= 0}
+        self.counters: Dict[str, Any] = {name: itertools.count() for name in self.every}
+
+    def _match(self, logger_name: str) -> Optional[str]:
+        while logger_name:
+            if logger_name in self.every or logger_name in self.dropped:
+                return logger_name
+            logger_name = logger_name.rpartition('.')[0]
+        return None
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.level:
+            return True
+        name = self._match(record.name)
+        if name is None:
+            return True
+        if name in self.dropped:
+            return False
+        return next(self.counters[name]) % self.every[name] == 0
+
+
+def parse_sampling(value: str) -> Dict[str, float]:
+    """Parse LOG_SAMPLING ("app.middleware.auth=0.01,app.repositories=0.1")"""
+    rates = {}
+    for pair in filter(None, (part.strip() for part in value.split(','))):
+        name, _, rate = pair.partition('=')
+        try:
+            rates[name.strip()] = float(rate)
+        except ValueError:
+            raise ValueError(f"Invalid LOG_SAMPLING entry '{pair}', expected logger=rate") from None
+    return rates
+
+
+class _LoggingState:
+    """Handler and background listener installed on the root logger"""
+
+    def __init__(self):
+        self.config: Optional[Mapping[str, Any]] = None
+        self.handler: Optional[logging.Handler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+        self.lock = threading.Lock()
+
+
+_state = _LoggingState()
+
+
+def _stop_listener() -> None:
+    """Flush queued records; registered at exit"""
+    if _state.listener is not None:
+        _state.listener.stop()
+        _state.listener = None
+
+
+def configure_logging(config: Mapping[str, Any]) -> None:
+    """
+    Install the root log handler from the LOG_* settings
+
+    With LOG_QUEUE the calling thread only enqueues records and a listener
+    thread writes them, so a slow stderr never blocks requests. Safe to call
+    again (e.g. per create_app); forked processes (Celery pool, WSGI workers)
+    restart the listener automatically.
+    """
+    with _state.lock:
+        root = logging.getLogger()
+        if _state.handler is not None:
+            root.removeHandler(_state.handler)
+        if _state.listener is not None:
+            _state.listener.stop()
+            _state.listener = None
+
+        output = logging.StreamHandler(sys.stderr)
+        output.setFormatter(logging.Formatter(config['LOG_FORMAT']))
+
+        if config['LOG_QUEUE']:
+            records: queue.SimpleQueue = queue.SimpleQueue()
+            handler: logging.Handler = logging.handlers.QueueHandler(records)
+            _state.listener = logging.handlers.QueueListener(records, output, respect_handler_level=True)
+            _state.listener.start()
+        else:
+            handler = output
+
+        # Filters run in the logging thread, before the record is queued and formatted
+        rates = parse_sampling(config['LOG_SAMPLING'])
+        if rates:
+            handler.addFilter(SamplingFilter(rates))
+        extra_fields = [field.strip() for field in config['LOG_REDACT_FIELDS'].split(',') if field.strip()]
+        handler.addFilter(RedactionFilter(REDACTED_FIELDS | frozenset(extra_fields)))
+
+        root.addHandler(handler)
+        root.setLevel(config['LOG_LEVEL'].upper())
+        _state.handler = handler
+        _state.config = config
+
+
+def _restart_after_fork() -> None:
+    """The listener thread does not survive fork; give the child its own queue and listener"""
+    _state.lock = threading.Lock()
+    _state.listener = None
+    if _state.config is not None and _state.config['LOG_QUEUE']:
+        configure_logging(_state.config)
+
+
+atexit.register(_stop_listener)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_after_fork)
@@ -0,0 +1,92 @@
+import math
+import re
+from typing import Dict, Any, Optional
+
+# Value types stored alongside the original observation text
+VALUE_TYPE_QUANTITY = "quantity"
+VALUE_TYPE_STRING = "string"
+
+# Signed decimals with optional exponent, e.g. "-3", "+0.5", ".25", "1.2e-3"
+NUMERIC_PATTERN = re.compile(r'^[+-]?(\d+(\.\d*)?|\.\d+)([eE][+-]?\d+)?$')
+
+# Common spellings mapped to their UCUM codes
+UNIT_ALIASES = {
+    'mmhg': 'mm[Hg]',
+    'mm hg': 'mm[Hg]',
+    'mm[hg]': 'mm[Hg]',
+    'c': 'Cel',
+    '°c': 'Cel',
+    'cel': 'Cel',
+    'celsius': 'Cel',
+    'f': '[degF]',
+    '°f': '[degF]',
+    '[degf]': '[degF]',
+    'fahrenheit': '[degF]',
+    'kg': 'kg',
+    'kilogram': 'kg',
+    'kilograms': 'kg',
+    'g': 'g',
+    'lb': '[lb_av]',
+    'lbs': '[lb_av]',
+    '[lb_av]': '[lb_av]',
+    'cm': 'cm',
+    'm': 'm',
+    'in': '[in_i]',
+    '[in_i]': '[in_i]',
+    'bpm': '/min',
+    'beats/min': '/min',
+    '/min': '/min',
+    '%': '%',
+    'percent': '%',
+    'mg/dl': 'mg/dL',
+    'mmol/l': 'mmol/L',
+    'score': '{score}',
+    'points': '{score}',
+    '{score}': '{score}',
+}
+
+
+def parse_numeric(value: Any) -> Optional[float]:
+    """Parse a finite number from an observation value, or return None"""
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) if math.isfinite(value) else None
+
+    text = str(value).strip()
+    if not NUMERIC_PATTERN.match(text):
+        return None
+
+    number = float(text)
+    return number if math.isfinite(number) else None
+
+
+def normalize_unit(unit: Optional[str]) -> Optional[str]:
+    """Map a free-text unit onto its UCUM code where one is known"""
+    if unit is None:
+        return None
+    text = unit.strip()
+    if not text:
+        return None
+    return UNIT_ALIASES.get(text.lower(), text)
+
+
+def parse_observation_value(value: Any, unit: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Derive the typed storage columns for an observation value
+
+    Args:
+        value: The observation value as submitted (usually text)
+        unit: The unit of measurement as submitted
+
+    Returns:
+        Dictionary with value_numeric, value_type and unit_normalized keys
+    """
+    numeric = parse_numeric(value)
+    return {
+        'value_numeric': numeric,
+        'value_type': VALUE_TYPE_QUANTITY if numeric is not None else VALUE_TYPE_STRING,
+        'unit_normalized': normalize_unit(unit),
+    }
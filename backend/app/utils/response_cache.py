@@ -0,0 +1,164 @@
+import logging
+from functools import lru_cache
+from typing import Any, Callable, Hashable, Iterable, Optional, Tuple, Union
+
+from pydantic import TypeAdapter, ValidationError
+
+from app.config import Config
+from app.utils.cache import TTLCache, MISSING
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+
+def entity_key(entity: str, id: int) -> str:
+    """Cache key of a single record, e.g. patient:42"""
+    return f"{entity}:{id}"
+
+
+def collection_key(entity: str, patient_id: int) -> str:
+    """Cache key of a patient's records of one entity, e.g. conditions:patient:42"""
+    return f"{entity}s:patient:{patient_id}"
+
+
+def json_key(key: str) -> str:
+    """Cache key of the encoded JSON body for a cached response, e.g. conditions:patient:42:json"""
+    return f"{key}:json"
+
+
+# Versions are a record's version or a collection fingerprint (count, max ID, sum of versions)
+Version = Optional[Union[int, Tuple[int, ...]]]
+
+
+@lru_cache(maxsize=None)
+def entry_adapter(value_type: Any) -> TypeAdapter:
+    """Validator and JSON encoder of (version, value) cache entries holding value_type"""
+    return TypeAdapter(Tuple[Version, value_type])
+
+
+class LocalCacheBackend:
+    """In-process LRU backend; each process keeps its own entries, as the objects themselves"""
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 300.0):
+        self.cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def get(self, key: str, value_type: Any = Any) -> Any:
+        return self.cache.get(key)
+
+    def set(self, key: str, entry: Tuple[Hashable, Any], value_type: Any = Any) -> None:
+        self.cache.set(key, entry)
+
+    def delete(self, *keys: str) -> None:
+        for key in keys:
+            self.cache.delete(key)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+
+class RedisCacheBackend:
+    """
+    Redis backend shared by every API process and the Celery workers
+
+    Entries are stored as JSON and validated against the cached value's type
+    when read, so nothing from the shared server is ever unpickled. Redis
+    failures and entries that no longer validate (e.g. written before a
+    response schema changed) are logged and treated as cache misses, so
+    reads never fail because of the cache.
+    """
+
+    def __init__(self, url: str, ttl: int = 300, prefix: str = 'response-cache:'):
+        import redis  # Only needed when this backend is configured
+
+        self.client = redis.Redis.from_url(url)
+        self.errors = redis.RedisError
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def get(self, key: str, value_type: Any = Any) -> Any:
+        try:
+            data = self.client.get(self.prefix + key)
+        except self.errors as e:
+            logger.warning("Response cache read failed for %s: %s", key, e)
+            return MISSING
+        if data is None:
+            return MISSING
+        try:
+            return entry_adapter(value_type).validate_json(data)
+        except ValidationError as e:
+            logger.warning("Discarding unreadable response cache entry %s: %s", key, e.error_count())
+            return MISSING
+
+    def set(self, key: str, entry: Tuple[Hashable, Any], value_type: Any = Any) -> None:
+        try:
+            self.client.set(self.prefix + key, entry_adapter(value_type).dump_json(entry), ex=self.ttl)
+        except self.errors as e:
+            logger.warning("Response cache write failed for %s: %s", key, e)
+
+    def delete(self, *keys: str) -> None:
+        try:
+            self.client.delete(*(self.prefix + key for key in keys))
+        except self.errors as e:
+            logger.error("Response cache invalidation failed for %s keys: %s", len(keys), e)
+
+    def clear(self) -> None:
+        keys = list(self.client.scan_iter(match=self.prefix + '*'))
+        if keys:
+            self.client.delete(*keys)
+
+
+class ResponseCache:
+    """
+    Read-through cache of service responses
+
+    Entries are stored with the version they were built from and only served
+    for that version, so a missed invalidation can never serve stale data;
+    writes still delete their keys so memory is not spent on dead entries.
+    """
+
+    def __init__(self, backend: Optional[Any] = None):
+        self.backend = backend
+
+    def get_or_load(self, key: str, version: Hashable, loader: Callable[[], Any], value_type: Any = Any) -> Any:
+        """
+        Return the entry for key if it was built from this version, otherwise load and store it
+
+        value_type is the type loader returns (a response schema, a list of
+        them or str); backends that serialize entries validate them with it.
+        """
+        if self.backend is None:
+            return loader()
+        entry = self.backend.get(key, value_type)
+        if entry is not MISSING and entry[0] == version:
+            return entry[1]
+        value = loader()
+        if value is not None:
+            self.backend.set(key, (version, value), value_type)
+        return value
+
+    def invalidate(self, keys: Iterable[str]) -> None:
+        """Delete the entries for the given keys"""
+        keys = list(keys)
+        if self.backend is not None and keys:
+            logger.debug("Invalidating %s response cache entries", len(keys))
+            self.backend.delete(*keys)
+
+    def clear(self) -> None:
+        """Delete every entry"""
+        if self.backend is not None:
+            self.backend.clear()
+
+
+def create_response_cache(config=Config) -> ResponseCache:
+    """Build the response cache for the configured backend (memory, redis or none)"""
+    backend = config.RESPONSE_CACHE_BACKEND.lower()
+    if backend == 'none':
+        return ResponseCache()
+    if backend == 'redis':
+        return ResponseCache(RedisCacheBackend(config.RESPONSE_CACHE_REDIS_URL, ttl=config.RESPONSE_CACHE_TTL))
+    if backend != 'memory':
+        logger.warning("Unknown RESPONSE_CACHE_BACKEND '%s', using the in-process cache", backend)
+    return ResponseCache(LocalCacheBackend(maxsize=config.RESPONSE_CACHE_SIZE, ttl=config.RESPONSE_CACHE_TTL))
+
+# Shared instance used by the services
+response_cache = create_response_cache()
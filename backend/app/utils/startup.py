@@ -0,0 +1,26 @@
+import time
+from typing import Dict
+
+# app.extensions key holding the create_app phase timings
+STARTUP_TIMINGS = 'startup_timings'
+
+
+class StartupTimer:
+    """Wall time of consecutive startup phases, in seconds"""
+
+    def __init__(self):
+        self.started = self.last = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    def mark(self, phase: str) -> None:
+        """Record the time since the previous mark as the given phase"""
+        now = time.perf_counter()
+        self.phases[phase] = now - self.last
+        self.last = now
+
+    @property
+    def total(self) -> float:
+        return self.last - self.started
+
+    def as_dict(self) -> Dict[str, float]:
+        return {'phases': dict(self.phases), 'total': self.total}
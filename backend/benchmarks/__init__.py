@@ -0,0 +1,4 @@
+# This file makes the benchmarks directory a Python package
+#
+# Benchmarks are run from the backend directory, e.g. `python -m benchmarks.startup`,
+# and append one JSON record per run to benchmarks/results/<name>.jsonl.
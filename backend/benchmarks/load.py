@@ -0,0 +1,245 @@
+"""
+HTTP load benchmark: a realistic request mix against an in-process server
+
+Starts the API in this process on a temporary SQLite database filled with
+synthetic patients, with an in-memory Celery broker standing in for Redis,
+and drives it over HTTP from concurrent clients. Run from the backend directory:
+
+    python -m benchmarks.load --patients 500 --concurrency 8 --requests 2000 --compare
+
+Reports throughput and p50/p95/p99 latency per endpoint and appends a JSON
+record to benchmarks/results/load.jsonl.
+"""
+import argparse
+import logging
+import math
+import os
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Stub the broker before the app (and its Celery instance) is imported
+os.environ.setdefault('CELERY_BROKER_URL', 'memory://')
+os.environ.setdefault('CELERY_RESULT_BACKEND', 'cache+memory://')
+
+import requests
+from werkzeug.serving import make_server
+
+from benchmarks.results import read_results, write_result
+
+BENCHMARK_NAME = 'load'
+
+MOCA_CODE = '72172-0'
+
+FIRST_NAMES = ['Ada', 'Ben', 'Carla', 'Dev', 'Elena', 'Farid', 'Grace', 'Hiro', 'Ines', 'Jonas', 'Kemi', 'Luis']
+LAST_NAMES = ['Abbott', 'Barros', 'Chen', 'Diallo', 'Evans', 'Fischer', 'Garcia', 'Haddad', 'Ito', 'Jensen']
+CONDITION_CODES = ['G30.9', 'G20', 'G35', 'G40.909', 'G43.909']
+
+
+def synthetic_patient(rng: random.Random) -> Dict[str, Any]:
+    birth_date = date(1930, 1, 1) + timedelta(days=rng.randint(0, 365 * 60))
+    return {'name': f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}", 'birth_date': birth_date.isoformat(),
+            'gender': rng.choice(['male', 'female'])}
+
+
+def moca_observation(patient_id: int, score: int, when: datetime) -> Dict[str, Any]:
+    return {'observation_code': MOCA_CODE, 'observation_name': 'MoCA total score', 'value': str(score),
+            'unit': '{score}', 'observation_date': when.isoformat(timespec='seconds'), 'status': 'final',
+            'patient_id': patient_id}
+
+
+def populate(app, patients: int, seed: int) -> List[int]:
+    """Insert synthetic patient histories (as `flask generate-data` does); returns the patient IDs"""
+    from sqlalchemy import select
+    from app import db
+    from app.models import Patient
+    from app.services.synthetic_data_service import synthetic_data_service
+
+    with app.app_context():
+        synthetic_data_service.generate(patients, seed=seed)
+        return list(db.session.execute(select(Patient.id).order_by(Patient.id)).scalars())
+
+
+def request_mix(patient_ids: List[int], rng: random.Random) -> Dict[str, Tuple[int, Callable[[], Tuple[str, str, Dict[str, Any]]]]]:
+    """
+    Endpoint label -> (weight, request builder)
+
+    Weights approximate a clinic workload dominated by chart reads, with
+    occasional searches, cohorts, writes and logins.
+    """
+    def patient():
+        return rng.choice(patient_ids)
+
+    return {
+        'POST /auth/login': (1, lambda: ('POST', '/auth/login', {'json': {'username': 'admin', 'password': 'password'}})),
+        'GET /patients/': (4, lambda: ('GET', '/patients/', {})),
+        'GET /patients/<id>': (15, lambda: ('GET', f"/patients/{patient()}", {})),
+        'GET /patients/search': (6, lambda: ('GET', f"/patients/search?name={rng.choice(LAST_NAMES)}", {})),
+        'GET /conditions/patient/<id>': (15, lambda: ('GET', f"/conditions/patient/{patient()}", {})),
+        'GET /observations/patient/<id>': (20, lambda: ('GET', f"/observations/patient/{patient()}", {})),
+        'GET /procedures/patient/<id>': (10, lambda: ('GET', f"/procedures/patient/{patient()}", {})),
+        'GET /observations/summary': (4, lambda: ('GET', f"/observations/summary?code={MOCA_CODE}", {})),
+        'GET /statistics/summary': (3, lambda: ('GET', '/statistics/summary', {})),
+        'POST /cohorts/count': (3, lambda: ('POST', '/cohorts/count', {'json': {'criteria': {'and': [
+            {'condition': {'code': rng.choice(CONDITION_CODES)}},
+            {'observation': {'code': MOCA_CODE, 'max_value': rng.randint(18, 26)}}]}}})),
+        'POST /observations/': (6, lambda: ('POST', '/observations/', {'json': moca_observation(
+            patient(), rng.randint(10, 30), datetime(2024, 1, 1) + timedelta(days=rng.randint(0, 365)))})),
+        'POST /patients/': (2, lambda: ('POST', '/patients/', {'json': synthetic_patient(rng)})),
+    }
+
+
+def start_server(patients: int, seed: int):
+    """Create the app on a fresh SQLite database and serve it on an ephemeral port in a thread"""
+    from app import create_app, db
+    from app.services.seed_service import seed_service
+
+    handle, database_path = tempfile.mkstemp(suffix='.db', prefix='load_benchmark_')
+    os.close(handle)
+    app = create_app(role='api', config={
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{database_path}",
+        'SEED_ON_STARTUP': False,
+        'LOG_LEVEL': 'WARNING',
+    })
+    with app.app_context():
+        db.create_all()
+        seed_service.seed(force=True)
+    patient_ids = populate(app, patients, seed)
+
+    # One access log line per request would dominate the measurement
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    def stop():
+        server.shutdown()
+        with app.app_context():
+            db.engine.dispose()
+        os.remove(database_path)
+
+    return f"http://127.0.0.1:{server.server_port}", patient_ids, stop
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of pre-sorted values"""
+    index = min(len(sorted_values) - 1, max(0, math.ceil(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def run_load(base_url: str, patient_ids: List[int], concurrency: int, total_requests: int, seed: int,
+             only: Optional[Callable[[str], bool]] = None) -> Tuple[Dict[str, List[float]], Dict[str, int], float]:
+    """Issue total_requests from concurrency clients (endpoints passing `only`); latencies and error counts per endpoint"""
+    latencies: Dict[str, List[float]] = {}
+    errors: Dict[str, int] = {}
+    lock = threading.Lock()
+    remaining = iter(range(total_requests))
+
+    def client(worker: int) -> None:
+        rng = random.Random(seed * 1000 + worker)
+        mix = request_mix(patient_ids, rng)
+        labels = [label for label in mix if only is None or only(label)]
+        weights = [mix[label][0] for label in labels]
+        session = requests.Session()
+        token = session.post(f"{base_url}/auth/login", json={'username': 'admin', 'password': 'password'}).json()
+        session.headers['Authorization'] = f"Bearer {token['access_token']}"
+        while True:
+            with lock:
+                if next(remaining, None) is None:
+                    return
+            label = rng.choices(labels, weights)[0]
+            method, path, kwargs = mix[label][1]()
+            started = time.perf_counter()
+            try:
+                response = session.request(method, base_url + path, timeout=60, **kwargs)
+                failed = response.status_code >= 400
+            except requests.RequestException:
+                failed = True
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.setdefault(label, []).append(elapsed)
+                if failed:
+                    errors[label] = errors.get(label, 0) + 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(client, range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def summarize(latencies: Dict[str, List[float]], errors: Dict[str, int], elapsed: float) -> Dict[str, Any]:
+    endpoints = {}
+    for label, values in sorted(latencies.items()):
+        values = sorted(values)
+        endpoints[label] = {
+            'requests': len(values),
+            'errors': errors.get(label, 0),
+            'throughput_rps': len(values) / elapsed,
+            'p50_ms': percentile(values, 0.50) * 1000,
+            'p95_ms': percentile(values, 0.95) * 1000,
+            'p99_ms': percentile(values, 0.99) * 1000,
+        }
+    every = sorted(value for values in latencies.values() for value in values)
+    return {
+        'requests': len(every),
+        'errors': sum(errors.values()),
+        'elapsed_s': elapsed,
+        'throughput_rps': len(every) / elapsed,
+        'p50_ms': percentile(every, 0.50) * 1000,
+        'p95_ms': percentile(every, 0.95) * 1000,
+        'p99_ms': percentile(every, 0.99) * 1000,
+        'endpoints': endpoints,
+    }
+
+
+def print_report(results: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> None:
+    baseline = previous['results']['summary']['endpoints'] if previous else {}
+    if previous:
+        print(f"Compared with {previous['revision']} ({previous['recorded_at']})")
+    print(f"{'endpoint':<34} {'reqs':>6} {'err':>4} {'rps':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for label, stats in results['summary']['endpoints'].items():
+        line = (f"{label:<34} {stats['requests']:>6} {stats['errors']:>4} {stats['throughput_rps']:>8.1f} "
+                f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f}")
+        if label in baseline and baseline[label]['p95_ms']:
+            line += f"  (p95 {(stats['p95_ms'] - baseline[label]['p95_ms']) / baseline[label]['p95_ms']:+.1%})"
+        print(line)
+    summary = results['summary']
+    print(f"{'all':<34} {summary['requests']:>6} {summary['errors']:>4} {summary['throughput_rps']:>8.1f} "
+          f"{summary['p50_ms']:>8.2f} {summary['p95_ms']:>8.2f} {summary['p99_ms']:>8.2f}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--patients', type=int, default=500, help='Synthetic patients to create (default 500)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent clients (default 8)')
+    parser.add_argument('--requests', type=int, default=2000, help='Total requests to issue (default 2000)')
+    parser.add_argument('--seed', type=int, default=1, help='Seed for the data and the request mix (default 1)')
+    parser.add_argument('--output', help='Results file (default benchmarks/results/load.jsonl)')
+    parser.add_argument('--compare', action='store_true', help='Show the p95 change against the last recorded run')
+    parser.add_argument('--no-record', action='store_true', help='Print the results without recording them')
+    args = parser.parse_args(argv)
+
+    base_url, patient_ids, stop = start_server(args.patients, args.seed)
+    try:
+        latencies, errors, elapsed = run_load(base_url, patient_ids, args.concurrency, args.requests, args.seed)
+    finally:
+        stop()
+
+    results = {
+        'patients': args.patients,
+        'concurrency': args.concurrency,
+        'seed': args.seed,
+        'summary': summarize(latencies, errors, elapsed),
+    }
+    previous = read_results(BENCHMARK_NAME, args.output)
+    print_report(results, previous[-1] if args.compare and previous else None)
+    if not args.no_record:
+        write_result(BENCHMARK_NAME, results, args.output)
+
+
+if __name__ == '__main__':
+    main()
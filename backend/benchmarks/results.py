@@ -0,0 +1,61 @@
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+BENCHMARKS_DIR = os.path.dirname(os.path.abspath(__file__))
+RESULTS_DIR = os.path.join(BENCHMARKS_DIR, 'results')
+
+
+def git_revision() -> Optional[str]:
+    """Commit the benchmark ran against, marked dirty when the tree has changes"""
+    try:
+        revision = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=BENCHMARKS_DIR,
+                                  capture_output=True, text=True, check=True).stdout.strip()
+        status = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=BENCHMARKS_DIR,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{revision}-dirty" if status else revision
+
+
+def results_path(name: str) -> str:
+    """Default results file for a benchmark"""
+    return os.path.join(RESULTS_DIR, f"{name}.jsonl")
+
+
+def write_result(name: str, results: Dict[str, Any], path: Optional[str] = None) -> Dict[str, Any]:
+    """Append one benchmark run, with the commit and environment it ran in, as a JSON line"""
+    record = {
+        'benchmark': name,
+        'revision': git_revision(),
+        'recorded_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    path = path or results_path(name)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'a', encoding='utf-8') as handle:
+        handle.write(json.dumps(record, sort_keys=True) + '\n')
+    return record
+
+
+def read_results(name: str, path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """All recorded runs of a benchmark, oldest first"""
+    path = path or results_path(name)
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as handle:
+        return [json.loads(line) for line in handle if line.strip()]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB"""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
@@ -0,0 +1,181 @@
+"""
+Serialization benchmark: list responses through the schemas vs. from projected rows
+
+For each entity and list size, builds the same JSON body two ways inside a
+request context on a temporary SQLite database of synthetic patients:
+
+    schema  ORM entities -> XResponse.model_validate -> model_dump -> jsonify
+    rows    projected row tuples -> RowSerializer -> json_response
+
+and checks the bodies are identical. Procedure lists are also encoded with
+a sparse fieldset (?fields=...) that leaves out the notes text. Run from the
+backend directory:
+
+    python -m benchmarks.serialization --patients 2000 --sizes 100 1000 10000 --compare
+
+Reports the median time per list and the speedup, and appends a JSON record
+to benchmarks/results/serialization.jsonl.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Stub the broker before the app (and its Celery instance) is imported
+os.environ.setdefault('CELERY_BROKER_URL', 'memory://')
+os.environ.setdefault('CELERY_RESULT_BACKEND', 'cache+memory://')
+
+from benchmarks.load import populate
+from benchmarks.results import read_results, write_result
+
+BENCHMARK_NAME = 'serialization'
+
+# Sparse fieldset of a procedure list view (?fields=...), leaving out the notes text
+PROCEDURE_SUMMARY_FIELDS = ('id', 'procedure_code', 'procedure_name', 'performed_date', 'status')
+
+
+def create_app_with_data(patients: int, seed: int):
+    """App on a fresh SQLite database filled with synthetic patient histories"""
+    from app import create_app, db
+    from app.services.seed_service import seed_service
+
+    handle, database_path = tempfile.mkstemp(suffix='.db', prefix='serialization_benchmark_')
+    os.close(handle)
+    app = create_app(role='api', config={
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{database_path}",
+        'SEED_ON_STARTUP': False,
+        'LOG_LEVEL': 'WARNING',
+    })
+    with app.app_context():
+        db.create_all()
+        seed_service.seed(force=True)
+    populate(app, patients, seed)
+
+    def cleanup():
+        with app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        os.remove(database_path)
+
+    return app, cleanup
+
+
+def list_builders(model, schema, size: int,
+                  fields: Optional[Tuple[str, ...]] = None) -> Tuple[Callable[[], bytes], Callable[[], bytes]]:
+    """The schema path and the row path (only `fields`, if given) for the first `size` records of a model"""
+    from flask import jsonify
+    from sqlalchemy import select
+    from app import db
+    from app.utils.fast_json import RowSerializer, json_response
+
+    serializer = RowSerializer(schema, fields)
+
+    def schema_path() -> bytes:
+        entities = db.session.query(model).order_by(model.id).limit(size).all()
+        body = jsonify([schema.model_validate(entity).model_dump() for entity in entities]).get_data()
+        db.session.remove()
+        return body
+
+    def row_path() -> bytes:
+        columns = [getattr(model, name) for name in serializer.fields]
+        rows = db.session.execute(select(*columns).order_by(model.id).limit(size)).all()
+        body = json_response(serializer.dumps(rows)).get_data()
+        db.session.remove()
+        return body
+
+    return schema_path, row_path
+
+
+def median_ms(build: Callable[[], bytes], repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        build()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def run(app, sizes: List[int], repeats: int) -> Dict[str, Any]:
+    from app import db
+    from app.models import Patient, Condition, Observation, Procedure
+    from app.schemas import PatientResponse, ConditionResponse, ObservationResponse, ProcedureResponse
+
+    results = {}
+    with app.test_request_context():
+        for name, model, schema in (('patients', Patient, PatientResponse),
+                                    ('conditions', Condition, ConditionResponse),
+                                    ('observations', Observation, ObservationResponse),
+                                    ('procedures', Procedure, ProcedureResponse)):
+            available = db.session.query(model).count()
+            for size in sizes:
+                if size > available:
+                    print(f"Skipping {name} x {size}: only {available} rows")
+                    continue
+                schema_path, row_path = list_builders(model, schema, size)
+                body = row_path()
+                if schema_path() != body:
+                    raise AssertionError(f"Row-encoded {name} body differs from the schema path")
+                schema_ms = median_ms(schema_path, repeats)
+                rows_ms = median_ms(row_path, repeats)
+                results[f"{name} x {size}"] = {
+                    'rows': size,
+                    'bytes': len(body),
+                    'schema_ms': schema_ms,
+                    'rows_ms': rows_ms,
+                    'speedup': schema_ms / rows_ms,
+                }
+                if model is Procedure:
+                    _, summary_path = list_builders(model, schema, size, PROCEDURE_SUMMARY_FIELDS)
+                    summary_ms = median_ms(summary_path, repeats)
+                    results[f"{name} summary x {size}"] = {
+                        'rows': size,
+                        'bytes': len(summary_path()),
+                        'schema_ms': schema_ms,
+                        'rows_ms': summary_ms,
+                        'speedup': schema_ms / summary_ms,
+                    }
+    return results
+
+
+def print_report(results: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> None:
+    baseline = previous['results']['lists'] if previous else {}
+    if previous:
+        print(f"Compared with {previous['revision']} ({previous['recorded_at']})")
+    print(f"{'list':<30} {'bytes':>10} {'schema ms':>10} {'rows ms':>10} {'speedup':>8}")
+    for label, stats in results['lists'].items():
+        line = (f"{label:<30} {stats['bytes']:>10} {stats['schema_ms']:>10.2f} {stats['rows_ms']:>10.2f} "
+                f"{stats['speedup']:>7.1f}x")
+        if label in baseline and baseline[label]['rows_ms']:
+            line += f"  (rows {(stats['rows_ms'] - baseline[label]['rows_ms']) / baseline[label]['rows_ms']:+.1%})"
+        print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--patients', type=int, default=2000, help='Synthetic patients to create (default 2000)')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000],
+                        help='List sizes to encode (default 100 1000 10000)')
+    parser.add_argument('--repeats', type=int, default=7, help='Timed builds per list, median reported (default 7)')
+    parser.add_argument('--seed', type=int, default=1, help='Seed for the synthetic data (default 1)')
+    parser.add_argument('--output', help='Results file (default benchmarks/results/serialization.jsonl)')
+    parser.add_argument('--compare', action='store_true', help='Show the change against the last recorded run')
+    parser.add_argument('--no-record', action='store_true', help='Print the results without recording them')
+    args = parser.parse_args(argv)
+
+    app, cleanup = create_app_with_data(args.patients, args.seed)
+    try:
+        lists = run(app, args.sizes, args.repeats)
+    finally:
+        cleanup()
+
+    results = {'patients': args.patients, 'seed': args.seed, 'repeats': args.repeats, 'lists': lists}
+    previous = read_results(BENCHMARK_NAME, args.output)
+    print_report(results, previous[-1] if args.compare and previous else None)
+    if not args.no_record:
+        write_result(BENCHMARK_NAME, results, args.output)
+
+
+if __name__ == '__main__':
+    main()
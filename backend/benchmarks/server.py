@@ -0,0 +1,166 @@
+"""
+Server scaling benchmark: read throughput of the gunicorn entrypoint by worker count
+
+Fills a temporary SQLite database with synthetic patients, then for each
+worker count starts `gunicorn --config gunicorn.conf.py wsgi:app` (preloaded,
+gthread workers) against it and drives the read endpoints of the load mix
+over HTTP. Run from the backend directory:
+
+    python -m benchmarks.server --workers 1 2 4 8 --threads 4 --concurrency 32 --compare
+
+Reports throughput, p50/p95 latency and the speedup over the first worker
+count, and appends a JSON record to benchmarks/results/server.jsonl. Only
+reads are issued: SQLite serializes writes across processes, which would
+measure the database rather than the server.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Stub the broker before the app (and its Celery instance) is imported
+os.environ.setdefault('CELERY_BROKER_URL', 'memory://')
+os.environ.setdefault('CELERY_RESULT_BACKEND', 'cache+memory://')
+
+import requests
+
+from benchmarks.load import populate, run_load, summarize
+from benchmarks.results import BENCHMARKS_DIR, read_results, write_result
+
+BENCHMARK_NAME = 'server'
+
+BACKEND_DIR = os.path.dirname(BENCHMARKS_DIR)
+
+STARTUP_TIMEOUT = 60
+
+
+def prepare_database(patients: int, seed: int) -> Tuple[str, List[int]]:
+    """Temporary SQLite database with reference data and synthetic patients; returns its path and the patient IDs"""
+    from app import create_app, db
+    from app.services.seed_service import seed_service
+
+    handle, database_path = tempfile.mkstemp(suffix='.db', prefix='server_benchmark_')
+    os.close(handle)
+    app = create_app(role='cli', config={
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{database_path}",
+        'SEED_ON_STARTUP': False,
+        'LOG_LEVEL': 'WARNING',
+    })
+    with app.app_context():
+        db.create_all()
+        seed_service.seed(force=True)
+    patient_ids = populate(app, patients, seed)
+    with app.app_context():
+        db.engine.dispose()
+    return database_path, patient_ids
+
+
+def free_port() -> int:
+    with socket.socket() as probe:
+        probe.bind(('127.0.0.1', 0))
+        return probe.getsockname()[1]
+
+
+def start_gunicorn(database_path: str, workers: int, threads: int) -> Tuple[str, subprocess.Popen]:
+    """Start the production entrypoint on an ephemeral port and wait until it answers"""
+    port = free_port()
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{database_path}", SEED_ON_STARTUP='false', LOG_LEVEL='WARNING',
+               WEB_BIND=f"127.0.0.1:{port}", WEB_WORKERS=str(workers), WEB_THREADS=str(threads))
+    process = subprocess.Popen([sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', 'wsgi:app'],
+                               cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with code {process.returncode}")
+        try:
+            requests.get(f"{base_url}/health/", timeout=1)
+            return base_url, process
+        except requests.RequestException:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"gunicorn did not answer within {STARTUP_TIMEOUT}s")
+
+
+def is_read(label: str) -> bool:
+    return label.startswith('GET ')
+
+
+def run(database_path: str, patient_ids: List[int], worker_counts: List[int], threads: int, concurrency: int,
+        total_requests: int, seed: int) -> Dict[str, Any]:
+    runs = {}
+    for workers in worker_counts:
+        base_url, process = start_gunicorn(database_path, workers, threads)
+        try:
+            # Warm every worker's caches before measuring
+            run_load(base_url, patient_ids, concurrency, min(total_requests, 50 * workers * threads), seed, is_read)
+            latencies, errors, elapsed = run_load(base_url, patient_ids, concurrency, total_requests, seed, is_read)
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+        summary = summarize(latencies, errors, elapsed)
+        runs[str(workers)] = {key: summary[key] for key in
+                              ('requests', 'errors', 'throughput_rps', 'p50_ms', 'p95_ms', 'p99_ms')}
+    return runs
+
+
+def print_report(results: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> None:
+    baseline = previous['results']['runs'] if previous else {}
+    if previous:
+        print(f"Compared with {previous['revision']} ({previous['recorded_at']})")
+    print(f"{results['cpu_count']} CPU cores, {results['threads']} threads per worker, "
+          f"{results['concurrency']} concurrent clients")
+    print(f"{'workers':>8} {'reqs':>6} {'err':>4} {'rps':>8} {'speedup':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    runs = results['runs']
+    first = next(iter(runs.values()))['throughput_rps'] if runs else 0
+    for workers, stats in runs.items():
+        line = (f"{workers:>8} {stats['requests']:>6} {stats['errors']:>4} {stats['throughput_rps']:>8.1f} "
+                f"{stats['throughput_rps'] / first:>7.2f}x {stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f}")
+        if workers in baseline and baseline[workers]['throughput_rps']:
+            change = (stats['throughput_rps'] - baseline[workers]['throughput_rps']) / baseline[workers]['throughput_rps']
+            line += f"  (rps {change:+.1%})"
+        print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    cpu_count = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--patients', type=int, default=500, help='Synthetic patients to create (default 500)')
+    parser.add_argument('--workers', type=int, nargs='+',
+                        default=sorted({1, max(1, cpu_count // 2), cpu_count}),
+                        help='Worker counts to measure (default 1, half and all CPU cores)')
+    parser.add_argument('--threads', type=int, default=4, help='Threads per worker (default 4)')
+    parser.add_argument('--concurrency', type=int, default=32, help='Concurrent clients (default 32)')
+    parser.add_argument('--requests', type=int, default=3000, help='Requests per worker count (default 3000)')
+    parser.add_argument('--seed', type=int, default=1, help='Seed for the data and the request mix (default 1)')
+    parser.add_argument('--output', help='Results file (default benchmarks/results/server.jsonl)')
+    parser.add_argument('--compare', action='store_true', help='Show the change against the last recorded run')
+    parser.add_argument('--no-record', action='store_true', help='Print the results without recording them')
+    args = parser.parse_args(argv)
+
+    database_path, patient_ids = prepare_database(args.patients, args.seed)
+    try:
+        runs = run(database_path, patient_ids, args.workers, args.threads, args.concurrency, args.requests, args.seed)
+    finally:
+        os.remove(database_path)
+
+    results = {
+        'patients': args.patients,
+        'cpu_count': cpu_count,
+        'threads': args.threads,
+        'concurrency': args.concurrency,
+        'seed': args.seed,
+        'runs': runs,
+    }
+    previous = read_results(BENCHMARK_NAME, args.output)
+    print_report(results, previous[-1] if args.compare and previous else None)
+    if not args.no_record:
+        write_result(BENCHMARK_NAME, results, args.output)
+
+
+if __name__ == '__main__':
+    main()
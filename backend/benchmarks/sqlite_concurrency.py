@@ -0,0 +1,244 @@
+"""
+SQLite concurrency benchmark: mixed reads and writes with and without concurrent mode
+
+For each mode, fills a temporary SQLite database with synthetic patients,
+then for a fixed time runs, against the same file:
+
+    readers    threads reading a collection version and one patient's observations, like API list requests
+    writers    threads inserting a synthetic patient history per transaction, like API writes
+    processes  separate processes doing the same, like Celery write-backs
+
+with SQLITE_CONCURRENT_MODE off (rollback journal, the driver's default lock
+timeout) and on (WAL, busy_timeout and pragmas, one writer per process).
+Run from the backend directory:
+
+    python -m benchmarks.sqlite_concurrency --readers 8 --writers 4 --processes 2 --seconds 10 --compare
+
+Reports reads and writes per second, p50/p95/max latency and "database is
+locked" errors per mode, and appends a JSON record to
+benchmarks/results/sqlite_concurrency.jsonl.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+# Stub the broker before the app (and its Celery instance) is imported
+os.environ.setdefault('CELERY_BROKER_URL', 'memory://')
+os.environ.setdefault('CELERY_RESULT_BACKEND', 'cache+memory://')
+
+from benchmarks.load import percentile, populate
+from benchmarks.results import read_results, write_result
+
+BENCHMARK_NAME = 'sqlite_concurrency'
+
+MODES = {'off': False, 'on': True}
+
+# Patients inserted per write transaction
+WRITE_BATCH = 5
+
+
+def create_benchmark_app(database_path: str, concurrent: bool):
+    from app import create_app
+
+    return create_app(role='worker', config={
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{database_path}",
+        'SQLITE_CONCURRENT_MODE': concurrent,
+        'SEED_ON_STARTUP': False,
+        'LOG_LEVEL': 'ERROR',
+    })
+
+
+def prepare_database(patients: int, seed: int) -> Tuple[str, List[int]]:
+    """Temporary SQLite database with reference data and synthetic patients; returns its path and the patient IDs"""
+    from app import db
+    from app.services.seed_service import seed_service
+
+    handle, database_path = tempfile.mkstemp(suffix='.db', prefix='sqlite_benchmark_')
+    os.close(handle)
+    app = create_benchmark_app(database_path, concurrent=False)
+    with app.app_context():
+        db.create_all()
+        seed_service.seed(force=True)
+    patient_ids = populate(app, patients, seed)
+    with app.app_context():
+        db.engine.dispose()
+    return database_path, patient_ids
+
+
+def is_locked(error: Exception) -> bool:
+    return 'database is locked' in str(error) or 'database is busy' in str(error)
+
+
+def run_operations(app, operation, deadline: float, seed: int) -> Tuple[List[float], int]:
+    """Repeat operation, one app context (like one request) each, until the deadline; latencies and lock errors"""
+    from sqlalchemy.exc import OperationalError
+    from app import db
+
+    rng = random.Random(seed)
+    latencies, errors = [], 0
+    while time.monotonic() < deadline:
+        with app.app_context():
+            started = time.perf_counter()
+            try:
+                operation(rng)
+            except OperationalError as e:
+                if not is_locked(e):
+                    raise
+                errors += 1
+            finally:
+                db.session.remove()
+            latencies.append(time.perf_counter() - started)
+    return latencies, errors
+
+
+def read_operation(patient_ids: List[int]):
+    from app.repositories.observation_repository import ObservationRepository
+    from app.repositories.patient_repository import PatientRepository
+
+    def read(rng: random.Random) -> None:
+        PatientRepository().get_collection_version()
+        ObservationRepository().find_by_patient_id(rng.choice(patient_ids))
+    return read
+
+
+def write_operation(rng: random.Random) -> None:
+    from app.services.synthetic_data_service import synthetic_data_service
+
+    synthetic_data_service.generate(WRITE_BATCH, seed=rng.randrange(1 << 30))
+
+
+def write_process(database_path: str, concurrent: bool, deadline_in: float, seed: int, results) -> None:
+    """Writer in a separate process; puts its latencies and lock errors on the results queue"""
+    import logging
+    logging.disable(logging.CRITICAL)
+    app = create_benchmark_app(database_path, concurrent)
+    results.put(run_operations(app, write_operation, time.monotonic() + deadline_in, seed))
+
+
+def run_mode(database_path: str, patient_ids: List[int], concurrent: bool, readers: int, writers: int,
+             processes: int, seconds: float, seed: int) -> Dict[str, Any]:
+    import logging
+    # Failed batches log a traceback; the benchmark counts them instead
+    logging.disable(logging.CRITICAL)
+    app = create_benchmark_app(database_path, concurrent)
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    # Spawned processes import the app first; give them a head start on the same deadline
+    startup = 5.0 if processes else 0.0
+    children = [context.Process(target=write_process, args=(database_path, concurrent, startup + seconds,
+                                                            seed + 1000 + index, queue))
+                for index in range(processes)]
+    for child in children:
+        child.start()
+    time.sleep(startup)
+
+    deadline = time.monotonic() + seconds
+    outcomes: Dict[str, List[Tuple[List[float], int]]] = {'read': [], 'write': []}
+    lock = threading.Lock()
+
+    def worker(kind: str, operation, worker_seed: int) -> None:
+        outcome = run_operations(app, operation, deadline, worker_seed)
+        with lock:
+            outcomes[kind].append(outcome)
+
+    read = read_operation(patient_ids)
+    threads = ([threading.Thread(target=worker, args=('read', read, seed + index)) for index in range(readers)]
+               + [threading.Thread(target=worker, args=('write', write_operation, seed + 100 + index))
+                  for index in range(writers)])
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    for child in children:
+        outcomes['write'].append(queue.get())
+        child.join()
+    logging.disable(logging.NOTSET)
+
+    with app.app_context():
+        from app import db
+        db.engine.dispose()
+    return {kind: summarize(results, seconds) for kind, results in outcomes.items()}
+
+
+def summarize(results: List[Tuple[List[float], int]], seconds: float) -> Dict[str, Any]:
+    latencies = sorted(value for values, _ in results for value in values)
+    errors = sum(count for _, count in results)
+    if not latencies:
+        return {'operations': 0, 'errors': errors, 'per_second': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+    return {
+        'operations': len(latencies) - errors,
+        'errors': errors,
+        'per_second': (len(latencies) - errors) / seconds,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'max_ms': latencies[-1] * 1000,
+    }
+
+
+def print_report(results: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> None:
+    baseline = previous['results']['modes'] if previous else {}
+    if previous:
+        print(f"Compared with {previous['revision']} ({previous['recorded_at']})")
+    print(f"{results['readers']} reader threads, {results['writers']} writer threads, "
+          f"{results['processes']} writer processes, {results['seconds']}s per mode")
+    print(f"{'mode':<5} {'kind':<6} {'ops':>7} {'ops/s':>8} {'locked':>7} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for mode, kinds in results['modes'].items():
+        for kind, stats in kinds.items():
+            line = (f"{mode:<5} {kind:<6} {stats['operations']:>7} {stats['per_second']:>8.1f} {stats['errors']:>7} "
+                    f"{stats['p50_ms']:>8.2f} {stats['p95_ms']:>8.2f} {stats['max_ms']:>8.1f}")
+            previous_stats = baseline.get(mode, {}).get(kind)
+            if previous_stats and previous_stats['per_second']:
+                change = (stats['per_second'] - previous_stats['per_second']) / previous_stats['per_second']
+                line += f"  (ops/s {change:+.1%})"
+            print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--patients', type=int, default=500, help='Synthetic patients to start with (default 500)')
+    parser.add_argument('--readers', type=int, default=8, help='Reader threads (default 8)')
+    parser.add_argument('--writers', type=int, default=4, help='Writer threads (default 4)')
+    parser.add_argument('--processes', type=int, default=2, help='Writer processes (default 2)')
+    parser.add_argument('--seconds', type=float, default=10, help='Duration of each mode (default 10)')
+    parser.add_argument('--modes', nargs='+', choices=list(MODES), default=list(MODES),
+                        help='SQLITE_CONCURRENT_MODE settings to run (default off on)')
+    parser.add_argument('--seed', type=int, default=1, help='Seed for the data and the operations (default 1)')
+    parser.add_argument('--output', help='Results file (default benchmarks/results/sqlite_concurrency.jsonl)')
+    parser.add_argument('--compare', action='store_true', help='Show the change against the last recorded run')
+    parser.add_argument('--no-record', action='store_true', help='Print the results without recording them')
+    args = parser.parse_args(argv)
+
+    modes = {}
+    for mode in args.modes:
+        # A fresh file per mode: WAL journaling is a persistent property of the database
+        database_path, patient_ids = prepare_database(args.patients, args.seed)
+        try:
+            modes[mode] = run_mode(database_path, patient_ids, MODES[mode], args.readers, args.writers,
+                                   args.processes, args.seconds, args.seed)
+        finally:
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(database_path + suffix):
+                    os.remove(database_path + suffix)
+
+    results = {
+        'patients': args.patients,
+        'readers': args.readers,
+        'writers': args.writers,
+        'processes': args.processes,
+        'seconds': args.seconds,
+        'seed': args.seed,
+        'modes': modes,
+    }
+    previous = read_results(BENCHMARK_NAME, args.output)
+    print_report(results, previous[-1] if args.compare and previous else None)
+    if not args.no_record:
+        write_result(BENCHMARK_NAME, results, args.output)
+
+
+if __name__ == '__main__':
+    main()
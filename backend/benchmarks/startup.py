@@ -0,0 +1,212 @@
+"""
+Startup benchmark: cold import time per module, create_app() phases and memory
+
+Every measurement runs in a fresh interpreter (with -X importtime) so nothing
+is served from already imported modules. Run from the backend directory:
+
+    python -m benchmarks.startup --runs 5 --compare
+
+Each run appends a JSON record to benchmarks/results/startup.jsonl.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+from benchmarks.results import BENCHMARKS_DIR, peak_rss_mb, read_results, write_result
+
+BENCHMARK_NAME = 'startup'
+
+BACKEND_DIR = os.path.dirname(BENCHMARKS_DIR)
+
+# Modules whose cold import time is measured
+IMPORT_TARGETS = ('app', 'app.models', 'app.schemas', 'app.api_docs.documentation', 'app.tasks')
+
+# Process roles passed to create_app()
+ROLES = ('api', 'worker')
+
+# Written to stderr right before the measured code so -X importtime lines of the
+# benchmark's own imports can be told apart
+MEASURE_MARKER = '--- measure ---'
+
+TOP_IMPORTS = 10
+
+
+def measure_import(module: str) -> Dict[str, Any]:
+    """Child: import one module"""
+    import importlib
+    started = time.perf_counter()
+    importlib.import_module(module)
+    return {'wall_s': time.perf_counter() - started, 'rss_mb': peak_rss_mb()}
+
+
+def measure_create_app(role: str) -> Dict[str, Any]:
+    """Child: import the app package and create the app for a role"""
+    started = time.perf_counter()
+    from app import create_app
+    from app.utils.startup import STARTUP_TIMINGS
+    imported = time.perf_counter()
+    app = create_app(role=role)
+    created = time.perf_counter()
+    return {
+        'import_s': imported - started,
+        'create_app_s': created - imported,
+        'wall_s': created - started,
+        'phases': app.extensions[STARTUP_TIMINGS]['phases'],
+        'rss_mb': peak_rss_mb(),
+    }
+
+
+def measure_celery_worker(_: Optional[str] = None) -> Dict[str, Any]:
+    """Child: load celery_worker.py and the task modules the worker imports before consuming"""
+    started = time.perf_counter()
+    from celery_worker import celery
+    imported = time.perf_counter()
+    celery.loader.import_default_modules()
+    loaded = time.perf_counter()
+    return {
+        'import_s': imported - started,
+        'tasks_s': loaded - imported,
+        'wall_s': loaded - started,
+        'rss_mb': peak_rss_mb(),
+    }
+
+
+CHILD_MEASUREMENTS = {
+    'import': measure_import,
+    'create_app': measure_create_app,
+    'celery_worker': measure_celery_worker,
+}
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Self import time per package (app modules individually) from -X importtime output"""
+    lines = stderr.split(MEASURE_MARKER, 1)[-1].splitlines()
+    totals: Dict[str, int] = defaultdict(int)
+    for line in lines:
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        try:
+            self_us, _, name = line[len('import time:'):].split('|', 2)
+            name = name.strip()
+            parts = name.split('.')
+            package = '.'.join(parts[:2]) if parts[0] == 'app' else parts[0]
+            totals[package] += int(self_us)
+        except ValueError:
+            continue
+    ranked = sorted(totals.items(), key=lambda item: item[1], reverse=True)[:TOP_IMPORTS]
+    return [{'package': package, 'self_s': self_us / 1e6} for package, self_us in ranked]
+
+
+def run_child(kind: str, argument: str, env: Dict[str, str]) -> Dict[str, Any]:
+    """Run one measurement in a fresh interpreter"""
+    command = [sys.executable, '-X', 'importtime', '-m', 'benchmarks.startup', '--child', kind, argument]
+    completed = subprocess.run(command, cwd=BACKEND_DIR, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{kind} {argument} failed:\n{completed.stderr[-2000:]}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['top_imports'] = parse_importtime(completed.stderr)
+    return result
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    return {'min': min(values), 'median': statistics.median(values), 'max': max(values)}
+
+
+def aggregate(samples: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Min/median/max of each numeric metric across runs; import breakdown from the median run"""
+    result: Dict[str, Any] = {}
+    for metric, value in samples[0].items():
+        if isinstance(value, (int, float)):
+            result[metric] = summarize([sample[metric] for sample in samples])
+    if 'phases' in samples[0]:
+        result['phases'] = {phase: summarize([sample['phases'][phase] for sample in samples])
+                            for phase in samples[0]['phases']}
+    median_run = sorted(samples, key=lambda sample: sample['wall_s'])[len(samples) // 2]
+    result['top_imports'] = median_run['top_imports']
+    return result
+
+
+def run_benchmark(runs: int, env: Dict[str, str]) -> Dict[str, Any]:
+    targets = [('imports', module, 'import', module) for module in IMPORT_TARGETS]
+    targets += [('create_app', role, 'create_app', role) for role in ROLES]
+    targets += [('celery_worker', 'celery_worker', 'celery_worker', '-')]
+
+    results: Dict[str, Any] = {'runs': runs, 'imports': {}, 'create_app': {}}
+    for group, label, kind, argument in targets:
+        samples = [run_child(kind, argument, env) for _ in range(runs)]
+        if group == 'celery_worker':
+            results[group] = aggregate(samples)
+        else:
+            results[group][label] = aggregate(samples)
+    return results
+
+
+def flatten(results: Dict[str, Any]) -> Dict[str, float]:
+    """Median of every metric, keyed by its path, for printing and comparison"""
+    flat = {}
+
+    def walk(prefix, node):
+        if isinstance(node, dict) and 'median' in node:
+            flat[prefix] = node['median']
+        elif isinstance(node, dict):
+            for key, value in node.items():
+                if key != 'top_imports':
+                    walk(f"{prefix}.{key}" if prefix else key, value)
+
+    walk('', results)
+    return flat
+
+
+def print_report(results: Dict[str, Any], previous: Optional[Dict[str, Any]] = None) -> None:
+    current = flatten(results)
+    baseline = flatten(previous['results']) if previous else {}
+    if previous:
+        print(f"Compared with {previous['revision']} ({previous['recorded_at']})")
+    for key, value in current.items():
+        unit = 'MB' if key.endswith('rss_mb') else 's'
+        line = f"{key:<50} {value:>9.3f} {unit}"
+        if baseline.get(key):
+            line += f"  ({(value - baseline[key]) / baseline[key]:+.1%})"
+        print(line)
+    print("\nSlowest imports for create_app (api):")
+    for entry in results['create_app'].get('api', {}).get('top_imports', []):
+        print(f"  {entry['package']:<40} {entry['self_s']:.3f} s")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per measurement (default 5)')
+    parser.add_argument('--database-url', help='DATABASE_URL for create_app (default: the environment)')
+    parser.add_argument('--output', help='Results file (default benchmarks/results/startup.jsonl)')
+    parser.add_argument('--compare', action='store_true', help='Show the change against the last recorded run')
+    parser.add_argument('--no-record', action='store_true', help='Print the results without recording them')
+    parser.add_argument('--child', nargs=2, metavar=('KIND', 'ARGUMENT'), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        kind, argument = args.child
+        print(MEASURE_MARKER, file=sys.stderr, flush=True)
+        result = CHILD_MEASUREMENTS[kind](argument)
+        print(json.dumps(result))
+        return
+
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [BACKEND_DIR, env.get('PYTHONPATH')]))
+    if args.database_url:
+        env['DATABASE_URL'] = args.database_url
+
+    previous = read_results(BENCHMARK_NAME, args.output)
+    results = run_benchmark(args.runs, env)
+    print_report(results, previous[-1] if args.compare and previous else None)
+    if not args.no_record:
+        write_result(BENCHMARK_NAME, results, args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""
+gunicorn settings for the production API server, read from the WEB_* settings
+
+    gunicorn --config gunicorn.conf.py wsgi:app
+
+Workers are separate processes (one per CPU core by default), each serving
+WEB_THREADS requests concurrently, so requests blocked on the database or
+the FHIR server do not hold up a whole process.
+"""
+import multiprocessing
+
+from app.config import Config
+
+bind = Config.WEB_BIND
+workers = Config.WEB_WORKERS or multiprocessing.cpu_count()
+worker_class = 'gthread'
+threads = Config.WEB_THREADS
+keepalive = Config.WEB_KEEPALIVE
+timeout = Config.WEB_TIMEOUT
+graceful_timeout = Config.WEB_TIMEOUT
+max_requests = Config.WEB_MAX_REQUESTS
+max_requests_jitter = Config.WEB_MAX_REQUESTS // 10
+
+# Create the app once in the master; workers share its memory copy-on-write
+preload_app = True
+
+# Application logging goes through app.utils.logging_setup; no per-request access log
+accesslog = None
+errorlog = '-'
+
+
+def post_fork(server, worker):
+    """Drop database and broker connections inherited from the master"""
+    from wsgi import after_fork
+    after_fork()
@@ -1,7 +1,80 @@
+import click
 from app import create_app, db
 
 app = create_app()
 
+@app.cli.command('rebuild-statistics')
+def rebuild_statistics():
+    """Reconcile registry statistics with the source tables"""
+    from app.services.statistics_service import statistics_service
+    result = statistics_service.rebuild_statistics()
+    print(f"Rebuilt {result['counters']} counters: {result['summary']}")
+
+@app.cli.command('seed-reference-data')
+@click.option('--force', is_flag=True, help='Upsert even if the stored fingerprint matches the definitions')
+def seed_reference_data(force):
+    """Upsert value sets, roles and demo users from app/value_sets when their definitions changed"""
+    from app.services.seed_service import seed_service
+    result = seed_service.seed(force=force)
+    if result['seeded']:
+        print(f"Seeded reference data {result['fingerprint'][:12]}: {result['tables']}, "
+              f"{result['demo_users_created']} demo users created")
+    else:
+        print(f"Reference data is up to date ({result['fingerprint'][:12]})")
+
+@app.cli.command('export-openapi')
+@click.argument('path', required=False, type=click.Path(dir_okay=False))
+def export_openapi(path):
+    """Generate the OpenAPI document served with API_DOCS=static (default path: OPENAPI_SPEC_PATH)"""
+    from app.api_docs.loader import export_openapi_spec
+    path = export_openapi_spec(app, path or app.config['OPENAPI_SPEC_PATH'])
+    print(f"Wrote OpenAPI document to {path}")
+
+@app.cli.command('import-data')
+@click.argument('entity', type=click.Choice(['patients', 'conditions', 'observations', 'procedures']))
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--source', required=True, help='Name of the sending site; scopes patient keys and checkpoints')
+@click.option('--format', 'file_format', type=click.Choice(['csv', 'ndjson']), help='Defaults to the file extension')
+@click.option('--batch-size', type=int, help='Rows per insert and commit (default IMPORT_BATCH_SIZE)')
+@click.option('--restart', is_flag=True, help='Ignore the checkpoint and import the file from the beginning')
+@click.option('--rejects', 'rejects_path', type=click.Path(dir_okay=False), help='Append rejected rows as NDJSON')
+def import_data(entity, path, source, file_format, batch_size, restart, rejects_path):
+    """Stream a CSV or NDJSON file into the registry; re-run to resume after a failure"""
+    from app.services.import_service import import_service
+
+    def report(progress):
+        print(f"{progress['rows_read']} rows read, {progress['rows_imported']} imported, "
+              f"{progress['rows_rejected']} rejected ({progress['rows_per_second']} rows/s)")
+
+    try:
+        result = import_service.import_file(entity, path, source, file_format=file_format, batch_size=batch_size,
+                                            restart=restart, rejects_path=rejects_path, progress=report)
+    except ValueError as e:
+        raise click.ClickException(str(e))
+    except Exception as e:
+        raise click.ClickException(f"Import failed: {str(e)}. Re-run the same command to resume.")
+    print(f"Imported {result['rows_imported']} {entity} from {result['file']} "
+          f"({result['rows_rejected']} rejected) in {result['elapsed_seconds']}s "
+          f"at {result['rows_per_second']} rows/s")
+
+@app.cli.command('generate-data')
+@click.argument('patients', type=click.IntRange(min=1))
+@click.option('--seed', type=int, default=0, show_default=True, help='Same seed, same registry content')
+@click.option('--batch-size', type=click.IntRange(min=1), help='Patients per insert and commit (default 1000)')
+@click.option('--as-of', type=click.DateTime(formats=['%Y-%m-%d']), help='Date histories run up to (default 2025-01-01)')
+def generate_data(patients, seed, batch_size, as_of):
+    """Fill the registry with synthetic patients, conditions, observations and procedures"""
+    from app.services.synthetic_data_service import synthetic_data_service, DEFAULT_AS_OF
+
+    def report(progress):
+        print(f"{progress['patients']} patients, {progress['rows']} rows ({progress['rows_per_second']} rows/s)")
+
+    result = synthetic_data_service.generate(patients, seed=seed, batch_size=batch_size,
+                                             as_of=as_of.date() if as_of else DEFAULT_AS_OF, progress=report)
+    print(f"Generated {result['patients']} patients, {result['conditions']} conditions, "
+          f"{result['observations']} observations and {result['procedures']} procedures "
+          f"in {result['elapsed_seconds']}s at {result['rows_per_second']} rows/s")
+
 if __name__ == '__main__':
     # Run directly when this file is executed as a script
     app.run(host='0.0.0.0', port=5005, debug=True)
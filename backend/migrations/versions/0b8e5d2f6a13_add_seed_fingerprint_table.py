@@ -0,0 +1,29 @@
+"""Add seed fingerprint table
+
+Revision ID: 0b8e5d2f6a13
+Revises: f1a6c3d9b274
+Create Date: 2025-04-17 15:48:02.613947
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b8e5d2f6a13'
+down_revision = 'f1a6c3d9b274'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('seed_fingerprint',
+    sa.Column('name', sa.String(length=50), nullable=False),
+    sa.Column('fingerprint', sa.String(length=64), nullable=False),
+    sa.Column('seeded_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('seed_fingerprint')
@@ -0,0 +1,85 @@
+"""Add typed observation values
+
+Revision ID: 3b7d9e2a4c16
+Revises: f23f1555d511
+Create Date: 2025-04-07 10:12:44.532118
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.utils.observation_values import parse_observation_value
+
+
+# revision identifiers, used by Alembic.
+revision = '3b7d9e2a4c16'
+down_revision = 'f23f1555d511'
+branch_labels = None
+depends_on = None
+
+# Rows backfilled per round trip; keeps memory and lock time bounded on large tables
+BACKFILL_CHUNK_SIZE = 1000
+
+observation_table = sa.table(
+    'observation',
+    sa.column('id', sa.Integer),
+    sa.column('value', sa.String),
+    sa.column('unit', sa.String),
+    sa.column('value_numeric', sa.Float),
+    sa.column('value_type', sa.String),
+    sa.column('unit_normalized', sa.String),
+)
+
+
+def backfill_typed_values(connection):
+    """Populate the typed columns for existing rows in id-ordered chunks"""
+    last_id = 0
+    while True:
+        rows = connection.execute(
+            sa.select(observation_table.c.id, observation_table.c.value, observation_table.c.unit)
+            .where(observation_table.c.id > last_id)
+            .order_by(observation_table.c.id)
+            .limit(BACKFILL_CHUNK_SIZE)
+        ).fetchall()
+        if not rows:
+            break
+
+        updates = []
+        for row in rows:
+            typed = parse_observation_value(row.value, row.unit)
+            updates.append({
+                'row_id': row.id,
+                'new_value_numeric': typed['value_numeric'],
+                'new_value_type': typed['value_type'],
+                'new_unit_normalized': typed['unit_normalized'],
+            })
+
+        connection.execute(
+            observation_table.update()
+            .where(observation_table.c.id == sa.bindparam('row_id'))
+            .values(
+                value_numeric=sa.bindparam('new_value_numeric'),
+                value_type=sa.bindparam('new_value_type'),
+                unit_normalized=sa.bindparam('new_unit_normalized'),
+            ),
+            updates
+        )
+        last_id = rows[-1].id
+
+
+def upgrade():
+    with op.batch_alter_table('observation', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('value_numeric', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('value_type', sa.String(length=50), nullable=True))
+        batch_op.add_column(sa.Column('unit_normalized', sa.String(length=50), nullable=True))
+        batch_op.create_index('ix_observation_code_value_numeric', ['observation_code', 'value_numeric'], unique=False)
+
+    backfill_typed_values(op.get_bind())
+
+
+def downgrade():
+    with op.batch_alter_table('observation', schema=None) as batch_op:
+        batch_op.drop_index('ix_observation_code_value_numeric')
+        batch_op.drop_column('unit_normalized')
+        batch_op.drop_column('value_type')
+        batch_op.drop_column('value_numeric')
@@ -0,0 +1,46 @@
+"""Add cohort query indexes
+
+Revision ID: 8e4a1f0c2d57
+Revises: 3b7d9e2a4c16
+Create Date: 2025-04-09 14:27:03.118450
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e4a1f0c2d57'
+down_revision = '3b7d9e2a4c16'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('patient', schema=None) as batch_op:
+        batch_op.create_index('ix_patient_birth_date', ['birth_date'], unique=False)
+
+    with op.batch_alter_table('condition', schema=None) as batch_op:
+        batch_op.create_index('ix_condition_patient_code', ['patient_id', 'condition_code'], unique=False)
+        batch_op.create_index('ix_condition_code_status', ['condition_code', 'status'], unique=False)
+
+    with op.batch_alter_table('observation', schema=None) as batch_op:
+        batch_op.create_index('ix_observation_patient_code_date', ['patient_id', 'observation_code', 'observation_date'], unique=False)
+
+    with op.batch_alter_table('procedure', schema=None) as batch_op:
+        batch_op.create_index('ix_procedure_patient_code', ['patient_id', 'procedure_code'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('procedure', schema=None) as batch_op:
+        batch_op.drop_index('ix_procedure_patient_code')
+
+    with op.batch_alter_table('observation', schema=None) as batch_op:
+        batch_op.drop_index('ix_observation_patient_code_date')
+
+    with op.batch_alter_table('condition', schema=None) as batch_op:
+        batch_op.drop_index('ix_condition_code_status')
+        batch_op.drop_index('ix_condition_patient_code')
+
+    with op.batch_alter_table('patient', schema=None) as batch_op:
+        batch_op.drop_index('ix_patient_birth_date')
@@ -0,0 +1,60 @@
+"""Add registry statistic table
+
+Revision ID: c5f2a8d3e917
+Revises: 8e4a1f0c2d57
+Create Date: 2025-04-11 09:48:21.604377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c5f2a8d3e917'
+down_revision = '8e4a1f0c2d57'
+branch_labels = None
+depends_on = None
+
+
+def month_expression(dialect_name):
+    """YYYY-MM bucket of observation_date for the running dialect"""
+    if dialect_name == 'postgresql':
+        return "to_char(observation_date, 'YYYY-MM')"
+    return "strftime('%Y-%m', observation_date)"
+
+
+def upgrade():
+    op.create_table('registry_statistic',
+    sa.Column('metric', sa.String(length=50), nullable=False),
+    sa.Column('bucket', sa.String(length=120), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('metric', 'bucket')
+    )
+
+    # Seed the counters from existing rows; afterwards they are maintained incrementally
+    month = month_expression(op.get_bind().dialect.name)
+    op.execute("""
+        INSERT INTO registry_statistic (metric, bucket, count, updated_at)
+        SELECT 'patients.total', 'all', COUNT(*), CURRENT_TIMESTAMP FROM patient
+        UNION ALL
+        SELECT 'patients.gender', COALESCE(gender, 'unspecified'), COUNT(*), CURRENT_TIMESTAMP
+            FROM patient GROUP BY COALESCE(gender, 'unspecified')
+        UNION ALL
+        SELECT 'conditions.total', 'all', COUNT(*), CURRENT_TIMESTAMP FROM condition
+        UNION ALL
+        SELECT 'conditions.code', condition_code, COUNT(*), CURRENT_TIMESTAMP
+            FROM condition GROUP BY condition_code
+        UNION ALL
+        SELECT 'observations.total', 'all', COUNT(*), CURRENT_TIMESTAMP FROM observation
+        UNION ALL
+        SELECT 'observations.code', observation_code, COUNT(*), CURRENT_TIMESTAMP
+            FROM observation GROUP BY observation_code
+        UNION ALL
+        SELECT 'observations.month', COALESCE({month}, 'unspecified'), COUNT(*), CURRENT_TIMESTAMP
+            FROM observation GROUP BY COALESCE({month}, 'unspecified')
+    """.format(month=month))
+
+
+def downgrade():
+    op.drop_table('registry_statistic')
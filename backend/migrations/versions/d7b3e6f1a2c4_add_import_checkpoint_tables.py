@@ -0,0 +1,44 @@
+"""Add import checkpoint and patient key tables
+
+Revision ID: d7b3e6f1a2c4
+Revises: c5f2a8d3e917
+Create Date: 2025-04-14 10:12:37.218840
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7b3e6f1a2c4'
+down_revision = 'c5f2a8d3e917'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('import_checkpoint',
+    sa.Column('source', sa.String(length=120), nullable=False),
+    sa.Column('entity', sa.String(length=50), nullable=False),
+    sa.Column('file_name', sa.String(length=255), nullable=True),
+    sa.Column('file_fingerprint', sa.String(length=64), nullable=True),
+    sa.Column('byte_offset', sa.BigInteger(), nullable=False),
+    sa.Column('rows_read', sa.Integer(), nullable=False),
+    sa.Column('rows_imported', sa.Integer(), nullable=False),
+    sa.Column('rows_rejected', sa.Integer(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('source', 'entity')
+    )
+    op.create_table('import_patient_key',
+    sa.Column('source', sa.String(length=120), nullable=False),
+    sa.Column('patient_key', sa.String(length=120), nullable=False),
+    sa.Column('patient_id', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['patient_id'], ['patient.id'], ),
+    sa.PrimaryKeyConstraint('source', 'patient_key')
+    )
+
+
+def downgrade():
+    op.drop_table('import_patient_key')
+    op.drop_table('import_checkpoint')
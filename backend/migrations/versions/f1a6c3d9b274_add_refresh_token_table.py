@@ -0,0 +1,43 @@
+"""Add refresh token table
+
+Revision ID: f1a6c3d9b274
+Revises: e4c9a7b2d815
+Create Date: 2025-04-17 09:26:14.731502
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1a6c3d9b274'
+down_revision = 'e4c9a7b2d815'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('refresh_token',
+    sa.Column('jti', sa.String(length=50), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('family_id', sa.String(length=50), nullable=False),
+    sa.Column('issued_at', sa.DateTime(), nullable=True),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('revoked_at', sa.DateTime(), nullable=True),
+    sa.Column('replaced_by', sa.String(length=50), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('jti')
+    )
+    with op.batch_alter_table('refresh_token', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_refresh_token_expires_at'), ['expires_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_refresh_token_family_id'), ['family_id'], unique=False)
+        batch_op.create_index(batch_op.f('ix_refresh_token_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('refresh_token', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_refresh_token_user_id'))
+        batch_op.drop_index(batch_op.f('ix_refresh_token_family_id'))
+        batch_op.drop_index(batch_op.f('ix_refresh_token_expires_at'))
+
+    op.drop_table('refresh_token')
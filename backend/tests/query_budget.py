@@ -0,0 +1,102 @@
+"""
+Query budget harness: runs requests against an in-process app and counts SQL statements
+
+Used by test_query_budgets.py. The app runs on a throwaway SQLite database with
+an in-memory Celery broker, so no server, Redis or FHIR endpoint is needed.
+"""
+import os
+import tempfile
+
+# Must be set before the app (and its Celery broker) is imported
+os.environ.setdefault('CELERY_BROKER_URL', 'memory://')
+os.environ.setdefault('CELERY_RESULT_BACKEND', 'cache+memory://')
+
+from sqlalchemy import event
+
+
+class QueryCounter:
+    """Context manager recording every SQL statement run on an engine"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __enter__(self):
+        event.listen(self.engine, 'before_cursor_execute', self._record)
+        return self
+
+    def __exit__(self, *exc_info):
+        event.remove(self.engine, 'before_cursor_execute', self._record)
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+class QueryBudgetHarness:
+    """In-process app with a seeded SQLite database and helpers to check query budgets"""
+
+    def __init__(self, config=None):
+        from app import create_app, db
+        from app.services.seed_service import seed_service
+
+        handle, self.database_path = tempfile.mkstemp(suffix='.db', prefix='query_budget_')
+        os.close(handle)
+        self.app = create_app(role='api', config={
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{self.database_path}",
+            'SEED_ON_STARTUP': False,
+            **(config or {}),
+        })
+        self.db = db
+        with self.app.app_context():
+            db.create_all(bind_key=None)
+            seed_service.seed(force=True)
+        self.client = self.app.test_client()
+
+    def close(self):
+        with self.app.app_context():
+            self.db.session.remove()
+            self.db.engine.dispose()
+        os.remove(self.database_path)
+
+    def login(self, username='admin', password='password'):
+        """Authorization headers for a seeded demo user"""
+        response = self.client.post('/auth/login', json={'username': username, 'password': password})
+        assert response.status_code == 200, response.get_data(as_text=True)
+        return {'Authorization': f"Bearer {response.get_json()['access_token']}"}
+
+    def reset_caches(self):
+        """
+        Drop the per-principal and per-entity caches so a request pays its own full cost
+
+        The value set snapshot is process-wide and loaded once, so it is kept warm.
+        """
+        from app.services.auth_service import auth_service
+        from app.services.cohort_service import cohort_service
+        from app.services.value_set_service import value_set_service
+        from app.utils.response_cache import response_cache
+        auth_service.principal_cache.clear()
+        cohort_service.cache.clear()
+        response_cache.clear()
+        value_set_service.get_snapshot()
+
+    def count_queries(self, method, path, **kwargs):
+        """Issue one request with cold caches; returns (response, QueryCounter)"""
+        with self.app.app_context():
+            self.reset_caches()
+            engine = self.db.engine
+        with QueryCounter(engine) as counter:
+            response = self.client.open(path, method=method, **kwargs)
+        return response, counter
+
+    def assert_within_budget(self, method, path, budget, **kwargs):
+        """Issue one request and fail if it ran more than budget SQL statements"""
+        response, counter = self.count_queries(method, path, **kwargs)
+        assert counter.count <= budget, (
+            f"{method} {path} ran {counter.count} queries, budget is {budget}:\n" +
+            '\n'.join(f"  {i + 1}. {statement.splitlines()[0][:160]}" for i, statement in enumerate(counter.statements))
+        )
+        return response
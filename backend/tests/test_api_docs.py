@@ -0,0 +1,52 @@
+"""
+Lazily built API documentation app: shared database and middleware, checked in-process
+
+    python -m pytest tests/test_api_docs.py
+"""
+import gzip
+
+import pytest
+
+from query_budget import QueryBudgetHarness
+
+from app.api_docs.loader import LazyDocsMiddleware
+
+
+@pytest.fixture(scope='module')
+def harness():
+    from app.services.synthetic_data_service import synthetic_data_service
+
+    harness = QueryBudgetHarness(config={'API_DOCS': 'lazy', 'COMPRESSION_MIN_SIZE': 0})
+    with harness.app.app_context():
+        synthetic_data_service.generate(3, seed=19)
+    harness.headers = harness.login()
+    yield harness
+    harness.close()
+
+
+def test_docs_resources_use_the_api_apps_engines(harness):
+    from app.utils.database import _write_locks
+
+    response = harness.client.get('/api/docs/statistics/summary', headers=harness.headers)
+    assert response.status_code == 200 and response.get_json()['patients'] == 3
+
+    docs_app = harness.app.wsgi_app.docs_app()
+    assert isinstance(harness.app.wsgi_app, LazyDocsMiddleware) and docs_app is not harness.app
+    with harness.app.app_context():
+        engines = harness.db.engines
+    with docs_app.app_context():
+        assert harness.db.engines is engines
+        # configure_sqlite's writer lock and pragmas apply to docs requests too
+        assert harness.db.engine in _write_locks
+        with harness.db.engine.connect() as connection:
+            assert connection.exec_driver_sql('PRAGMA journal_mode').scalar() == 'wal'
+
+
+def test_docs_responses_get_cors_and_compression(harness):
+    headers = {**harness.headers, 'Origin': 'http://localhost:3000', 'Accept-Encoding': 'gzip'}
+    response = harness.client.get('/api/docs/swagger.json', headers=headers)
+
+    assert response.status_code == 200
+    assert response.headers['Access-Control-Allow-Origin'] == 'http://localhost:3000'
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert b'"swagger"' in gzip.decompress(response.get_data())
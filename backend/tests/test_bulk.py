@@ -0,0 +1,164 @@
+import requests
+import json
+import time
+
+# Base URL for the API
+BASE_URL = "http://localhost:5005"
+
+# Colors for terminal output
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[96m'
+    RESET = '\033[0m'
+
+def print_success(message):
+    print(f"{Colors.GREEN}[SUCCESS] {message}{Colors.RESET}")
+
+def print_error(message):
+    print(f"{Colors.RED}[ERROR] {message}{Colors.RESET}")
+
+def print_info(message):
+    print(f"{Colors.YELLOW}[INFO] {message}{Colors.RESET}")
+
+def print_debug(message):
+    print(f"{Colors.BLUE}[DEBUG] {message}{Colors.RESET}")
+
+# Test user credentials
+timestamp = int(time.time())
+test_user = {
+    "username": f"bulk_user_{timestamp}",
+    "email": f"bulk_user_{timestamp}@example.com",
+    "password": "BulkPass123",
+    "first_name": "Bulk",
+    "last_name": "User",
+    "roles": ["user"]
+}
+
+def register_and_login():
+    """Register a test user and return an auth token"""
+    print_info("Registering test user...")
+    response = requests.post(f"{BASE_URL}/auth/register", json=test_user)
+    if response.status_code != 201:
+        print_error(f"Failed to register test user: {response.status_code} - {response.text}")
+        return None
+
+    response = requests.post(f"{BASE_URL}/auth/login", json={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    if response.status_code != 200:
+        print_error(f"Failed to login: {response.status_code} - {response.text}")
+        return None
+
+    print_success("Test user authenticated")
+    return response.json()["access_token"]
+
+def run_bulk_tests():
+    """Run tests for the bulk create endpoints"""
+    token = register_and_login()
+    if not token:
+        print_error("Authentication failed, cannot proceed with tests")
+        return False
+
+    auth_headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json"
+    }
+
+    # Step 1: Create a patient to attach the batches to
+    print_info("Creating test patient...")
+    response = requests.post(f"{BASE_URL}/patients", headers=auth_headers, json={
+        "name": "Bulk Patient",
+        "birth_date": "1952-03-14",
+        "gender": "male"
+    })
+    if response.status_code != 201:
+        print_error(f"Failed to create patient: {response.status_code} - {response.text}")
+        return False
+    patient_id = response.json()["id"]
+
+    # Step 2: Bulk create conditions with an invalid status and an unknown condition code
+    print_info("Bulk creating conditions...")
+    response = requests.post(f"{BASE_URL}/conditions/bulk", headers=auth_headers, json=[
+        {"condition_code": "G30.9", "onset_date": "2021-06-01", "status": "active", "patient_id": patient_id},
+        {"condition_code": "G20", "onset_date": "2022-01-15", "status": "not-a-status", "patient_id": patient_id},
+        {"condition_code": "G35", "onset_date": "2019-09-30", "status": "inactive", "patient_id": patient_id},
+        {"condition_code": "NOT-A-CODE", "onset_date": "2020-02-02", "status": "active", "patient_id": patient_id}
+    ])
+    result = response.json()
+    print_debug(f"Bulk condition result: {json.dumps(result, indent=2)}")
+    if response.status_code == 207 and result["created"] == 2 and result["results"][1]["status"] == 400 \
+            and result["results"][3]["errors"][0]["field"] == "condition_code":
+        print_success("Valid conditions were created and the invalid ones were reported")
+    else:
+        print_error(f"Unexpected bulk condition result: {response.status_code}")
+        return False
+
+    # Step 3: Bulk create observations and check the typed values were stored
+    print_info("Bulk creating observations...")
+    observations = [{
+        "observation_code": "72172-0",
+        "observation_name": "MoCA total score",
+        "value": str(score),
+        "unit": "{score}",
+        "observation_date": f"2023-0{month}-01T09:00:00",
+        "status": "final",
+        "patient_id": patient_id
+    } for month, score in enumerate([26, 24, 21], start=1)]
+    response = requests.post(f"{BASE_URL}/observations/bulk", headers=auth_headers, json={"items": observations})
+    if response.status_code != 201 or response.json()["created"] != 3:
+        print_error(f"Failed to bulk create observations: {response.status_code} - {response.text}")
+        return False
+    observation_id = response.json()["results"][2]["id"]
+    response = requests.get(f"{BASE_URL}/observations/{observation_id}", headers=auth_headers)
+    if response.status_code == 200 and response.json()["value_numeric"] == 21.0:
+        print_success("Bulk observations were created with typed values")
+    else:
+        print_error(f"Unexpected observation after bulk create: {response.text}")
+        return False
+
+    # Step 4: Bulk create procedures
+    print_info("Bulk creating procedures...")
+    response = requests.post(f"{BASE_URL}/procedures/bulk", headers=auth_headers, json=[
+        {"procedure_code": "MRI-BRAIN", "procedure_name": "MRI Brain", "performed_date": "2023-02-10T14:30:00",
+         "patient_id": patient_id},
+        {"procedure_code": "LP", "procedure_name": "Lumbar puncture", "performed_date": "2023-03-05T08:00:00",
+         "patient_id": patient_id}
+    ])
+    if response.status_code == 201 and response.json()["created"] == 2:
+        print_success("Bulk procedures were created")
+    else:
+        print_error(f"Failed to bulk create procedures: {response.status_code} - {response.text}")
+        return False
+
+    # Step 5: Items referencing unknown patients are rejected
+    print_info("Submitting a batch for an unknown patient...")
+    response = requests.post(f"{BASE_URL}/procedures/bulk", headers=auth_headers, json=[
+        {"procedure_code": "EEG", "procedure_name": "EEG", "performed_date": "2023-04-01T10:00:00",
+         "patient_id": 999999999}
+    ])
+    if response.status_code == 400 and response.json()["results"][0]["errors"][0]["field"] == "patient_id":
+        print_success("Unknown patient was reported per item")
+    else:
+        print_error(f"Expected a per-item patient error, got {response.status_code} - {response.text}")
+        return False
+
+    # Step 6: Empty batches are rejected
+    response = requests.post(f"{BASE_URL}/conditions/bulk", headers=auth_headers, json=[])
+    if response.status_code == 400:
+        print_success("Empty batch was rejected")
+    else:
+        print_error(f"Expected 400 for an empty batch, got {response.status_code}")
+        return False
+
+    return True
+
+if __name__ == "__main__":
+    print_info("Starting bulk create test flow...")
+    success = run_bulk_tests()
+    if success:
+        print_success("Bulk create test flow completed successfully!")
+    else:
+        print_error("Bulk create test flow failed!")
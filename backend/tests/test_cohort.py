@@ -0,0 +1,182 @@
+import requests
+import json
+import time
+from datetime import datetime, timedelta
+
+# Base URL for the API
+BASE_URL = "http://localhost:5005"
+
+# Colors for terminal output
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[96m'
+    RESET = '\033[0m'
+
+def print_success(message):
+    print(f"{Colors.GREEN}[SUCCESS] {message}{Colors.RESET}")
+
+def print_error(message):
+    print(f"{Colors.RED}[ERROR] {message}{Colors.RESET}")
+
+def print_info(message):
+    print(f"{Colors.YELLOW}[INFO] {message}{Colors.RESET}")
+
+def print_debug(message):
+    print(f"{Colors.BLUE}[DEBUG] {message}{Colors.RESET}")
+
+# Researcher credentials; cohort queries require the researcher or admin role
+timestamp = int(time.time())
+test_user = {
+    "username": f"cohort_researcher_{timestamp}",
+    "email": f"cohort_researcher_{timestamp}@example.com",
+    "password": "CohortPass123",
+    "first_name": "Cohort",
+    "last_name": "Researcher",
+    "roles": ["researcher"]
+}
+
+# Unique codes so repeated runs against the same database do not interfere
+CONDITION_CODE = "G30.9"
+MOCA_CODE = f"MOCA-{timestamp}"
+
+def register_and_login():
+    """Register a researcher and return an auth token"""
+    print_info("Registering researcher user...")
+    response = requests.post(f"{BASE_URL}/auth/register", json=test_user)
+    if response.status_code != 201:
+        print_error(f"Failed to register researcher: {response.status_code} - {response.text}")
+        return None
+
+    response = requests.post(f"{BASE_URL}/auth/login", json={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    if response.status_code != 200:
+        print_error(f"Failed to login: {response.status_code} - {response.text}")
+        return None
+
+    print_success("Researcher authenticated")
+    return response.json()["access_token"]
+
+def create_cohort_patient(auth_headers, name, birth_date, gender, moca_score):
+    """Create a patient with an active Alzheimer's condition and a recent MoCA score"""
+    response = requests.post(f"{BASE_URL}/patients", headers=auth_headers, json={
+        "name": name,
+        "birth_date": birth_date,
+        "gender": gender
+    })
+    if response.status_code != 201:
+        print_error(f"Failed to create patient: {response.status_code} - {response.text}")
+        return None
+    patient_id = response.json()["id"]
+
+    requests.post(f"{BASE_URL}/conditions", headers=auth_headers, json={
+        "condition_code": CONDITION_CODE,
+        "onset_date": "2022-01-01",
+        "status": "active",
+        "patient_id": patient_id
+    })
+    requests.post(f"{BASE_URL}/observations", headers=auth_headers, json={
+        "observation_code": MOCA_CODE,
+        "observation_name": "MoCA total score",
+        "value": str(moca_score),
+        "unit": "{score}",
+        "observation_date": (datetime.now() - timedelta(days=30)).strftime('%Y-%m-%dT%H:%M:%S'),
+        "status": "final",
+        "patient_id": patient_id
+    })
+    return patient_id
+
+def run_cohort_tests():
+    """Run tests for cohort query endpoints"""
+    token = register_and_login()
+    if not token:
+        print_error("Authentication failed, cannot proceed with tests")
+        return False
+
+    auth_headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json"
+    }
+
+    # Step 1: Create patients - only the first matches the example cohort
+    print_info("Creating cohort patients...")
+    matching_id = create_cohort_patient(auth_headers, "Cohort Match", "1950-02-01", "female", 22)
+    high_score_id = create_cohort_patient(auth_headers, "Cohort High Score", "1948-07-15", "male", 28)
+    young_id = create_cohort_patient(auth_headers, "Cohort Young", "1990-05-20", "female", 20)
+    if not all([matching_id, high_score_id, young_id]):
+        return False
+
+    criteria = {"and": [
+        {"condition": {"code": CONDITION_CODE, "status": "active"}},
+        {"age": {"min": 65}},
+        {"observation": {"code": MOCA_CODE, "max_value": 25.9, "within_days": 365}}
+    ]}
+
+    # Step 2: Count the cohort
+    print_info("Counting cohort...")
+    response = requests.post(f"{BASE_URL}/cohorts/count", headers=auth_headers, json={"criteria": criteria})
+    if response.status_code != 200:
+        print_error(f"Cohort count failed: {response.status_code} - {response.text}")
+        return False
+    result = response.json()
+    print_debug(f"Cohort count: {json.dumps(result, indent=2)}")
+    if result["count"] != 1:
+        print_error(f"Expected 1 matching patient, got {result['count']}")
+        return False
+    print_success("Cohort count is correct")
+
+    # Step 3: Reordered criteria share the normalized hash and hit the cache
+    print_info("Re-running the query with reordered criteria...")
+    reordered = {"and": list(reversed(criteria["and"]))}
+    response = requests.post(f"{BASE_URL}/cohorts/count", headers=auth_headers, json={"criteria": reordered})
+    if response.status_code == 200 and response.json()["query_hash"] == result["query_hash"] and response.json()["cached"]:
+        print_success("Equivalent query was served from the cache")
+    else:
+        print_error(f"Expected a cached result with the same hash: {response.text}")
+        return False
+
+    # Step 4: Page through patient IDs
+    print_info("Paging through cohort patient IDs...")
+    response = requests.post(f"{BASE_URL}/cohorts/patients", headers=auth_headers, json={
+        "criteria": {"observation": {"code": MOCA_CODE}},
+        "limit": 2
+    })
+    if response.status_code != 200:
+        print_error(f"Cohort patients failed: {response.status_code} - {response.text}")
+        return False
+    first_page = response.json()
+    response = requests.post(f"{BASE_URL}/cohorts/patients", headers=auth_headers, json={
+        "criteria": {"observation": {"code": MOCA_CODE}},
+        "limit": 2,
+        "after_id": first_page["next_after_id"]
+    })
+    all_ids = first_page["patient_ids"] + response.json()["patient_ids"]
+    if sorted(all_ids) == sorted([matching_id, high_score_id, young_id]):
+        print_success("Paging returned every matching patient exactly once")
+    else:
+        print_error(f"Unexpected patient IDs from paging: {all_ids}")
+        return False
+
+    # Step 5: Invalid criteria are rejected
+    print_info("Submitting invalid criteria...")
+    response = requests.post(f"{BASE_URL}/cohorts/count", headers=auth_headers, json={
+        "criteria": {"observation": {"code": MOCA_CODE, "max_vlaue": 10}}
+    })
+    if response.status_code == 400:
+        print_success("Invalid criteria were rejected")
+    else:
+        print_error(f"Expected 400 for invalid criteria, got {response.status_code}")
+        return False
+
+    return True
+
+if __name__ == "__main__":
+    print_info("Starting cohort test flow...")
+    success = run_cohort_tests()
+    if success:
+        print_success("Cohort test flow completed successfully!")
+    else:
+        print_error("Cohort test flow failed!")
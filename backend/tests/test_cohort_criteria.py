@@ -0,0 +1,51 @@
+"""
+Cohort criteria compilation and request validation, checked in-process
+
+    python -m pytest tests/test_cohort_criteria.py
+"""
+from datetime import date
+
+import pytest
+
+from query_budget import QueryBudgetHarness
+
+
+@pytest.fixture(scope='module')
+def harness():
+    from app.models import Patient
+
+    harness = QueryBudgetHarness()
+    with harness.app.app_context():
+        harness.db.session.add_all([
+            Patient(name='Female Patient', birth_date=date(1950, 1, 1), gender='female'),
+            Patient(name='Male Patient', birth_date=date(1951, 1, 1), gender='male'),
+            Patient(name='Unrecorded Patient', birth_date=date(1952, 1, 1), gender=None),
+        ])
+        harness.db.session.commit()
+        harness.reset_caches()
+    harness.headers = harness.login()
+    yield harness
+    harness.close()
+
+
+def cohort_names(harness, criteria):
+    from app.models import Patient
+
+    response = harness.client.post('/cohorts/patients', headers=harness.headers, json={'criteria': criteria})
+    assert response.status_code == 200, response.get_data(as_text=True)
+    with harness.app.app_context():
+        return sorted(harness.db.session.get(Patient, patient_id).name
+                      for patient_id in response.get_json()['patient_ids'])
+
+
+def test_negated_gender_keeps_patients_without_one(harness):
+    assert cohort_names(harness, {'gender': 'female'}) == ['Female Patient']
+    assert cohort_names(harness, {'not': {'gender': 'female'}}) == ['Male Patient', 'Unrecorded Patient']
+    assert cohort_names(harness, {'not': {'gender': ['female', 'male']}}) == ['Unrecorded Patient']
+
+
+@pytest.mark.parametrize('body', [[{'criteria': {'gender': 'female'}}], 'female', 42])
+def test_bodies_that_are_not_objects_are_rejected(harness, body):
+    for url in ('/cohorts/count', '/cohorts/patients'):
+        response = harness.client.post(url, headers=harness.headers, json=body)
+        assert response.status_code == 400
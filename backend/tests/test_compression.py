@@ -0,0 +1,70 @@
+"""
+Negotiated response compression, checked in-process
+
+    python -m pytest tests/test_compression.py
+"""
+import gzip
+import json
+
+import pytest
+from flask import Response
+
+from query_budget import QueryBudgetHarness
+
+GZIP = {'Accept-Encoding': 'gzip'}
+
+
+@pytest.fixture(scope='module')
+def harness():
+    from app.services.synthetic_data_service import synthetic_data_service
+
+    harness = QueryBudgetHarness()
+    with harness.app.app_context():
+        synthetic_data_service.generate(30, seed=5)
+
+    # Routes can only be added before the app serves its first request
+    @harness.app.route('/test-stream')
+    def stream_rows():
+        rows = (f"{json.dumps({'row': index})}\n" for index in range(500))
+        return Response(rows, mimetype='application/json')
+
+    harness.headers = harness.login()
+    yield harness
+    harness.close()
+
+
+def test_large_json_is_gzipped_when_accepted(harness):
+    plain = harness.client.get('/patients/', headers=harness.headers)
+    compressed = harness.client.get('/patients/', headers={**harness.headers, **GZIP})
+
+    assert 'Content-Encoding' not in plain.headers
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in compressed.vary and 'Accept-Encoding' in plain.vary
+    assert gzip.decompress(compressed.get_data()) == plain.get_data()
+    assert int(compressed.headers['Content-Length']) < len(plain.get_data()) / 4
+
+
+def test_small_and_refused_responses_are_sent_as_is(harness):
+    small = harness.client.get('/conditions/patient/1?fields=id', headers={**harness.headers, **GZIP})
+    assert len(small.get_data()) < harness.app.config['COMPRESSION_MIN_SIZE']
+    assert 'Content-Encoding' not in small.headers
+
+    refused = harness.client.get('/patients/', headers={**harness.headers, 'Accept-Encoding': 'gzip;q=0'})
+    assert 'Content-Encoding' not in refused.headers
+
+
+def test_compressed_etags_are_weak_and_still_revalidate(harness):
+    first = harness.client.get('/patients/', headers={**harness.headers, **GZIP})
+    etag, weak = first.get_etag()
+    assert weak
+
+    again = harness.client.get('/patients/', headers={**harness.headers, **GZIP, 'If-None-Match': f'W/"{etag}"'})
+    assert again.status_code == 304
+
+
+def test_streamed_bodies_are_compressed_as_they_are_sent(harness):
+    response = harness.client.get('/test-stream', headers=GZIP)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    rows = gzip.decompress(response.get_data()).decode().splitlines()
+    assert len(rows) == 500 and json.loads(rows[-1]) == {'row': 499}
@@ -0,0 +1,76 @@
+"""
+Entity versions and ETag revalidation of list and detail GETs, checked in-process
+
+    python -m pytest tests/test_conditional_gets.py
+"""
+import pytest
+
+from query_budget import QueryBudgetHarness
+
+
+@pytest.fixture(scope='module')
+def harness():
+    from app.services.synthetic_data_service import synthetic_data_service
+
+    harness = QueryBudgetHarness()
+    with harness.app.app_context():
+        synthetic_data_service.generate(3, seed=11)
+    harness.headers = harness.login()
+    yield harness
+    harness.close()
+
+
+def revalidate(harness, url, etag):
+    return harness.client.get(url, headers={**harness.headers, 'If-None-Match': f'"{etag}"'})
+
+
+def test_unchanged_lists_revalidate_to_304(harness):
+    response = harness.client.get('/observations/patient/1', headers=harness.headers)
+    etag, _ = response.get_etag()
+    assert response.status_code == 200 and etag
+
+    again = revalidate(harness, '/observations/patient/1', etag)
+    assert again.status_code == 304 and again.get_data() == b''
+
+
+def test_value_range_lists_do_not_share_the_full_lists_etag(harness):
+    full = harness.client.get('/observations/patient/1', headers=harness.headers)
+    numeric = [observation for observation in full.get_json() if observation['value_numeric'] is not None]
+    code = numeric[0]['observation_code']
+    floor = max(observation['value_numeric'] for observation in numeric if observation['observation_code'] == code)
+    url = f"/observations/patient/1?code={code}&min_value={floor}"
+
+    filtered = revalidate(harness, url, full.get_etag()[0])
+    assert filtered.status_code == 200
+    assert filtered.get_json() != full.get_json()
+
+    etag, _ = filtered.get_etag()
+    assert revalidate(harness, url, etag).status_code == 304
+    assert revalidate(harness, f"/observations/patient/1?code={code}&min_value={floor - 1}", etag).status_code == 200
+
+
+def test_updates_made_while_a_sync_task_holds_the_record_both_apply(harness):
+    from app.models import Patient
+
+    with harness.app.app_context():
+        # The sync task's session loads the record, then posts it to FHIR ...
+        task = harness.db.session
+        patient = task.get(Patient, 2)
+        version = patient.version
+
+        # ... while an API request updates the same record
+        api = harness.db.session.session_factory()
+        try:
+            api.get(Patient, 2).name = 'Renamed During Sync'
+            api.commit()
+        finally:
+            api.close()
+
+        patient.sync_status = 'success'
+        task.commit()
+        assert (patient.name, patient.sync_status, patient.version) == ('Renamed During Sync', 'success', version + 2)
+
+        # Assignments that change nothing keep the version, and the ETag
+        patient.sync_status = 'success'
+        task.commit()
+        assert patient.version == version + 2
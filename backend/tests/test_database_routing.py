@@ -0,0 +1,193 @@
+"""
+Engine options, read replica routing, post-fork disposal and SQLite
+concurrent mode, checked in-process on SQLite files
+
+The "replica" is a second database file holding a marker patient the
+primary does not have, so each read shows which engine served it.
+
+    python -m pytest tests/test_database_routing.py
+"""
+import os
+import shutil
+import tempfile
+import threading
+from datetime import date
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from query_budget import QueryBudgetHarness
+
+from app.config import Config
+from app.utils.database import _write_locks, engine_options, sqlite_pragmas
+
+
+def settings(url, **overrides):
+    config = {name: getattr(Config, name) for name in dir(Config) if name.startswith('DATABASE_')}
+    config['SQLALCHEMY_DATABASE_URI'] = url
+    config.update(overrides)
+    return config
+
+
+def test_engine_options_for_server_databases():
+    options = engine_options(settings('postgresql://registry@db/registry', DATABASE_POOL_SIZE=20,
+                                      DATABASE_STATEMENT_TIMEOUT=5000))
+    assert options['pool_size'] == 20
+    assert options['pool_pre_ping'] is True
+    assert options['connect_args'] == {'options': '-c statement_timeout=5000'}
+    assert 'connect_args' not in engine_options(settings('postgresql://registry@db/registry'))
+
+
+def test_sqlite_keeps_default_engine_options():
+    assert engine_options(settings('sqlite:///registry.db', DATABASE_STATEMENT_TIMEOUT=5000)) == {}
+
+
+def test_sqlite_pragmas():
+    config = {name: getattr(Config, name) for name in dir(Config) if name.startswith('SQLITE_')}
+    pragmas = sqlite_pragmas(config, make_url('sqlite:///registry.db'))
+    assert pragmas[0] == 'PRAGMA journal_mode = WAL'
+    assert 'PRAGMA busy_timeout = 5000' in pragmas and 'PRAGMA synchronous = NORMAL' in pragmas
+    assert not any('journal_mode' in pragma for pragma in sqlite_pragmas(config, make_url('sqlite://')))
+    with pytest.raises(ValueError):
+        sqlite_pragmas({**config, 'SQLITE_SYNCHRONOUS': 'SOMETIMES'}, make_url('sqlite:///registry.db'))
+
+
+class ReplicaHarness(QueryBudgetHarness):
+    """Seeded primary plus a copy of it, as the replica, with one extra marker patient"""
+
+    def __init__(self):
+        from app import create_app, db
+        from app.models import Patient
+        from app.services.seed_service import seed_service
+
+        primary = QueryBudgetHarness()
+        handle, self.replica_path = tempfile.mkstemp(suffix='.db', prefix='replica_')
+        os.close(handle)
+        with primary.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        shutil.copyfile(primary.database_path, self.replica_path)
+        self.database_path = primary.database_path
+
+        self.app = create_app(role='api', config={
+            'SQLALCHEMY_DATABASE_URI': f"sqlite:///{self.database_path}",
+            'DATABASE_REPLICA_URL': f"sqlite:///{self.replica_path}",
+            'SEED_ON_STARTUP': False,
+        })
+        self.db = db
+        with self.app.app_context():
+            replica = db.engines['replica']
+            with replica.begin() as connection:
+                connection.execute(Patient.__table__.insert(), {
+                    'name': 'Replica Marker', 'birth_date': date(1950, 1, 1), 'gender': 'female', 'version': 1})
+        self.client = self.app.test_client()
+
+    def close(self):
+        super().close()
+        os.remove(self.replica_path)
+
+
+@pytest.fixture
+def replica():
+    harness = ReplicaHarness()
+    yield harness
+    harness.close()
+
+
+def names(patients):
+    return {patient.name for patient in patients}
+
+
+def test_reads_use_the_replica_until_the_session_writes(replica):
+    from app.repositories.patient_repository import PatientRepository
+
+    with replica.app.app_context():
+        repository = PatientRepository()
+        assert 'Replica Marker' in names(repository.get_all())
+        assert 'Replica Marker' in names(repository.find_by_name('Marker'))
+
+        repository.create({'name': 'Primary Patient', 'birth_date': date(1960, 1, 1), 'gender': 'male'})
+        patients = names(repository.get_all())
+        assert 'Primary Patient' in patients and 'Replica Marker' not in patients
+
+        replica.db.session.remove()
+        assert 'Replica Marker' in names(repository.get_all())
+
+
+def test_unmarked_reads_stay_on_the_primary(replica):
+    from app.repositories.patient_repository import PatientRepository
+
+    with replica.app.app_context():
+        marker_id = max(patient.id for patient in PatientRepository().get_all())
+        assert PatientRepository().get_by_id(marker_id) is None
+
+
+def test_api_reads_its_own_writes(replica):
+    headers = replica.login()
+    response = replica.client.get('/patients/search?name=Marker', headers=headers)
+    assert [patient['name'] for patient in response.get_json()] == ['Replica Marker']
+
+    response = replica.client.post('/patients/', headers=headers, json={
+        'name': 'Fresh Patient', 'birth_date': '1970-01-01', 'gender': 'female'})
+    assert response.status_code == 201
+    assert response.get_json()['name'] == 'Fresh Patient'
+
+
+def test_forked_workers_drop_inherited_connections(replica):
+    from app.utils.database import dispose_engines_after_fork
+
+    with replica.app.app_context():
+        engines = replica.db.engines
+        for engine in engines.values():
+            engine.connect().close()
+        pools = {key: engine.pool for key, engine in engines.items()}
+        assert all(pool.checkedin() for pool in pools.values())
+
+        dispose_engines_after_fork(replica.db)
+        assert all(engine.pool is not pools[key] and engine.pool.checkedin() == 0 for key, engine in engines.items())
+
+
+@pytest.fixture
+def primary():
+    harness = QueryBudgetHarness()
+    yield harness
+    harness.close()
+
+
+def test_sqlite_connections_use_concurrent_mode(primary):
+    with primary.app.app_context():
+        session = primary.db.session
+        assert session.execute(text('PRAGMA journal_mode')).scalar() == 'wal'
+        assert session.execute(text('PRAGMA busy_timeout')).scalar() == primary.app.config['SQLITE_BUSY_TIMEOUT']
+        assert session.execute(text('PRAGMA synchronous')).scalar() == 1  # NORMAL
+
+
+def test_sqlite_writes_hold_the_writer_lock_until_commit(primary):
+    from app.models import Patient
+
+    def lock_is_free():
+        """Whether another thread (another request) could take the writer lock now"""
+        acquired = []
+
+        def try_lock():
+            acquired.append(lock.acquire(timeout=0))
+            if acquired[0]:
+                lock.release()
+
+        other = threading.Thread(target=try_lock)
+        other.start()
+        other.join()
+        return acquired[0]
+
+    with primary.app.app_context():
+        lock = _write_locks[primary.db.engine].lock
+        session = primary.db.session
+        session.get(Patient, 1)
+        assert lock_is_free()
+
+        session.add(Patient(name='Locked Writer', birth_date=date(1980, 1, 1), gender='female'))
+        session.flush()
+        assert not lock_is_free()
+        session.commit()
+        assert lock_is_free()
@@ -0,0 +1,149 @@
+import requests
+import time
+
+# Base URL for the API
+BASE_URL = "http://localhost:5005"
+
+# Colors for terminal output
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    RESET = '\033[0m'
+
+def print_success(message):
+    print(f"{Colors.GREEN}[SUCCESS] {message}{Colors.RESET}")
+
+def print_error(message):
+    print(f"{Colors.RED}[ERROR] {message}{Colors.RESET}")
+
+def print_info(message):
+    print(f"{Colors.YELLOW}[INFO] {message}{Colors.RESET}")
+
+# Test user credentials
+timestamp = int(time.time())
+test_user = {
+    "username": f"etag_user_{timestamp}",
+    "email": f"etag_user_{timestamp}@example.com",
+    "password": "EtagPass123",
+    "first_name": "Etag",
+    "last_name": "User",
+    "roles": ["user"]
+}
+
+def register_and_login():
+    """Register a test user and return an auth token"""
+    print_info("Registering test user...")
+    response = requests.post(f"{BASE_URL}/auth/register", json=test_user)
+    if response.status_code != 201:
+        print_error(f"Failed to register test user: {response.status_code} - {response.text}")
+        return None
+
+    response = requests.post(f"{BASE_URL}/auth/login", json={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    if response.status_code != 200:
+        print_error(f"Failed to login: {response.status_code} - {response.text}")
+        return None
+
+    print_success("Test user authenticated")
+    return response.json()["access_token"]
+
+def check_revalidation(url, auth_headers, label):
+    """GET a resource, then revalidate it with its ETag and expect an empty 304"""
+    response = requests.get(url, headers=auth_headers)
+    etag = response.headers.get("ETag")
+    if response.status_code != 200 or not etag:
+        print_error(f"{label}: expected 200 with an ETag, got {response.status_code} - {response.headers}")
+        return None
+
+    response = requests.get(url, headers={**auth_headers, "If-None-Match": etag})
+    if response.status_code != 304 or response.content:
+        print_error(f"{label}: expected an empty 304, got {response.status_code}")
+        return None
+
+    print_success(f"{label}: revalidated with 304 Not Modified")
+    return etag
+
+def run_etag_tests():
+    """Run tests for ETag / If-None-Match conditional GETs"""
+    token = register_and_login()
+    if not token:
+        print_error("Authentication failed, cannot proceed with tests")
+        return False
+
+    auth_headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json"
+    }
+
+    # Step 1: Create a patient with a condition
+    print_info("Creating test patient and condition...")
+    response = requests.post(f"{BASE_URL}/patients", headers=auth_headers, json={
+        "name": "Etag Patient",
+        "birth_date": "1948-11-02",
+        "gender": "female"
+    })
+    if response.status_code != 201:
+        print_error(f"Failed to create patient: {response.status_code} - {response.text}")
+        return False
+    patient_id = response.json()["id"]
+
+    response = requests.post(f"{BASE_URL}/conditions", headers=auth_headers, json={
+        "condition_code": "G30.9",
+        "onset_date": "2020-05-01",
+        "status": "active",
+        "patient_id": patient_id
+    })
+    if response.status_code != 201:
+        print_error(f"Failed to create condition: {response.status_code} - {response.text}")
+        return False
+    condition_id = response.json()["id"]
+
+    # Step 2: Single resources and per-patient lists revalidate with 304
+    if not check_revalidation(f"{BASE_URL}/patients/{patient_id}", auth_headers, "Patient"):
+        return False
+    if not check_revalidation(f"{BASE_URL}/conditions/{condition_id}", auth_headers, "Condition"):
+        return False
+    list_etag = check_revalidation(f"{BASE_URL}/conditions/patient/{patient_id}", auth_headers, "Patient conditions")
+    if not list_etag:
+        return False
+
+    # Step 3: Adding a condition changes the list ETag
+    print_info("Adding a second condition...")
+    response = requests.post(f"{BASE_URL}/conditions", headers=auth_headers, json={
+        "condition_code": "G20",
+        "onset_date": "2022-08-15",
+        "status": "active",
+        "patient_id": patient_id
+    })
+    if response.status_code != 201:
+        print_error(f"Failed to create condition: {response.status_code} - {response.text}")
+        return False
+
+    response = requests.get(f"{BASE_URL}/conditions/patient/{patient_id}",
+                            headers={**auth_headers, "If-None-Match": list_etag})
+    if response.status_code == 200 and len(response.json()) == 2 and response.headers.get("ETag") != list_etag:
+        print_success("Stale list ETag returned the updated list")
+    else:
+        print_error(f"Expected 200 with a new ETag, got {response.status_code}")
+        return False
+
+    # Step 4: Unknown resources are still 404
+    response = requests.get(f"{BASE_URL}/patients/999999999", headers=auth_headers)
+    if response.status_code == 404:
+        print_success("Unknown patient returned 404")
+    else:
+        print_error(f"Expected 404 for an unknown patient, got {response.status_code}")
+        return False
+
+    return True
+
+if __name__ == "__main__":
+    print_info("Starting ETag test flow...")
+    success = run_etag_tests()
+    if success:
+        print_success("ETag test flow completed successfully!")
+    else:
+        print_error("ETag test flow failed!")
@@ -0,0 +1,112 @@
+"""
+Row-encoded list responses match the schema path byte for byte
+
+Each list is encoded both ways: from projected rows by RowSerializer, and
+as before through model_validate, model_dump and jsonify. Sparse fieldsets
+(?fields=...) select and return only the named fields.
+
+    python -m pytest tests/test_fast_json.py
+"""
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from flask import jsonify
+from werkzeug.http import http_date as werkzeug_http_date
+
+from query_budget import QueryBudgetHarness
+
+from app.utils.fast_json import http_date
+
+
+@pytest.mark.parametrize('value', [
+    date(1950, 1, 1),
+    date(2024, 2, 29),
+    datetime(2025, 1, 1, 23, 59, 59, 999999),
+    datetime(1999, 12, 31, 8, 5, 3, tzinfo=timezone(timedelta(hours=-5))),
+    datetime(2001, 7, 4, 12, 0, tzinfo=timezone.utc),
+])
+def test_http_date_matches_werkzeug(value):
+    assert http_date(value) == werkzeug_http_date(value)
+
+
+@pytest.fixture(scope='module')
+def harness():
+    from app.models import Patient
+    from app.services.synthetic_data_service import synthetic_data_service
+
+    harness = QueryBudgetHarness()
+    with harness.app.app_context():
+        synthetic_data_service.generate(5, seed=7)
+        # Non-ASCII and escaped characters go through the same escaping as jsonify
+        harness.db.session.get(Patient, 1).name = 'Zoë Ångström "Quoted" \\ Name'
+        harness.db.session.commit()
+    yield harness
+    harness.close()
+
+
+def schema_body(schema, entities):
+    return jsonify([schema.model_validate(entity).model_dump() for entity in entities]).get_data(as_text=True)
+
+
+def test_list_bodies_match_the_schema_path(harness):
+    from app.schemas import PatientResponse, ConditionResponse, ObservationResponse, ProcedureResponse
+    from app.services.patient_service import patient_service
+    from app.services.condition_service import condition_service
+    from app.services.observation_service import observation_service
+    from app.services.procedure_service import procedure_service
+
+    with harness.app.app_context():
+        patient_service.response_cache.clear()
+        assert patient_service.get_all_patients_json() + '\n' == schema_body(
+            PatientResponse, patient_service.repository.get_all())
+        assert patient_service.find_patients_json_by_name('zoë') + '\n' == schema_body(
+            PatientResponse, patient_service.repository.find_by_name('zoë'))
+        for patient_id in (1, 2, 3):
+            assert condition_service.get_conditions_json_by_patient_id(patient_id) + '\n' == schema_body(
+                ConditionResponse, condition_service.repository.find_by_patient_id(patient_id))
+            assert observation_service.get_observations_json_by_patient_id(patient_id) + '\n' == schema_body(
+                ObservationResponse, observation_service.repository.find_by_patient_id(patient_id))
+            assert procedure_service.get_procedures_json_by_patient_id(patient_id) + '\n' == schema_body(
+                ProcedureResponse, procedure_service.repository.find_by_patient_id(patient_id))
+        assert observation_service.find_observations_json_by_value_range('72172-0', 10, 30) + '\n' == schema_body(
+            ObservationResponse, observation_service.repository.find_by_value_range('72172-0', 10, 30))
+
+
+def test_list_routes_serve_row_encoded_bodies(harness):
+    headers = harness.login()
+    response = harness.client.get('/procedures/patient/1', headers=headers)
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    assert response.get_data(as_text=True).endswith(']\n')
+    assert response.get_json() and all(procedure['patient_id'] == 1 for procedure in response.get_json())
+
+    # A write to the patient's list drops the cached body along with the cached responses
+    created = harness.client.post('/procedures/', headers=headers, json={
+        'procedure_code': '70553', 'procedure_name': 'MRI brain', 'performed_date': '2024-05-01T09:30:00',
+        'patient_id': 1})
+    assert created.status_code == 201
+    procedures = harness.client.get('/procedures/patient/1', headers=headers).get_json()
+    assert created.get_json()['id'] in [procedure['id'] for procedure in procedures]
+
+
+def test_sparse_fieldsets_select_and_encode_only_those_fields(harness):
+    from query_budget import QueryCounter
+
+    headers = harness.login()
+    full = harness.client.get('/procedures/patient/2', headers=headers)
+    with harness.app.app_context(), QueryCounter(harness.db.engine) as counter:
+        sparse = harness.client.get('/procedures/patient/2?fields=id,procedure_code,performed_date', headers=headers)
+    assert sparse.status_code == 200
+    assert sparse.get_json() == [{'id': procedure['id'], 'procedure_code': procedure['procedure_code'],
+                                  'performed_date': procedure['performed_date']} for procedure in full.get_json()]
+    assert sparse.get_etag() != full.get_etag()
+    assert not any('notes' in statement for statement in counter.statements)
+
+    patients = harness.client.get('/patients/?fields=name', headers=headers).get_json()
+    assert patients and all(list(patient) == ['name'] for patient in patients)
+
+
+def test_unknown_fields_are_rejected(harness):
+    response = harness.client.get('/conditions/patient/1?fields=id,diagnosis', headers=harness.login())
+    assert response.status_code == 400
+    assert 'diagnosis' in response.get_json()['error']['details'][0]['message']
@@ -0,0 +1,147 @@
+"""
+Resumable CSV/NDJSON imports: failure mid-run, resume, rejects and restarts, checked in-process
+
+    python -m pytest tests/test_import.py
+"""
+import json
+
+import pytest
+
+from query_budget import QueryBudgetHarness
+
+from app.repositories.import_repository import ImportRepository
+from app.services.import_service import ImportService
+
+PATIENTS_CSV = """patient_key,name,birth_date,gender
+P1,Ada Abbott,1941-02-03,female
+P2,Ben Barros,1950-11-30,male
+P3,Carla Chen,not-a-date,female
+P1,Ada Again,1941-02-03,female
+P4,Dev Diallo,1962-06-15,male
+P5,Elena Evans,1938-09-09,female
+P6,Farid Fischer,1945-01-20,male
+"""
+
+# Rows 3 (bad date) and 4 (duplicate key) are rejected
+VALID_PATIENTS = 5
+
+CONDITIONS = [
+    {'patient_key': 'P1', 'condition_code': 'G30.9', 'onset_date': '2019-04-01', 'status': 'active'},
+    {'patient_key': 'P2', 'condition_code': 'G20', 'onset_date': '2021-07-12', 'status': 'active'},
+    {'patient_key': 'P9', 'condition_code': 'G35', 'onset_date': '2020-01-01', 'status': 'active'},
+    {'patient_key': 'P6', 'condition_code': 'G35', 'onset_date': '2015-03-03', 'status': 'remission'},
+]
+
+
+class FailingImportRepository(ImportRepository):
+    """Import repository whose insert fails on the given call, as a crash or lost connection would"""
+
+    def __init__(self, fail_on_call):
+        super().__init__()
+        self.fail_on_call = fail_on_call
+        self.calls = 0
+
+    def insert_batch(self, model_class, rows, return_ids=False):
+        self.calls += 1
+        if self.calls == self.fail_on_call:
+            raise RuntimeError("connection lost")
+        return super().insert_batch(model_class, rows, return_ids)
+
+
+@pytest.fixture
+def harness():
+    harness = QueryBudgetHarness()
+    yield harness
+    harness.close()
+
+
+@pytest.fixture
+def files(tmp_path):
+    patients = tmp_path / 'patients.csv'
+    patients.write_text(PATIENTS_CSV, encoding='utf-8')
+    conditions = tmp_path / 'conditions.ndjson'
+    conditions.write_text(''.join(json.dumps(row) + '\n' for row in CONDITIONS) + 'not json\n', encoding='utf-8')
+    return {'patients': str(patients), 'conditions': str(conditions), 'rejects': str(tmp_path / 'rejects.ndjson')}
+
+
+def count(harness, model_class):
+    return harness.db.session.query(model_class).count()
+
+
+def test_failed_imports_resume_after_the_last_committed_batch(harness, files):
+    from app.models import Patient
+
+    with harness.app.app_context():
+        failing = ImportService(FailingImportRepository(fail_on_call=3))
+        with pytest.raises(RuntimeError):
+            failing.import_file('patients', files['patients'], 'site-a', batch_size=2, rejects_path=files['rejects'])
+
+        # Two batches (rows 1-4) were committed with the checkpoint; the third was rolled back
+        checkpoint = ImportRepository().get_checkpoint('site-a', 'patients')
+        assert (checkpoint.rows_read, checkpoint.rows_imported, checkpoint.rows_rejected) == (4, 2, 2)
+        assert checkpoint.completed_at is None
+        assert count(harness, Patient) == 2
+
+        summary = ImportService().import_file('patients', files['patients'], 'site-a', batch_size=2,
+                                              rejects_path=files['rejects'])
+        assert summary['resumed'] and summary['completed']
+        assert (summary['rows_read'], summary['rows_imported'], summary['rows_rejected']) == (7, VALID_PATIENTS, 2)
+        names = [patient.name for patient in harness.db.session.query(Patient).order_by(Patient.id)]
+        assert names == ['Ada Abbott', 'Ben Barros', 'Dev Diallo', 'Elena Evans', 'Farid Fischer']
+
+        # A completed import is not repeated
+        again = ImportService().import_file('patients', files['patients'], 'site-a', batch_size=2)
+        assert not again['resumed'] and again['rows_imported'] == VALID_PATIENTS
+        assert count(harness, Patient) == VALID_PATIENTS
+
+    with open(files['rejects'], encoding='utf-8') as handle:
+        rejects = [json.loads(line) for line in handle]
+    assert [(reject['row'], reject['errors'][0]['field']) for reject in rejects] == \
+        [(3, 'birth_date'), (4, 'patient_key')]
+
+
+def test_patient_keys_resolve_across_runs_and_files(harness, files):
+    from app.models import Condition, Patient
+
+    with harness.app.app_context():
+        ImportService().import_file('patients', files['patients'], 'site-a')
+        failing = ImportService(FailingImportRepository(fail_on_call=2))
+        with pytest.raises(RuntimeError):
+            failing.import_file('conditions', files['conditions'], 'site-a', batch_size=2,
+                                rejects_path=files['rejects'])
+        summary = ImportService().import_file('conditions', files['conditions'], 'site-a', batch_size=2,
+                                              rejects_path=files['rejects'])
+
+        assert (summary['rows_read'], summary['rows_imported'], summary['rows_rejected']) == (5, 3, 2)
+        patients = {patient.name: patient.id for patient in harness.db.session.query(Patient)}
+        conditions = harness.db.session.query(Condition).order_by(Condition.id).all()
+        assert [(condition.patient_id, condition.condition_code) for condition in conditions] == [
+            (patients['Ada Abbott'], 'G30.9'), (patients['Ben Barros'], 'G20'), (patients['Farid Fischer'], 'G35')]
+
+        # Another site's keys are its own
+        other = ImportService().import_file('conditions', files['conditions'], 'site-b')
+        assert other['rows_imported'] == 0 and other['rows_rejected'] == 5
+
+    with open(files['rejects'], encoding='utf-8') as handle:
+        rejects = [json.loads(line) for line in handle]
+    assert [(reject['row'], reject['errors'][0]['type']) for reject in rejects] == [(3, 'not_found'), (5, 'parse_error')]
+
+
+def test_a_changed_file_needs_a_restart(harness, files):
+    from app.models import Patient
+
+    with harness.app.app_context():
+        failing = ImportService(FailingImportRepository(fail_on_call=2))
+        with pytest.raises(RuntimeError):
+            failing.import_file('patients', files['patients'], 'site-a', batch_size=2)
+
+        with open(files['patients'], 'a', encoding='utf-8') as handle:
+            handle.write("P7,Grace Garcia,1955-05-05,female\n")
+        with pytest.raises(ValueError, match='different file'):
+            ImportService().import_file('patients', files['patients'], 'site-a', batch_size=2)
+
+        # The first batch's patients keep their keys, so a restart rejects them as duplicates
+        summary = ImportService().import_file('patients', files['patients'], 'site-a', batch_size=2, restart=True)
+        assert not summary['resumed']
+        assert (summary['rows_read'], summary['rows_imported'], summary['rows_rejected']) == (8, 4, 4)
+        assert count(harness, Patient) == VALID_PATIENTS + 1
@@ -0,0 +1,112 @@
+"""
+Log redaction, sampling and the queued handler, checked in-process
+
+    python -m pytest tests/test_logging.py
+"""
+import io
+import logging
+import sys
+import threading
+from datetime import date
+
+import pytest
+
+from app.config import Config
+from app.schemas import PatientCreate
+from app.utils.logging_setup import REDACTED, RedactionFilter, SamplingFilter, _state, configure_logging
+
+
+def record(msg, *args, name='app.test', level=logging.INFO):
+    return logging.LogRecord(name, level, __file__, 1, msg, args or None, None)
+
+
+def redacted(msg, *args):
+    """Message of a record after the redaction filter"""
+    log_record = record(msg, *args)
+    assert RedactionFilter().filter(log_record)
+    return log_record.getMessage()
+
+
+def test_arguments_after_a_field_name_are_redacted():
+    assert redacted("Finding user by email: %s", 'jane@example.org') == f"Finding user by email: {REDACTED}"
+    assert redacted("Invalid refresh token: %s", 'abc.def') == f"Invalid refresh token: {REDACTED}"
+    assert redacted("patient %d name=%r age=%d", 7, 'Jane Doe', 71) == f"patient 7 name={REDACTED} age=71"
+    assert redacted("%*d: name='%s'", 3, 7, 'Jane') == f"  7: name='{REDACTED}'"
+
+
+def test_dict_and_schema_arguments_are_redacted():
+    message = redacted("data: %s (%d%%)", {'name': 'Jane Doe', 'notes': [{'email': 'j@x.org'}], 'id': 4}, 50)
+    assert 'Jane' not in message and 'j@x.org' not in message
+    assert "'id': 4" in message and message.endswith('(50%)')
+
+    patient = PatientCreate(name='Jane Doe', birth_date=date(1950, 1, 1), gender='female')
+    message = redacted("Creating patient %s", patient)
+    assert 'Jane' not in message and '1950' not in message
+
+    assert redacted("%(name)s signed in from %(ip)s", {'name': 'Jane', 'ip': '10.0.0.1'}) == \
+        f"{REDACTED} signed in from 10.0.0.1"
+
+
+def test_counts_keyed_by_a_field_name_are_kept():
+    assert redacted("Seeded reference data: %s", {'gender': 2, 'condition_status': 6}) == \
+        "Seeded reference data: {'gender': 2, 'condition_status': 6}"
+    assert redacted("gender: %d patients", 40) == "gender: 40 patients"
+    assert redacted("Counts {'gender': 2, 'name': None}") == "Counts {'gender': 2, 'name': None}"
+
+    message = redacted("rows: %s", [{'gender': 'female', 'count': 3, 'active': True}])
+    assert message == f"rows: [{{'gender': '{REDACTED}', 'count': 3, 'active': True}}]"
+    assert redacted("Patient %s", {'name': {'given': ['Jane'], 'parts': 2}}) == \
+        f"Patient {{'name': {{'given': ['{REDACTED}'], 'parts': 2}}}}"
+
+    # Numbers of identifiers and credentials are still redacted
+    assert redacted("mrn=%d", 1234567) == f"mrn={REDACTED}"
+    assert redacted("Loaded %s", {'ssn': 123456789, 'password': 1234}) == \
+        f"Loaded {{'ssn': '{REDACTED}', 'password': '{REDACTED}'}}"
+    assert redacted("phone: 5551234567, gender: 3") == f"phone: {REDACTED}, gender: 3"
+
+
+def test_preformatted_messages_are_redacted():
+    assert redacted("Created patient name='Jane Doe', id=4") == f"Created patient name={REDACTED}, id=4"
+    assert redacted('{"email": "j@x.org", "id": 4}') == f'{{"email": {REDACTED}, "id": 4}}'
+    assert redacted("Nothing to hide: %s", 'ok') == "Nothing to hide: ok"
+
+
+def test_sampling_keeps_one_in_every_n_debug_records():
+    sampling = SamplingFilter({'app.middleware.auth': 0.25, 'app.noisy': 0})
+    kept = [sampling.filter(record("hit", name='app.middleware.auth.jwt', level=logging.DEBUG)) for _ in range(8)]
+    assert kept.count(True) == 2
+    assert not sampling.filter(record("dropped", name='app.noisy', level=logging.DEBUG))
+    assert sampling.filter(record("warning", name='app.noisy', level=logging.WARNING))
+    assert sampling.filter(record("other", name='app.services', level=logging.DEBUG))
+
+
+@pytest.fixture
+def queued_logging(monkeypatch):
+    """configure_logging with LOG_QUEUE writing to a buffer; the root handler is removed afterwards"""
+    output = io.StringIO()
+    monkeypatch.setattr(sys, 'stderr', output)
+    config = {name: getattr(Config, name) for name in dir(Config) if name.startswith('LOG_')}
+    config.update(LOG_QUEUE=True, LOG_LEVEL='INFO', LOG_FORMAT='%(levelname)s:%(threadName)s:%(message)s')
+    configure_logging(config)
+    yield output
+    logging.getLogger().removeHandler(_state.handler)
+    if _state.listener is not None:
+        _state.listener.stop()
+    _state.handler = _state.listener = _state.config = None
+
+
+def test_queued_records_are_written_by_the_listener_thread(queued_logging):
+    assert isinstance(_state.handler, logging.handlers.QueueHandler)
+    logging.getLogger('app.test').info("Finding user by email: %s", 'jane@example.org')
+    _state.listener.stop()
+    _state.listener = None
+
+    line = queued_logging.getvalue().strip()
+    assert line == f"INFO:{threading.current_thread().name}:Finding user by email: {REDACTED}"
+
+
+def test_reconfiguring_replaces_the_listener(queued_logging):
+    first = _state.listener
+    configure_logging(_state.config)
+    assert _state.listener is not first and first._thread is None
+    assert logging.getLogger().handlers.count(_state.handler) == 1
@@ -236,7 +236,26 @@ def run_observation_tests():
         print_error(f"Failed to retrieve patient observations. Status code: {get_all_response.status_code}")
         print_error(f"Response: {get_all_response.text}")
         return False
-    
+
+    # Step 7b: Filter by numeric value range using the typed value column
+    print_info("Filtering systolic blood pressure observations between 100 and 130...")
+    range_response = requests.get(
+        f"{BASE_URL}/observations/patient/{patient_id}",
+        headers=auth_headers,
+        params={"code": "8480-6", "min_value": 100, "max_value": 130}
+    )
+
+    if range_response.status_code == 200:
+        ranged = range_response.json()
+        if len(ranged) == 1 and ranged[0].get("value_numeric") == 120.0:
+            print_success("Range filter returned the numeric observation")
+        else:
+            print_error(f"Unexpected range filter result: {json.dumps(ranged, indent=2)}")
+            return False
+    else:
+        print_error(f"Failed to filter observations by range. Status code: {range_response.status_code}")
+        return False
+
     # Step 8: Wait a bit longer and verify sync_status is updated to success
     print_info("Waiting for sync status to update...")
     time.sleep(5)  # Wait a bit longer to ensure sync has completed
@@ -0,0 +1,84 @@
+"""
+JWT principal cache: role and status changes, expiry and /auth/me, checked in-process
+
+    python -m pytest tests/test_principal_cache.py
+"""
+import time
+
+import pytest
+from sqlalchemy import update
+
+from query_budget import QueryBudgetHarness
+
+from app.utils.cache import TTLCache
+
+
+@pytest.fixture
+def harness():
+    harness = QueryBudgetHarness()
+    yield harness
+    harness.close()
+
+
+def researcher(harness):
+    from app.models import User
+    return harness.db.session.execute(harness.db.select(User).filter_by(username='researcher')).scalar_one()
+
+
+def test_deactivated_users_are_rejected_at_once(harness):
+    headers = harness.login('researcher', 'research')
+    assert harness.client.get('/auth/test', headers=headers).status_code == 200
+
+    with harness.app.app_context():
+        researcher(harness).is_active = False
+        harness.db.session.commit()
+
+    response = harness.client.get('/auth/test', headers=headers)
+    assert response.status_code == 401
+
+
+def test_role_changes_apply_at_once_and_rollbacks_keep_the_entry(harness):
+    from app.models import Role
+    from app.services.auth_service import auth_service
+
+    with harness.app.app_context():
+        user = researcher(harness)
+        assert not auth_service.get_principal(user.id).has_role('admin')
+
+        user.roles.append(harness.db.session.execute(harness.db.select(Role).filter_by(name='admin')).scalar_one())
+        harness.db.session.flush()
+        harness.db.session.rollback()
+        assert auth_service.principal_cache.get(user.id) is not None
+
+        user = researcher(harness)
+        user.roles.append(harness.db.session.execute(harness.db.select(Role).filter_by(name='admin')).scalar_one())
+        harness.db.session.commit()
+        assert auth_service.get_principal(user.id).has_role('admin')
+
+
+def test_changes_from_other_processes_apply_within_the_ttl(harness):
+    from app.models import User
+    from app.services.auth_service import AuthService
+
+    service = AuthService(principal_cache=TTLCache(ttl=0.2))
+    with harness.app.app_context():
+        user_id = researcher(harness).id
+        assert service.get_principal(user_id).is_active
+
+        # A Core UPDATE stands in for another process: no session hook sees it
+        harness.db.session.execute(update(User).where(User.id == user_id).values(is_active=False))
+        harness.db.session.commit()
+        assert service.get_principal(user_id).is_active
+
+        time.sleep(0.25)
+        assert not service.get_principal(user_id).is_active
+
+
+def test_me_returns_the_full_profile(harness):
+    headers = harness.login('researcher', 'research')
+    profile = harness.client.get('/auth/me', headers=headers).get_json()
+
+    assert profile['username'] == 'researcher'
+    assert profile['email'] and profile['is_active'] is True and profile['created_at']
+    assert [role['name'] for role in profile['roles']] == ['researcher']
+    assert 'password_hash' not in profile
@@ -0,0 +1,169 @@
+"""
+Query budgets per route, checked in-process against registries of different sizes
+
+Every route registered by the API blueprints must declare a budget: the most
+SQL statements one request may run with cold per-request caches (the JWT
+principal lookup included). Budgets must hold at every registry size, so an
+N+1 query over patients, roles or created_by fails here.
+
+    python -m pytest tests/test_query_budgets.py
+"""
+import pytest
+
+from query_budget import QueryBudgetHarness
+
+# The JWT principal lookup (user, roles and status in one query)
+AUTH = 1
+
+# Registry sizes each budget is checked against
+REGISTRY_SIZES = (1, 25)
+
+# Items per bulk request; budgets must not grow with the batch
+BULK_SIZE = 20
+
+MOCA_CODE = '72172-0'
+
+
+def patient_payload(i=0):
+    return {'name': f"Budget Patient {i}", 'birth_date': '1950-01-01', 'gender': 'female'}
+
+
+def condition_payload(patient_id):
+    return {'condition_code': 'G30.9', 'onset_date': '2021-06-01', 'status': 'active', 'patient_id': patient_id}
+
+
+def observation_payload(patient_id, score=24):
+    return {'observation_code': MOCA_CODE, 'observation_name': 'MoCA total score', 'value': str(score),
+            'unit': '{score}', 'observation_date': '2023-01-01T09:00:00', 'status': 'final', 'patient_id': patient_id}
+
+
+def procedure_payload(patient_id):
+    return {'procedure_code': 'MRI-BRAIN', 'procedure_name': 'MRI Brain', 'performed_date': '2023-02-10T14:30:00',
+            'patient_id': patient_id}
+
+
+def refresh_token(registry):
+    response = registry.client.post('/auth/login', json={'username': 'admin', 'password': 'password'})
+    return {'refresh_token': response.get_json()['refresh_token']}
+
+
+COHORT = {'criteria': {'and': [{'condition': {'code': 'G30.9'}}, {'observation': {'code': MOCA_CODE}}]}}
+
+# (method, route rule) -> (budget, request builder returning the path and request kwargs)
+QUERY_BUDGETS = {
+    # Patients
+    ('POST', '/patients/'): (AUTH + 4, lambda r: ('/patients/', {'json': patient_payload()})),
+    ('GET', '/patients/'): (AUTH + 2, lambda r: ('/patients/', {})),
+    ('GET', '/patients/<int:id>'): (AUTH + 2, lambda r: (f"/patients/{r.patient_id}", {})),
+    ('GET', '/patients/search'): (AUTH + 1, lambda r: ('/patients/search?name=Budget', {})),
+    # Conditions
+    ('POST', '/conditions/'): (AUTH + 4, lambda r: ('/conditions/', {'json': condition_payload(r.patient_id)})),
+    ('POST', '/conditions/bulk'): (AUTH + 4, lambda r: ('/conditions/bulk', {
+        'json': [condition_payload(r.patient_id) for _ in range(BULK_SIZE)]})),
+    ('GET', '/conditions/<int:id>'): (AUTH + 2, lambda r: (f"/conditions/{r.condition_id}", {})),
+    ('GET', '/conditions/patient/<int:patient_id>'): (AUTH + 2, lambda r: (f"/conditions/patient/{r.patient_id}", {})),
+    # Observations
+    ('POST', '/observations/'): (AUTH + 5, lambda r: ('/observations/', {'json': observation_payload(r.patient_id)})),
+    ('POST', '/observations/bulk'): (AUTH + 5, lambda r: ('/observations/bulk', {
+        'json': [observation_payload(r.patient_id, i) for i in range(BULK_SIZE)]})),
+    ('GET', '/observations/<int:id>'): (AUTH + 2, lambda r: (f"/observations/{r.observation_id}", {})),
+    ('GET', '/observations/patient/<int:patient_id>'): (AUTH + 2, lambda r: (
+        f"/observations/patient/{r.patient_id}", {})),
+    ('GET', '/observations/summary'): (AUTH + 1, lambda r: (f"/observations/summary?code={MOCA_CODE}", {})),
+    # Procedures
+    ('POST', '/procedures/'): (AUTH + 4, lambda r: ('/procedures/', {'json': procedure_payload(r.patient_id)})),
+    ('POST', '/procedures/bulk'): (AUTH + 4, lambda r: ('/procedures/bulk', {
+        'json': [procedure_payload(r.patient_id) for _ in range(BULK_SIZE)]})),
+    ('GET', '/procedures/<int:id>'): (AUTH + 2, lambda r: (f"/procedures/{r.procedure_id}", {})),
+    ('GET', '/procedures/patient/<int:patient_id>'): (AUTH + 2, lambda r: (f"/procedures/patient/{r.patient_id}", {})),
+    # Cohorts
+    ('POST', '/cohorts/count'): (AUTH + 1, lambda r: ('/cohorts/count', {'json': COHORT})),
+    ('POST', '/cohorts/patients'): (AUTH + 1, lambda r: ('/cohorts/patients', {'json': COHORT})),
+    # Statistics
+    ('GET', '/statistics/summary'): (AUTH + 3, lambda r: ('/statistics/summary', {})),
+    ('GET', '/statistics/genders'): (AUTH + 1, lambda r: ('/statistics/genders', {})),
+    ('GET', '/statistics/conditions'): (AUTH + 1, lambda r: ('/statistics/conditions', {})),
+    ('GET', '/statistics/observations'): (AUTH + 1, lambda r: ('/statistics/observations', {})),
+    ('GET', '/statistics/observations/monthly'): (AUTH + 1, lambda r: ('/statistics/observations/monthly', {})),
+    ('POST', '/statistics/rebuild'): (AUTH, lambda r: ('/statistics/rebuild', {})),
+    # Auth
+    ('POST', '/auth/register'): (5, lambda r: ('/auth/register', {'json': r.new_user()})),
+    ('POST', '/auth/login'): (8, lambda r: ('/auth/login', {'json': {'username': 'admin', 'password': 'password'}})),
+    ('POST', '/auth/refresh'): (4, lambda r: ('/auth/refresh', {'json': refresh_token(r)})),
+    ('POST', '/auth/logout'): (1, lambda r: ('/auth/logout', {'json': refresh_token(r)})),
+    ('GET', '/auth/me'): (AUTH + 2, lambda r: ('/auth/me', {})),
+    ('GET', '/auth/test'): (AUTH, lambda r: ('/auth/test', {})),
+    # Value sets (served from the process-wide snapshot)
+    ('GET', '/value-sets/genders'): (0, lambda r: ('/value-sets/genders', {})),
+    ('GET', '/value-sets/condition-statuses'): (0, lambda r: ('/value-sets/condition-statuses', {})),
+    ('GET', '/value-sets/neurological-conditions'): (0, lambda r: ('/value-sets/neurological-conditions', {})),
+    ('GET', '/value-sets/sync-statuses'): (0, lambda r: ('/value-sets/sync-statuses', {})),
+    # Health
+    ('GET', '/health/'): (0, lambda r: ('/health/', {})),
+}
+
+# Routes that cannot be exercised in-process
+UNBUDGETED_ROUTES = {
+    ('GET', '/health/celery'),  # Pings live Celery workers
+}
+
+
+class Registry(QueryBudgetHarness):
+    """Harness with a registry of a given size: patients with conditions, observations and procedures"""
+
+    def __init__(self, size):
+        super().__init__()
+        self.headers = self.login()
+        self.users = 0
+        patients = [self._post('/patients/', patient_payload(i)) for i in range(size)]
+        self.patient_id = patients[0]['id']
+        for patient in patients:
+            self._post('/conditions/bulk', [condition_payload(patient['id'])] * 2)
+            self._post('/observations/bulk', [observation_payload(patient['id'], score) for score in (26, 24, 21)])
+            self._post('/procedures/bulk', [procedure_payload(patient['id'])] * 2)
+        self.condition_id = self._get(f"/conditions/patient/{self.patient_id}")[0]['id']
+        self.observation_id = self._get(f"/observations/patient/{self.patient_id}")[0]['id']
+        self.procedure_id = self._get(f"/procedures/patient/{self.patient_id}")[0]['id']
+
+    def _post(self, path, payload):
+        response = self.client.post(path, headers=self.headers, json=payload)
+        assert response.status_code in (200, 201), response.get_data(as_text=True)
+        return response.get_json()
+
+    def _get(self, path):
+        response = self.client.get(path, headers=self.headers)
+        assert response.status_code == 200, response.get_data(as_text=True)
+        return response.get_json()
+
+    def new_user(self):
+        self.users += 1
+        return {'username': f"budget_user_{self.users}", 'email': f"budget_user_{self.users}@example.com",
+                'password': 'BudgetPass123', 'first_name': 'Budget', 'last_name': 'User', 'roles': ['user']}
+
+
+@pytest.fixture(scope='module', params=REGISTRY_SIZES, ids=lambda size: f"{size}_patients")
+def registry(request):
+    harness = Registry(request.param)
+    yield harness
+    harness.close()
+
+
+def test_every_route_has_a_budget():
+    """New routes in any blueprint must declare a query budget"""
+    harness = QueryBudgetHarness()
+    try:
+        routes = {(method, rule.rule) for rule in harness.app.url_map.iter_rules()
+                  if rule.endpoint != 'static' for method in rule.methods - {'HEAD', 'OPTIONS'}}
+    finally:
+        harness.close()
+    missing = sorted(routes - set(QUERY_BUDGETS) - UNBUDGETED_ROUTES)
+    assert not missing, f"Routes without a query budget: {missing}"
+
+
+@pytest.mark.parametrize('route', sorted(QUERY_BUDGETS), ids=lambda route: f"{route[0]} {route[1]}")
+def test_query_budget(registry, route):
+    """The route stays within its budget and succeeds"""
+    budget, build_request = QUERY_BUDGETS[route]
+    path, kwargs = build_request(registry)
+    response = registry.assert_within_budget(route[0], path, budget, headers=registry.headers, **kwargs)
+    assert response.status_code < 400, response.get_data(as_text=True)
@@ -45,7 +45,7 @@ test_patient = {
 }
 
 test_condition = {
-    "condition_code": f"TEST-{random.randint(1000, 9999)}",
+    "condition_code": "G30.9",
     "onset_date": "2023-01-01",
     "status": "active",
     "patient_id": None  # Will be filled in after patient creation
@@ -0,0 +1,125 @@
+import requests
+import time
+
+# Base URL for the API
+BASE_URL = "http://localhost:5005"
+
+# Colors for terminal output
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    RESET = '\033[0m'
+
+def print_success(message):
+    print(f"{Colors.GREEN}[SUCCESS] {message}{Colors.RESET}")
+
+def print_error(message):
+    print(f"{Colors.RED}[ERROR] {message}{Colors.RESET}")
+
+def print_info(message):
+    print(f"{Colors.YELLOW}[INFO] {message}{Colors.RESET}")
+
+# Test user credentials
+timestamp = int(time.time())
+test_user = {
+    "username": f"refresh_user_{timestamp}",
+    "email": f"refresh_user_{timestamp}@example.com",
+    "password": "RefreshPass123",
+    "first_name": "Refresh",
+    "last_name": "User",
+    "roles": ["user"]
+}
+
+def refresh(refresh_token):
+    """Call the refresh endpoint"""
+    return requests.post(f"{BASE_URL}/auth/refresh", json={"refresh_token": refresh_token})
+
+def run_refresh_token_tests():
+    """Run tests for refresh token rotation, reuse detection and logout"""
+    # Step 1: Register and log in
+    print_info("Registering and logging in test user...")
+    response = requests.post(f"{BASE_URL}/auth/register", json=test_user)
+    if response.status_code != 201:
+        print_error(f"Failed to register test user: {response.status_code} - {response.text}")
+        return False
+
+    response = requests.post(f"{BASE_URL}/auth/login", json={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    if response.status_code != 200 or not response.json().get("refresh_token"):
+        print_error(f"Login did not return a refresh token: {response.status_code} - {response.text}")
+        return False
+    first_refresh_token = response.json()["refresh_token"]
+    print_success("Login returned an access token and a refresh token")
+
+    # Step 2: Refresh tokens cannot be used as access tokens
+    response = requests.get(f"{BASE_URL}/auth/test", headers={"Authorization": f"Bearer {first_refresh_token}"})
+    if response.status_code == 401:
+        print_success("Refresh token was rejected as an access token")
+    else:
+        print_error(f"Expected 401 for a refresh token on a protected endpoint, got {response.status_code}")
+        return False
+
+    # Step 3: Refreshing returns a working access token and a rotated refresh token
+    response = refresh(first_refresh_token)
+    if response.status_code != 200:
+        print_error(f"Failed to refresh tokens: {response.status_code} - {response.text}")
+        return False
+    tokens = response.json()
+    if tokens["refresh_token"] == first_refresh_token:
+        print_error("Refresh token was not rotated")
+        return False
+
+    response = requests.get(f"{BASE_URL}/auth/test", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+    if response.status_code == 200 and response.json()["username"] == test_user["username"]:
+        print_success("Refreshed access token works")
+    else:
+        print_error(f"Refreshed access token was rejected: {response.status_code} - {response.text}")
+        return False
+
+    # Step 4: Replaying the rotated token revokes the whole family
+    response = refresh(first_refresh_token)
+    if response.status_code != 401:
+        print_error(f"Expected 401 when reusing a rotated refresh token, got {response.status_code}")
+        return False
+    response = refresh(tokens["refresh_token"])
+    if response.status_code == 401:
+        print_success("Reuse of a rotated token revoked the token family")
+    else:
+        print_error(f"Expected the token family to be revoked, got {response.status_code}")
+        return False
+
+    # Step 5: Logout revokes the current refresh token
+    response = requests.post(f"{BASE_URL}/auth/login", json={
+        "username": test_user["username"],
+        "password": test_user["password"]
+    })
+    refresh_token = response.json()["refresh_token"]
+    response = requests.post(f"{BASE_URL}/auth/logout", json={"refresh_token": refresh_token})
+    if response.status_code != 200:
+        print_error(f"Failed to log out: {response.status_code} - {response.text}")
+        return False
+    if refresh(refresh_token).status_code == 401:
+        print_success("Logged out refresh token was revoked")
+    else:
+        print_error("Refresh token still worked after logout")
+        return False
+
+    # Step 6: Garbage is rejected
+    if refresh("not-a-token").status_code == 401:
+        print_success("Invalid refresh token was rejected")
+    else:
+        print_error("Expected 401 for an invalid refresh token")
+        return False
+
+    return True
+
+if __name__ == "__main__":
+    print_info("Starting refresh token test flow...")
+    success = run_refresh_token_tests()
+    if success:
+        print_success("Refresh token test flow completed successfully!")
+    else:
+        print_error("Refresh token test flow failed!")
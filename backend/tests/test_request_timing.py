@@ -0,0 +1,97 @@
+"""
+Server-Timing instrumentation and /request-stats, checked in-process
+
+The off path is checked first: engine listeners are process-wide, so it
+must run before any app in this process enables REQUEST_TIMING.
+
+    python -m pytest tests/test_request_timing.py
+"""
+import re
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from query_budget import QueryBudgetHarness, QueryCounter
+
+from app.middleware.timing import TimedJSONProvider, before_cursor_execute, start_request_timing
+
+METRIC = re.compile(r'(\w+)(?:;desc="(\d+) queries")?;dur=([\d.]+)')
+
+
+def server_timing(response):
+    """Server-Timing metrics as {name: (duration ms, query count or None)}"""
+    return {name: (float(duration), int(count) if count else None)
+            for name, count, duration in METRIC.findall(response.headers['Server-Timing'])}
+
+
+def test_nothing_is_installed_when_timing_is_off():
+    harness = QueryBudgetHarness()
+    try:
+        app = harness.app
+        assert not event.contains(Engine, 'before_cursor_execute', before_cursor_execute)
+        assert start_request_timing not in app.before_request_funcs.get(None, [])
+        assert not isinstance(app.json, TimedJSONProvider)
+
+        headers = harness.login()
+        response = harness.client.get('/patients/', headers=headers)
+        assert response.status_code == 200 and 'Server-Timing' not in response.headers
+        assert harness.client.get('/request-stats/', headers=headers).status_code == 404
+    finally:
+        harness.close()
+
+
+@pytest.fixture(scope='module')
+def harness():
+    from app.services.synthetic_data_service import synthetic_data_service
+
+    harness = QueryBudgetHarness(config={'REQUEST_TIMING': True, 'REQUEST_STATS': True})
+    with harness.app.app_context():
+        synthetic_data_service.generate(3, seed=17)
+    harness.headers = harness.login()
+    yield harness
+    harness.close()
+
+
+def test_server_timing_reports_sql_auth_and_serialization(harness):
+    with harness.app.app_context():
+        engine = harness.db.engine
+    with QueryCounter(engine) as counter:
+        response = harness.client.get('/conditions/patient/1', headers=harness.headers)
+    metrics = server_timing(response)
+
+    # serialize is absent when the list body comes from the response cache
+    assert {'db', 'auth', 'total'} <= set(metrics)
+    assert metrics['db'][1] == counter.count > 0
+    assert metrics['total'][0] >= metrics['db'][0] + metrics['auth'][0]
+
+    # jsonify goes through the timed JSON provider
+    metrics = server_timing(harness.client.get('/auth/test', headers=harness.headers))
+    assert list(metrics) == ['db', 'auth', 'serialize', 'total']
+
+
+def test_unauthenticated_requests_have_no_auth_phase(harness):
+    response = harness.client.get('/health/')
+    assert set(server_timing(response)) >= {'db', 'total'} and 'auth' not in server_timing(response)
+
+
+def test_request_stats_aggregate_per_endpoint_and_reset(harness):
+    assert harness.client.delete('/request-stats/', headers=harness.headers).status_code == 204
+    for _ in range(3):
+        harness.client.get('/conditions/patient/1', headers=harness.headers)
+    harness.client.get('/auth/test', headers=harness.headers)
+
+    stats = harness.client.get('/request-stats/', headers=harness.headers).get_json()
+    endpoint = stats['GET /conditions/patient/<int:patient_id>']
+    assert endpoint['count'] == 3
+    assert endpoint['mean_queries'] > 0 and endpoint['max_ms'] >= endpoint['mean_ms'] > 0
+    assert 'auth' in endpoint['mean_phases_ms']
+    assert set(stats['GET /auth/test']['mean_phases_ms']) == {'auth', 'serialize'}
+
+    researcher = harness.login('researcher', 'research')
+    assert harness.client.get('/request-stats/', headers=researcher).status_code == 403
+
+    assert harness.client.delete('/request-stats/', headers=harness.headers).status_code == 204
+    # Only the reset itself, recorded as it finished, is left
+    stats = harness.client.get('/request-stats/', headers=harness.headers).get_json()
+    assert list(stats) == ['DELETE /request-stats/']
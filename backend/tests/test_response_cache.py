@@ -0,0 +1,155 @@
+"""
+Read-through response cache: hits, misses, invalidation after commit and the backends, checked in-process
+
+The Redis backend is exercised against a dictionary standing in for the
+server, so the JSON entries it writes and reads back are checked without one.
+
+    python -m pytest tests/test_response_cache.py
+"""
+import pickle
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+from query_budget import QueryBudgetHarness
+
+from app.schemas import PatientResponse
+from app.utils.cache import MISSING
+from app.utils.response_cache import LocalCacheBackend, RedisCacheBackend, ResponseCache, create_response_cache
+
+
+class CountingLoader:
+    def __init__(self, value):
+        self.value = value
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        return self.value
+
+
+class DictRedis:
+    """The get/set/delete subset of the Redis client used by RedisCacheBackend, kept in a dictionary"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+
+@pytest.fixture
+def redis_backend():
+    backend = RedisCacheBackend('redis://localhost:6379/15')
+    backend.client = DictRedis()
+    return backend
+
+
+@pytest.fixture(scope='module')
+def harness():
+    from app.services.synthetic_data_service import synthetic_data_service
+
+    harness = QueryBudgetHarness()
+    with harness.app.app_context():
+        synthetic_data_service.generate(3, seed=13)
+    yield harness
+    harness.close()
+
+
+def test_entries_are_served_only_for_their_version():
+    cache = ResponseCache(LocalCacheBackend())
+    loader = CountingLoader(['body'])
+
+    assert cache.get_or_load('conditions:patient:1', (2, 5, 2), loader) == ['body']
+    assert cache.get_or_load('conditions:patient:1', (2, 5, 2), loader) == ['body']
+    assert loader.calls == 1
+
+    assert cache.get_or_load('conditions:patient:1', (3, 6, 3), loader) == ['body']
+    assert loader.calls == 2
+
+    missing = CountingLoader(None)
+    cache.get_or_load('patient:9', 1, missing)
+    cache.get_or_load('patient:9', 1, missing)
+    assert missing.calls == 2
+
+
+def test_none_backend_always_loads():
+    cache = create_response_cache(SimpleNamespace(RESPONSE_CACHE_BACKEND='none'))
+    loader = CountingLoader('body')
+    cache.get_or_load('patient:1', 1, loader)
+    cache.get_or_load('patient:1', 1, loader)
+    assert cache.backend is None and loader.calls == 2
+
+
+def test_commits_invalidate_the_written_records_entries(harness):
+    from app import db
+    from app.models import Condition, Patient
+    from app.services.condition_service import condition_service
+    from app.services.patient_service import patient_service
+    from app.utils.response_cache import response_cache
+
+    with harness.app.app_context():
+        before = patient_service.get_patient_by_id(1)
+        conditions = condition_service.get_conditions_by_patient_id(1)
+        assert response_cache.backend.get('patient:1') is not MISSING
+        assert response_cache.backend.get('conditions:patient:1') is not MISSING
+
+        db.session.get(Patient, 1).name = 'Renamed Patient'
+        condition = db.session.get(Condition, conditions[0].id)
+        db.session.add(Condition(condition_code=condition.condition_code, onset_date=condition.onset_date,
+                                 status=condition.status, patient_id=1))
+        db.session.flush()
+        # Nothing is dropped until the transaction commits
+        assert response_cache.backend.get('patient:1') is not MISSING
+        db.session.commit()
+
+        assert response_cache.backend.get('patient:1') is MISSING
+        assert response_cache.backend.get('conditions:patient:1') is MISSING
+        assert patient_service.get_patient_by_id(1).name == 'Renamed Patient' != before.name
+        assert len(condition_service.get_conditions_by_patient_id(1)) == len(conditions) + 1
+
+
+def test_redis_entries_round_trip_as_validated_json(harness, redis_backend):
+    from app.services.patient_service import patient_service
+
+    cache = ResponseCache(redis_backend)
+    with harness.app.app_context():
+        patients = [patient_service.get_patient_by_id(2), patient_service.get_patient_by_id(3)]
+        loader = CountingLoader(patients)
+        assert cache.get_or_load('patients', (2, 3, 2), loader, List[PatientResponse]) == patients
+        assert cache.get_or_load('patients', (2, 3, 2), loader, List[PatientResponse]) == patients
+        assert loader.calls == 1
+
+        stored = redis_backend.client.data['response-cache:patients']
+        assert stored.startswith(b'[[2,3,2],[{')
+
+        body = CountingLoader('[{"id": 2}]\n')
+        cache.get_or_load('patients:json', (2, 3, 2), body, str)
+        assert cache.get_or_load('patients:json', (2, 3, 2), body, str) == '[{"id": 2}]\n'
+        assert body.calls == 1
+
+
+@pytest.mark.parametrize('stored', [
+    b'not json',
+    pickle.dumps((1, {'name': 'pickled'})),
+    b'[1, {"id": 2}]',  # valid JSON, but not a PatientResponse (e.g. written before the schema changed)
+])
+def test_unreadable_redis_entries_are_misses(harness, redis_backend, stored):
+    redis_backend.client.data['response-cache:patient:2'] = stored
+    assert redis_backend.get('patient:2', PatientResponse) is MISSING
+
+    from app.services.patient_service import patient_service
+    with harness.app.app_context():
+        patient = patient_service.get_patient_by_id(2)
+        loader = CountingLoader(patient)
+        assert ResponseCache(redis_backend).get_or_load('patient:2', 1, loader, PatientResponse) == patient
+        assert loader.calls == 1
+        assert redis_backend.get('patient:2', PatientResponse) == (1, patient)
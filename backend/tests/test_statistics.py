@@ -0,0 +1,126 @@
+import requests
+import json
+import time
+
+# Base URL for the API
+BASE_URL = "http://localhost:5005"
+
+# Colors for terminal output
+class Colors:
+    GREEN = '\033[92m'
+    RED = '\033[91m'
+    YELLOW = '\033[93m'
+    BLUE = '\033[96m'
+    RESET = '\033[0m'
+
+def print_success(message):
+    print(f"{Colors.GREEN}[SUCCESS] {message}{Colors.RESET}")
+
+def print_error(message):
+    print(f"{Colors.RED}[ERROR] {message}{Colors.RESET}")
+
+def print_info(message):
+    print(f"{Colors.YELLOW}[INFO] {message}{Colors.RESET}")
+
+def print_debug(message):
+    print(f"{Colors.BLUE}[DEBUG] {message}{Colors.RESET}")
+
+# Default admin credentials created by reference data seeding
+ADMIN_CREDENTIALS = {"username": "admin", "password": "password"}
+
+def login():
+    """Login as the default admin and return an auth token"""
+    response = requests.post(f"{BASE_URL}/auth/login", json=ADMIN_CREDENTIALS)
+    if response.status_code != 200:
+        print_error(f"Failed to login: {response.status_code} - {response.text}")
+        return None
+    print_success("Admin authenticated")
+    return response.json()["access_token"]
+
+def get_counts(auth_headers):
+    """Fetch the summary and per-code condition counts"""
+    summary = requests.get(f"{BASE_URL}/statistics/summary", headers=auth_headers).json()
+    conditions = requests.get(f"{BASE_URL}/statistics/conditions", headers=auth_headers).json()
+    by_code = {row["code"]: row["count"] for row in conditions}
+    return summary, by_code
+
+def run_statistics_tests():
+    """Run tests for the statistics endpoints"""
+    token = login()
+    if not token:
+        print_error("Authentication failed, cannot proceed with tests")
+        return False
+
+    auth_headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json"
+    }
+
+    # Step 1: Record the current counts
+    print_info("Fetching current statistics...")
+    summary_before, codes_before = get_counts(auth_headers)
+    print_debug(f"Summary before: {json.dumps(summary_before)}")
+
+    # Step 2: Write a patient, a condition and an observation
+    print_info("Creating a patient with a condition and an observation...")
+    response = requests.post(f"{BASE_URL}/patients", headers=auth_headers, json={
+        "name": f"Statistics Patient {int(time.time())}",
+        "birth_date": "1960-04-12",
+        "gender": "female"
+    })
+    if response.status_code != 201:
+        print_error(f"Failed to create patient: {response.status_code} - {response.text}")
+        return False
+    patient_id = response.json()["id"]
+
+    requests.post(f"{BASE_URL}/conditions", headers=auth_headers, json={
+        "condition_code": "G35",
+        "onset_date": "2021-06-01",
+        "status": "active",
+        "patient_id": patient_id
+    })
+    requests.post(f"{BASE_URL}/observations", headers=auth_headers, json={
+        "observation_code": "8480-6",
+        "observation_name": "Systolic blood pressure",
+        "value": "118",
+        "unit": "mm[Hg]",
+        "observation_date": "2025-03-31T14:30:00",
+        "patient_id": patient_id
+    })
+
+    # Step 3: The counters moved with the writes
+    summary_after, codes_after = get_counts(auth_headers)
+    print_debug(f"Summary after: {json.dumps(summary_after)}")
+    expected = {key: summary_before[key] + 1 for key in ("patients", "conditions", "observations")}
+    if summary_after == expected and codes_after.get("G35", 0) == codes_before.get("G35", 0) + 1:
+        print_success("Statistics were updated incrementally")
+    else:
+        print_error(f"Expected {expected}, got {summary_after}")
+        return False
+
+    # Step 4: Monthly observation counts include the new observation's month
+    response = requests.get(f"{BASE_URL}/statistics/observations/monthly", headers=auth_headers)
+    months = [row["month"] for row in response.json()]
+    if response.status_code == 200 and "2025-03" in months:
+        print_success("Monthly observation counts include 2025-03")
+    else:
+        print_error(f"Unexpected monthly counts: {response.text}")
+        return False
+
+    # Step 5: Admins can queue a reconciliation
+    response = requests.post(f"{BASE_URL}/statistics/rebuild", headers=auth_headers)
+    if response.status_code == 202:
+        print_success("Statistics rebuild queued")
+    else:
+        print_error(f"Failed to queue statistics rebuild: {response.status_code} - {response.text}")
+        return False
+
+    return True
+
+if __name__ == "__main__":
+    print_info("Starting statistics test flow...")
+    success = run_statistics_tests()
+    if success:
+        print_success("Statistics test flow completed successfully!")
+    else:
+        print_error("Statistics test flow failed!")
@@ -0,0 +1,178 @@
+"""
+Incrementally maintained registry statistics: deltas at commit, savepoints and rebuilds, checked in-process
+
+SQLite applies deltas inside the writer's transaction. The after-commit path
+PostgreSQL takes is exercised by treating SQLite as a dialect with advisory
+locks and recording the lock calls.
+
+    python -m pytest tests/test_statistics_counters.py
+"""
+import threading
+from datetime import date
+from unittest import mock
+
+import pytest
+from sqlalchemy import func, insert, select
+
+from query_budget import QueryBudgetHarness, QueryCounter
+
+from app.repositories.statistics_repository import StatisticsRepository
+from app.services.statistics_service import StatisticsService
+
+
+@pytest.fixture
+def harness():
+    harness = QueryBudgetHarness()
+    yield harness
+    harness.close()
+
+
+def patient_total():
+    from app.services.statistics_service import statistics_service
+    return statistics_service.get_summary()['patients']
+
+
+def new_patient(name, gender='female'):
+    from app.models import Patient
+    return Patient(name=name, birth_date=date(1950, 1, 1), gender=gender)
+
+
+def test_counters_are_written_at_commit_not_at_flush(harness):
+    with harness.app.app_context():
+        session = harness.db.session
+        before = patient_total()
+        session.commit()
+
+        with QueryCounter(harness.db.engine) as counter:
+            session.add(new_patient('Counted Patient'))
+            session.flush()
+            flushed = len(counter.statements)
+            session.commit()
+        assert not any('registry_statistic' in statement for statement in counter.statements[:flushed])
+        assert any('registry_statistic' in statement for statement in counter.statements[flushed:])
+        assert patient_total() == before + 1
+
+
+def test_rolled_back_transactions_and_savepoints_do_not_count(harness):
+    from app.models import Patient
+
+    with harness.app.app_context():
+        session = harness.db.session
+        before = patient_total()
+        session.commit()
+
+        session.add(new_patient('Rolled Back'))
+        session.flush()
+        session.rollback()
+
+        session.execute(insert(Patient), [
+            {'name': f"Bulk {index}", 'birth_date': date(1960, 1, index + 1), 'gender': 'male'} for index in range(3)])
+        with pytest.raises(RuntimeError):
+            with session.begin_nested():
+                session.add(new_patient('Savepoint Rolled Back'))
+                with session.begin_nested():
+                    session.add(new_patient('Inner Savepoint Released'))
+                raise RuntimeError("abandon the savepoint")
+        with session.begin_nested():
+            session.add(new_patient('Savepoint Released'))
+        session.commit()
+
+        assert patient_total() == before + 4 == session.execute(select(func.count(Patient.id))).scalar_one()
+
+
+@pytest.fixture
+def advisory_locks():
+    """SQLite treated as a dialect with advisory locks; yields the recorded lock calls"""
+    calls = []
+    with mock.patch('app.repositories.statistics_repository.ADVISORY_LOCK_DIALECTS', ('sqlite',)), \
+            mock.patch.object(StatisticsRepository, 'lock_shared', side_effect=lambda c: calls.append(('lock', c))), \
+            mock.patch.object(StatisticsRepository, 'unlock_shared', side_effect=lambda c: calls.append(('unlock', c))), \
+            mock.patch.object(StatisticsRepository, 'lock_exclusive', side_effect=lambda s: calls.append(('exclusive', s))):
+        yield calls
+
+
+def test_deltas_are_applied_after_the_commit_under_the_shared_lock(harness, advisory_locks):
+    from app.models import Patient
+
+    with harness.app.app_context():
+        session = harness.db.session
+        before = patient_total()
+        session.commit()
+
+        def committed_patients():
+            with harness.db.engine.connect() as connection:
+                return connection.execute(select(func.count(Patient.id))).scalar_one()
+
+        patients = committed_patients()
+        applied = []
+        apply_deltas = StatisticsRepository.apply_deltas
+
+        def record_apply(connection, deltas):
+            applied.append(committed_patients())
+            apply_deltas(connection, deltas)
+
+        with mock.patch.object(StatisticsRepository, 'apply_deltas', side_effect=record_apply):
+            session.add(new_patient('Counted After Commit'))
+            session.commit()
+
+        # Locked before the data committed, applied after, then unlocked on the same connection
+        assert [call for call, _ in advisory_locks] == ['lock', 'unlock']
+        assert advisory_locks[0][1] is advisory_locks[1][1] and advisory_locks[0][1].closed
+        assert applied == [patients + 1]
+        assert patient_total() == before + 1
+
+
+def test_failed_counter_updates_keep_the_write_and_are_reconciled(harness, advisory_locks):
+    from app.models import Patient
+    from app.services.statistics_service import statistics_service
+
+    with harness.app.app_context():
+        session = harness.db.session
+        before = patient_total()
+        session.commit()
+
+        with mock.patch.object(StatisticsRepository, 'apply_deltas', side_effect=RuntimeError("database gone")):
+            session.add(new_patient('Uncounted Patient'))
+            session.commit()
+        assert session.query(Patient).filter_by(name='Uncounted Patient').count() == 1
+        assert [call for call, _ in advisory_locks] == ['lock', 'unlock']
+        assert patient_total() == before
+
+        statistics_service.rebuild_statistics()
+        assert advisory_locks[-1] == ('exclusive', session)
+        assert patient_total() == before + 1
+
+
+def test_writes_committed_during_a_rebuild_are_not_lost(harness):
+    from app.models import RegistryStatistic
+    from app.services.statistics_service import statistics_service
+
+    compute_counts = StatisticsService.compute_counts
+    writer = threading.Thread(target=lambda: write_patient(harness))
+
+    def count_then_write(self):
+        counts = compute_counts(self)
+        # The rebuild's transaction holds the write lock, so the writer commits only after the replacement
+        writer.start()
+        writer.join(timeout=0.5)
+        assert writer.is_alive()
+        return counts
+
+    with harness.app.app_context():
+        before = patient_total()
+        harness.db.session.commit()
+        with mock.patch.object(StatisticsService, 'compute_counts', count_then_write):
+            statistics_service.rebuild_statistics()
+        writer.join()
+
+        harness.db.session.commit()
+        stored = {(statistic.metric, statistic.bucket): statistic.count
+                  for statistic in harness.db.session.query(RegistryStatistic)}
+        assert stored == statistics_service.compute_counts()
+        assert patient_total() == before + 1
+
+
+def write_patient(harness):
+    with harness.app.app_context():
+        harness.db.session.add(new_patient('Written During Rebuild'))
+        harness.db.session.commit()
@@ -0,0 +1,63 @@
+"""
+Synthetic registry data: determinism, plausibility and the bulk insert path
+
+    python -m pytest tests/test_synthetic_data.py
+"""
+import pytest
+
+from query_budget import QueryBudgetHarness
+
+from app.services.synthetic_data_service import DEFAULT_AS_OF, RegistryGenerator
+from app.value_sets.neurological_conditions import NEUROLOGICAL_CONDITIONS
+
+
+def histories(seed, count=50):
+    generator = RegistryGenerator(seed)
+    return [generator.patient() for _ in range(count)]
+
+
+def test_same_seed_same_histories():
+    assert histories(11) == histories(11)
+    assert histories(11) != histories(12)
+
+
+def test_histories_are_plausible():
+    codes = {condition['code'] for condition in NEUROLOGICAL_CONDITIONS}
+    for history in histories(5, 200):
+        birth_date = history['patient']['birth_date']
+        assert history['conditions']
+        for condition in history['conditions']:
+            assert condition['condition_code'] in codes
+            assert birth_date <= condition['onset_date'] <= DEFAULT_AS_OF
+        for observation in history['observations']:
+            assert observation['observation_date'].date() <= DEFAULT_AS_OF
+            if observation['observation_code'] == '72172-0':
+                assert 0 <= observation['value_numeric'] <= 30
+        for procedure in history['procedures']:
+            assert birth_date <= procedure['performed_date'].date() <= DEFAULT_AS_OF
+
+
+@pytest.fixture(scope='module')
+def harness():
+    harness = QueryBudgetHarness()
+    yield harness
+    harness.close()
+
+
+def test_generate_inserts_histories_and_keeps_statistics(harness):
+    from app.models import Patient, Condition, Observation, Procedure, RegistryStatistic
+    from app.services.statistics_service import statistics_service
+    from app.services.synthetic_data_service import synthetic_data_service
+
+    with harness.app.app_context():
+        result = synthetic_data_service.generate(40, seed=3, batch_size=15)
+        session = harness.db.session
+        assert result['patients'] == session.query(Patient).count() == 40
+        assert result['conditions'] == session.query(Condition).count()
+        assert result['observations'] == session.query(Observation).count()
+        assert result['procedures'] == session.query(Procedure).count()
+        assert result['rows'] == 40 + result['conditions'] + result['observations'] + result['procedures']
+
+        stored = {(statistic.metric, statistic.bucket): statistic.count
+                  for statistic in session.query(RegistryStatistic) if statistic.count}
+        assert stored == statistics_service.compute_counts()
@@ -152,6 +152,31 @@ def test_sync_statuses_endpoint():
         print_error(f"Failed to retrieve sync status values: {response.status_code} - {response.text}")
         return False
 
+def test_conditional_get():
+    """Test ETag/Cache-Control headers and 304 responses for unchanged value sets"""
+    print_info("Testing conditional GET on value sets...")
+    
+    response = requests.get(f"{BASE_URL}/value-sets/genders")
+    etag = response.headers.get("ETag")
+    if response.status_code != 200 or not etag:
+        print_error(f"Expected a 200 with an ETag: {response.status_code} - {response.headers}")
+        return False
+    print_debug(f"ETag: {etag}, Cache-Control: {response.headers.get('Cache-Control')}")
+    
+    response = requests.get(f"{BASE_URL}/value-sets/genders", headers={"If-None-Match": etag})
+    if response.status_code == 304 and not response.content:
+        print_success("Unchanged value set was answered with 304 Not Modified")
+    else:
+        print_error(f"Expected 304 for a matching ETag, got {response.status_code}")
+        return False
+    
+    response = requests.get(f"{BASE_URL}/value-sets/genders", headers={"If-None-Match": '"stale"'})
+    if response.status_code == 200 and response.headers.get("ETag") == etag:
+        print_success("Stale ETag received the full value set")
+        return True
+    print_error(f"Expected 200 for a stale ETag, got {response.status_code}")
+    return False
+
 def run_value_sets_tests():
     """Run all value sets tests"""
     print_info("Starting value sets tests...")
@@ -168,6 +193,9 @@ def run_value_sets_tests():
     # Test 4: Sync status values
     test_sync_statuses_endpoint()
     
+    # Test 5: Conditional GET with ETags
+    test_conditional_get()
+    
     print_info("Value sets tests completed.")
 
 if __name__ == "__main__":
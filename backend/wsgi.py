@@ -0,0 +1,21 @@
+"""
+Production WSGI entrypoint
+
+    gunicorn --config gunicorn.conf.py wsgi:app
+
+gunicorn.conf.py preloads this module in the master process, so the app is
+created (and reference data seeded) once and shared copy-on-write by every
+worker; `after_fork` then gives each worker its own connections.
+"""
+from app import create_app, db
+from app.celery_app import reset_broker_connections
+from app.utils.database import dispose_engines_after_fork
+
+app = create_app(role='api')
+
+
+def after_fork():
+    """Run in each worker right after it is forked from the preloading master"""
+    with app.app_context():
+        dispose_engines_after_fork(db)
+    reset_broker_connections()
@@ -3,6 +3,41 @@ import CredentialsProvider from "next-auth/providers/credentials";
 
 const API_BASE_URL = 'http://localhost:5005';
 
+// Refresh the access token this long before it expires (ms)
+const REFRESH_MARGIN = 60 * 1000;
+
+/**
+ * Exchange the refresh token for a new access token and a rotated refresh token
+ */
+async function refreshAccessToken(token: any) {
+  try {
+    const response = await fetch(`${API_BASE_URL}/auth/refresh`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({ refresh_token: token.refreshToken }),
+    });
+
+    if (!response.ok) {
+      console.error('Token refresh failed:', response.status);
+      return { ...token, error: 'RefreshAccessTokenError' };
+    }
+
+    const data = await response.json();
+    return {
+      ...token,
+      accessToken: data.access_token,
+      accessTokenExpires: Date.now() + data.expires_in * 1000,
+      refreshToken: data.refresh_token,
+      error: undefined,
+    };
+  } catch (error) {
+    console.error('Token refresh error:', error);
+    return { ...token, error: 'RefreshAccessTokenError' };
+  }
+}
+
 export const authOptions = {
   providers: [
     CredentialsProvider({
@@ -32,13 +67,15 @@ export const authOptions = {
 
           const data = await response.json();
           
-          // Return the user object with access token
+          // Return the user object with access and refresh tokens
           return {
             id: data.user.id.toString(),
             name: data.user.username,
             email: data.user.email || `${data.user.username}@example.com`,
             role: data.user.role,
-            accessToken: data.access_token
+            accessToken: data.access_token,
+            accessTokenExpires: Date.now() + data.expires_in * 1000,
+            refreshToken: data.refresh_token
           };
         } catch (error) {
           console.error('Auth error:', error);
@@ -54,8 +91,16 @@ export const authOptions = {
         token.id = user.id;
         token.role = user.role;
         token.accessToken = user.accessToken;
+        token.accessTokenExpires = user.accessTokenExpires;
+        token.refreshToken = user.refreshToken;
+        return token;
+      }
+
+      // Access tokens are short-lived; rotate through /auth/refresh shortly before expiry
+      if (!token.refreshToken || Date.now() < token.accessTokenExpires - REFRESH_MARGIN) {
+        return token;
       }
-      return token;
+      return refreshAccessToken(token);
     },
     async session({ session, token }) {
       // Pass data to the client
@@ -63,6 +108,7 @@ export const authOptions = {
         session.user.id = token.id;
         session.user.role = token.role;
         session.accessToken = token.accessToken;
+        session.error = token.error;
       }
       return session;
     }
@@ -47,8 +47,8 @@ export const AuthProvider = ({ children }: AuthProviderProps) => {
         setUser(userData);
       } catch (err) {
         console.error('Failed to validate token:', err);
-        // Clear invalid token
-        localStorage.removeItem('auth_token');
+        // Clear invalid tokens
+        apiClient.clearTokens();
       } finally {
         setLoading(false);
       }
@@ -62,9 +62,9 @@ export const AuthProvider = ({ children }: AuthProviderProps) => {
     try {
       const response = await apiClient.login(username, password);
       
-      // Save token to localStorage
+      // Save tokens to localStorage
       if (response.access_token) {
-        localStorage.setItem('auth_token', response.access_token);
+        apiClient.storeTokens(response);
         setUser(response.user);
         return true;
       } else {
@@ -78,7 +78,8 @@ export const AuthProvider = ({ children }: AuthProviderProps) => {
   };
 
   const logout = () => {
-    localStorage.removeItem('auth_token');
+    // Revoke the refresh token server-side; the local tokens are cleared either way
+    apiClient.logout().catch((err) => console.error('Logout failed:', err));
     setUser(null);
     router.push('/auth/signin');
   };
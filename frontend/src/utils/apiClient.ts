@@ -83,9 +83,21 @@ interface TokenResponse {
   access_token: string;
   token_type: string;
   expires_in: number;
-  user: UserResponse;
+  refresh_token?: string;
+  refresh_expires_in?: number;
+  user?: UserResponse;
 }
 
+// Local storage keys of the refresh token and the access token's expiry (ms since epoch)
+const REFRESH_TOKEN_KEY = 'refresh_token';
+const TOKEN_EXPIRES_KEY = 'auth_token_expires_at';
+
+// Refresh the access token this long before it expires (ms)
+const REFRESH_MARGIN = 60 * 1000;
+
+// Endpoints whose 401 means bad credentials, not an expired access token
+const CREDENTIAL_ENDPOINTS = ['/auth/login', '/auth/refresh', '/auth/logout'];
+
 interface UserResponse {
   id: number;
   username: string;
@@ -101,6 +113,7 @@ interface UserResponse {
 class ApiClient {
   private baseUrl: string;
   private defaultHeaders: HeadersInit;
+  private refreshing: Promise<boolean> | null = null;
   
   constructor() {
     this.baseUrl = config.api.baseUrl;
@@ -119,6 +132,76 @@ class ApiClient {
     return null;
   }
   
+  /**
+   * Store the tokens of a login or refresh response
+   */
+  storeTokens(response: TokenResponse): void {
+    localStorage.setItem('auth_token', response.access_token);
+    localStorage.setItem(TOKEN_EXPIRES_KEY, String(Date.now() + response.expires_in * 1000));
+    if (response.refresh_token) {
+      localStorage.setItem(REFRESH_TOKEN_KEY, response.refresh_token);
+    }
+  }
+  
+  /**
+   * Remove the stored tokens
+   */
+  clearTokens(): void {
+    localStorage.removeItem('auth_token');
+    localStorage.removeItem(TOKEN_EXPIRES_KEY);
+    localStorage.removeItem(REFRESH_TOKEN_KEY);
+  }
+  
+  /**
+   * Exchange the refresh token for a new access token and a rotated refresh token
+   *
+   * Concurrent callers share one request: a refresh token is single-use, and
+   * presenting it twice revokes the whole login.
+   */
+  private refreshAccessToken(): Promise<boolean> {
+    const refreshToken = typeof window !== 'undefined' ? localStorage.getItem(REFRESH_TOKEN_KEY) : null;
+    if (!refreshToken) {
+      return Promise.resolve(false);
+    }
+    if (!this.refreshing) {
+      this.refreshing = (async () => {
+        try {
+          const response = await fetch(`${this.baseUrl}/auth/refresh`, {
+            method: 'POST',
+            headers: this.defaultHeaders,
+            body: JSON.stringify({ refresh_token: refreshToken }),
+            mode: 'cors'
+          });
+          if (!response.ok) {
+            this.clearTokens();
+            return false;
+          }
+          this.storeTokens(await response.json());
+          return true;
+        } catch (error) {
+          console.error('Token refresh failed:', error);
+          return false;
+        } finally {
+          this.refreshing = null;
+        }
+      })();
+    }
+    return this.refreshing;
+  }
+  
+  /**
+   * Refresh the access token if it expires within REFRESH_MARGIN
+   */
+  private async ensureFreshToken(): Promise<void> {
+    if (typeof window === 'undefined' || !localStorage.getItem(REFRESH_TOKEN_KEY)) {
+      return;
+    }
+    const expiresAt = Number(localStorage.getItem(TOKEN_EXPIRES_KEY) || 0);
+    if (Date.now() >= expiresAt - REFRESH_MARGIN) {
+      await this.refreshAccessToken();
+    }
+  }
+  
   /**
    * Add authentication headers to request if token exists
    */
@@ -172,11 +255,11 @@ class ApiClient {
   ): Promise<T> {
     // Direct endpoint URL without /api prefix
     const url = `${this.baseUrl}${endpoint}`;
-    const headers = this.getHeaders(customHeaders);
+    await this.ensureFreshToken();
     
     const options: RequestInit = {
       method,
-      headers,
+      headers: this.getHeaders(customHeaders),
       // Fix CORS issues with 'include' instead of 'same-origin'
       credentials: 'include',
       // Add mode: 'cors' to explicitly enable CORS
@@ -188,7 +271,11 @@ class ApiClient {
     }
     
     try {
-      const response = await fetch(url, options);
+      let response = await fetch(url, options);
+      // The access token may have expired or been revoked since it was checked: refresh once and retry
+      if (response.status === 401 && !CREDENTIAL_ENDPOINTS.includes(endpoint) && await this.refreshAccessToken()) {
+        response = await fetch(url, { ...options, headers: this.getHeaders(customHeaders) });
+      }
       return this.handleResponse<T>(response);
     } catch (error) {
       console.error(`${method} request to ${endpoint} failed:`, error);
@@ -222,6 +309,14 @@ class ApiClient {
     return this.post<TokenResponse>('/auth/login', { username, password });
   }
   
+  async logout(): Promise<void> {
+    const refreshToken = localStorage.getItem(REFRESH_TOKEN_KEY);
+    this.clearTokens();
+    if (refreshToken) {
+      await this.post('/auth/logout', { refresh_token: refreshToken });
+    }
+  }
+  
   async getCurrentUser(): Promise<UserResponse> {
     return this.get<UserResponse>('/auth/me');
   }